@@ -25,7 +25,7 @@ from ..core.events import (
     PlayerJoinedEvent, HandEndedEvent
 )
 from ..core.invariant import GameInvariants, InvariantError
-from ..core.snapshot import SnapshotManager, get_snapshot_manager
+from ..core.snapshot import SnapshotManager, GameStateView, get_snapshot_manager
 from ..core.chips.chip_ledger import ChipLedger
 from ..core.rules.phase_logic import get_possible_next_phases
 from v3.application.types import QueryResult
@@ -399,6 +399,8 @@ class GameCommandService:
         context.active_player_id = None
         context.winners_this_hand = []
         context.current_hand_bets.clear()
+        context.pot_tracker.reset()
+        context.mark_changed()
     
     def _setup_blinds_for_new_hand(self, context: GameContext) -> bool:
         """为新手牌设置盲注"""
@@ -487,11 +489,13 @@ class GameCommandService:
             if amount_to_post > 0:
                 context.chip_ledger.freeze_chips(player_id, amount_to_post, f"下{blind_type}")
                 context.current_hand_bets[player_id] = context.current_hand_bets.get(player_id, 0) + amount_to_post
+                context.pot_tracker.add_bet(player_id, amount_to_post)
                 context.players[player_id]['current_bet'] = amount_to_post
                 context.players[player_id]['total_bet_this_hand'] = amount_to_post
                 
                 if amount_to_post >= player_balance:
                     context.players[player_id]['status'] = 'all_in'
+                context.mark_player_changed(player_id)
             
             return amount_to_post
 
@@ -561,6 +565,7 @@ class GameCommandService:
             )
             
             session.state_machine.handle_event(game_event, session.context)
+            session.context.mark_player_changed(player_id)
             session.update_timestamp()
 
             # 发布领域事件
@@ -721,7 +726,9 @@ class GameCommandService:
                     error_code="GAME_NOT_FOUND"
                 )
             
-            del self._sessions[game_id]
+            session = self._sessions.pop(game_id)
+            session.context.chip_ledger.close()
+            self._snapshot_manager.drop_partition(game_id)
             
             return CommandResult.success_result(
                 message=f"游戏 {game_id} 已移除"
@@ -798,6 +805,27 @@ class GameCommandService:
                 error_code="GET_GAME_STATE_SNAPSHOT_FAILED"
             )
     
+    def get_game_state_view(self, game_id: str) -> QueryResult:
+        """
+        获取游戏状态的只读视图
+        
+        视图直接读取实时的游戏上下文，属性与GameStateSnapshot相同，但不复制状态，
+        也不登记到快照历史，用于进程内的查询。需要传递到进程外或持久化时使用get_game_state_snapshot。
+        
+        Args:
+            game_id: 游戏ID
+            
+        Returns:
+            QueryResult[GameStateView]: 查询结果，包含游戏状态视图
+        """
+        session = self._sessions.get(game_id)
+        if session is None:
+            return QueryResult.business_rule_violation(
+                f"游戏 {game_id} 不存在",
+                error_code="GAME_NOT_FOUND"
+            )
+        return QueryResult.success_result(GameStateView(session.context))
+    
     def _verify_game_invariants(self, game_id: str, operation_context: str = "游戏操作") -> None:
         """
         验证游戏不变量
@@ -16,7 +16,9 @@ from .types import QueryResult
 from ..core.state_machine.types import GamePhase, GameContext
 from ..core.events import EventBus, get_event_bus, DomainEvent
 from ..core.snapshot.types import GameStateSnapshot, PlayerSnapshot
+from ..core.snapshot.state_view import GameStateView
 from ..core.rules.types import CorePermissibleActionsData
+from ..core.rules import determine_permissible_actions_from_state
 
 
 @dataclass(frozen=True)
@@ -72,6 +74,9 @@ class GameQueryService:
         """
         获取游戏状态快照 (PLAN 40: 使用快照接口)
         
+        返回的完整快照会登记到快照历史，适合需要传递到进程外或持久化的场景；
+        进程内只读取少量字段的查询使用命令服务的get_game_state_view。
+        
         Args:
             game_id: 游戏ID
             
@@ -106,7 +111,7 @@ class GameQueryService:
     
     def get_player_info(self, game_id: str, player_id: str) -> QueryResult[PlayerInfo]:
         """
-        获取玩家信息 (PLAN 40: 使用快照接口)
+        获取玩家信息 (使用只读状态视图)
         
         Args:
             game_id: 游戏ID
@@ -121,18 +126,17 @@ class GameQueryService:
                 error_code="COMMAND_SERVICE_NOT_INITIALIZED"
             )
         
-        # PLAN 40: 使用快照接口获取游戏状态
-        snapshot_result = self._command_service.get_game_state_snapshot(game_id)
-        if not snapshot_result.success:
+        view_result = self._command_service.get_game_state_view(game_id)
+        if not view_result.success:
             return QueryResult.failure_result(
-                snapshot_result.message,
-                error_code=snapshot_result.error_code
+                view_result.message,
+                error_code=view_result.error_code
             )
         
-        snapshot: GameStateSnapshot = snapshot_result.data
+        view: GameStateView = view_result.data
         
         # 检查玩家是否存在
-        player_snapshot = snapshot.get_player_by_id(player_id)
+        player_snapshot = view.get_player_by_id(player_id)
         if player_snapshot is None:
             return QueryResult.failure_result(
                 f"玩家 {player_id} 不在游戏中",
@@ -151,7 +155,7 @@ class GameQueryService:
     
     def get_available_actions(self, game_id: str, player_id: str) -> QueryResult[AvailableActions]:
         """
-        获取玩家可用行动 (PLAN 44: 使用核心层逻辑)
+        获取玩家可用行动 (PLAN 44: 使用核心层逻辑，读取只读状态视图)
         
         Args:
             game_id: 游戏ID
@@ -167,62 +171,25 @@ class GameQueryService:
             )
         
         try:
-            # PLAN 40: 使用快照接口获取游戏状态
-            snapshot_result = self._command_service.get_game_state_snapshot(game_id)
-            if not snapshot_result.success:
+            # 只读视图直接读取实时状态，不复制上下文或重建ChipLedger
+            view_result = self._command_service.get_game_state_view(game_id)
+            if not view_result.success:
                 return QueryResult.failure_result(
-                    snapshot_result.message,
-                    error_code=snapshot_result.error_code
+                    view_result.message,
+                    error_code=view_result.error_code
                 )
             
-            snapshot: GameStateSnapshot = snapshot_result.data
+            view: GameStateView = view_result.data
             
             # 检查玩家是否存在
-            player_snapshot = snapshot.get_player_by_id(player_id)
-            if player_snapshot is None:
+            if view.get_player_by_id(player_id) is None:
                 return QueryResult.failure_result(
                     f"玩家 {player_id} 不在游戏中",
                     error_code="PLAYER_NOT_IN_GAME"
                 )
 
             # PLAN 44: 使用核心层逻辑确定可用行动
-            # Re-import for clarity, can be optimized at module level
-            from ..core.rules import determine_permissible_actions
-            from ..core.chips.chip_ledger import ChipLedger
-            
-            # 构建GameContext用于核心层逻辑
-            
-            # 从快照数据重建 ChipLedger, 这是一个临时的解决方案
-            # 正确的重构应该让 ChipLedger 存在于一个更高层级的 GameSession 中
-            ledger = ChipLedger()
-            for p in snapshot.players:
-                ledger.set_balance(p.player_id, p.chips)
-            
-            # 将玩家快照元组转换为GameContext所需的字典
-            # GameContext.players 期望一个字典, value可以是任何东西 (Any)
-            # 在这里我们传递PlayerSnapshot的字典表示
-            players_dict = {p.player_id: asdict(p) for p in snapshot.players}
-
-            active_player_id = None
-            if snapshot.active_player_position is not None:
-                if 0 <= snapshot.active_player_position < len(snapshot.players):
-                    active_player_id = snapshot.players[snapshot.active_player_position].player_id
-
-            game_context = GameContext(
-                game_id=snapshot.game_id,
-                current_phase=snapshot.phase,
-                players=players_dict,
-                chip_ledger=ledger,
-                community_cards=list(snapshot.community_cards),
-                pot_total=snapshot.pot.total_pot,
-                current_bet=snapshot.current_bet,
-                small_blind=snapshot.small_blind_amount,
-                big_blind=snapshot.big_blind_amount,
-                active_player_id=active_player_id
-            )
-            
-            # 调用核心层逻辑获取可用行动
-            core_actions_data: CorePermissibleActionsData = determine_permissible_actions(game_context, player_id)
+            core_actions_data: CorePermissibleActionsData = determine_permissible_actions_from_state(view, player_id)
             
             # 转换为应用层DTO
             available_actions = AvailableActions(
@@ -307,7 +274,7 @@ class GameQueryService:
     
     def get_phase_info(self, game_id: str) -> QueryResult[Dict[str, Any]]:
         """
-        获取当前阶段信息 (PLAN 40: 使用快照接口)
+        获取当前阶段信息 (使用只读状态视图)
         
         Args:
             game_id: 游戏ID
@@ -321,37 +288,67 @@ class GameQueryService:
                 error_code="COMMAND_SERVICE_NOT_INITIALIZED"
             )
         
-        # PLAN 40: 使用快照接口获取游戏状态
-        snapshot_result = self._command_service.get_game_state_snapshot(game_id)
-        if not snapshot_result.success:
+        view_result = self._command_service.get_game_state_view(game_id)
+        if not view_result.success:
             return QueryResult.failure_result(
-                snapshot_result.message,
-                error_code=snapshot_result.error_code
+                view_result.message,
+                error_code=view_result.error_code
             )
         
-        snapshot = snapshot_result.data
+        view: GameStateView = view_result.data
         
-        # 临时：基于快照信息构建阶段信息
+        # 临时：基于状态视图构建阶段信息
         # TODO: 在PLAN 43中将部分逻辑移到core层
-        from ..core.state_machine import GamePhase
-        current_phase_enum = None
-        for phase in GamePhase:
-            if phase.name == snapshot.current_phase:
-                current_phase_enum = phase
-                break
-        
         phase_info = {
-            'current_phase': snapshot.current_phase,
-            'transition_history': [],  # 快照中暂无此信息
+            'current_phase': view.phase.name,
+            'transition_history': [],  # 视图中暂无此信息
             'can_advance': False,  # 临时简化，TODO: 在PLAN 43中实现
-            'next_phase': self._get_next_phase(current_phase_enum) if current_phase_enum else None,
-            'community_cards': snapshot.community_cards,
-            'pot_total': snapshot.pot_total
+            'next_phase': self._get_next_phase(view.phase),
+            'community_cards': list(view.community_cards),
+            'pot_total': view.pot.total_pot
         }
         
         return QueryResult.success_result(phase_info)
     
 
+    def get_pot_info(self, game_id: str) -> QueryResult[Dict[str, Any]]:
+        """
+        获取当前手牌的底池信息：边池预览和每位玩家可争夺的边池
+        
+        直接读取随下注增量更新的GameContext.pot_tracker，不会每次从全部下注重新计算边池。
+        
+        Args:
+            game_id: 游戏ID
+            
+        Returns:
+            查询结果，包含底池总额、边池预览和玩家可争夺的边池ID
+        """
+        if self._command_service is None:
+            return QueryResult.failure_result(
+                "命令服务未初始化",
+                error_code="COMMAND_SERVICE_NOT_INITIALIZED"
+            )
+        
+        context_result = self._command_service.get_live_context(game_id)
+        if not context_result.success:
+            return QueryResult.failure_result(
+                context_result.message,
+                error_code=context_result.error_code
+            )
+        
+        context: GameContext = context_result.data
+        
+        # 跟踪器与下注记录不一致时（例如直接修改了current_hand_bets）才重新计算
+        from ..core.pot import PotCalculator
+        tracker = PotCalculator.resolve_tracker(context.current_hand_bets, context.pot_tracker)
+        pot_info = {
+            'pot_total': tracker.total,
+            'preview': tracker.preview(),
+            'eligible_pots': {player_id: tracker.eligible_pot_ids(player_id) for player_id in context.players}
+        }
+        
+        return QueryResult.success_result(pot_info)
+    
     def calculate_random_raise_amount(self, game_id: str, player_id: str, 
                                     min_ratio: float = 0.25, max_ratio: float = 2.0) -> QueryResult[int]:
         """
@@ -610,7 +607,7 @@ class GameQueryService:
     
     def is_game_over(self, game_id: str) -> QueryResult[bool]:
         """
-        检查游戏是否已结束 (PLAN 40: 使用快照接口)
+        检查游戏是否已结束 (使用只读状态视图)
         
         在德州扑克中，游戏在以下情况结束：
         1. 只剩下1个或0个有筹码的玩家能够继续下一手牌
@@ -631,21 +628,17 @@ class GameQueryService:
                 error_code="COMMAND_SERVICE_NOT_INITIALIZED"
             )
         
-        # PLAN 40: 使用快照接口获取游戏状态
-        snapshot_result = self._command_service.get_game_state_snapshot(game_id)
-        if not snapshot_result.success:
+        view_result = self._command_service.get_game_state_view(game_id)
+        if not view_result.success:
             return QueryResult.failure_result(
-                snapshot_result.message,
-                error_code=snapshot_result.error_code
+                view_result.message,
+                error_code=view_result.error_code
             )
         
-        snapshot = snapshot_result.data
+        view: GameStateView = view_result.data
         
-        # 计算有筹码的玩家数量（能够继续下一手牌的玩家）
-        players_with_chips = [
-            player_id for player_id, player_data in snapshot.players.items()
-            if player_data.get('chips', 0) > 0
-        ]
+        # 计算有筹码的玩家数量（能够继续下一手牌的玩家），筹码来自ChipLedger
+        players_with_chips = [player.player_id for player in view.players if player.chips > 0]
         
         # 德州扑克规则：如果少于2个玩家有筹码能够继续游戏，整个游戏结束
         # 这与当前手牌状态无关，只看筹码分布
@@ -656,7 +649,7 @@ class GameQueryService:
         result.__dict__['data_details'] = {
             'players_with_chips_count': len(players_with_chips),
             'players_with_chips': players_with_chips,
-            'current_phase': snapshot.current_phase,
+            'current_phase': view.phase.name,
             'reason': 'insufficient_players_with_chips' if game_over else 'ongoing'
         }
         return result
@@ -952,33 +945,39 @@ class GameQueryService:
             import hashlib
             import json
             
+            if self._command_service is None:
+                return QueryResult.failure_result(
+                    "命令服务未初始化",
+                    error_code="COMMAND_SERVICE_NOT_INITIALIZED"
+                )
+            
             # 获取游戏状态
-            state_result = self.get_game_state(game_id)
-            if not state_result.success:
+            view_result = self._command_service.get_game_state_view(game_id)
+            if not view_result.success:
                 return QueryResult.failure_result(
-                    f"无法获取游戏状态: {state_result.message}",
-                    error_code=state_result.error_code
+                    f"无法获取游戏状态: {view_result.message}",
+                    error_code=view_result.error_code
                 )
             
-            game_state = state_result.data
+            view: GameStateView = view_result.data
             
             # 提取关键状态信息
             state_info = {
-                'phase': game_state.current_phase,
-                'pot_total': game_state.pot_total,
-                'current_bet': game_state.current_bet,
-                'active_player': game_state.active_player_id,
-                'community_cards_count': len(game_state.community_cards),
+                'phase': view.phase.name,
+                'pot_total': view.pot.total_pot,
+                'current_bet': view.current_bet,
+                'active_player': view.active_player_position,
+                'community_cards_count': len(view.community_cards),
             }
             
             # 添加玩家状态信息
             player_states = {}
-            for player_id, player_data in game_state.players.items():
-                player_states[player_id] = {
-                    'chips': player_data.get('chips', 0),
-                    'current_bet': player_data.get('current_bet', 0),
-                    'active': player_data.get('active', False),
-                    'status': player_data.get('status', 'unknown')
+            for player in view.players:
+                player_states[player.player_id] = {
+                    'chips': player.chips,
+                    'current_bet': player.current_bet,
+                    'active': player.is_active,
+                    'all_in': player.is_all_in
                 }
             
             state_info['players'] = player_states
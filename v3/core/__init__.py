@@ -11,6 +11,7 @@ Modules:
     chips: 筹码账本和筹码操作
     deck: 牌组管理和发牌逻辑
     eval: 牌型评估和手牌比较
+    equity: 胜率计算
     rules: 游戏规则和验证逻辑
     invariant: 数学不变量检查
     events: 领域事件系统
@@ -5,13 +5,22 @@
 """
 
 from .chip_ledger import ChipLedger
+from .simulation_ledger import SimulationChipLedger, TransactionRecording, TransactionAggregate
 from .chip_transaction import ChipTransaction, TransactionType
+from .transaction_log import TransactionLog
+from .ledger_wal import LedgerWAL, WALRecoveryResult
 from .chip_validator import ChipValidator, ValidationResult
 
 __all__ = [
     'ChipLedger',
+    'SimulationChipLedger',
+    'TransactionRecording',
+    'TransactionAggregate',
     'ChipTransaction',
     'TransactionType', 
+    'TransactionLog',
+    'LedgerWAL',
+    'WALRecoveryResult',
     'ChipValidator',
     'ValidationResult'
 ] 
\ No newline at end of file
@@ -4,12 +4,16 @@
 提供筹码管理的核心功能，确保所有筹码操作的原子性和一致性。
 """
 
-from typing import Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Dict, List, Optional, Set
 from dataclasses import dataclass, field
 from .chip_transaction import ChipTransaction, TransactionType
+from .transaction_log import TransactionLog
 import threading
 import time
 
+if TYPE_CHECKING:
+    from .ledger_wal import LedgerWAL
+
 __all__ = ['ChipLedger', 'ChipLedgerSnapshot']
 
 
@@ -34,24 +38,66 @@ class ChipLedger:
     筹码账本
     
     确保所有筹码操作的原子性和一致性，支持筹码守恒检查。
+    
+    系统总筹码在每次变动时增量维护；交易记录保存在列式的TransactionLog中，
+    内存中只保留最近的一段，更早的记录溢出到本地文件。交易记录按玩家和手牌建立索引
+    （每次settle_hand结束一手牌），守恒检查和历史查询不需要扫描全部记录。
     """
     
-    def __init__(self, initial_balances: Optional[Dict[str, int]] = None):
+    def __init__(self, initial_balances: Optional[Dict[str, int]] = None,
+                 transaction_log: Optional[TransactionLog] = None,
+                 wal: Optional['LedgerWAL'] = None):
         """
         初始化筹码账本
         
         Args:
             initial_balances: 初始筹码分配
+            transaction_log: 交易日志，为None时使用默认窗口大小和临时溢出文件
+            wal: 可选的预写日志，每次变动都会追加记录，用于崩溃后恢复
         """
         self._player_balances: Dict[str, int] = initial_balances.copy() if initial_balances else {}
         self._frozen_chips: Dict[str, int] = {}  # 冻结的筹码
-        self._transaction_history: List[ChipTransaction] = []
+        self._transaction_log = transaction_log if transaction_log is not None else TransactionLog()
+        # 变化版本号：每次余额或冻结筹码变化时递增，并记录到对应玩家，供快照增量重建
+        self._version = 0
+        self._player_versions: Dict[str, int] = {}
         self._lock = threading.RLock()  # 线程安全锁
         
         # 验证初始余额
         for player_id, balance in self._player_balances.items():
             if balance < 0:
                 raise ValueError(f"玩家{player_id}的初始余额不能为负数: {balance}")
+        self._total_chips = sum(self._player_balances.values())
+        
+        self._wal: Optional['LedgerWAL'] = None
+        if wal is not None:
+            self.attach_wal(wal)
+    
+    def attach_wal(self, wal: 'LedgerWAL') -> None:
+        """
+        附加预写日志，先写入当前状态的检查点，之后的每次变动都会追加记录
+        
+        Args:
+            wal: 预写日志
+        """
+        with self._lock:
+            wal.log_checkpoint(self._player_balances, self._frozen_chips)
+            self._wal = wal
+    
+    def __enter__(self) -> 'ChipLedger':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """
+        关闭交易日志的溢出文件和内存映射
+        
+        附加的预写日志由创建者负责关闭。
+        """
+        with self._lock:
+            self._transaction_log.close()
     
     def get_balance(self, player_id: str) -> int:
         """获取玩家总筹码余额"""
@@ -70,10 +116,28 @@ class ChipLedger:
         with self._lock:
             return self._frozen_chips.get(player_id, 0)
     
+    @property
+    def version(self) -> int:
+        """变化版本号，任何玩家的余额或冻结筹码变化时递增"""
+        return self._version
+    
+    def changed_since(self, player_id: str, version: int) -> bool:
+        """
+        玩家的余额或冻结筹码在版本version之后是否变化过
+        
+        Args:
+            player_id: 玩家ID
+            version: 之前读取的version
+            
+        Returns:
+            是否变化过
+        """
+        return self._player_versions.get(player_id, 0) > version
+    
     def get_total_chips(self) -> int:
         """获取系统总筹码，用于守恒检查"""
         with self._lock:
-            return sum(self._player_balances.values())
+            return self._total_chips
     
     def get_all_players(self) -> Set[str]:
         """获取所有玩家ID"""
@@ -102,10 +166,13 @@ class ChipLedger:
             
             # 执行扣除
             self._player_balances[player_id] = self._player_balances.get(player_id, 0) - amount
+            self._total_chips -= amount
+            self._mark_changed(player_id)
             
             # 记录交易
-            transaction = ChipTransaction.create_deduct_transaction(player_id, amount, description)
-            self._transaction_history.append(transaction)
+            self._transaction_log.append(TransactionType.DEDUCT, player_id, amount, -amount, description)
+            if self._wal is not None:
+                self._wal.log_deduct(player_id, amount)
             
             return True
     
@@ -123,10 +190,13 @@ class ChipLedger:
         
         with self._lock:
             self._player_balances[player_id] = self._player_balances.get(player_id, 0) + amount
+            self._total_chips += amount
+            self._mark_changed(player_id)
             
             # 记录交易
-            transaction = ChipTransaction.create_add_transaction(player_id, amount, description)
-            self._transaction_history.append(transaction)
+            self._transaction_log.append(TransactionType.ADD, player_id, amount, amount, description)
+            if self._wal is not None:
+                self._wal.log_add(player_id, amount)
     
     def transfer_chips(self, from_player: str, to_player: str, amount: int, description: str = "") -> bool:
         """
@@ -177,17 +247,12 @@ class ChipLedger:
                 return False
             
             self._frozen_chips[player_id] = self._frozen_chips.get(player_id, 0) + amount
+            self._mark_changed(player_id)
             
             # 记录交易
-            transaction = ChipTransaction(
-                transaction_id=f"freeze_{player_id}_{len(self._transaction_history)}",
-                transaction_type=TransactionType.FREEZE,
-                player_id=player_id,
-                amount=amount,
-                timestamp=time.time(),
-                description=description
-            )
-            self._transaction_history.append(transaction)
+            self._transaction_log.append(TransactionType.FREEZE, player_id, amount, 0, description)
+            if self._wal is not None:
+                self._wal.log_freeze(player_id, amount)
             
             return True
     
@@ -214,17 +279,12 @@ class ChipLedger:
             self._frozen_chips[player_id] = frozen - amount
             if self._frozen_chips[player_id] == 0:
                 del self._frozen_chips[player_id]
+            self._mark_changed(player_id)
             
             # 记录交易
-            transaction = ChipTransaction(
-                transaction_id=f"unfreeze_{player_id}_{len(self._transaction_history)}",
-                transaction_type=TransactionType.UNFREEZE,
-                player_id=player_id,
-                amount=amount,
-                timestamp=time.time(),
-                description=description
-            )
-            self._transaction_history.append(transaction)
+            self._transaction_log.append(TransactionType.UNFREEZE, player_id, amount, 0, description)
+            if self._wal is not None:
+                self._wal.log_unfreeze(player_id, amount)
             
             return True
     
@@ -235,7 +295,7 @@ class ChipLedger:
                 player_balances=self._player_balances.copy(),
                 frozen_chips=self._frozen_chips.copy(),
                 total_chips=self.get_total_chips(),
-                transaction_count=len(self._transaction_history),
+                transaction_count=len(self._transaction_log),
                 timestamp=time.time()
             )
     
@@ -253,23 +313,20 @@ class ChipLedger:
             total_before_settle = self.get_total_chips()
 
             # 2. 清空所有冻结的筹码
+            for player_id in self._frozen_chips:
+                self._mark_changed(player_id)
             self._frozen_chips.clear()
             
             # 3. 应用净变化
             for player_id, net_change in transactions.items():
                 self._player_balances[player_id] = self._player_balances.get(player_id, 0) + net_change
+                self._total_chips += net_change
+                self._mark_changed(player_id)
                 
                 # 记录详细的Settle交易
-                transaction = ChipTransaction(
-                    transaction_id=f"settle_{player_id}_{len(self._transaction_history)}",
-                    transaction_type=TransactionType.SETTLE,
-                    player_id=player_id,
-                    amount=abs(net_change),
-                    timestamp=time.time(),
-                    description=f"手牌结算: 净变化 {net_change}",
-                    metadata={'net_change': net_change}
-                )
-                self._transaction_history.append(transaction)
+                self._transaction_log.append(TransactionType.SETTLE, player_id, abs(net_change), net_change,
+                                             f"手牌结算: 净变化 {net_change}")
+            self._transaction_log.end_hand()
 
             # 4. 验证筹码守恒
             total_after_settle = self.get_total_chips()
@@ -279,6 +336,8 @@ class ChipLedger:
                     f"手牌结算后筹码不守恒! "
                     f"结算前: {total_before_settle}, 结算后: {total_after_settle}"
                 )
+            if self._wal is not None:
+                self._wal.log_settle(transactions)
 
     def get_transaction_history(self, player_id: Optional[str] = None) -> List[ChipTransaction]:
         """
@@ -292,9 +351,50 @@ class ChipLedger:
         """
         with self._lock:
             if player_id is None:
-                return self._transaction_history.copy()
+                return self._transaction_log.slice()
             else:
-                return [t for t in self._transaction_history if t.player_id == player_id]
+                return self._transaction_log.for_player(player_id)
+    
+    def get_hand_count(self) -> int:
+        """获取已结算的手牌数量"""
+        with self._lock:
+            return self._transaction_log.hand_count
+    
+    def get_hand_transactions(self, hand_index: Optional[int] = None) -> List[ChipTransaction]:
+        """
+        获取某一手牌的交易记录
+        
+        一手牌包含上一次settle_hand之后到本次settle_hand（含结算记录）之间的所有交易。
+        
+        Args:
+            hand_index: 已结算手牌的序号（从0开始，支持负数从末尾计数）；
+                        为None时返回尚未结算的当前手牌的交易
+            
+        Returns:
+            交易记录列表
+            
+        Raises:
+            IndexError: 当手牌序号超出范围时
+        """
+        with self._lock:
+            hand_count = self._transaction_log.hand_count
+            if hand_index is None:
+                hand_index = hand_count
+            elif not -hand_count <= hand_index < hand_count:
+                raise IndexError(f"手牌序号超出范围: {hand_index}，已结算{hand_count}手")
+            else:
+                hand_index %= hand_count
+            return self._transaction_log.slice(*self._transaction_log.hand_bounds(hand_index))
+    
+    def _mark_changed(self, player_id: str) -> None:
+        """递增变化版本号并记录到玩家"""
+        self._version += 1
+        self._player_versions[player_id] = self._version
+    
+    @property
+    def transaction_log(self) -> TransactionLog:
+        """交易日志，用于按列审计查询"""
+        return self._transaction_log
     
     def validate_chip_conservation(self, expected_total: Optional[int] = None) -> bool:
         """
@@ -0,0 +1,333 @@
+"""
+筹码账本预写日志（WAL）
+
+把账本的每次变动以紧凑的二进制记录追加到日志文件，进程崩溃后可以重放日志恢复账本。
+记录先写入内存缓冲区，按组提交：累计到一定笔数、距上次提交超过一定时间或一手牌结算时
+才写入文件并fsync一次，把fsync的开销分摊到多笔操作上。
+
+每条记录的格式为：
+    负载长度(uint32) | CRC32(uint32) | 负载
+负载的第一个字节为操作码，其后按操作码依次为：
+    DEFINE      玩家序号(uint32) + 玩家ID(UTF-8)
+    CHECKPOINT  玩家数(uint32) + 玩家数 x [玩家序号(uint32) + 余额(int64) + 冻结筹码(int64)]
+    DEDUCT / ADD / FREEZE / UNFREEZE  玩家序号(uint32) + 数量(int64)
+    SETTLE      玩家数(uint32) + 玩家数 x [玩家序号(uint32) + 净变化(int64)]
+所有数值均为小端序。每次打开日志后玩家序号从0重新编号；附加到账本时先写入CHECKPOINT，
+记录账本的完整状态，重放时遇到CHECKPOINT即从该状态重新开始，因此同一个日志文件可以在恢复后继续追加。
+"""
+
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from enum import IntEnum
+from pathlib import Path
+from typing import Dict, List, Mapping, Union
+
+from .chip_ledger import ChipLedger
+
+__all__ = ['LedgerWAL', 'WALRecoveryResult', 'DEFAULT_GROUP_COMMIT_SIZE', 'DEFAULT_GROUP_COMMIT_INTERVAL']
+
+# 默认每组提交的最大记录数
+DEFAULT_GROUP_COMMIT_SIZE = 256
+
+# 默认两次提交之间的最长间隔（秒）
+DEFAULT_GROUP_COMMIT_INTERVAL = 0.01
+
+_FRAME = struct.Struct('<II')
+_AMOUNT = struct.Struct('<BIq')
+_COUNT = struct.Struct('<BI')
+_ENTRY = struct.Struct('<Iqq')
+_SETTLE_ENTRY = struct.Struct('<Iq')
+_DEFINE = struct.Struct('<BI')
+
+
+class _Op(IntEnum):
+    """WAL操作码"""
+    DEFINE = 1
+    CHECKPOINT = 2
+    DEDUCT = 3
+    ADD = 4
+    FREEZE = 5
+    UNFREEZE = 6
+    SETTLE = 7
+
+
+@dataclass(frozen=True)
+class WALRecoveryResult:
+    """
+    WAL恢复结果
+
+    Attributes:
+        ledger: 恢复的筹码账本
+        record_count: 重放的记录数
+        valid_bytes: 完整记录占用的字节数
+        torn_bytes: 末尾不完整或校验失败（崩溃时未写完）的字节数
+    """
+
+    ledger: ChipLedger
+    record_count: int
+    valid_bytes: int
+    torn_bytes: int
+
+
+class LedgerWAL:
+    """
+    筹码账本预写日志
+
+    通过ChipLedger(wal=...)或ChipLedger.attach_wal附加到账本后，账本的每次成功变动都会追加一条记录。
+    settle_hand之后的状态总是已经落盘；其余记录最多丢失最近一组未提交的部分。
+
+    Examples:
+        >>> wal = LedgerWAL("table_1.wal")
+        >>> ledger = ChipLedger({"player1": 1000}, wal=wal)
+        >>> ledger.deduct_chips("player1", 100)
+        True
+        >>> LedgerWAL.recover("table_1.wal").ledger.get_balance("player1")  # 崩溃后恢复
+        900
+    """
+
+    def __init__(self, path: Union[str, Path], group_commit_size: int = DEFAULT_GROUP_COMMIT_SIZE,
+                 group_commit_interval: float = DEFAULT_GROUP_COMMIT_INTERVAL, sync: bool = True) -> None:
+        """
+        打开（或创建）日志文件，新记录追加到文件末尾
+
+        Args:
+            path: 日志文件路径
+            group_commit_size: 每组提交的最大记录数
+            group_commit_interval: 两次提交之间的最长间隔（秒）
+            sync: 提交时是否fsync
+
+        Raises:
+            ValueError: 当组提交参数无效时
+        """
+        if group_commit_size < 1:
+            raise ValueError(f"group_commit_size必须为正数，实际: {group_commit_size}")
+        if group_commit_interval < 0:
+            raise ValueError(f"group_commit_interval不能为负数，实际: {group_commit_interval}")
+        self._path = Path(path)
+        self._group_commit_size = group_commit_size
+        self._group_commit_interval = group_commit_interval
+        self._sync = sync
+        self._fd = os.open(self._path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self._buffer = bytearray()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._player_index: Dict[str, int] = {}
+        self._record_count = 0
+        self._commit_count = 0
+
+    @property
+    def path(self) -> Path:
+        """日志文件路径"""
+        return self._path
+
+    @property
+    def record_count(self) -> int:
+        """本次打开后追加的记录数"""
+        return self._record_count
+
+    @property
+    def commit_count(self) -> int:
+        """本次打开后的提交（写入并fsync）次数"""
+        return self._commit_count
+
+    @property
+    def closed(self) -> bool:
+        """日志是否已关闭"""
+        return self._fd < 0
+
+    def log_checkpoint(self, balances: Mapping[str, int], frozen_chips: Mapping[str, int]) -> None:
+        """
+        记录账本的完整状态并立即提交
+
+        Args:
+            balances: 玩家余额
+            frozen_chips: 玩家冻结的筹码
+        """
+        players = set(balances) | set(frozen_chips)
+        payload = bytearray(_COUNT.pack(_Op.CHECKPOINT, len(players)))
+        for player_id in sorted(players):
+            payload += _ENTRY.pack(self._player(player_id), balances.get(player_id, 0),
+                                   frozen_chips.get(player_id, 0))
+        self._append(payload)
+        self.commit()
+
+    def log_amount(self, op: int, player_id: str, amount: int) -> None:
+        """
+        记录一次扣除、增加、冻结或解冻
+
+        Args:
+            op: 操作码（_Op.DEDUCT、_Op.ADD、_Op.FREEZE或_Op.UNFREEZE）
+            player_id: 玩家ID
+            amount: 数量
+        """
+        self._append(_AMOUNT.pack(op, self._player(player_id), amount))
+
+    def log_deduct(self, player_id: str, amount: int) -> None:
+        """记录一次扣除"""
+        self.log_amount(_Op.DEDUCT, player_id, amount)
+
+    def log_add(self, player_id: str, amount: int) -> None:
+        """记录一次增加"""
+        self.log_amount(_Op.ADD, player_id, amount)
+
+    def log_freeze(self, player_id: str, amount: int) -> None:
+        """记录一次冻结"""
+        self.log_amount(_Op.FREEZE, player_id, amount)
+
+    def log_unfreeze(self, player_id: str, amount: int) -> None:
+        """记录一次解冻"""
+        self.log_amount(_Op.UNFREEZE, player_id, amount)
+
+    def log_settle(self, transactions: Mapping[str, int]) -> None:
+        """
+        记录一手牌的结算并立即提交
+
+        Args:
+            transactions: {player_id: net_chip_change}
+        """
+        payload = bytearray(_COUNT.pack(_Op.SETTLE, len(transactions)))
+        for player_id, net_change in transactions.items():
+            payload += _SETTLE_ENTRY.pack(self._player(player_id), net_change)
+        self._append(payload)
+        self.commit()
+
+    def commit(self) -> None:
+        """把缓冲区中的记录写入文件并fsync"""
+        if self._buffer:
+            data = bytes(self._buffer)
+            while data:
+                data = data[os.write(self._fd, data):]
+            if self._sync:
+                os.fsync(self._fd)
+            self._buffer.clear()
+            self._commit_count += 1
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def close(self) -> None:
+        """提交剩余记录并关闭文件"""
+        if self._fd >= 0:
+            self.commit()
+            os.close(self._fd)
+            self._fd = -1
+
+    def _player(self, player_id: str) -> int:
+        """获取玩家序号，第一次出现时追加DEFINE记录"""
+        index = self._player_index.get(player_id)
+        if index is None:
+            index = self._player_index[player_id] = len(self._player_index)
+            self._append(_DEFINE.pack(_Op.DEFINE, index) + player_id.encode('utf-8'))
+        return index
+
+    def _append(self, payload: bytes) -> None:
+        """追加一条记录，满足组提交条件时提交"""
+        if self._fd < 0:
+            raise RuntimeError("WAL已关闭")
+        self._buffer += _FRAME.pack(len(payload), zlib.crc32(payload))
+        self._buffer += payload
+        self._record_count += 1
+        self._pending += 1
+        if (self._pending >= self._group_commit_size
+                or time.monotonic() - self._last_commit >= self._group_commit_interval):
+            self.commit()
+
+    @staticmethod
+    def recover(path: Union[str, Path], truncate_torn_tail: bool = True) -> WALRecoveryResult:
+        """
+        重放日志恢复筹码账本
+
+        从最后一个CHECKPOINT之前的状态开始，依次通过账本的公开方法重放每条记录，
+        因此恢复过程同样经过筹码守恒检查。末尾不完整的记录（崩溃时未写完）会被忽略。
+
+        Args:
+            path: 日志文件路径
+            truncate_torn_tail: 是否把文件截断到最后一条完整记录，以便继续追加
+
+        Returns:
+            WALRecoveryResult: 恢复结果
+
+        Raises:
+            FileNotFoundError: 当文件不存在时
+            ValueError: 当日志内容与账本状态不一致时
+            RuntimeError: 当重放的结算不守恒时
+        """
+        data = Path(path).read_bytes()
+        ledger = ChipLedger()
+        players: List[str] = []
+        offset = 0
+        record_count = 0
+        size = len(data)
+        while offset + _FRAME.size <= size:
+            length, checksum = _FRAME.unpack_from(data, offset)
+            start = offset + _FRAME.size
+            payload = data[start:start + length]
+            if len(payload) < length or zlib.crc32(payload) != checksum or not payload:
+                break
+            ledger = LedgerWAL._replay(ledger, players, payload)
+            record_count += 1
+            offset = start + length
+
+        torn_bytes = size - offset
+        if torn_bytes and truncate_torn_tail:
+            os.truncate(path, offset)
+        return WALRecoveryResult(ledger=ledger, record_count=record_count,
+                                 valid_bytes=offset, torn_bytes=torn_bytes)
+
+    @staticmethod
+    def _replay(ledger: ChipLedger, players: List[str], payload: bytes) -> ChipLedger:
+        """
+        重放一条记录
+
+        Args:
+            ledger: 当前账本
+            players: 玩家序号 -> 玩家ID
+            payload: 记录负载
+
+        Returns:
+            ChipLedger: 重放后的账本（CHECKPOINT时为新账本）
+
+        Raises:
+            ValueError: 当记录无效或与账本状态不一致时
+        """
+        op = payload[0]
+        if op == _Op.DEFINE:
+            _, index = _DEFINE.unpack_from(payload)
+            if index == 0:
+                # 新一次打开日志，玩家序号重新编号
+                players.clear()
+            elif index != len(players):
+                raise ValueError(f"WAL中的玩家序号不连续: {index}")
+            players.append(payload[_DEFINE.size:].decode('utf-8'))
+        elif op == _Op.CHECKPOINT:
+            _, count = _COUNT.unpack_from(payload)
+            entries = [_ENTRY.unpack_from(payload, _COUNT.size + i * _ENTRY.size) for i in range(count)]
+            ledger = ChipLedger({players[index]: balance for index, balance, _ in entries})
+            for index, _, frozen in entries:
+                if frozen > 0 and not ledger.freeze_chips(players[index], frozen, "WAL恢复"):
+                    raise ValueError(f"WAL检查点中玩家{players[index]}的冻结筹码超过余额")
+        elif op == _Op.SETTLE:
+            _, count = _COUNT.unpack_from(payload)
+            ledger.settle_hand({
+                players[index]: net_change
+                for index, net_change in (_SETTLE_ENTRY.unpack_from(payload, _COUNT.size + i * _SETTLE_ENTRY.size)
+                                          for i in range(count))
+            })
+        elif op in (_Op.DEDUCT, _Op.ADD, _Op.FREEZE, _Op.UNFREEZE):
+            _, index, amount = _AMOUNT.unpack_from(payload)
+            player_id = players[index]
+            if op == _Op.ADD:
+                ledger.add_chips(player_id, amount, "WAL恢复")
+            elif op == _Op.DEDUCT:
+                applied = ledger.deduct_chips(player_id, amount, "WAL恢复")
+            elif op == _Op.FREEZE:
+                applied = ledger.freeze_chips(player_id, amount, "WAL恢复")
+            else:
+                applied = ledger.unfreeze_chips(player_id, amount, "WAL恢复")
+            if op != _Op.ADD and not applied:
+                raise ValueError(f"WAL记录与账本状态不一致: {_Op(op).name} {player_id} {amount}")
+        else:
+            raise ValueError(f"未知的WAL操作码: {op}")
+        return ledger
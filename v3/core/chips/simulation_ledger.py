@@ -0,0 +1,317 @@
+"""
+单线程模拟用筹码账本
+
+为无界面的大规模模拟提供不加锁、可聚合或关闭交易记录的筹码账本。
+"""
+
+from contextlib import nullcontext
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Dict, Optional, Set, Tuple, TYPE_CHECKING
+import time
+
+from .chip_ledger import ChipLedger, ChipLedgerSnapshot
+from .chip_transaction import TransactionType
+from .transaction_log import TransactionLog
+
+if TYPE_CHECKING:
+    from .ledger_wal import LedgerWAL
+
+__all__ = ['SimulationChipLedger', 'TransactionRecording', 'TransactionAggregate']
+
+
+class TransactionRecording(Enum):
+    """交易记录方式"""
+    FULL = auto()       # 与ChipLedger相同，逐笔写入交易日志
+    AGGREGATE = auto()  # 只按(玩家, 交易类型)累计笔数和金额
+    NONE = auto()       # 只计数，不记录
+
+
+@dataclass
+class TransactionAggregate:
+    """按(玩家, 交易类型)聚合的交易统计"""
+    count: int = 0
+    amount: int = 0
+
+
+class SimulationChipLedger(ChipLedger):
+    """
+    单线程模拟用筹码账本
+
+    接口和筹码守恒规则与ChipLedger一致，但只能在单个线程中使用：
+    所有操作都不加锁，也不会在持锁时嵌套调用其他公开方法；
+    交易记录按TransactionRecording聚合或关闭，避免每次操作都写入带时间戳的交易日志，
+    逐笔的交易历史和按手牌查询只在FULL记录方式下有内容。
+    """
+
+    def __init__(self, initial_balances: Optional[Dict[str, int]] = None,
+                 recording: TransactionRecording = TransactionRecording.AGGREGATE,
+                 transaction_log: Optional[TransactionLog] = None,
+                 wal: Optional['LedgerWAL'] = None):
+        """
+        初始化筹码账本
+
+        Args:
+            initial_balances: 初始筹码分配
+            recording: 交易记录方式
+            transaction_log: FULL记录方式使用的交易日志，为None时使用默认配置
+            wal: 可选的预写日志；与交易记录方式无关，每次变动都会追加记录
+
+        Raises:
+            TypeError: 当交易记录方式类型无效时
+            ValueError: 当初始余额为负数时
+        """
+        if not isinstance(recording, TransactionRecording):
+            raise TypeError(f"交易记录方式必须是TransactionRecording类型，实际: {type(recording)}")
+        super().__init__(initial_balances, transaction_log, wal)
+        # 继承自ChipLedger且未重写的方法也不再加锁
+        self._lock = nullcontext()
+        self._recording = recording
+        self._transaction_count = 0
+        self._aggregates: Dict[Tuple[str, TransactionType], TransactionAggregate] = {}
+
+    @property
+    def recording(self) -> TransactionRecording:
+        """交易记录方式"""
+        return self._recording
+
+    @property
+    def transaction_count(self) -> int:
+        """已执行的交易笔数（与记录方式无关）"""
+        return self._transaction_count
+
+    def get_balance(self, player_id: str) -> int:
+        """获取玩家总筹码余额"""
+        return self._player_balances.get(player_id, 0)
+
+    def get_available_chips(self, player_id: str) -> int:
+        """获取玩家可用筹码（总筹码 - 冻结筹码）"""
+        return max(0, self._player_balances.get(player_id, 0) - self._frozen_chips.get(player_id, 0))
+
+    def get_frozen_chips(self, player_id: str) -> int:
+        """获取玩家冻结的筹码数量"""
+        return self._frozen_chips.get(player_id, 0)
+
+    def get_total_chips(self) -> int:
+        """获取系统总筹码，用于守恒检查"""
+        return self._total_chips
+
+    def get_all_players(self) -> Set[str]:
+        """获取所有玩家ID"""
+        return set(self._player_balances)
+
+    def deduct_chips(self, player_id: str, amount: int, description: str = "") -> bool:
+        """
+        扣除玩家筹码
+
+        Args:
+            player_id: 玩家ID
+            amount: 扣除数量
+            description: 交易描述
+
+        Returns:
+            是否成功扣除
+        """
+        if amount <= 0:
+            raise ValueError("扣除数量必须为正数")
+        balance = self._player_balances.get(player_id, 0)
+        if balance - self._frozen_chips.get(player_id, 0) < amount:
+            return False
+        self._player_balances[player_id] = balance - amount
+        self._total_chips -= amount
+        self._mark_changed(player_id)
+        self._record(TransactionType.DEDUCT, player_id, amount, -amount, description)
+        if self._wal is not None:
+            self._wal.log_deduct(player_id, amount)
+        return True
+
+    def add_chips(self, player_id: str, amount: int, description: str = "") -> None:
+        """
+        增加玩家筹码
+
+        Args:
+            player_id: 玩家ID
+            amount: 增加数量
+            description: 交易描述
+        """
+        if amount <= 0:
+            raise ValueError("增加数量必须为正数")
+        self._player_balances[player_id] = self._player_balances.get(player_id, 0) + amount
+        self._total_chips += amount
+        self._mark_changed(player_id)
+        self._record(TransactionType.ADD, player_id, amount, amount, description)
+        if self._wal is not None:
+            self._wal.log_add(player_id, amount)
+
+    def transfer_chips(self, from_player: str, to_player: str, amount: int, description: str = "") -> bool:
+        """
+        在玩家之间转移筹码
+
+        Args:
+            from_player: 转出玩家ID
+            to_player: 转入玩家ID
+            amount: 转移数量
+            description: 交易描述
+
+        Returns:
+            是否成功转移
+        """
+        if amount <= 0:
+            raise ValueError("转移数量必须为正数")
+        if from_player == to_player:
+            raise ValueError("不能向自己转移筹码")
+        balance = self._player_balances.get(from_player, 0)
+        if balance - self._frozen_chips.get(from_player, 0) < amount:
+            return False
+        self._player_balances[from_player] = balance - amount
+        self._player_balances[to_player] = self._player_balances.get(to_player, 0) + amount
+        self._mark_changed(from_player)
+        self._mark_changed(to_player)
+        # 只有FULL记录方式会保存描述
+        full = self._recording is TransactionRecording.FULL
+        self._record(TransactionType.DEDUCT, from_player, amount, -amount,
+                     f"转移给{to_player}: {description}" if full else "")
+        self._record(TransactionType.ADD, to_player, amount, amount,
+                     f"从{from_player}接收: {description}" if full else "")
+        if self._wal is not None:
+            self._wal.log_deduct(from_player, amount)
+            self._wal.log_add(to_player, amount)
+        return True
+
+    def freeze_chips(self, player_id: str, amount: int, description: str = "") -> bool:
+        """
+        冻结玩家筹码（用于下注等操作）
+
+        Args:
+            player_id: 玩家ID
+            amount: 冻结数量
+            description: 交易描述
+
+        Returns:
+            是否成功冻结
+        """
+        if amount <= 0:
+            raise ValueError("冻结数量必须为正数")
+        frozen = self._frozen_chips.get(player_id, 0)
+        if self._player_balances.get(player_id, 0) - frozen < amount:
+            return False
+        self._frozen_chips[player_id] = frozen + amount
+        self._mark_changed(player_id)
+        self._record(TransactionType.FREEZE, player_id, amount, 0, description)
+        if self._wal is not None:
+            self._wal.log_freeze(player_id, amount)
+        return True
+
+    def unfreeze_chips(self, player_id: str, amount: int, description: str = "") -> bool:
+        """
+        解冻玩家筹码
+
+        Args:
+            player_id: 玩家ID
+            amount: 解冻数量
+            description: 交易描述
+
+        Returns:
+            是否成功解冻
+        """
+        if amount <= 0:
+            raise ValueError("解冻数量必须为正数")
+        frozen = self._frozen_chips.get(player_id, 0)
+        if frozen < amount:
+            return False
+        if frozen == amount:
+            del self._frozen_chips[player_id]
+        else:
+            self._frozen_chips[player_id] = frozen - amount
+        self._mark_changed(player_id)
+        self._record(TransactionType.UNFREEZE, player_id, amount, 0, description)
+        if self._wal is not None:
+            self._wal.log_unfreeze(player_id, amount)
+        return True
+
+    def settle_hand(self, transactions: Dict[str, int]) -> None:
+        """
+        结算一手牌，清空所有冻结的筹码并应用每位玩家的净变化。
+
+        与ChipLedger不同，净变化之和不为0时在修改任何余额之前就抛出异常。
+
+        Args:
+            transactions: 一个字典，{player_id: net_chip_change}。
+                          赢家用正数表示，输家用负数表示。
+
+        Raises:
+            RuntimeError: 当净变化之和不为0（结算后筹码不守恒）时
+        """
+        net_total = sum(transactions.values())
+        if net_total != 0:
+            total_before_settle = self.get_total_chips()
+            raise RuntimeError(
+                f"手牌结算后筹码不守恒! "
+                f"结算前: {total_before_settle}, 结算后: {total_before_settle + net_total}"
+            )
+        for player_id in self._frozen_chips:
+            self._mark_changed(player_id)
+        self._frozen_chips.clear()
+        full = self._recording is TransactionRecording.FULL
+        for player_id, net_change in transactions.items():
+            self._player_balances[player_id] = self._player_balances.get(player_id, 0) + net_change
+            self._mark_changed(player_id)
+            self._record(TransactionType.SETTLE, player_id, abs(net_change), net_change,
+                         f"手牌结算: 净变化 {net_change}" if full else "")
+        self._transaction_log.end_hand()
+        if self._wal is not None:
+            self._wal.log_settle(transactions)
+
+    def create_snapshot(self) -> ChipLedgerSnapshot:
+        """创建当前状态的快照"""
+        return ChipLedgerSnapshot(
+            player_balances=self._player_balances.copy(),
+            frozen_chips=self._frozen_chips.copy(),
+            total_chips=self.get_total_chips(),
+            transaction_count=self._transaction_count,
+            timestamp=time.time()
+        )
+
+    def get_transaction_summary(self) -> Dict[Tuple[str, TransactionType], TransactionAggregate]:
+        """
+        获取按(玩家, 交易类型)聚合的交易统计
+
+        AGGREGATE记录方式下直接返回累计结果；FULL记录方式下由交易日志的列汇总；NONE记录方式下为空。
+
+        Returns:
+            {(player_id, transaction_type): TransactionAggregate}
+        """
+        if self._recording is TransactionRecording.FULL:
+            summary: Dict[Tuple[str, TransactionType], TransactionAggregate] = {}
+            log = self._transaction_log
+            types = {transaction_type.value: transaction_type for transaction_type in TransactionType}
+            for player, type_value, amount in zip(log.column('player'), log.column('type'), log.column('amount')):
+                key = (log.player_id_of(player), types[type_value])
+                aggregate = summary.setdefault(key, TransactionAggregate())
+                aggregate.count += 1
+                aggregate.amount += amount
+            return summary
+        return {key: TransactionAggregate(a.count, a.amount) for key, a in self._aggregates.items()}
+
+    def _record(self, transaction_type: TransactionType, player_id: str, amount: int,
+                delta: int, description: str) -> None:
+        """
+        按记录方式记录一笔交易
+
+        Args:
+            transaction_type: 交易类型
+            player_id: 玩家ID
+            amount: 交易金额
+            delta: 玩家余额的变化
+            description: 交易描述
+        """
+        self._transaction_count += 1
+        recording = self._recording
+        if recording is TransactionRecording.AGGREGATE:
+            aggregate = self._aggregates.get((player_id, transaction_type))
+            if aggregate is None:
+                aggregate = self._aggregates[(player_id, transaction_type)] = TransactionAggregate()
+            aggregate.count += 1
+            aggregate.amount += amount
+        elif recording is TransactionRecording.FULL:
+            self._transaction_log.append(transaction_type, player_id, amount, delta, description)
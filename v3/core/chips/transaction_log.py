@@ -0,0 +1,634 @@
+"""
+列式筹码交易日志
+
+交易记录按列存放在定长类型数组中（玩家序号、手牌序号、交易类型、金额、余额变化、时间戳），
+玩家ID和描述只保存一次，查询时才还原为ChipTransaction。
+内存中只保留最近的一段记录（窗口），窗口写满后整段追加到本地二进制文件，
+旧记录、各玩家的行号和手牌边界都通过只读mmap按需读取，长时间运行的牌桌内存占用保持平稳。
+
+文件由若干段组成，每段的布局为：
+    段头（魔数、版本、首条记录序号、记录数、玩家表长度、描述长度、玩家数、已结束的手牌数）
+    时间戳(float64) | 金额(int64) | 余额变化(int64) | 描述结束偏移(uint64) | 玩家序号(uint32) |
+    手牌序号(uint32) | 交易类型(uint8)
+    玩家表（UTF-8，以NUL分隔）
+    玩家行号索引：各玩家行号的起始位置(uint32，玩家数+1个) | 按玩家分组的段内行号(uint32)
+    描述（UTF-8，首尾相接）
+所有数值均为小端序，每个区块按8字节对齐。
+"""
+
+import mmap
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from .chip_transaction import ChipTransaction, TransactionType
+
+__all__ = ['TransactionLog', 'DEFAULT_WINDOW_SIZE']
+
+# 默认的内存窗口记录数
+DEFAULT_WINDOW_SIZE = 10000
+
+# 段头：魔数、版本、保留字段、首条记录序号、记录数、玩家表长度、描述长度、玩家数、已结束的手牌数
+SEGMENT_HEADER_FORMAT = '<4sHHQQIIII'
+SEGMENT_HEADER_SIZE = struct.calcsize(SEGMENT_HEADER_FORMAT)
+MAGIC = b'CTXL'
+VERSION = 2
+
+# 列名和类型码，按元素大小降序排列以保证对齐
+_COLUMNS = (
+    ('timestamp', 'd'),
+    ('amount', 'q'),
+    ('delta', 'q'),
+    ('description_end', 'Q'),
+    ('player', 'I'),
+    ('hand', 'I'),
+    ('type', 'B'),
+)
+
+_UINT32 = struct.Struct('<I')
+
+_TYPES_BY_VALUE = {transaction_type.value: transaction_type for transaction_type in TransactionType}
+
+
+def _align(size: int) -> int:
+    """向上对齐到8字节"""
+    return (size + 7) & ~7
+
+
+def _to_little_endian(values: array) -> bytes:
+    """把类型数组编码为小端序字节"""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _new_columns() -> Dict[str, array]:
+    """创建一组空的列数组"""
+    return {name: array(code) for name, code in _COLUMNS}
+
+
+@dataclass(frozen=True)
+class _Segment:
+    """已写入文件的一段记录"""
+    offset: int
+    first_sequence: int
+    row_count: int
+    players_size: int
+    descriptions_size: int
+    player_count: int
+
+    def column_offset(self, name: str) -> int:
+        """获取某一列在文件中的起始偏移"""
+        offset = self.offset + SEGMENT_HEADER_SIZE
+        for column_name, code in _COLUMNS:
+            if column_name == name:
+                return offset
+            offset += array(code).itemsize * self.row_count
+        raise KeyError(name)
+
+    @property
+    def players_offset(self) -> int:
+        """玩家表在文件中的起始偏移"""
+        size = sum(array(code).itemsize for _, code in _COLUMNS) * self.row_count
+        return self.offset + SEGMENT_HEADER_SIZE + _align(size)
+
+    @property
+    def player_index_offset(self) -> int:
+        """玩家行号索引在文件中的起始偏移"""
+        return self.players_offset + _align(self.players_size)
+
+    @property
+    def descriptions_offset(self) -> int:
+        """描述在文件中的起始偏移"""
+        return self.player_index_offset + _align(_UINT32.size * (self.player_count + 1 + self.row_count))
+
+    @property
+    def end(self) -> int:
+        """段在文件中的结束偏移"""
+        return self.descriptions_offset + _align(self.descriptions_size)
+
+
+class TransactionLog:
+    """
+    列式筹码交易日志
+
+    记录按追加顺序编号（序号从0开始），并记录所属的手牌序号（每次end_hand结束一手牌）。
+    内存窗口写满后整段写入溢出文件；未指定文件路径时在首次溢出时创建临时文件。
+    每个溢出段在文件中保存各玩家在段内的行号，按玩家查询时只读取属于该玩家的行；
+    手牌序号随记录单调不减，按手牌查询时二分查找边界。内存中除窗口外只保存各段的文件偏移。
+
+    Examples:
+        >>> log = TransactionLog(window_size=1000, spill_path="table_1.ctxl")
+        >>> log.append(TransactionType.DEDUCT, "player1", 100, -100, "下注")
+        0
+        >>> TransactionLog.open_archive("table_1.ctxl")  # 只读打开已写入文件的记录用于审计
+    """
+
+    def __init__(self, window_size: int = DEFAULT_WINDOW_SIZE,
+                 spill_path: Optional[Union[str, Path]] = None) -> None:
+        """
+        初始化交易日志
+
+        Args:
+            window_size: 内存中保留的最大记录数
+            spill_path: 溢出文件路径，为None时使用临时文件；已存在的文件会被覆盖
+
+        Raises:
+            ValueError: 当窗口大小无效时
+        """
+        if window_size < 1:
+            raise ValueError(f"窗口大小必须为正数，实际: {window_size}")
+        self._window_size = window_size
+        self._spill_path = Path(spill_path) if spill_path is not None else None
+        self._file: Optional[BinaryIO] = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._read_only = False
+        self._segment_offsets = array('Q')  # 各溢出段在文件中的偏移
+        self._spill_end = 0
+        self._spilled_count = 0
+        self._hand_count = 0
+
+        self._players: List[str] = []
+        self._player_index: Dict[str, int] = {}
+
+        self._columns = _new_columns()
+        self._descriptions: List[str] = []
+        self._window_positions: Dict[int, List[int]] = {}
+
+    @classmethod
+    def open_archive(cls, path: Union[str, Path]) -> 'TransactionLog':
+        """
+        只读打开溢出文件
+
+        Args:
+            path: 溢出文件路径
+
+        Returns:
+            TransactionLog: 只包含文件中记录的只读日志
+
+        Raises:
+            FileNotFoundError: 当文件不存在时
+            ValueError: 当文件格式无效时
+        """
+        log = cls()
+        log._spill_path = Path(path)
+        log._read_only = True
+        log._file = open(log._spill_path, 'rb')
+        log._remap()
+        size = len(log._mmap) if log._mmap is not None else 0
+        segment = None
+        while log._spill_end < size:
+            offset = log._spill_end
+            if size - offset < SEGMENT_HEADER_SIZE:
+                raise ValueError(f"溢出文件不完整: {path}")
+            magic, version, _, first_sequence, row_count, players_size, descriptions_size, player_count, \
+                hand_count = struct.unpack_from(SEGMENT_HEADER_FORMAT, log._mmap, offset)
+            if magic != MAGIC or version != VERSION or first_sequence != log._spilled_count:
+                raise ValueError(f"无效的溢出文件: {path}")
+            segment = _Segment(offset, first_sequence, row_count, players_size, descriptions_size, player_count)
+            if segment.end > size:
+                raise ValueError(f"溢出文件不完整: {path}")
+            log._segment_offsets.append(offset)
+            log._spilled_count += row_count
+            log._hand_count = hand_count
+            log._spill_end = segment.end
+        if segment is not None:
+            log._players = log._read_players(segment)
+            log._player_index = {player_id: index for index, player_id in enumerate(log._players)}
+        return log
+
+    def __len__(self) -> int:
+        """获取记录总数"""
+        return self._spilled_count + len(self._descriptions)
+
+    def __iter__(self) -> Iterator[ChipTransaction]:
+        """按顺序遍历所有记录"""
+        for segment in self._segments_between(0, self._spilled_count):
+            yield from self._read_segment(segment, 0, segment.row_count)
+        yield from self._read_window(0, len(self._descriptions))
+
+    @property
+    def window_size(self) -> int:
+        """内存窗口的最大记录数"""
+        return self._window_size
+
+    @property
+    def spilled_count(self) -> int:
+        """已写入溢出文件的记录数"""
+        return self._spilled_count
+
+    @property
+    def spill_path(self) -> Optional[Path]:
+        """溢出文件路径，使用临时文件时为None"""
+        return self._spill_path
+
+    @property
+    def hand_count(self) -> int:
+        """已结束的手牌数，也是之后追加的记录所属的手牌序号"""
+        return self._hand_count
+
+    def append(self, transaction_type: TransactionType, player_id: str, amount: int, delta: int,
+               description: str = "", timestamp: Optional[float] = None) -> int:
+        """
+        追加一条记录
+
+        Args:
+            transaction_type: 交易类型
+            player_id: 玩家ID
+            amount: 交易金额
+            delta: 玩家余额的变化（扣除为负，结算为净变化，冻结和解冻为0）
+            description: 交易描述
+            timestamp: 时间戳，为None时使用当前时间
+
+        Returns:
+            int: 记录序号
+
+        Raises:
+            RuntimeError: 当日志为只读时
+        """
+        if self._read_only:
+            raise RuntimeError("只读的交易日志不能追加记录")
+        if len(self._descriptions) >= self._window_size:
+            self._spill()
+
+        player = self._player_index.get(player_id)
+        if player is None:
+            player = self._player_index[player_id] = len(self._players)
+            self._players.append(player_id)
+        position = len(self._descriptions)
+        columns = self._columns
+        columns['timestamp'].append(time.time() if timestamp is None else timestamp)
+        columns['amount'].append(amount)
+        columns['delta'].append(delta)
+        columns['player'].append(player)
+        columns['hand'].append(self._hand_count)
+        columns['type'].append(transaction_type.value)
+        self._descriptions.append(description)
+        positions = self._window_positions.get(player)
+        if positions is None:
+            self._window_positions[player] = [position]
+        else:
+            positions.append(position)
+        return self._spilled_count + position
+
+    def end_hand(self) -> None:
+        """
+        结束当前手牌，之后追加的记录属于下一手牌
+
+        Raises:
+            RuntimeError: 当日志为只读时
+        """
+        if self._read_only:
+            raise RuntimeError("只读的交易日志不能结束手牌")
+        self._hand_count += 1
+
+    def hand_bounds(self, hand: int) -> Tuple[int, int]:
+        """
+        获取某一手牌的记录序号范围
+
+        Args:
+            hand: 手牌序号，等于hand_count时为尚未结束的当前手牌
+
+        Returns:
+            Tuple[int, int]: 该手牌记录的序号范围[start, stop)
+        """
+        return self._first_row_of_hand(hand), self._first_row_of_hand(hand + 1)
+
+    def get(self, sequence: int) -> ChipTransaction:
+        """
+        获取一条记录
+
+        Args:
+            sequence: 记录序号
+
+        Returns:
+            ChipTransaction: 交易记录
+
+        Raises:
+            IndexError: 当序号超出范围时
+        """
+        if not 0 <= sequence < len(self):
+            raise IndexError(f"记录序号超出范围: {sequence}")
+        return self.slice(sequence, sequence + 1)[0]
+
+    def slice(self, start: int = 0, stop: Optional[int] = None) -> List[ChipTransaction]:
+        """
+        获取序号在[start, stop)范围内的记录
+
+        Args:
+            start: 起始序号
+            stop: 结束序号（不含），为None时到最后一条
+
+        Returns:
+            List[ChipTransaction]: 交易记录列表
+        """
+        total = len(self)
+        stop = total if stop is None else min(stop, total)
+        start = max(start, 0)
+        transactions: List[ChipTransaction] = []
+        for segment in self._segments_between(start, stop):
+            segment_stop = segment.first_sequence + segment.row_count
+            transactions.extend(self._read_segment(
+                segment, max(start, segment.first_sequence) - segment.first_sequence,
+                min(stop, segment_stop) - segment.first_sequence
+            ))
+        if stop > self._spilled_count:
+            transactions.extend(self._read_window(max(start - self._spilled_count, 0),
+                                                  stop - self._spilled_count))
+        return transactions
+
+    def for_player(self, player_id: str) -> List[ChipTransaction]:
+        """
+        获取某个玩家的全部记录
+
+        Args:
+            player_id: 玩家ID
+
+        Returns:
+            List[ChipTransaction]: 交易记录列表
+        """
+        player = self._player_index.get(player_id)
+        if player is None:
+            return []
+        transactions: List[ChipTransaction] = []
+        for index in range(len(self._segment_offsets)):
+            segment = self._segment(index)
+            if player < segment.player_count:
+                positions = self._player_rows(segment, player)
+                if positions:
+                    transactions.extend(self._read_rows(segment, player_id, positions))
+        for position in self._window_positions.get(player, ()):
+            transactions.extend(self._read_window(position, position + 1))
+        return transactions
+
+    def column(self, name: str, start: int = 0, stop: Optional[int] = None) -> array:
+        """
+        获取某一列在[start, stop)范围内的值，用于审计统计
+
+        Args:
+            name: 列名（timestamp、amount、delta、player、hand、type）
+            start: 起始序号
+            stop: 结束序号（不含），为None时到最后一条
+
+        Returns:
+            array: 该列的类型数组副本
+
+        Raises:
+            ValueError: 当列名无效时
+        """
+        codes = dict(_COLUMNS)
+        if name not in codes or name == 'description_end':
+            raise ValueError(f"无效的列名: {name}")
+        total = len(self)
+        stop = total if stop is None else min(stop, total)
+        start = max(start, 0)
+        values = array(codes[name])
+        for segment in self._segments_between(start, stop):
+            segment_stop = segment.first_sequence + segment.row_count
+            values.extend(self._read_column(
+                segment, name, max(start, segment.first_sequence) - segment.first_sequence,
+                min(stop, segment_stop) - segment.first_sequence
+            ))
+        if stop > self._spilled_count:
+            window = self._columns[name]
+            values.extend(window[max(start - self._spilled_count, 0):stop - self._spilled_count])
+        return values
+
+    def player_id_of(self, player: int) -> str:
+        """
+        把player列中的玩家序号还原为玩家ID
+
+        Args:
+            player: 玩家序号
+
+        Returns:
+            str: 玩家ID
+        """
+        return self._players[player]
+
+    def close(self) -> None:
+        """关闭溢出文件和内存映射"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _spill(self) -> None:
+        """把内存窗口整段追加到溢出文件"""
+        row_count = len(self._descriptions)
+        if row_count == 0:
+            return
+        if self._file is None:
+            if self._spill_path is None:
+                self._file = tempfile.TemporaryFile(prefix='chip_ledger_', suffix='.ctxl')
+            else:
+                self._file = open(self._spill_path, 'w+b')
+
+        encoded = [description.encode('utf-8') for description in self._descriptions]
+        description_end = array('Q')
+        end = 0
+        for data in encoded:
+            end += len(data)
+            description_end.append(end)
+        self._columns['description_end'] = description_end
+        players = '\0'.join(self._players).encode('utf-8')
+        player_count = len(self._players)
+        player_rows = array('I')
+        player_starts = array('I', [0])
+        for player in range(player_count):
+            player_rows.extend(self._window_positions.get(player, ()))
+            player_starts.append(len(player_rows))
+
+        chunks = [struct.pack(SEGMENT_HEADER_FORMAT, MAGIC, VERSION, 0, self._spilled_count,
+                              row_count, len(players), end, player_count, self._hand_count)]
+        column_size = 0
+        for name, _ in _COLUMNS:
+            values = self._columns[name]
+            chunks.append(_to_little_endian(values))
+            column_size += values.itemsize * row_count
+        chunks.append(bytes(_align(column_size) - column_size))
+        chunks.append(players + bytes(_align(len(players)) - len(players)))
+        index_size = _UINT32.size * (len(player_starts) + len(player_rows))
+        chunks.append(_to_little_endian(player_starts) + _to_little_endian(player_rows) +
+                      bytes(_align(index_size) - index_size))
+        chunks.append(b''.join(encoded) + bytes(_align(end) - end))
+
+        self._file.seek(self._spill_end)
+        self._file.write(b''.join(chunks))
+        self._file.flush()
+        segment = _Segment(self._spill_end, self._spilled_count, row_count, len(players), end, player_count)
+        self._segment_offsets.append(segment.offset)
+        self._spill_end = segment.end
+        self._spilled_count += row_count
+        self._remap()
+
+        self._columns = _new_columns()
+        self._descriptions = []
+        self._window_positions = {}
+
+    def _remap(self) -> None:
+        """文件增长后重新建立只读映射"""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.seek(0, 2)
+        if self._file.tell() > 0:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _segment(self, index: int) -> _Segment:
+        """从映射中读取第index个溢出段的段头"""
+        offset = self._segment_offsets[index]
+        _, _, _, first_sequence, row_count, players_size, descriptions_size, player_count, _ = \
+            struct.unpack_from(SEGMENT_HEADER_FORMAT, self._mmap, offset)
+        return _Segment(offset, first_sequence, row_count, players_size, descriptions_size, player_count)
+
+    def _segments_between(self, start: int, stop: int) -> Iterator[_Segment]:
+        """按顺序产出与序号范围[start, stop)相交的溢出段，二分查找第一段"""
+        low, high = 0, len(self._segment_offsets)
+        while low < high:
+            middle = (low + high) // 2
+            segment = self._segment(middle)
+            if segment.first_sequence + segment.row_count <= start:
+                low = middle + 1
+            else:
+                high = middle
+        for index in range(low, len(self._segment_offsets)):
+            segment = self._segment(index)
+            if segment.first_sequence >= stop:
+                break
+            yield segment
+
+    def _first_row_of_hand(self, hand: int) -> int:
+        """二分查找第一条手牌序号不小于hand的记录的序号"""
+        low, high = 0, len(self._segment_offsets)
+        while low < high:
+            middle = (low + high) // 2
+            segment = self._segment(middle)
+            if self._hand_at(segment, segment.row_count - 1) < hand:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self._segment_offsets):
+            return self._spilled_count + bisect_left(self._columns['hand'], hand)
+        segment = self._segment(low)
+        row_low, row_high = 0, segment.row_count - 1
+        while row_low < row_high:
+            middle = (row_low + row_high) // 2
+            if self._hand_at(segment, middle) < hand:
+                row_low = middle + 1
+            else:
+                row_high = middle
+        return segment.first_sequence + row_low
+
+    def _hand_at(self, segment: _Segment, position: int) -> int:
+        """读取一段内某一行的手牌序号"""
+        return _UINT32.unpack_from(self._mmap, segment.column_offset('hand') + position * _UINT32.size)[0]
+
+    def _player_rows(self, segment: _Segment, player: int) -> array:
+        """读取某个玩家在一段内的行号"""
+        start, stop = self._read_array(segment.player_index_offset + player * _UINT32.size, 'I', 2)
+        rows_offset = segment.player_index_offset + (segment.player_count + 1 + start) * _UINT32.size
+        return self._read_array(rows_offset, 'I', stop - start)
+
+    def _read_array(self, offset: int, code: str, count: int) -> array:
+        """从映射中复制count个小端序数值"""
+        values = array(code)
+        values.frombytes(self._mmap[offset:offset + count * values.itemsize])
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def _read_column(self, segment: _Segment, name: str, start: int, stop: int) -> array:
+        """从映射中复制一段的某一列"""
+        code = dict(_COLUMNS)[name]
+        itemsize = array(code).itemsize
+        return self._read_array(segment.column_offset(name) + start * itemsize, code, stop - start)
+
+    def _read_players(self, segment: _Segment) -> List[str]:
+        """读取段中保存的玩家表"""
+        offset = segment.players_offset
+        data = self._mmap[offset:offset + segment.players_size].decode('utf-8')
+        return data.split('\0') if data else []
+
+    def _read_segment(self, segment: _Segment, start: int, stop: int) -> List[ChipTransaction]:
+        """从映射中读取一段内[start, stop)范围的记录"""
+        if start >= stop:
+            return []
+        columns = {name: self._read_column(segment, name, start, stop) for name, _ in _COLUMNS}
+        description_start = (self._read_column(segment, 'description_end', start - 1, start)[0]
+                             if start > 0 else 0)
+        offset = segment.descriptions_offset
+        blob = self._mmap[offset + description_start:offset + columns['description_end'][-1]]
+        descriptions = []
+        previous = 0
+        for end in columns['description_end']:
+            end -= description_start
+            descriptions.append(blob[previous:end].decode('utf-8'))
+            previous = end
+        players = self._read_players(segment)
+        return [
+            self._make_transaction(segment.first_sequence + start + i, players[columns['player'][i]],
+                                   columns['type'][i], columns['amount'][i], columns['delta'][i],
+                                   columns['timestamp'][i], descriptions[i])
+            for i in range(stop - start)
+        ]
+
+    def _read_rows(self, segment: _Segment, player_id: str, positions: array) -> List[ChipTransaction]:
+        """从映射中只读取一段内给定位置的记录（这些位置都属于player_id，按升序排列）"""
+        # 复制覆盖这些位置的一段行，不读取玩家列
+        first, stop = positions[0], positions[-1] + 1
+        columns = {}
+        for name, code in _COLUMNS:
+            if name != 'player':
+                itemsize = array(code).itemsize
+                columns[name] = self._read_array(segment.column_offset(name) + first * itemsize, code, stop - first)
+        # description_ends[i]是第first + i - 1行的描述结束偏移
+        description_ends = array('Q', [0]) if first == 0 else \
+            self._read_array(segment.column_offset('description_end') + (first - 1) * 8, 'Q', 1)
+        description_ends.extend(columns['description_end'])
+        base = description_ends[0]
+        offset = segment.descriptions_offset
+        blob = self._mmap[offset + base:offset + description_ends[-1]]
+        transactions: List[ChipTransaction] = []
+        for position in positions:
+            i = position - first
+            transactions.append(self._make_transaction(
+                segment.first_sequence + position, player_id, columns['type'][i], columns['amount'][i],
+                columns['delta'][i], columns['timestamp'][i],
+                blob[description_ends[i] - base:description_ends[i + 1] - base].decode('utf-8')
+            ))
+        return transactions
+
+    def _read_window(self, start: int, stop: int) -> List[ChipTransaction]:
+        """读取内存窗口内[start, stop)范围的记录"""
+        columns = self._columns
+        return [
+            self._make_transaction(self._spilled_count + i, self._players[columns['player'][i]],
+                                   columns['type'][i], columns['amount'][i], columns['delta'][i],
+                                   columns['timestamp'][i], self._descriptions[i])
+            for i in range(start, min(stop, len(self._descriptions)))
+        ]
+
+    @staticmethod
+    def _make_transaction(sequence: int, player_id: str, type_value: int, amount: int, delta: int,
+                          timestamp: float, description: str) -> ChipTransaction:
+        """把一行还原为ChipTransaction"""
+        transaction_type = _TYPES_BY_VALUE[type_value]
+        return ChipTransaction(
+            transaction_id=f"{transaction_type.name.lower()}_{player_id}_{sequence}",
+            transaction_type=transaction_type,
+            player_id=player_id,
+            amount=amount,
+            timestamp=timestamp,
+            description=description,
+            metadata={'net_change': delta} if transaction_type is TransactionType.SETTLE else None
+        )
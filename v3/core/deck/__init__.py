@@ -1,11 +1,13 @@
 """
 德州扑克牌组管理模块.
 
-提供Card和Deck类，实现扑克牌的基本操作和牌组管理功能.
+提供Card、CardSet和Deck类，实现扑克牌的基本操作和牌组管理功能.
 遵循v3架构规范，支持严格的类型检查和不可变性.
+需要大量发牌的模拟场景可以使用fast_deck模块中基于NumPy排列的FastDeck.
 """
 
-from .card import Card
+from .card import ALL_CARDS, Card
+from .card_set import CardSet
 from .deck import Deck
 
-__all__ = ['Card', 'Deck'] 
\ No newline at end of file
+__all__ = ['Card', 'CardSet', 'Deck', 'ALL_CARDS'] 
\ No newline at end of file
@@ -2,159 +2,273 @@
 扑克牌数据结构.
 
 定义不可变的Card类，支持严格的类型检查和完整的操作接口.
+52张牌在模块加载时一次性创建，之后所有构造、解析和反序列化都返回同一批实例（享元）.
+每张牌有稳定的整数id（花色序号*13 + 点数-2，花色按Suit枚举顺序），
+与批量评估使用的牌下标一致.
 """
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Tuple
 
 from .types import Suit, Rank
 
+__all__ = ['Card', 'ALL_CARDS']
 
-@dataclass(frozen=True)
+# 点数的字符串表示
+_RANK_DISPLAY: Dict[Rank, str] = {
+    Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5",
+    Rank.SIX: "6", Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9",
+    Rank.TEN: "10", Rank.JACK: "J", Rank.QUEEN: "Q",
+    Rank.KING: "K", Rank.ACE: "A"
+}
+
+# 花色的字符串表示
+_SUIT_DISPLAY: Dict[Suit, str] = {
+    Suit.HEARTS: "H", Suit.DIAMONDS: "D",
+    Suit.CLUBS: "C", Suit.SPADES: "S"
+}
+
+# 解析时接受的点数字符串
+_RANK_PARSE: Dict[str, Rank] = {
+    "2": Rank.TWO, "3": Rank.THREE, "4": Rank.FOUR, "5": Rank.FIVE,
+    "6": Rank.SIX, "7": Rank.SEVEN, "8": Rank.EIGHT, "9": Rank.NINE,
+    "10": Rank.TEN, "T": Rank.TEN, "J": Rank.JACK, "Q": Rank.QUEEN,
+    "K": Rank.KING, "A": Rank.ACE
+}
+
+# 解析时接受的花色字符串
+_SUIT_PARSE: Dict[str, Suit] = {
+    "h": Suit.HEARTS, "H": Suit.HEARTS,
+    "d": Suit.DIAMONDS, "D": Suit.DIAMONDS,
+    "c": Suit.CLUBS, "C": Suit.CLUBS,
+    "s": Suit.SPADES, "S": Suit.SPADES
+}
+
+# 花色 -> id偏移
+_SUIT_OFFSET: Dict[Suit, int] = {suit: i * 13 for i, suit in enumerate(Suit)}
+
+
+@dataclass(frozen=True, init=False, eq=False)
 class Card:
     """
     表示一张扑克牌.
-    
-    不可变数据类，包含花色和点数，支持比较、排序和字符串表示等操作.
-    
+
+    不可变的享元对象，包含花色和点数，支持比较、排序和字符串表示等操作.
+    同一张牌始终是同一个实例，相等比较和哈希都基于整数id.
+
     Attributes:
         suit: 花色
         rank: 点数
-        
+
     Examples:
         >>> card = Card(Suit.HEARTS, Rank.ACE)
         >>> str(card)
         'AH'
         >>> card.rank.value
         14
+        >>> card is Card.from_str("AH")
+        True
     """
 
     suit: Suit
     rank: Rank
-    
-    def __post_init__(self) -> None:
+
+    def __new__(cls, suit: Suit, rank: Rank) -> 'Card':
         """
-        验证扑克牌数据的有效性.
-        
+        获取花色和点数对应的扑克牌实例.
+
+        Args:
+            suit: 花色
+            rank: 点数
+
+        Returns:
+            Card: 预先创建的扑克牌实例
+
         Raises:
             TypeError: 当花色或点数类型无效时
-            ValueError: 当花色或点数值无效时
         """
-        if not isinstance(self.suit, Suit):
-            raise TypeError(f"花色必须是Suit类型，实际: {type(self.suit)}")
-        if not isinstance(self.rank, Rank):
-            raise TypeError(f"点数必须是Rank类型，实际: {type(self.rank)}")
-    
+        if suit.__class__ is not Suit:
+            raise TypeError(f"花色必须是Suit类型，实际: {type(suit)}")
+        if rank.__class__ is not Rank:
+            raise TypeError(f"点数必须是Rank类型，实际: {type(rank)}")
+        return ALL_CARDS[_SUIT_OFFSET[suit] + rank - 2]
+
+    @classmethod
+    def _create(cls, suit: Suit, rank: Rank) -> 'Card':
+        """
+        创建扑克牌实例，只在模块加载时调用.
+
+        id和字符串表示作为普通属性预先计算，不属于数据类字段.
+
+        Args:
+            suit: 花色
+            rank: 点数
+
+        Returns:
+            Card: 新的扑克牌实例
+        """
+        card = object.__new__(cls)
+        object.__setattr__(card, 'suit', suit)
+        object.__setattr__(card, 'rank', rank)
+        object.__setattr__(card, '_id', _SUIT_OFFSET[suit] + rank - 2)
+        object.__setattr__(card, '_str', f"{_RANK_DISPLAY[rank]}{_SUIT_DISPLAY[suit]}")
+        return card
+
+    @classmethod
+    def from_id(cls, card_id: int) -> 'Card':
+        """
+        根据整数id获取扑克牌.
+
+        Args:
+            card_id: 0..51之间的id
+
+        Returns:
+            Card: 对应的扑克牌对象
+
+        Raises:
+            ValueError: 当id超出范围时
+        """
+        if not 0 <= card_id < 52:
+            raise ValueError(f"卡牌id必须在0..51之间，实际: {card_id}")
+        return ALL_CARDS[card_id]
+
+    @property
+    def id(self) -> int:
+        """
+        获取扑克牌的整数id.
+
+        Returns:
+            int: 0..51之间的id，与批量评估的牌下标一致
+        """
+        return self._id
+
     def __str__(self) -> str:
         """
         返回扑克牌的字符串表示.
-        
+
         Returns:
             str: 格式为"点数花色"的字符串，如"AH"表示红桃A
         """
-        rank_display: Dict[Rank, str] = {
-            Rank.TWO: "2", Rank.THREE: "3", Rank.FOUR: "4", Rank.FIVE: "5",
-            Rank.SIX: "6", Rank.SEVEN: "7", Rank.EIGHT: "8", Rank.NINE: "9",
-            Rank.TEN: "10", Rank.JACK: "J", Rank.QUEEN: "Q", 
-            Rank.KING: "K", Rank.ACE: "A"
-        }
-        suit_display: Dict[Suit, str] = {
-            Suit.HEARTS: "H", Suit.DIAMONDS: "D", 
-            Suit.CLUBS: "C", Suit.SPADES: "S"
-        }
-        return f"{rank_display[self.rank]}{suit_display[self.suit]}"
-    
+        return self._str
+
     def __repr__(self) -> str:
         """
         返回扑克牌的详细字符串表示.
-        
+
         Returns:
             str: 包含类名的详细表示，如"Card(suit=Suit.HEARTS, rank=Rank.ACE)"
         """
         return f"Card({self.rank.name}, {self.suit.name})"
-    
+
     @classmethod
     def from_str(cls, card_str: str) -> 'Card':
         """
         从字符串创建扑克牌对象.
-        
+
         Args:
             card_str: 扑克牌字符串，格式为"点数花色"，如"AH"
-            
+
         Returns:
             Card: 对应的扑克牌对象
-            
+
         Raises:
             ValueError: 当字符串格式无效时
         """
+        card = _CARDS_BY_STR.get(card_str)
+        if card is not None:
+            return card
+
         if not isinstance(card_str, str):
             raise TypeError(f"输入必须是字符串，实际: {type(card_str)}")
-            
         if len(card_str) < 2:
             raise ValueError(f"卡牌字符串格式错误: {card_str}")
-        
+
         # 处理10的特殊情况
         if card_str.startswith("10"):
             rank_str, suit_str = "10", card_str[2:]
         else:
             rank_str, suit_str = card_str[0], card_str[1:]
-        
-        # 解析点数
-        rank_map: Dict[str, Rank] = {
-            "2": Rank.TWO, "3": Rank.THREE, "4": Rank.FOUR, "5": Rank.FIVE,
-            "6": Rank.SIX, "7": Rank.SEVEN, "8": Rank.EIGHT, "9": Rank.NINE,
-            "10": Rank.TEN, "T": Rank.TEN, "J": Rank.JACK, "Q": Rank.QUEEN,
-            "K": Rank.KING, "A": Rank.ACE
-        }
-        
-        # 解析花色
-        suit_map: Dict[str, Suit] = {
-            "h": Suit.HEARTS, "H": Suit.HEARTS,
-            "d": Suit.DIAMONDS, "D": Suit.DIAMONDS,
-            "c": Suit.CLUBS, "C": Suit.CLUBS,
-            "s": Suit.SPADES, "S": Suit.SPADES
-        }
-        
-        if rank_str not in rank_map:
+
+        if rank_str not in _RANK_PARSE:
             raise ValueError(f"无效的点数: {rank_str}")
-        if suit_str not in suit_map:
-            raise ValueError(f"无效的花色: {suit_str}")
-        
-        return cls(suit_map[suit_str], rank_map[rank_str])
-    
+        raise ValueError(f"无效的花色: {suit_str}")
+
     def __lt__(self, other: 'Card') -> bool:
         """
         比较两张牌的大小.
-        
+
         Args:
             other: 另一张牌
-            
+
         Returns:
             bool: 如果当前牌小于另一张牌则返回True
         """
         if not isinstance(other, Card):
             return NotImplemented
         return self.rank.value < other.rank.value
-    
+
     def __eq__(self, other: object) -> bool:
         """
         判断两张牌是否相等.
-        
+
         Args:
             other: 另一个对象
-            
+
         Returns:
             bool: 如果两张牌的花色和点数都相同则返回True
         """
         if not isinstance(other, Card):
             return NotImplemented
-        return self.suit == other.suit and self.rank == other.rank
-    
+        return self._id == other._id
+
     def __hash__(self) -> int:
         """
         返回扑克牌的哈希值.
-        
+
         Returns:
-            int: 基于花色和点数计算的哈希值
+            int: 扑克牌的整数id
         """
-        return hash((self.suit, self.rank)) 
\ No newline at end of file
+        return self._id
+
+    def __reduce__(self) -> Tuple[type, Tuple[Suit, Rank]]:
+        """
+        支持pickle，反序列化时返回同一个实例.
+
+        Returns:
+            Tuple: 重建参数
+        """
+        return (Card, (self.suit, self.rank))
+
+    def __copy__(self) -> 'Card':
+        """
+        复制扑克牌（享元对象直接返回自身）.
+
+        Returns:
+            Card: 自身
+        """
+        return self
+
+    def __deepcopy__(self, memo: dict) -> 'Card':
+        """
+        深复制扑克牌（享元对象直接返回自身）.
+
+        Args:
+            memo: 深复制备忘录
+
+        Returns:
+            Card: 自身
+        """
+        return self
+
+
+# 按id排列的全部52张牌
+ALL_CARDS: Tuple[Card, ...] = tuple(
+    Card._create(suit, rank) for suit in Suit for rank in Rank
+)
+
+# 字符串 -> 扑克牌
+_CARDS_BY_STR: Dict[str, Card] = {
+    rank_str + suit_str: ALL_CARDS[_SUIT_OFFSET[suit] + rank - 2]
+    for rank_str, rank in _RANK_PARSE.items()
+    for suit_str, suit in _SUIT_PARSE.items()
+}
@@ -0,0 +1,348 @@
+"""
+扑克牌集合.
+
+定义基于52位整数掩码的不可变CardSet类，第i位对应id为i的扑克牌.
+并集、交集、差集、包含判断和计数都是单次整数运算.
+"""
+
+from typing import Iterable, Iterator, Union
+
+from .card import ALL_CARDS, Card
+
+__all__ = ['CardSet', 'FULL_MASK']
+
+# 52张牌全部在内的掩码
+FULL_MASK = (1 << 52) - 1
+
+
+class CardSet:
+    """
+    不可变的扑克牌集合.
+
+    迭代按牌id升序返回预先创建的Card实例，可以直接传给评估器和胜率计算.
+
+    Examples:
+        >>> board = CardSet.from_str("AH KH QH")
+        >>> Card.from_str("KH") in board
+        True
+        >>> len(CardSet.full() - board)
+        49
+    """
+
+    __slots__ = ('_mask',)
+
+    def __init__(self, cards: Iterable[Card] = ()) -> None:
+        """
+        从扑克牌创建集合，重复的牌只计一次.
+
+        Args:
+            cards: 扑克牌
+
+        Raises:
+            TypeError: 当元素不是Card类型时
+        """
+        mask = 0
+        for card in cards:
+            if not isinstance(card, Card):
+                raise TypeError(f"集合元素必须是Card类型，实际: {type(card)}")
+            mask |= 1 << card.id
+        self._mask = mask
+
+    @classmethod
+    def from_mask(cls, mask: int) -> 'CardSet':
+        """
+        从整数掩码创建集合.
+
+        Args:
+            mask: 52位掩码
+
+        Returns:
+            CardSet: 对应的集合
+
+        Raises:
+            ValueError: 当掩码超出52位时
+        """
+        if mask < 0 or mask > FULL_MASK:
+            raise ValueError(f"掩码必须在0到2^52-1之间，实际: {mask}")
+        card_set = object.__new__(cls)
+        card_set._mask = mask
+        return card_set
+
+    @classmethod
+    def from_str(cls, cards_str: str) -> 'CardSet':
+        """
+        从以空格或逗号分隔的字符串创建集合.
+
+        Args:
+            cards_str: 如"AH KD 10C"
+
+        Returns:
+            CardSet: 对应的集合
+        """
+        return cls(Card.from_str(part) for part in cards_str.replace(',', ' ').split())
+
+    @classmethod
+    def full(cls) -> 'CardSet':
+        """
+        获取包含全部52张牌的集合.
+
+        Returns:
+            CardSet: 完整牌组
+        """
+        return cls.from_mask(FULL_MASK)
+
+    @staticmethod
+    def duplicates(cards: Iterable[Card]) -> 'CardSet':
+        """
+        找出序列中出现不止一次的牌.
+
+        Args:
+            cards: 扑克牌序列
+
+        Returns:
+            CardSet: 重复的牌，没有重复时为空集合
+        """
+        seen = 0
+        repeated = 0
+        for card in cards:
+            bit = 1 << card.id
+            repeated |= seen & bit
+            seen |= bit
+        return CardSet.from_mask(repeated)
+
+    @property
+    def mask(self) -> int:
+        """
+        获取52位掩码.
+
+        Returns:
+            int: 第i位对应id为i的牌
+        """
+        return self._mask
+
+    def add(self, card: Card) -> 'CardSet':
+        """
+        返回加入一张牌后的新集合.
+
+        Args:
+            card: 扑克牌
+
+        Returns:
+            CardSet: 新集合
+        """
+        return CardSet.from_mask(self._mask | (1 << card.id))
+
+    def remove(self, card: Card) -> 'CardSet':
+        """
+        返回去掉一张牌后的新集合.
+
+        Args:
+            card: 扑克牌
+
+        Returns:
+            CardSet: 新集合
+
+        Raises:
+            KeyError: 当牌不在集合中时
+        """
+        bit = 1 << card.id
+        if not self._mask & bit:
+            raise KeyError(card)
+        return CardSet.from_mask(self._mask ^ bit)
+
+    def isdisjoint(self, other: Union['CardSet', Iterable[Card]]) -> bool:
+        """
+        判断两个集合是否没有共同的牌.
+
+        Args:
+            other: 另一个集合或扑克牌序列
+
+        Returns:
+            bool: 没有共同的牌时返回True
+        """
+        return not self._mask & _as_mask(other)
+
+    def issubset(self, other: Union['CardSet', Iterable[Card]]) -> bool:
+        """
+        判断是否为另一个集合的子集.
+
+        Args:
+            other: 另一个集合或扑克牌序列
+
+        Returns:
+            bool: 是子集时返回True
+        """
+        return not self._mask & ~_as_mask(other)
+
+    def ids(self) -> Iterator[int]:
+        """
+        按升序迭代集合中牌的id.
+
+        Returns:
+            Iterator[int]: 牌id
+        """
+        mask = self._mask
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def __iter__(self) -> Iterator[Card]:
+        """
+        按id升序迭代集合中的牌.
+
+        Returns:
+            Iterator[Card]: 扑克牌
+        """
+        return (ALL_CARDS[card_id] for card_id in self.ids())
+
+    def __len__(self) -> int:
+        """
+        返回集合中的牌数.
+
+        Returns:
+            int: 掩码中1的个数
+        """
+        return self._mask.bit_count()
+
+    def __bool__(self) -> bool:
+        """
+        判断集合是否非空.
+
+        Returns:
+            bool: 非空时返回True
+        """
+        return self._mask != 0
+
+    def __contains__(self, card: object) -> bool:
+        """
+        判断牌是否在集合中.
+
+        Args:
+            card: 扑克牌
+
+        Returns:
+            bool: 在集合中时返回True
+        """
+        return isinstance(card, Card) and bool(self._mask >> card.id & 1)
+
+    def __or__(self, other: 'CardSet') -> 'CardSet':
+        """
+        并集.
+
+        Args:
+            other: 另一个集合
+
+        Returns:
+            CardSet: 并集
+        """
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet.from_mask(self._mask | other._mask)
+
+    def __and__(self, other: 'CardSet') -> 'CardSet':
+        """
+        交集.
+
+        Args:
+            other: 另一个集合
+
+        Returns:
+            CardSet: 交集
+        """
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet.from_mask(self._mask & other._mask)
+
+    def __sub__(self, other: 'CardSet') -> 'CardSet':
+        """
+        差集.
+
+        Args:
+            other: 另一个集合
+
+        Returns:
+            CardSet: 在本集合中但不在另一个集合中的牌
+        """
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet.from_mask(self._mask & ~other._mask)
+
+    def __xor__(self, other: 'CardSet') -> 'CardSet':
+        """
+        对称差.
+
+        Args:
+            other: 另一个集合
+
+        Returns:
+            CardSet: 只在其中一个集合中的牌
+        """
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return CardSet.from_mask(self._mask ^ other._mask)
+
+    def __invert__(self) -> 'CardSet':
+        """
+        补集.
+
+        Returns:
+            CardSet: 52张牌中不在本集合中的牌
+        """
+        return CardSet.from_mask(FULL_MASK ^ self._mask)
+
+    def __eq__(self, other: object) -> bool:
+        """
+        判断两个集合是否相等.
+
+        Args:
+            other: 另一个对象
+
+        Returns:
+            bool: 掩码相同时返回True
+        """
+        if not isinstance(other, CardSet):
+            return NotImplemented
+        return self._mask == other._mask
+
+    def __hash__(self) -> int:
+        """
+        返回集合的哈希值.
+
+        Returns:
+            int: 基于掩码的哈希值
+        """
+        return hash(self._mask)
+
+    def __str__(self) -> str:
+        """
+        返回集合的字符串表示.
+
+        Returns:
+            str: 以空格分隔的牌，如"AH KH"
+        """
+        return ' '.join(str(card) for card in self)
+
+    def __repr__(self) -> str:
+        """
+        返回集合的详细字符串表示.
+
+        Returns:
+            str: 如"CardSet('2H AH')"
+        """
+        return f"CardSet('{self}')"
+
+
+def _as_mask(cards: Union[CardSet, Iterable[Card]]) -> int:
+    """
+    获取集合或扑克牌序列的掩码.
+
+    Args:
+        cards: 集合或扑克牌序列
+
+    Returns:
+        int: 52位掩码
+    """
+    if isinstance(cards, CardSet):
+        return cards.mask
+    return CardSet(cards).mask
@@ -5,10 +5,10 @@
 """
 
 import random
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
-from .card import Card
-from .types import Suit, Rank, get_all_suits, get_all_ranks
+from .card import ALL_CARDS, Card
+from .card_set import FULL_MASK, CardSet
 
 
 class Deck:
@@ -20,6 +20,7 @@ class Deck:
     
     Attributes:
         _cards: 当前牌组中的牌列表
+        _remaining_mask: 当前牌组中的牌的52位掩码
         _rng: 随机数生成器
         
     Examples:
@@ -39,15 +40,13 @@ class Deck:
         """
         self._rng = rng or random.Random()
         self._cards: List[Card] = []
+        self._remaining_mask = 0
         self._reset_deck()
     
     def _reset_deck(self) -> None:
-        """重置牌组为完整的52张牌."""
-        self._cards = [
-            Card(suit, rank) 
-            for suit in get_all_suits()
-            for rank in get_all_ranks()
-        ]
+        """重置牌组为完整的52张牌（复用预先创建的扑克牌实例）."""
+        self._cards = list(ALL_CARDS)
+        self._remaining_mask = FULL_MASK
     
     def shuffle(self) -> None:
         """
@@ -69,7 +68,9 @@ class Deck:
         """
         if not self._cards:
             raise IndexError("Cannot deal from empty deck")
-        return self._cards.pop()
+        card = self._cards.pop()
+        self._remaining_mask ^= 1 << card.id
+        return card
     
     def deal_cards(self, count: int) -> List[Card]:
         """
@@ -90,9 +91,14 @@ class Deck:
         if count > len(self._cards):
             raise IndexError(f"Cannot deal {count} cards, only {len(self._cards)} remaining")
         
-        dealt_cards = []
-        for _ in range(count):
-            dealt_cards.append(self.deal_card())
+        if count == 0:
+            return []
+        
+        # 一次切片发出，顺序与逐张从顶部发牌相同
+        dealt_cards = self._cards[:-count - 1:-1]
+        del self._cards[-count:]
+        for card in dealt_cards:
+            self._remaining_mask ^= 1 << card.id
         return dealt_cards
     
     @property
@@ -105,6 +111,33 @@ class Deck:
         """
         return len(self._cards)
     
+    @property
+    def remaining_cards(self) -> CardSet:
+        """
+        获取牌组中剩余的牌.
+        
+        Returns:
+            CardSet: 剩余的牌
+        """
+        return CardSet.from_mask(self._remaining_mask)
+    
+    def remove_cards(self, cards: Iterable[Card]) -> int:
+        """
+        从牌组中移除指定的牌（如已知的死牌），不改变其余牌的顺序.
+        
+        Args:
+            cards: 要移除的牌，可以是CardSet或扑克牌序列，不在牌组中的牌会被忽略
+            
+        Returns:
+            int: 实际移除的牌数
+        """
+        card_set = cards if isinstance(cards, CardSet) else CardSet(cards)
+        removed_mask = card_set.mask & self._remaining_mask
+        if removed_mask:
+            self._cards = [card for card in self._cards if not removed_mask >> card.id & 1]
+            self._remaining_mask ^= removed_mask
+        return removed_mask.bit_count()
+    
     @property
     def is_empty(self) -> bool:
         """
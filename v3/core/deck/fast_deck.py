@@ -0,0 +1,306 @@
+"""
+高吞吐量牌组.
+
+定义基于整数排列的FastDeck类和批量预生成洗牌排列的ShuffleStream类，
+用于模拟、胜率计算等需要大量发牌的场景.
+牌组内部只保存0..51的牌id排列和发牌位置，发牌是一次切片，
+洗牌从预生成的排列块中取下一行，块用完后由NumPy Generator批量补充.
+"""
+
+import random
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .card import ALL_CARDS, Card
+from .card_set import CardSet
+
+__all__ = ['ShuffleStream', 'FastDeck']
+
+# 默认每块预生成的排列数
+DEFAULT_BLOCK_SIZE = 256
+
+_DECK_SIZE = 52
+_IDENTITY = np.arange(_DECK_SIZE, dtype=np.int8)
+_IDENTITY.flags.writeable = False
+
+
+class ShuffleStream:
+    """
+    预生成的洗牌排列流.
+
+    给定种子时产生的排列序列完全确定，与块大小无关.
+
+    Examples:
+        >>> stream = ShuffleStream(seed=7)
+        >>> stream.next_permutation().shape
+        (52,)
+        >>> stream.next_block(1000).shape
+        (1000, 52)
+    """
+
+    def __init__(self, seed: Optional[int] = None, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        """
+        初始化排列流.
+
+        Args:
+            seed: 随机种子，为None时使用系统熵
+            block_size: 每块预生成的排列数
+
+        Raises:
+            ValueError: 当block_size无效时
+        """
+        if block_size < 1:
+            raise ValueError(f"block_size必须为正数，实际: {block_size}")
+        self._rng = np.random.default_rng(seed)
+        self._block_size = block_size
+        self._block = np.empty((0, _DECK_SIZE), dtype=np.int8)
+        self._next_row = 0
+
+    def _generate(self, count: int) -> np.ndarray:
+        """
+        生成若干个独立的随机排列.
+
+        Args:
+            count: 排列数
+
+        Returns:
+            np.ndarray: 形状为(count, 52)的int8牌id排列
+        """
+        return self._rng.permuted(np.broadcast_to(_IDENTITY, (count, _DECK_SIZE)), axis=1)
+
+    def next_permutation(self) -> np.ndarray:
+        """
+        取出下一个排列.
+
+        Returns:
+            np.ndarray: 形状为(52,)的只读牌id排列
+        """
+        if self._next_row == len(self._block):
+            self._block = self._generate(self._block_size)
+            self._block.flags.writeable = False
+            self._next_row = 0
+        row = self._block[self._next_row]
+        self._next_row += 1
+        return row
+
+    def next_block(self, count: int) -> np.ndarray:
+        """
+        一次取出多个排列，供向量化模拟直接使用.
+
+        Args:
+            count: 排列数
+
+        Returns:
+            np.ndarray: 形状为(count, 52)的牌id排列
+
+        Raises:
+            ValueError: 当count为负数时
+        """
+        if count < 0:
+            raise ValueError(f"排列数不能为负数，实际: {count}")
+        buffered = self._block[self._next_row:self._next_row + count]
+        self._next_row += len(buffered)
+        if len(buffered) == count:
+            return buffered.copy()
+        return np.concatenate([buffered, self._generate(count - len(buffered))])
+
+
+class FastDeck:
+    """
+    基于整数排列的高吞吐量牌组.
+
+    接口与Deck一致，另外提供直接返回牌id的deal_ids.
+    传入random.Random时从中派生排列流的种子，
+    因此相同种子的rng总是得到相同的发牌顺序.
+
+    Attributes:
+        _order: 当前的牌id排列
+        _position: 下一张要发出的牌在排列中的位置
+        _stream: 洗牌排列流
+
+    Examples:
+        >>> deck = FastDeck(random.Random(42))
+        >>> deck.shuffle()
+        >>> hole_cards = deck.deal_cards(2)
+        >>> len(deck)
+        50
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None,
+                 stream: Optional[ShuffleStream] = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        """
+        初始化牌组.
+
+        Args:
+            rng: 随机数生成器，用于派生排列流的种子；为None时使用系统熵
+            stream: 可选的共享排列流，提供时忽略rng和block_size
+            block_size: 每块预生成的排列数
+        """
+        if stream is None:
+            seed = rng.getrandbits(64) if rng is not None else None
+            stream = ShuffleStream(seed, block_size)
+        self._stream = stream
+        self._order: np.ndarray = _IDENTITY
+        self._position = 0
+
+    def shuffle(self) -> None:
+        """
+        洗牌.
+
+        换上排列流中的下一个排列，牌组恢复为完整的52张.
+        """
+        self._order = self._stream.next_permutation()
+        self._position = 0
+
+    def reset(self) -> None:
+        """重置牌组为完整的52张牌（按id顺序）."""
+        self._order = _IDENTITY
+        self._position = 0
+
+    def deal_ids(self, count: int) -> np.ndarray:
+        """
+        发多张牌，直接返回牌id.
+
+        Args:
+            count: 要发的牌数
+
+        Returns:
+            np.ndarray: 长度为count的只读牌id视图
+
+        Raises:
+            ValueError: 当count为负数时
+            IndexError: 当牌组中的牌不足时
+        """
+        if count < 0:
+            raise ValueError("Count must be non-negative")
+        if count > len(self):
+            raise IndexError(f"Cannot deal {count} cards, only {len(self)} remaining")
+        start = self._position
+        self._position += count
+        return self._order[start:self._position]
+
+    def deal_cards(self, count: int) -> List[Card]:
+        """
+        发多张牌.
+
+        Args:
+            count: 要发的牌数
+
+        Returns:
+            List[Card]: 发出的牌列表
+
+        Raises:
+            ValueError: 当count为负数时
+            IndexError: 当牌组中的牌不足时
+        """
+        return [ALL_CARDS[card_id] for card_id in self.deal_ids(count).tolist()]
+
+    def deal_card(self) -> Card:
+        """
+        发一张牌.
+
+        Returns:
+            Card: 发出的牌
+
+        Raises:
+            IndexError: 当牌组为空时
+        """
+        if self._position >= len(self._order):
+            raise IndexError("Cannot deal from empty deck")
+        card_id = int(self._order[self._position])
+        self._position += 1
+        return ALL_CARDS[card_id]
+
+    def peek_top(self) -> Optional[Card]:
+        """
+        查看顶部的牌但不发出.
+
+        Returns:
+            Optional[Card]: 顶部的牌，如果牌组为空则返回None
+        """
+        if self._position >= len(self._order):
+            return None
+        return ALL_CARDS[int(self._order[self._position])]
+
+    def remove_cards(self, cards: Iterable[Card]) -> int:
+        """
+        从牌组中移除指定的牌（如已知的死牌），不改变其余牌的顺序.
+
+        Args:
+            cards: 要移除的牌，可以是CardSet或扑克牌序列，不在牌组中的牌会被忽略
+
+        Returns:
+            int: 实际移除的牌数
+        """
+        card_set = cards if isinstance(cards, CardSet) else CardSet(cards)
+        removed_mask = card_set.mask & self.remaining_cards.mask
+        if removed_mask:
+            remaining = self._order[self._position:]
+            keep = [not removed_mask >> card_id & 1 for card_id in remaining.tolist()]
+            self._order = remaining[np.array(keep, dtype=bool)]
+            self._position = 0
+        return removed_mask.bit_count()
+
+    @property
+    def remaining_cards(self) -> CardSet:
+        """
+        获取牌组中剩余的牌.
+
+        掩码按需从剩余排列计算，发牌时不做额外记录.
+
+        Returns:
+            CardSet: 剩余的牌
+        """
+        mask = 0
+        for card_id in self._order[self._position:].tolist():
+            mask |= 1 << card_id
+        return CardSet.from_mask(mask)
+
+    @property
+    def cards_remaining(self) -> int:
+        """
+        获取剩余牌数.
+
+        Returns:
+            int: 牌组中剩余的牌数
+        """
+        return len(self._order) - self._position
+
+    @property
+    def is_empty(self) -> bool:
+        """
+        检查牌组是否为空.
+
+        Returns:
+            bool: 如果牌组为空则返回True
+        """
+        return self._position >= len(self._order)
+
+    def __len__(self) -> int:
+        """
+        返回牌组中剩余的牌数.
+
+        Returns:
+            int: 剩余牌数
+        """
+        return len(self._order) - self._position
+
+    def __str__(self) -> str:
+        """
+        返回牌组的字符串表示.
+
+        Returns:
+            str: 包含剩余牌数的描述
+        """
+        return f"FastDeck({len(self)} cards remaining)"
+
+    def __repr__(self) -> str:
+        """
+        返回牌组的详细字符串表示.
+
+        Returns:
+            str: 包含类名和剩余牌数的详细描述
+        """
+        return f"FastDeck(cards_remaining={len(self)})"
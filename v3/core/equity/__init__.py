@@ -0,0 +1,28 @@
+"""
+德州扑克胜率计算模块.
+
+提供基于蒙特卡洛抽样的胜率估算和穷举剩余公共牌的精确计算，
+输入各玩家已知手牌、部分公共牌和死牌，输出每位玩家的胜/平/负比例和底池权益.
+HandRange把范围写法解析为1326个组合的权重数组，RangeEquityCalculator计算范围对范围的胜率.
+"""
+
+from .types import PlayerEquity, EquityResult, RangeEquityResult
+from .spot import EquitySpot
+from .monte_carlo import MonteCarloEquityCalculator
+from .exact import ExactEquityCalculator
+from .cache import CachedEquityCalculator
+from .ranges import HandRange, combo_index
+from .range_equity import RangeEquityCalculator
+
+__all__ = [
+    'PlayerEquity',
+    'EquityResult',
+    'EquitySpot',
+    'MonteCarloEquityCalculator',
+    'ExactEquityCalculator',
+    'CachedEquityCalculator',
+    'HandRange',
+    'combo_index',
+    'RangeEquityResult',
+    'RangeEquityCalculator',
+]
@@ -0,0 +1,178 @@
+"""
+胜率计算结果缓存.
+
+以"公共牌、各玩家手牌、死牌"的花色规范形式为键缓存胜率结果，
+只相差花色置换的牌局共享同一条记录，命中时按玩家顺序还原结果.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+
+from ..deck.card import Card
+from ..deck.card_set import CardSet
+from ..eval.cache import CacheStats, LRUCache
+from ..eval.canonical import canonicalize
+from .types import EquityResult, PlayerEquity
+
+__all__ = ['CachedEquityCalculator']
+
+# 默认缓存容量
+DEFAULT_CACHE_SIZE = 4096
+
+CardGroup = Union[Sequence[Card], CardSet]
+
+
+@dataclass(frozen=True)
+class _CachedEquity:
+    """
+    按玩家位置保存的胜率结果.
+
+    Attributes:
+        players: 每个位置的(独赢, 平分, 输, 权益)
+        samples: 参与统计的发牌结果数量
+        exact: 是否为精确结果
+    """
+
+    players: Tuple[Tuple[float, float, float, float], ...]
+    samples: int
+    exact: bool
+
+
+class CachedEquityCalculator:
+    """
+    带缓存的胜率计算器.
+
+    包装MonteCarloEquityCalculator或ExactEquityCalculator，calculate的其余参数
+    （样本数、种子等）原样传给底层计算器，并作为缓存键的一部分.
+    只缓存可复现的结果：精确结果，或指定了种子且不受时间预算影响的抽样结果；
+    未指定种子的抽样结果每次重新计算. 抽样结果依赖具体的牌而不只是花色规范形式，
+    因此指定种子时以原始的牌（按给出的顺序）为键，不与花色置换后的牌局共享.
+    输入无效时不查缓存，直接由底层计算器报错.
+
+    Examples:
+        >>> calculator = CachedEquityCalculator(ExactEquityCalculator())
+        >>> result = calculator.calculate(hole_cards, flop)
+        >>> calculator.stats().misses
+        1
+    """
+
+    def __init__(self, calculator: Any, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        初始化带缓存的计算器.
+
+        Args:
+            calculator: 底层胜率计算器，需要提供calculate(hole_cards, board, dead_cards, **options)
+            maxsize: 缓存容量
+
+        Raises:
+            ValueError: 当maxsize无效时
+        """
+        self._calculator = calculator
+        self._cache: LRUCache[Tuple, _CachedEquity] = LRUCache(maxsize)
+
+    def calculate(self, hole_cards: Dict[str, CardGroup],
+                  board: CardGroup = (),
+                  dead_cards: CardGroup = (),
+                  **options: Any) -> EquityResult:
+        """
+        计算各玩家的胜率，优先使用缓存.
+
+        Args:
+            hole_cards: 玩家ID -> 2张手牌
+            board: 已知公共牌
+            dead_cards: 已知不会再出现的牌
+            **options: 传给底层计算器的其余参数
+
+        Returns:
+            EquityResult: 计算结果，命中缓存时elapsed为查询耗时
+
+        Raises:
+            TypeError: 当输入类型无效时
+            ValueError: 当牌数不符合要求或存在重复的牌时
+        """
+        start_time = time.perf_counter()
+        key = self._cache_key(hole_cards, board, dead_cards, options)
+        if key is None:
+            return self._calculator.calculate(hole_cards, board, dead_cards, **options)
+
+        cached = self._cache.get(key)
+        if cached is None:
+            result = self._calculator.calculate(hole_cards, board, dead_cards, **options)
+            if not self._is_reproducible(result, options):
+                return result
+            self._cache.put(key, _CachedEquity(
+                players=tuple(
+                    (equity.win, equity.tie, equity.lose, equity.equity)
+                    for equity in (result.players[player_id] for player_id in hole_cards)
+                ),
+                samples=result.samples,
+                exact=result.exact,
+            ))
+            return result
+
+        players = {
+            player_id: PlayerEquity(player_id, win, tie, lose, equity)
+            for player_id, (win, tie, lose, equity) in zip(hole_cards, cached.players)
+        }
+        return EquityResult(players=players, samples=cached.samples, exact=cached.exact,
+                            elapsed=time.perf_counter() - start_time)
+
+    @staticmethod
+    def _is_reproducible(result: EquityResult, options: Dict[str, Any]) -> bool:
+        """
+        相同参数再次计算是否得到相同结果.
+
+        Args:
+            result: 底层计算器的结果
+            options: 底层计算器的其余参数
+
+        Returns:
+            bool: 精确结果，或指定了种子且未设置时间预算的抽样结果
+        """
+        if result.exact:
+            return True
+        return options.get('seed') is not None and options.get('time_budget') is None
+
+    @staticmethod
+    def _cache_key(hole_cards: Dict[str, CardGroup], board: CardGroup,
+                   dead_cards: CardGroup, options: Dict[str, Any]) -> Optional[Tuple]:
+        """
+        计算缓存键，输入无效时返回None.
+
+        Args:
+            hole_cards: 玩家ID -> 2张手牌
+            board: 已知公共牌
+            dead_cards: 已知不会再出现的牌
+            options: 底层计算器的其余参数
+
+        Returns:
+            Optional[Tuple]: (规范索引, 排序后的参数)；指定种子时为(各组牌的id, 排序后的参数)
+        """
+        if not isinstance(hole_cards, dict) or len(hole_cards) < 2:
+            return None
+        try:
+            form = canonicalize([board, *hole_cards.values(), dead_cards])
+            option_key = tuple(sorted(options.items()))
+            hash(option_key)
+        except TypeError:
+            return None
+        if not form.is_valid:
+            return None
+        if options.get('seed') is not None:
+            groups = (board, *hole_cards.values(), dead_cards)
+            return tuple(tuple(card.id for card in group) for group in groups), option_key
+        return form.index, option_key
+
+    def stats(self) -> CacheStats:
+        """
+        获取缓存统计信息.
+
+        Returns:
+            CacheStats: 统计信息
+        """
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        """清空缓存和统计计数."""
+        self._cache.clear()
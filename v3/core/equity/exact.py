@@ -0,0 +1,163 @@
+"""
+精确胜率计算器.
+
+穷举剩余公共牌的全部发牌结果，得到精确的胜/平/负比例.
+评估状态逐层增量扩展："手牌+已知公共牌"的点数键和牌面掩码只计算一次，
+之后每加一张转牌、河牌只在上一层的部分和上叠加，而不是从头评估整手牌.
+"""
+
+import time
+from math import comb
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from ..deck.card import Card
+from ..eval.batch import CARD_BITS, CARD_RANK_KEYS, strengths_from_components
+from .spot import EquitySpot, build_equity_result, tally_strengths
+from .types import EquityResult
+
+__all__ = ['ExactEquityCalculator']
+
+# 最后一层扩展时每批处理的部分组合数，用于限制翻牌前穷举的内存占用
+DEFAULT_BATCH_SIZE = 8192
+
+
+def _extend_runouts(last: np.ndarray, keys: np.ndarray, bits: np.ndarray,
+                    card_keys: np.ndarray, card_bits: np.ndarray
+                    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    在已有的部分发牌结果上再发一张牌.
+
+    只扩展下标大于上一张牌的牌，保证每个组合只出现一次.
+
+    Args:
+        last: 每个部分结果最后一张牌在剩余牌中的位置
+        keys: 每个部分结果的点数键之和
+        bits: 每个部分结果的牌面掩码
+        card_keys: 剩余牌的点数键
+        card_bits: 剩余牌的牌面位
+
+    Returns:
+        Tuple: 扩展后的(最后一张牌位置, 点数键之和, 牌面掩码)
+    """
+    remaining_count = len(card_keys)
+    counts = remaining_count - 1 - last
+    rows = np.repeat(np.arange(len(last)), counts)
+    group_starts = np.repeat(np.cumsum(counts) - counts, counts)
+    positions = last[rows] + 1 + (np.arange(len(rows)) - group_starts)
+    return positions, keys[rows] + card_keys[positions], bits[rows] | card_bits[positions]
+
+
+class ExactEquityCalculator:
+    """
+    精确胜率计算器.
+
+    适用于翻牌、转牌和河牌圈的实时全下胜率展示；
+    翻牌前需要穷举约171万种发牌结果，耗时明显更长，建议使用预计算表或蒙特卡洛.
+
+    Examples:
+        >>> calculator = ExactEquityCalculator()
+        >>> result = calculator.calculate(hole_cards, flop)
+        >>> result.samples
+        990
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        """
+        初始化计算器.
+
+        Args:
+            batch_size: 最后一层扩展时每批处理的部分组合数
+
+        Raises:
+            ValueError: 当batch_size无效时
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size必须为正数，实际: {batch_size}")
+        self._batch_size = batch_size
+
+    @staticmethod
+    def count_runouts(hole_cards: Dict[str, Sequence[Card]],
+                      board: Sequence[Card] = (),
+                      dead_cards: Sequence[Card] = ()) -> int:
+        """
+        计算需要穷举的发牌结果数量.
+
+        Args:
+            hole_cards: 玩家ID -> 2张手牌
+            board: 已知公共牌
+            dead_cards: 已知不会再出现的牌
+
+        Returns:
+            int: 发牌结果数量
+        """
+        spot = EquitySpot.from_cards(hole_cards, board, dead_cards)
+        return comb(len(spot.remaining_indices), spot.cards_to_come)
+
+    def calculate(self, hole_cards: Dict[str, Sequence[Card]],
+                  board: Sequence[Card] = (),
+                  dead_cards: Sequence[Card] = ()) -> EquityResult:
+        """
+        穷举计算各玩家的精确胜率.
+
+        Args:
+            hole_cards: 玩家ID -> 2张手牌
+            board: 已知公共牌（0-5张）
+            dead_cards: 已知不会再出现的牌
+
+        Returns:
+            EquityResult: exact为True的精确结果
+
+        Raises:
+            TypeError: 当输入类型无效时
+            ValueError: 当牌数不符合要求或存在重复的牌时
+        """
+        start_time = time.perf_counter()
+        spot = EquitySpot.from_cards(hole_cards, board, dead_cards)
+
+        if spot.cards_to_come == 0:
+            # 公共牌已发完，只有一种结果
+            strengths = strengths_from_components(spot.base_rank_keys, spot.base_bits)
+            wins, ties, shares = tally_strengths(strengths.reshape(-1, 1))
+            return build_equity_result(spot, wins, ties, shares, 1, True,
+                                       time.perf_counter() - start_time)
+
+        player_count = len(spot.player_ids)
+        wins = np.zeros(player_count, dtype=np.int64)
+        ties = np.zeros(player_count, dtype=np.int64)
+        shares = np.zeros(player_count, dtype=np.float64)
+        card_keys = CARD_RANK_KEYS[spot.remaining_indices]
+        card_bits = CARD_BITS[spot.remaining_indices]
+
+        # 第一张待发牌：每张剩余牌各一个部分结果
+        last = np.arange(len(card_keys))
+        keys = card_keys.copy()
+        bits = card_bits.copy()
+        for _ in range(spot.cards_to_come - 2):
+            last, keys, bits = _extend_runouts(last, keys, bits, card_keys, card_bits)
+
+        total = 0
+        if spot.cards_to_come == 1:
+            batches = [(keys, bits)]
+        else:
+            batches = (
+                _extend_runouts(last[i:i + self._batch_size], keys[i:i + self._batch_size],
+                                bits[i:i + self._batch_size], card_keys, card_bits)[1:]
+                for i in range(0, len(last), self._batch_size)
+            )
+
+        for runout_keys, runout_bits in batches:
+            strengths = np.empty((player_count, len(runout_keys)), dtype=np.int32)
+            for player in range(player_count):
+                strengths[player] = strengths_from_components(
+                    runout_keys + spot.base_rank_keys[player], runout_bits | spot.base_bits[player]
+                )
+            batch_wins, batch_ties, batch_shares = tally_strengths(strengths)
+            wins += batch_wins
+            ties += batch_ties
+            shares += batch_shares
+            total += len(runout_keys)
+
+        return build_equity_result(spot, wins, ties, shares, total, True,
+                                   time.perf_counter() - start_time)
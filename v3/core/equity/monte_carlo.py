@@ -0,0 +1,235 @@
+"""
+蒙特卡洛胜率计算器.
+
+对剩余牌堆随机抽取公共牌，使用向量化批量评估统计各玩家的胜/平/负比例.
+支持固定样本数或时间预算、可复现的种子，以及基于ProcessPoolExecutor的多进程扇出.
+"""
+
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..deck.card import Card
+from ..eval.batch import CARD_BITS, CARD_RANK_KEYS, strengths_from_components
+from .spot import EquitySpot, build_equity_result, tally_strengths
+from .types import EquityResult
+
+__all__ = ['MonteCarloEquityCalculator']
+
+# 单个抽样块的默认样本数
+DEFAULT_CHUNK_SIZE = 4096
+
+
+def _sample_chunk(base_rank_keys: np.ndarray, base_bits: np.ndarray,
+                  remaining_indices: np.ndarray, cards_to_come: int,
+                  samples: int, seed: np.random.SeedSequence
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    抽样并统计一个块的发牌结果.
+
+    定义在模块顶层，以便提交给子进程执行.
+
+    Args:
+        base_rank_keys: 每位玩家"手牌+已知公共牌"的点数键之和
+        base_bits: 每位玩家"手牌+已知公共牌"的牌面掩码
+        remaining_indices: 剩余牌下标
+        cards_to_come: 需要补发的公共牌张数
+        samples: 本块样本数
+        seed: 本块的随机种子序列
+
+    Returns:
+        Tuple: (独赢次数, 平分次数, 权益累计)
+    """
+    rng = np.random.default_rng(seed)
+    decks = np.broadcast_to(remaining_indices, (samples, len(remaining_indices)))
+    runouts = rng.permuted(decks, axis=1)[:, :cards_to_come]
+
+    runout_keys = CARD_RANK_KEYS[runouts].sum(axis=1)
+    runout_bits = np.bitwise_or.reduce(CARD_BITS[runouts], axis=1)
+
+    strengths = np.empty((len(base_rank_keys), samples), dtype=np.int32)
+    for player in range(len(base_rank_keys)):
+        strengths[player] = strengths_from_components(
+            runout_keys + base_rank_keys[player], runout_bits | base_bits[player]
+        )
+    return tally_strengths(strengths)
+
+
+class MonteCarloEquityCalculator:
+    """
+    蒙特卡洛胜率计算器.
+
+    样本按固定大小分块，每块使用从种子派生的独立随机流，
+    因此给定种子和样本数时，无论使用多少个进程结果都完全一致.
+    进程池在首次并行计算时创建并复用，使用完毕后应调用close或使用with语句.
+
+    Examples:
+        >>> with MonteCarloEquityCalculator(workers=4) as calculator:
+        ...     result = calculator.calculate(hole_cards, board, samples=20000, seed=7)
+        >>> result.players['player1'].equity
+        0.8123
+    """
+
+    def __init__(self, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 executor: Optional[Executor] = None) -> None:
+        """
+        初始化计算器.
+
+        Args:
+            workers: 并行进程数，1表示在当前进程内计算
+            chunk_size: 单个抽样块的样本数
+            executor: 可选的外部执行器，提供时不会自行创建或关闭进程池
+
+        Raises:
+            ValueError: 当参数无效时
+        """
+        if workers < 1:
+            raise ValueError(f"workers必须至少为1，实际: {workers}")
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size必须为正数，实际: {chunk_size}")
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._executor = executor
+        self._owns_executor = executor is None
+
+    def calculate(self, hole_cards: Dict[str, Sequence[Card]],
+                  board: Sequence[Card] = (),
+                  dead_cards: Sequence[Card] = (),
+                  samples: Optional[int] = 10000,
+                  time_budget: Optional[float] = None,
+                  seed: Optional[int] = None) -> EquityResult:
+        """
+        估算各玩家的胜率.
+
+        Args:
+            hole_cards: 玩家ID -> 2张手牌
+            board: 已知公共牌（0-5张）
+            dead_cards: 已知不会再出现的牌
+            samples: 最大样本数，为None时只受时间预算限制
+            time_budget: 时间预算（秒），为None时只受样本数限制
+            seed: 随机种子，相同种子和样本数得到相同结果
+
+        Returns:
+            EquityResult: 估算结果
+
+        Raises:
+            TypeError: 当输入类型无效时
+            ValueError: 当牌数、样本数或时间预算无效时
+        """
+        if samples is None and time_budget is None:
+            raise ValueError("samples和time_budget不能同时为None")
+        if samples is not None and samples <= 0:
+            raise ValueError(f"样本数必须为正数，实际: {samples}")
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError(f"时间预算必须为正数，实际: {time_budget}")
+
+        start_time = time.perf_counter()
+        spot = EquitySpot.from_cards(hole_cards, board, dead_cards)
+
+        if spot.cards_to_come == 0:
+            # 公共牌已发完，结果是确定的
+            strengths = strengths_from_components(spot.base_rank_keys, spot.base_bits)
+            wins, ties, shares = tally_strengths(strengths.reshape(-1, 1))
+            return build_equity_result(spot, wins, ties, shares, 1, True,
+                                       time.perf_counter() - start_time)
+
+        player_count = len(spot.player_ids)
+        wins = np.zeros(player_count, dtype=np.int64)
+        ties = np.zeros(player_count, dtype=np.int64)
+        shares = np.zeros(player_count, dtype=np.float64)
+        seed_sequence = np.random.SeedSequence(seed)
+        total = 0
+
+        while samples is None or total < samples:
+            round_sizes = self._next_round_sizes(total, samples)
+            chunk_seeds = seed_sequence.spawn(len(round_sizes))
+            for chunk_wins, chunk_ties, chunk_shares in self._run_round(spot, round_sizes, chunk_seeds):
+                wins += chunk_wins
+                ties += chunk_ties
+                shares += chunk_shares
+            total += sum(round_sizes)
+            if time_budget is not None and time.perf_counter() - start_time >= time_budget:
+                break
+
+        return build_equity_result(spot, wins, ties, shares, total, False,
+                                   time.perf_counter() - start_time)
+
+    def _next_round_sizes(self, done: int, samples: Optional[int]) -> List[int]:
+        """
+        计算下一轮各抽样块的样本数（每个进程一块）.
+
+        Args:
+            done: 已完成的样本数
+            samples: 最大样本数
+
+        Returns:
+            List[int]: 本轮各块的样本数
+        """
+        sizes = []
+        for _ in range(self._workers):
+            size = self._chunk_size
+            if samples is not None:
+                size = min(size, samples - done)
+            if size <= 0:
+                break
+            sizes.append(size)
+            done += size
+        return sizes
+
+    def _run_round(self, spot: EquitySpot, sizes: List[int],
+                   seeds: List[np.random.SeedSequence]
+                   ) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        执行一轮抽样块，按块顺序返回统计结果.
+
+        Args:
+            spot: 胜率计算输入
+            sizes: 各块样本数
+            seeds: 各块随机种子序列
+
+        Returns:
+            List: 各块的(独赢次数, 平分次数, 权益累计)
+        """
+        args = [
+            (spot.base_rank_keys, spot.base_bits, spot.remaining_indices,
+             spot.cards_to_come, size, seed)
+            for size, seed in zip(sizes, seeds)
+        ]
+        if self._workers == 1 or len(args) == 1:
+            return [_sample_chunk(*chunk_args) for chunk_args in args]
+
+        executor = self._get_executor()
+        futures = [executor.submit(_sample_chunk, *chunk_args) for chunk_args in args]
+        return [future.result() for future in futures]
+
+    def _get_executor(self) -> Executor:
+        """
+        获取进程池，首次调用时创建.
+
+        Returns:
+            Executor: 执行器
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    def close(self) -> None:
+        """关闭自行创建的进程池."""
+        if self._executor is not None and self._owns_executor:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'MonteCarloEquityCalculator':
+        """
+        进入上下文.
+
+        Returns:
+            MonteCarloEquityCalculator: 计算器本身
+        """
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """退出上下文时关闭进程池."""
+        self.close()
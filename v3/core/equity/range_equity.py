@@ -0,0 +1,246 @@
+"""
+范围对范围胜率计算.
+
+双方范围都是长度1326的权重数组. 先用52位掩码剔除与已知公共牌、死牌冲突的组合，
+再构建"我方组合 x 对方组合"的权重矩阵（两组合共用一张牌时为0）.
+每种剩余公共牌的发牌结果只对所有组合做一次向量化评估，
+按组合对累计胜、平次数，与发牌结果冲突的组合用哨兵强度排除，
+最后与权重矩阵相乘一次得到加权结果.
+"""
+
+import time
+from itertools import combinations
+from math import comb
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from ..deck.card import Card
+from ..deck.card_set import CardSet
+from ..eval.batch import CARD_BITS, CARD_RANK_KEYS, flush_strengths, rank_strengths
+from .ranges import COMBO_CARDS, COMBO_COUNT, COMBO_MASKS, HandRange
+from .spot import BOARD_SIZE
+from .types import RangeEquityResult
+
+__all__ = ['RangeEquityCalculator']
+
+# 剩余发牌结果不超过该数量时穷举（翻牌、转牌、河牌），否则抽样
+DEFAULT_MAX_EXACT_RUNOUTS = 1225
+
+# 抽样时的发牌结果数量
+DEFAULT_RUNOUT_SAMPLES = 500
+
+# 每批比较矩阵的元素数上限，用于限制内存占用
+_BATCH_ELEMENTS = 1 << 22
+
+# 与发牌结果冲突的对方组合使用的哨兵强度
+_DEAD_VILLAIN = np.iinfo(np.int32).max
+
+# 组合下标 -> 两张牌的点数键之和
+_COMBO_RANK_KEYS = CARD_RANK_KEYS[COMBO_CARDS].sum(axis=1)
+
+
+def _card_ids(cards: Union[Iterable[Card], CardSet], seen_mask: int, name: str) -> Tuple[list, int]:
+    """
+    校验一组牌并转换为牌id.
+
+    Args:
+        cards: 扑克牌
+        seen_mask: 已出现的牌的掩码
+        name: 用于错误信息的牌组名称
+
+    Returns:
+        Tuple: (牌id列表, 更新后的掩码)
+
+    Raises:
+        TypeError: 当元素不是Card类型时
+        ValueError: 当存在重复的牌时
+    """
+    card_ids = []
+    for card in cards:
+        if not isinstance(card, Card):
+            raise TypeError(f"{name}必须是Card类型，实际: {type(card)}")
+        if seen_mask >> card.id & 1:
+            raise ValueError(f"存在重复的牌: {card}")
+        seen_mask |= 1 << card.id
+        card_ids.append(card.id)
+    return card_ids, seen_mask
+
+
+class RangeEquityCalculator:
+    """
+    范围对范围胜率计算器.
+
+    翻牌、转牌和河牌圈默认穷举全部发牌结果（翻牌圈最多1225种），
+    翻牌前按给定样本数抽样发牌结果. 抽样结果在给定种子时完全确定.
+
+    Examples:
+        >>> calculator = RangeEquityCalculator()
+        >>> result = calculator.calculate(HandRange.parse("TT+, AK"), HandRange.parse("22+"), flop)
+        >>> result.exact
+        True
+    """
+
+    def __init__(self, max_exact_runouts: int = DEFAULT_MAX_EXACT_RUNOUTS,
+                 samples: int = DEFAULT_RUNOUT_SAMPLES) -> None:
+        """
+        初始化计算器.
+
+        Args:
+            max_exact_runouts: 穷举的发牌结果数量上限
+            samples: 超过上限时抽样的发牌结果数量
+
+        Raises:
+            ValueError: 当参数无效时
+        """
+        if max_exact_runouts < 1:
+            raise ValueError(f"max_exact_runouts必须为正数，实际: {max_exact_runouts}")
+        if samples < 1:
+            raise ValueError(f"样本数必须为正数，实际: {samples}")
+        self._max_exact_runouts = max_exact_runouts
+        self._samples = samples
+
+    def calculate(self, hero_range: HandRange, villain_range: HandRange,
+                  board: Union[Iterable[Card], CardSet] = (),
+                  dead_cards: Union[Iterable[Card], CardSet] = (),
+                  seed: Optional[int] = None) -> RangeEquityResult:
+        """
+        计算我方范围对对方范围的胜率.
+
+        Args:
+            hero_range: 我方范围
+            villain_range: 对方范围
+            board: 已知公共牌（0-5张）
+            dead_cards: 已知不会再出现的牌
+            seed: 抽样时的随机种子
+
+        Returns:
+            RangeEquityResult: 计算结果
+
+        Raises:
+            TypeError: 当输入类型无效时
+            ValueError: 当公共牌数量无效、存在重复的牌或范围内没有可对抗的组合时
+        """
+        if not isinstance(hero_range, HandRange) or not isinstance(villain_range, HandRange):
+            raise TypeError("范围必须是HandRange类型")
+        start_time = time.perf_counter()
+
+        board_ids, known_mask = _card_ids(board, 0, "公共牌")
+        if len(board_ids) > BOARD_SIZE:
+            raise ValueError(f"公共牌不能超过{BOARD_SIZE}张，实际: {len(board_ids)}")
+        _, known_mask = _card_ids(dead_cards, known_mask, "死牌")
+
+        # 剔除被已知牌阻断的组合
+        available = (COMBO_MASKS & np.uint64(known_mask)) == 0
+        hero_index = np.flatnonzero(available & (hero_range.weights > 0))
+        villain_index = np.flatnonzero(available & (villain_range.weights > 0))
+        hero_masks = COMBO_MASKS[hero_index]
+        villain_masks = COMBO_MASKS[villain_index]
+        pair_weights = np.outer(hero_range.weights[hero_index], villain_range.weights[villain_index])
+        pair_weights[(hero_masks[:, None] & villain_masks[None, :]) != 0] = 0.0
+        if not pair_weights.any():
+            raise ValueError("双方范围内没有可以对抗的组合")
+
+        runout_ids, exact = self._runouts(board_ids, known_mask, seed)
+        board_key = int(CARD_RANK_KEYS[board_ids].sum()) if board_ids else 0
+        board_bits = np.bitwise_or.reduce(CARD_BITS[board_ids]) if board_ids else np.uint64(0)
+        if runout_ids.shape[1]:
+            runout_keys = CARD_RANK_KEYS[runout_ids].sum(axis=1) + board_key
+            runout_bits = np.bitwise_or.reduce(CARD_BITS[runout_ids], axis=1) | board_bits
+        else:
+            runout_keys = np.full(1, board_key, dtype=np.int64)
+            runout_bits = np.full(1, board_bits, dtype=np.uint64)
+
+        # 按组合对累计：胜场数、平局数、双方都不与发牌结果冲突的次数
+        win_counts = np.zeros(pair_weights.shape, dtype=np.int32)
+        tie_counts = np.zeros(pair_weights.shape, dtype=np.int32)
+        live_counts = np.zeros(pair_weights.shape, dtype=np.float64)
+        batch = max(1, _BATCH_ELEMENTS // pair_weights.size)
+        for begin in range(0, len(runout_keys), batch):
+            keys = runout_keys[begin:begin + batch]
+            bits = runout_bits[begin:begin + batch]
+            hero_strengths, hero_live = self._evaluate(hero_index, hero_masks, keys, bits)
+            villain_strengths, villain_live = self._evaluate(villain_index, villain_masks, keys, bits)
+
+            # 冲突的组合用哨兵强度排除：我方为-1，对方为最大值，二者既不会赢也不会平
+            hero_strengths[~hero_live] = -1
+            villain_strengths[~villain_live] = _DEAD_VILLAIN
+            hero_strengths = hero_strengths[:, :, None]
+            villain_strengths = villain_strengths[:, None, :]
+            win_counts += np.add.reduce(hero_strengths > villain_strengths, axis=0, dtype=np.int32)
+            tie_counts += np.add.reduce(hero_strengths == villain_strengths, axis=0, dtype=np.int32)
+            live_counts += hero_live.T.astype(np.float64) @ villain_live.astype(np.float64)
+
+        hero_wins = (win_counts * pair_weights).sum(axis=1)
+        hero_ties = (tie_counts * pair_weights).sum(axis=1)
+        hero_totals = (live_counts * pair_weights).sum(axis=1)
+        total = hero_totals.sum()
+        win = hero_wins.sum() / total
+        tie = hero_ties.sum() / total
+        combo_equities = np.full(COMBO_COUNT, np.nan)
+        played = hero_totals > 0
+        combo_equities[hero_index[played]] = (
+            (hero_wins[played] + hero_ties[played] / 2) / hero_totals[played]
+        )
+        combo_equities.flags.writeable = False
+
+        return RangeEquityResult(
+            equity=float(win + tie / 2),
+            win=float(win),
+            tie=float(tie),
+            combo_equities=combo_equities,
+            samples=len(runout_keys),
+            exact=exact,
+            elapsed=time.perf_counter() - start_time,
+        )
+
+    def _runouts(self, board_ids: list, known_mask: int,
+                 seed: Optional[int]) -> Tuple[np.ndarray, bool]:
+        """
+        生成剩余公共牌的发牌结果.
+
+        Args:
+            board_ids: 已知公共牌id
+            known_mask: 已知公共牌和死牌的掩码
+            seed: 抽样时的随机种子
+
+        Returns:
+            Tuple: (形状为(R, k)的牌id数组, 是否穷举)
+        """
+        remaining = np.array([card_id for card_id in range(52) if not known_mask >> card_id & 1],
+                             dtype=np.intp)
+        cards_to_come = BOARD_SIZE - len(board_ids)
+        if cards_to_come == 0:
+            return np.zeros((1, 0), dtype=np.intp), True
+        if comb(len(remaining), cards_to_come) <= self._max_exact_runouts:
+            return np.array(list(combinations(remaining, cards_to_come)), dtype=np.intp), True
+        rng = np.random.default_rng(seed)
+        shuffled = rng.permuted(np.broadcast_to(remaining, (self._samples, len(remaining))), axis=1)
+        return shuffled[:, :cards_to_come], False
+
+    @staticmethod
+    def _evaluate(combo_index: np.ndarray, combo_masks: np.ndarray,
+                  runout_keys: np.ndarray, runout_bits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        对一批完整公共牌评估范围内的全部组合.
+
+        Args:
+            combo_index: 组合下标
+            combo_masks: 组合的牌面掩码
+            runout_keys: 每种完整公共牌的点数键之和
+            runout_bits: 每种完整公共牌的牌面掩码
+
+        Returns:
+            Tuple: 形状均为(R, C)的(强度键, 组合是否与公共牌不冲突)
+        """
+        live = (combo_masks[None, :] & runout_bits[:, None]) == 0
+
+        # 非同花部分只取决于点数：对去重后的(公共牌点数键, 组合点数键)网格查表，
+        # 不同花色的发牌结果和组合共用同一格
+        unique_runout_keys, runout_inverse = np.unique(runout_keys, return_inverse=True)
+        unique_combo_keys, combo_inverse = np.unique(_COMBO_RANK_KEYS[combo_index], return_inverse=True)
+        grid = rank_strengths(unique_runout_keys[:, None] + unique_combo_keys[None, :])
+        strengths = grid[runout_inverse[:, None], combo_inverse[None, :]]
+
+        flushes = flush_strengths(runout_bits[:, None] | combo_masks[None, :])
+        return np.where(flushes > 0, flushes, strengths), live
@@ -0,0 +1,388 @@
+"""
+手牌范围.
+
+把标准范围写法（如"AKs, TT+, A5s-A2s"）解析为长度1326的权重数组，
+数组下标对应两张不同牌的全部组合（按牌id升序）.
+每个组合同时记录52位牌面掩码，阻断牌（已知公共牌、死牌、对手手牌）
+只需一次按位与即可从范围中剔除.
+
+支持的写法（以逗号分隔，可在末尾加":权重"，后出现的写法覆盖先前的权重）:
+    - 对子: "TT"、"TT+"（TT到AA）、"TT-66"
+    - 非对子: "AKs"（同花）、"AKo"（不同花）、"AK"（两者）
+    - 踢脚递增: "ATs+"（ATs到AKs）
+    - 踢脚区间: "A5s-A2s"
+    - 具体组合: "AhKh"
+"""
+
+import re
+from itertools import combinations
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ..deck.card import ALL_CARDS, Card
+from ..deck.card_set import CardSet
+from ..deck.types import Rank, Suit
+from ..eval.batch import CARD_BITS
+
+__all__ = ['COMBO_COUNT', 'COMBO_CARDS', 'COMBO_MASKS', 'combo_index', 'HandRange']
+
+# 两张不同牌的组合数
+COMBO_COUNT = 1326
+
+# 组合下标 -> 两张牌的id（升序） / 52位牌面掩码
+COMBO_CARDS = np.array(list(combinations(range(52), 2)), dtype=np.intp)
+COMBO_CARDS.flags.writeable = False
+COMBO_MASKS = CARD_BITS[COMBO_CARDS[:, 0]] | CARD_BITS[COMBO_CARDS[:, 1]]
+COMBO_MASKS.flags.writeable = False
+
+# 52x52的牌id对 -> 组合下标（对角线为-1）
+_COMBO_INDEX = np.full((52, 52), -1, dtype=np.intp)
+_COMBO_INDEX[COMBO_CARDS[:, 0], COMBO_CARDS[:, 1]] = np.arange(COMBO_COUNT)
+_COMBO_INDEX[COMBO_CARDS[:, 1], COMBO_CARDS[:, 0]] = np.arange(COMBO_COUNT)
+
+_RANK_CHARS = {
+    "2": Rank.TWO, "3": Rank.THREE, "4": Rank.FOUR, "5": Rank.FIVE,
+    "6": Rank.SIX, "7": Rank.SEVEN, "8": Rank.EIGHT, "9": Rank.NINE,
+    "T": Rank.TEN, "J": Rank.JACK, "Q": Rank.QUEEN, "K": Rank.KING, "A": Rank.ACE,
+}
+_SUIT_COUNT = len(Suit)
+
+_RANK = r"(10|[2-9TJQKA])"
+_HAND_CLASS = _RANK + _RANK + r"([SO]?)"
+_COMBO_PATTERN = re.compile(r"^" + _RANK + r"([HDCS])" + _RANK + r"([HDCS])$")
+_CLASS_PATTERN = re.compile(r"^" + _HAND_CLASS + r"(\+?)$")
+_SPAN_PATTERN = re.compile(r"^" + _HAND_CLASS + r"-" + _HAND_CLASS + r"$")
+
+
+def combo_index(card1: Card, card2: Card) -> int:
+    """
+    获取两张牌组成的组合下标.
+
+    Args:
+        card1: 第一张牌
+        card2: 第二张牌
+
+    Returns:
+        int: 0..1325之间的下标，与两张牌的顺序无关
+
+    Raises:
+        TypeError: 当参数不是Card类型时
+        ValueError: 当两张牌相同时
+    """
+    if not isinstance(card1, Card) or not isinstance(card2, Card):
+        raise TypeError("组合的两张牌必须是Card类型")
+    index = int(_COMBO_INDEX[card1.id, card2.id])
+    if index < 0:
+        raise ValueError(f"组合的两张牌不能相同: {card1}")
+    return index
+
+
+def _parse_rank(text: str) -> Rank:
+    """
+    解析点数字符.
+
+    Args:
+        text: 点数字符，"10"与"T"等价
+
+    Returns:
+        Rank: 点数
+    """
+    return _RANK_CHARS["T" if text == "10" else text]
+
+
+def _class_combos(high: Rank, low: Rank, suitedness: str) -> List[int]:
+    """
+    获取一个起手牌类别的全部组合下标.
+
+    Args:
+        high: 较大的点数
+        low: 较小的点数
+        suitedness: "S"同花、"O"不同花、""两者
+
+    Returns:
+        List[int]: 组合下标
+    """
+    indices = []
+    for suit1 in range(_SUIT_COUNT):
+        for suit2 in range(_SUIT_COUNT):
+            if high == low and suit2 <= suit1:
+                continue
+            if suitedness == "S" and suit1 != suit2:
+                continue
+            if suitedness == "O" and suit1 == suit2:
+                continue
+            indices.append(int(_COMBO_INDEX[suit1 * 13 + high - 2, suit2 * 13 + low - 2]))
+    return indices
+
+
+def _ordered_class(first: str, second: str, suitedness: str, token: str) -> Tuple[Rank, Rank]:
+    """
+    解析并校验起手牌类别的两个点数.
+
+    Args:
+        first: 第一个点数字符
+        second: 第二个点数字符
+        suitedness: 同花标记
+        token: 原始写法，用于错误信息
+
+    Returns:
+        Tuple[Rank, Rank]: (较大点数, 较小点数)
+
+    Raises:
+        ValueError: 当对子带有同花标记时
+    """
+    high, low = sorted((_parse_rank(first), _parse_rank(second)), reverse=True)
+    if high == low and suitedness:
+        raise ValueError(f"对子不能标记同花或不同花: {token}")
+    return high, low
+
+
+def _token_combos(token: str) -> List[int]:
+    """
+    解析单个范围写法.
+
+    Args:
+        token: 不含权重的范围写法
+
+    Returns:
+        List[int]: 组合下标
+
+    Raises:
+        ValueError: 当写法无效时
+    """
+    match = _COMBO_PATTERN.match(token)
+    if match:
+        rank1, suit1, rank2, suit2 = match.groups()
+        card1 = Card.from_str(("T" if rank1 == "10" else rank1) + suit1)
+        card2 = Card.from_str(("T" if rank2 == "10" else rank2) + suit2)
+        return [combo_index(card1, card2)]
+
+    match = _CLASS_PATTERN.match(token)
+    if match:
+        first, second, suitedness, plus = match.groups()
+        high, low = _ordered_class(first, second, suitedness, token)
+        if not plus:
+            return _class_combos(high, low, suitedness)
+        if high == low:
+            # TT+: TT到AA
+            return [i for rank in range(low, Rank.ACE + 1) for i in _class_combos(Rank(rank), Rank(rank), "")]
+        # ATs+: 踢脚从T递增到K
+        return [i for kicker in range(low, high) for i in _class_combos(high, Rank(kicker), suitedness)]
+
+    match = _SPAN_PATTERN.match(token)
+    if match:
+        first1, second1, suited1, first2, second2, suited2 = match.groups()
+        high1, low1 = _ordered_class(first1, second1, suited1, token)
+        high2, low2 = _ordered_class(first2, second2, suited2, token)
+        if high1 == low1 and high2 == low2:
+            # TT-66: 对子区间
+            start, stop = sorted((low1, low2))
+            return [i for rank in range(start, stop + 1) for i in _class_combos(Rank(rank), Rank(rank), "")]
+        if high1 != high2 or suited1 != suited2 or high1 == low1 or high2 == low2:
+            raise ValueError(f"区间两端必须是同一高牌、同一同花标记的起手牌: {token}")
+        start, stop = sorted((low1, low2))
+        return [i for kicker in range(start, stop + 1) for i in _class_combos(high1, Rank(kicker), suited1)]
+
+    raise ValueError(f"无效的范围写法: {token}")
+
+
+class HandRange:
+    """
+    长度1326的组合权重数组.
+
+    权重在0到1之间，0表示不在范围内. 实例不可变，阻断牌等操作返回新实例.
+
+    Examples:
+        >>> hand_range = HandRange.parse("AKs, TT+, A5s-A2s")
+        >>> hand_range.combo_count
+        50
+        >>> hand_range.blocked([Card.from_str("AH")]).combo_count
+        42
+    """
+
+    __slots__ = ('_weights',)
+
+    def __init__(self, weights: Optional[np.ndarray] = None) -> None:
+        """
+        从权重数组创建范围.
+
+        Args:
+            weights: 长度1326的权重数组，为None时创建空范围
+
+        Raises:
+            ValueError: 当数组形状或权重无效时
+        """
+        if weights is None:
+            array = np.zeros(COMBO_COUNT, dtype=np.float64)
+        else:
+            array = np.array(weights, dtype=np.float64)
+            if array.shape != (COMBO_COUNT,):
+                raise ValueError(f"权重数组的形状必须是({COMBO_COUNT},)，实际: {array.shape}")
+            if not np.isfinite(array).all() or array.min() < 0 or array.max() > 1:
+                raise ValueError("权重必须在0到1之间")
+        array.flags.writeable = False
+        self._weights = array
+
+    @classmethod
+    def parse(cls, text: str) -> 'HandRange':
+        """
+        解析范围写法.
+
+        Args:
+            text: 逗号分隔的范围写法，如"AKs, TT+, A5s-A2s, KQo:0.5"
+
+        Returns:
+            HandRange: 解析得到的范围
+
+        Raises:
+            TypeError: 当输入不是字符串时
+            ValueError: 当写法或权重无效时
+        """
+        if not isinstance(text, str):
+            raise TypeError(f"范围写法必须是字符串，实际: {type(text)}")
+        weights = np.zeros(COMBO_COUNT, dtype=np.float64)
+        for raw_token in text.split(","):
+            token = raw_token.strip()
+            if not token:
+                continue
+            weight = 1.0
+            if ":" in token:
+                token, weight_text = (part.strip() for part in token.split(":", 1))
+                try:
+                    weight = float(weight_text)
+                except ValueError:
+                    raise ValueError(f"无效的权重: {raw_token.strip()}") from None
+                if not 0 <= weight <= 1:
+                    raise ValueError(f"权重必须在0到1之间: {raw_token.strip()}")
+            weights[_token_combos(token.upper())] = weight
+        return cls(weights)
+
+    @classmethod
+    def from_combos(cls, combos: Iterable[Tuple[Card, Card]], weight: float = 1.0) -> 'HandRange':
+        """
+        从具体组合创建范围.
+
+        Args:
+            combos: (牌, 牌)序列
+            weight: 每个组合的权重
+
+        Returns:
+            HandRange: 范围
+
+        Raises:
+            TypeError: 当元素不是Card类型时
+            ValueError: 当组合或权重无效时
+        """
+        weights = np.zeros(COMBO_COUNT, dtype=np.float64)
+        for card1, card2 in combos:
+            weights[combo_index(card1, card2)] = weight
+        return cls(weights)
+
+    @property
+    def weights(self) -> np.ndarray:
+        """
+        获取只读的权重数组.
+
+        Returns:
+            np.ndarray: 长度1326的float64数组
+        """
+        return self._weights
+
+    @property
+    def combo_count(self) -> int:
+        """
+        获取权重大于0的组合数.
+
+        Returns:
+            int: 组合数
+        """
+        return int(np.count_nonzero(self._weights))
+
+    @property
+    def total_weight(self) -> float:
+        """
+        获取权重之和.
+
+        Returns:
+            float: 权重之和
+        """
+        return float(self._weights.sum())
+
+    def weight_of(self, card1: Card, card2: Card) -> float:
+        """
+        获取一个组合的权重.
+
+        Args:
+            card1: 第一张牌
+            card2: 第二张牌
+
+        Returns:
+            float: 权重
+        """
+        return float(self._weights[combo_index(card1, card2)])
+
+    def blocked(self, cards: Union[Iterable[Card], CardSet]) -> 'HandRange':
+        """
+        剔除与给定牌冲突的组合.
+
+        Args:
+            cards: 阻断牌，可以是CardSet或扑克牌序列
+
+        Returns:
+            HandRange: 新范围
+
+        Raises:
+            TypeError: 当元素不是Card类型时
+        """
+        card_set = cards if isinstance(cards, CardSet) else CardSet(cards)
+        if not card_set:
+            return self
+        weights = np.where(COMBO_MASKS & np.uint64(card_set.mask), 0.0, self._weights)
+        return HandRange(weights)
+
+    def combos(self) -> List[Tuple[Card, Card, float]]:
+        """
+        列出范围内的组合.
+
+        Returns:
+            List[Tuple[Card, Card, float]]: (牌, 牌, 权重)，按组合下标排序
+        """
+        return [
+            (ALL_CARDS[COMBO_CARDS[index, 0]], ALL_CARDS[COMBO_CARDS[index, 1]], float(self._weights[index]))
+            for index in np.flatnonzero(self._weights)
+        ]
+
+    def __len__(self) -> int:
+        """
+        返回权重大于0的组合数.
+
+        Returns:
+            int: 组合数
+        """
+        return self.combo_count
+
+    def __eq__(self, other: object) -> bool:
+        """
+        比较两个范围的权重是否完全相同.
+
+        Args:
+            other: 另一个对象
+
+        Returns:
+            bool: 权重相同时返回True
+        """
+        if not isinstance(other, HandRange):
+            return NotImplemented
+        return bool(np.array_equal(self._weights, other._weights))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        """
+        返回范围的详细字符串表示.
+
+        Returns:
+            str: 包含组合数和权重之和的描述
+        """
+        return f"HandRange(combos={self.combo_count}, weight={self.total_weight:.2f})"
@@ -0,0 +1,180 @@
+"""
+胜率计算的牌局输入.
+
+将玩家手牌、公共牌和死牌校验并转换为整数下标，
+预先累加每位玩家"手牌+已知公共牌"的点数键和牌面掩码，
+供蒙特卡洛抽样和穷举计算共用.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..deck.card import Card
+from ..deck.card_set import FULL_MASK, CardSet
+from ..eval.batch import CARD_BITS, CARD_RANK_KEYS
+from .types import EquityResult, PlayerEquity
+
+__all__ = ['EquitySpot', 'tally_strengths', 'build_equity_result']
+
+# 德州扑克公共牌总数
+BOARD_SIZE = 5
+
+
+@dataclass(frozen=True)
+class EquitySpot:
+    """
+    已校验的胜率计算输入.
+
+    Attributes:
+        player_ids: 玩家ID，顺序与各数组的第一维一致
+        hole_indices: 形状为(P, 2)的手牌下标
+        board_indices: 已知公共牌下标
+        remaining_indices: 可用于发剩余公共牌的牌下标（升序）
+        base_rank_keys: 形状为(P,)的"手牌+已知公共牌"点数键之和
+        base_bits: 形状为(P,)的"手牌+已知公共牌"牌面掩码
+    """
+
+    player_ids: Tuple[str, ...]
+    hole_indices: np.ndarray
+    board_indices: Tuple[int, ...]
+    remaining_indices: np.ndarray
+    base_rank_keys: np.ndarray
+    base_bits: np.ndarray
+
+    @property
+    def cards_to_come(self) -> int:
+        """
+        获取还需要发出的公共牌张数.
+
+        Returns:
+            int: 0-5
+        """
+        return BOARD_SIZE - len(self.board_indices)
+
+    @classmethod
+    def from_cards(cls, hole_cards: Dict[str, Union[Sequence[Card], CardSet]],
+                   board: Union[Sequence[Card], CardSet] = (),
+                   dead_cards: Union[Sequence[Card], CardSet] = ()) -> 'EquitySpot':
+        """
+        从扑克牌对象构建胜率计算输入.
+
+        重复检测和剩余牌计算都基于52位掩码.
+
+        Args:
+            hole_cards: 玩家ID -> 2张手牌（序列或CardSet）
+            board: 已知公共牌（0-5张）
+            dead_cards: 已知不会再出现的牌（如弃牌玩家亮出的牌）
+
+        Returns:
+            EquitySpot: 已校验的输入
+
+        Raises:
+            TypeError: 当输入类型无效时
+            ValueError: 当牌数不符合要求或存在重复的牌时
+        """
+        if not isinstance(hole_cards, dict):
+            raise TypeError(f"手牌必须是字典类型，实际: {type(hole_cards)}")
+        if len(hole_cards) < 2:
+            raise ValueError(f"至少需要2名玩家，实际: {len(hole_cards)}")
+        if len(board) > BOARD_SIZE:
+            raise ValueError(f"公共牌不能超过5张，实际: {len(board)}")
+
+        seen_mask = 0
+
+        def to_indices(cards: Iterable[Card], label: str) -> Tuple[int, ...]:
+            nonlocal seen_mask
+            indices = []
+            for card in cards:
+                if not isinstance(card, Card):
+                    raise TypeError(f"{label}必须是Card类型，实际: {type(card)}")
+                card_bit = 1 << card.id
+                if seen_mask & card_bit:
+                    raise ValueError(f"存在重复的牌: {card}")
+                seen_mask |= card_bit
+                indices.append(card.id)
+            return tuple(indices)
+
+        player_ids = tuple(hole_cards)
+        hole_rows = []
+        for player_id in player_ids:
+            cards = hole_cards[player_id]
+            if len(cards) != 2:
+                raise ValueError(f"玩家{player_id}的手牌必须是2张，实际: {len(cards)}")
+            hole_rows.append(to_indices(cards, f"玩家{player_id}的手牌"))
+        board_indices = to_indices(board, "公共牌")
+        to_indices(dead_cards, "死牌")
+
+        remaining = np.fromiter(CardSet.from_mask(FULL_MASK ^ seen_mask).ids(), dtype=np.intp)
+        if len(remaining) < BOARD_SIZE - len(board_indices):
+            raise ValueError(f"剩余牌数不足以发完公共牌: {len(remaining)}")
+
+        hole_indices = np.array(hole_rows, dtype=np.intp)
+        board_array = np.array(board_indices, dtype=np.intp)
+        board_key = int(CARD_RANK_KEYS[board_array].sum()) if board_indices else 0
+        board_bits = np.bitwise_or.reduce(CARD_BITS[board_array]) if board_indices else np.uint64(0)
+
+        base_rank_keys = CARD_RANK_KEYS[hole_indices].sum(axis=1) + board_key
+        base_bits = np.bitwise_or.reduce(CARD_BITS[hole_indices], axis=1) | board_bits
+
+        return cls(
+            player_ids=player_ids,
+            hole_indices=hole_indices,
+            board_indices=board_indices,
+            remaining_indices=remaining,
+            base_rank_keys=base_rank_keys,
+            base_bits=base_bits,
+        )
+
+
+def tally_strengths(strengths: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    统计每位玩家在一批发牌结果中的胜、平次数和底池权益.
+
+    Args:
+        strengths: 形状为(P, N)的强度键，N为发牌结果数
+
+    Returns:
+        Tuple: (独赢次数, 平分次数, 权益累计)，形状均为(P,)
+    """
+    best = strengths.max(axis=0)
+    is_best = strengths == best
+    winner_counts = is_best.sum(axis=0)
+    sole = winner_counts == 1
+    wins = (is_best & sole).sum(axis=1)
+    ties = (is_best & ~sole).sum(axis=1)
+    shares = (is_best / winner_counts).sum(axis=1)
+    return wins, ties, shares
+
+
+def build_equity_result(spot: EquitySpot, wins: np.ndarray, ties: np.ndarray,
+                        shares: np.ndarray, samples: int, exact: bool,
+                        elapsed: float) -> EquityResult:
+    """
+    将累计计数转换为EquityResult.
+
+    Args:
+        spot: 胜率计算输入
+        wins: 每位玩家的独赢次数
+        ties: 每位玩家的平分次数
+        shares: 每位玩家的权益累计
+        samples: 发牌结果总数
+        exact: 是否为穷举结果
+        elapsed: 计算耗时（秒）
+
+    Returns:
+        EquityResult: 计算结果
+    """
+    players = {}
+    for i, player_id in enumerate(spot.player_ids):
+        win = float(wins[i]) / samples
+        tie = float(ties[i]) / samples
+        players[player_id] = PlayerEquity(
+            player_id=player_id,
+            win=win,
+            tie=tie,
+            lose=max(0.0, 1.0 - win - tie),
+            equity=float(shares[i]) / samples,
+        )
+    return EquityResult(players=players, samples=samples, exact=exact, elapsed=elapsed)
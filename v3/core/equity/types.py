@@ -0,0 +1,144 @@
+"""
+胜率计算相关类型定义.
+
+定义玩家胜率、整体计算结果等数据结构.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+__all__ = ['PlayerEquity', 'EquityResult', 'RangeEquityResult']
+
+
+@dataclass(frozen=True)
+class PlayerEquity:
+    """
+    单个玩家的胜率统计.
+
+    Attributes:
+        player_id: 玩家ID
+        win: 独赢的比例
+        tie: 平分的比例
+        lose: 输掉的比例
+        equity: 底池权益（独赢计1，n人平分计1/n）
+    """
+
+    player_id: str
+    win: float
+    tie: float
+    lose: float
+    equity: float
+
+    def __post_init__(self) -> None:
+        """
+        验证胜率数据的有效性.
+
+        Raises:
+            ValueError: 当比例超出[0, 1]或三者之和不为1时
+        """
+        for name in ('win', 'tie', 'lose', 'equity'):
+            value = getattr(self, name)
+            if value < -1e-9 or value > 1 + 1e-9:
+                raise ValueError(f"{name}必须在0到1之间，实际: {value}")
+        if abs(self.win + self.tie + self.lose - 1.0) > 1e-9:
+            raise ValueError(f"胜、平、负比例之和必须为1，实际: {self.win + self.tie + self.lose}")
+
+
+@dataclass(frozen=True)
+class EquityResult:
+    """
+    一次胜率计算的结果.
+
+    Attributes:
+        players: 玩家ID -> 胜率统计
+        samples: 参与统计的发牌结果数量
+        exact: 是否为穷举得到的精确结果
+        elapsed: 计算耗时（秒）
+    """
+
+    players: Dict[str, PlayerEquity]
+    samples: int
+    exact: bool = False
+    elapsed: float = 0.0
+
+    def __post_init__(self) -> None:
+        """
+        验证计算结果的有效性.
+
+        Raises:
+            ValueError: 当没有玩家或样本数无效时
+        """
+        if not self.players:
+            raise ValueError("胜率结果必须包含至少一个玩家")
+        if self.samples <= 0:
+            raise ValueError(f"样本数必须为正数，实际: {self.samples}")
+
+    def equity_of(self, player_id: str) -> float:
+        """
+        获取玩家的底池权益.
+
+        Args:
+            player_id: 玩家ID
+
+        Returns:
+            float: 底池权益
+
+        Raises:
+            KeyError: 当玩家不在结果中时
+        """
+        return self.players[player_id].equity
+
+    def ranking(self) -> Tuple[str, ...]:
+        """
+        按底池权益从高到低排列玩家.
+
+        Returns:
+            Tuple[str, ...]: 玩家ID序列
+        """
+        return tuple(sorted(self.players, key=lambda p: self.players[p].equity, reverse=True))
+
+
+@dataclass(frozen=True)
+class RangeEquityResult:
+    """
+    一次范围对范围胜率计算的结果.
+
+    Attributes:
+        equity: 我方范围的底池权益（平分计1/2）
+        win: 我方独赢的加权比例
+        tie: 平分的加权比例
+        combo_equities: 长度1326的数组，我方每个组合对对方范围的权益，不参与计算的组合为NaN
+        samples: 参与统计的发牌结果数量
+        exact: 是否为穷举得到的精确结果
+        elapsed: 计算耗时（秒）
+    """
+
+    equity: float
+    win: float
+    tie: float
+    combo_equities: np.ndarray
+    samples: int
+    exact: bool = False
+    elapsed: float = 0.0
+
+    @property
+    def lose(self) -> float:
+        """
+        获取我方输掉的加权比例.
+
+        Returns:
+            float: 比例
+        """
+        return max(0.0, 1.0 - self.win - self.tie)
+
+    @property
+    def villain_equity(self) -> float:
+        """
+        获取对方范围的底池权益.
+
+        Returns:
+            float: 底池权益
+        """
+        return 1.0 - self.equity
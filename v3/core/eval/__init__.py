@@ -3,9 +3,43 @@
 
 提供HandEvaluator类和相关类型，实现牌型识别、比较和评估功能.
 遵循v3架构规范，支持严格的类型检查和完整的测试覆盖.
+翻牌前胜率通过预计算的查询表获取，无需调用评估器.
+CachedHandEvaluator以花色规范形式为键缓存评估结果.
+rank_showdown一次评估所有摊牌玩家并按牌力分层.
+analyze_draws分析听牌、补牌和提升概率.
 """
 
-from .types import HandRank, HandResult
+from .types import HandRank, HandResult, pack_strength, unpack_strength
 from .evaluator import HandEvaluator
+from .canonical import CanonicalForm, canonicalize, canonical_hand_key
+from .cache import CacheStats, LRUCache, CachedHandEvaluator
+from .showdown import ShowdownRanking, ShowdownTier, rank_showdown
+from .draws import DrawAnalysis, analyze_draws, straight_completions
+from .preflop import (
+    PreflopEquityTable, get_preflop_table, hand_class_index, hand_class_name, parse_hand_class,
+)
 
-__all__ = ['HandRank', 'HandResult', 'HandEvaluator'] 
\ No newline at end of file
+__all__ = [
+    'HandRank',
+    'HandResult',
+    'HandEvaluator',
+    'CanonicalForm',
+    'canonicalize',
+    'canonical_hand_key',
+    'CacheStats',
+    'LRUCache',
+    'CachedHandEvaluator',
+    'ShowdownTier',
+    'ShowdownRanking',
+    'rank_showdown',
+    'DrawAnalysis',
+    'analyze_draws',
+    'straight_completions',
+    'pack_strength',
+    'unpack_strength',
+    'PreflopEquityTable',
+    'get_preflop_table',
+    'hand_class_index',
+    'hand_class_name',
+    'parse_hand_class',
+]
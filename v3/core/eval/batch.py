@@ -0,0 +1,170 @@
+"""
+德州扑克批量牌型评估.
+
+基于NumPy在查找表上做向量化计算，一次调用评估成千上万手牌，
+用于胜率估算、AI训练和离线分析.
+
+牌的整数下标约定为 suit_index * 13 + (rank - 2)，
+花色顺序与Suit枚举定义顺序一致（红桃、方块、梅花、黑桃），
+与Deck生成整副牌的顺序相同.
+"""
+
+from typing import Sequence
+
+import numpy as np
+
+from ..deck.card import Card
+from ..deck.types import Rank, Suit
+from .lookup_tables import FLUSH_TABLE, RANK_KEYS, RANK_TABLE
+
+__all__ = [
+    'CARD_RANK_KEYS',
+    'CARD_BITS',
+    'card_to_index',
+    'cards_to_array',
+    'evaluate_batch',
+    'strengths_from_components',
+    'flush_strengths',
+    'rank_strengths',
+]
+
+# 52张牌 -> 点数键 / 52位牌面位
+CARD_RANK_KEYS = np.array(
+    [RANK_KEYS[rank] for _ in Suit for rank in Rank], dtype=np.int64
+)
+CARD_BITS = np.array([1 << index for index in range(52)], dtype=np.uint64)
+
+# 点数键（升序）及对应强度键，用于searchsorted查表
+_RANK_TABLE_KEYS = np.array(sorted(RANK_TABLE), dtype=np.int64)
+_RANK_TABLE_STRENGTHS = np.array(
+    [RANK_TABLE[key].strength for key in sorted(RANK_TABLE)], dtype=np.int32
+)
+
+# 13位同花掩码 -> 强度键（不足5张为0）
+_FLUSH_STRENGTHS = np.array(
+    [result.strength if result is not None else 0 for result in FLUSH_TABLE],
+    dtype=np.int32,
+)
+
+_SUIT_MASK = np.uint64(0x1FFF)
+
+
+def card_to_index(card: Card) -> int:
+    """
+    获取扑克牌的整数下标.
+
+    Args:
+        card: 扑克牌
+
+    Returns:
+        int: 0..51之间的下标，即Card.id
+    """
+    return card.id
+
+
+def cards_to_array(hands: Sequence[Sequence[Card]]) -> np.ndarray:
+    """
+    将多手牌转换为批量评估使用的下标数组.
+
+    Args:
+        hands: 手牌序列，每手牌的张数必须相同
+
+    Returns:
+        np.ndarray: 形状为(N, k)的uint8数组
+    """
+    return np.array(
+        [[card_to_index(card) for card in hand] for hand in hands], dtype=np.uint8
+    ).reshape(len(hands), -1)
+
+
+def evaluate_batch(card_indices: np.ndarray) -> np.ndarray:
+    """
+    批量评估多手牌的强度键.
+
+    Args:
+        card_indices: 形状为(N, k)的整数数组，k为5-7，每行是一手牌的下标
+
+    Returns:
+        np.ndarray: 形状为(N,)的int32强度键数组，与HandResult.strength一致
+
+    Raises:
+        TypeError: 当输入不是整数数组时
+        ValueError: 当数组形状、下标范围无效或同一手牌中有重复的牌时
+    """
+    cards = np.asarray(card_indices)
+    if cards.dtype.kind not in 'iu':
+        raise TypeError(f"牌下标必须是整数数组，实际: {cards.dtype}")
+    if cards.ndim != 2:
+        raise ValueError(f"牌下标数组必须是二维(N, k)，实际维度: {cards.ndim}")
+    if not 5 <= cards.shape[1] <= 7:
+        raise ValueError(f"每手牌必须是5-7张，实际: {cards.shape[1]}")
+    if cards.shape[0] == 0:
+        return np.zeros(0, dtype=np.int32)
+    if cards.min() < 0 or cards.max() > 51:
+        raise ValueError("牌下标必须在0..51之间")
+
+    cards = cards.astype(np.intp, copy=False)
+    sorted_cards = np.sort(cards, axis=1)
+    if (sorted_cards[:, 1:] == sorted_cards[:, :-1]).any():
+        raise ValueError("同一手牌中存在重复的牌")
+
+    rank_keys = CARD_RANK_KEYS[cards].sum(axis=1)
+    hand_bits = np.bitwise_or.reduce(CARD_BITS[cards], axis=1)
+    return strengths_from_components(rank_keys, hand_bits)
+
+
+def strengths_from_components(rank_keys: np.ndarray, hand_bits: np.ndarray) -> np.ndarray:
+    """
+    由点数键之和与52位牌面掩码计算强度键.
+
+    调用方可以增量累加公共部分（如手牌加已知公共牌）的点数键和掩码，
+    再叠加每种发牌结果，从而避免重复构建(N, k)数组.
+    调用方负责保证每手牌为5-7张且没有重复的牌.
+
+    Args:
+        rank_keys: 形状为(N,)的int64点数键之和
+        hand_bits: 形状为(N,)的uint64牌面掩码
+
+    Returns:
+        np.ndarray: 形状为(N,)的int32强度键数组
+    """
+    # 非同花：点数键在有序表中查找
+    positions = np.searchsorted(_RANK_TABLE_KEYS, rank_keys)
+    strengths = _RANK_TABLE_STRENGTHS[positions]
+    flushes = flush_strengths(hand_bits)
+    return np.where(flushes > 0, flushes, strengths)
+
+
+def flush_strengths(hand_bits: np.ndarray) -> np.ndarray:
+    """
+    由52位牌面掩码计算同花类牌型的强度键.
+
+    Args:
+        hand_bits: 任意形状的uint64牌面掩码，每手牌为5-7张且没有重复的牌
+
+    Returns:
+        np.ndarray: 同形状的int32强度键，不成同花的位置为0
+    """
+    # 按花色切出13位掩码查同花表，至多一种花色能达到5张
+    strengths = np.zeros(np.shape(hand_bits), dtype=np.int32)
+    for suit_index in range(4):
+        suit_masks = (hand_bits >> np.uint64(13 * suit_index)) & _SUIT_MASK
+        np.maximum(strengths, _FLUSH_STRENGTHS[suit_masks.astype(np.intp)], out=strengths)
+    return strengths
+
+
+def rank_strengths(rank_keys: np.ndarray) -> np.ndarray:
+    """
+    由点数键之和计算非同花牌型的强度键.
+
+    与strengths_from_components不同，这里允许无效的点数键（如同一点数超过4张），
+    便于调用方先对点数组合的网格整体查表，再丢弃不可能出现的组合.
+
+    Args:
+        rank_keys: 任意形状的int64点数键之和
+
+    Returns:
+        np.ndarray: 同形状的int32强度键，无效的点数键为0
+    """
+    positions = np.minimum(np.searchsorted(_RANK_TABLE_KEYS, rank_keys), len(_RANK_TABLE_KEYS) - 1)
+    return np.where(_RANK_TABLE_KEYS[positions] == rank_keys, _RANK_TABLE_STRENGTHS[positions], 0)
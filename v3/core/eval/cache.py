@@ -0,0 +1,271 @@
+"""
+评估结果缓存.
+
+提供容量有上限的LRU缓存和以花色规范形式为键的带缓存评估器.
+只相差花色置换的手牌牌型相同，因此可以共享同一条缓存记录.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Generic, Hashable, List, Optional, TypeVar, Union
+
+from ..deck.card import Card
+from ..deck.card_set import CardSet
+from .canonical import canonical_hand_key
+from .evaluator import HandEvaluator
+from .types import HandResult
+
+if TYPE_CHECKING:
+    import numpy as np
+
+__all__ = ['CacheStats', 'LRUCache', 'CachedHandEvaluator']
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+# 默认缓存容量
+DEFAULT_CACHE_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    缓存统计信息.
+
+    Attributes:
+        hits: 命中次数
+        misses: 未命中次数
+        size: 当前条目数
+        maxsize: 容量上限
+    """
+
+    hits: int
+    misses: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        获取命中率.
+
+        Returns:
+            float: 命中次数占查询次数的比例，尚无查询时为0
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class LRUCache(Generic[K, V]):
+    """
+    容量有上限的最近最少使用缓存.
+
+    Examples:
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache.put('a', 1)
+        >>> cache.get('a')
+        1
+        >>> cache.stats().hits
+        1
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        初始化缓存.
+
+        Args:
+            maxsize: 最大条目数
+
+        Raises:
+            ValueError: 当maxsize无效时
+        """
+        if maxsize < 1:
+            raise ValueError(f"缓存容量必须为正数，实际: {maxsize}")
+        self._maxsize = maxsize
+        self._entries: 'OrderedDict[K, V]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        查询缓存，命中时将条目标记为最近使用.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[V]: 缓存的值，未命中时返回None
+        """
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """
+        写入缓存，超出容量时淘汰最久未使用的条目.
+
+        Args:
+            key: 缓存键
+            value: 缓存值（不能为None）
+        """
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """清空缓存和统计计数."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> CacheStats:
+        """
+        获取缓存统计信息.
+
+        Returns:
+            CacheStats: 统计信息
+        """
+        return CacheStats(hits=self.hits, misses=self.misses,
+                          size=len(self._entries), maxsize=self._maxsize)
+
+    def __len__(self) -> int:
+        """
+        返回当前条目数.
+
+        Returns:
+            int: 条目数
+        """
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """
+        判断键是否在缓存中（不影响统计和使用顺序）.
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            bool: 在缓存中时返回True
+        """
+        return key in self._entries
+
+
+class CachedHandEvaluator:
+    """
+    带缓存的牌型评估器.
+
+    以花色规范键查询缓存，未命中时交给底层HandEvaluator评估.
+    输入无效（牌数不对、有重复的牌或类型错误）时不查缓存，直接由底层评估器报错.
+
+    Examples:
+        >>> evaluator = CachedHandEvaluator(maxsize=10000)
+        >>> result = evaluator.evaluate_hand(hole_cards, community_cards)
+        >>> evaluator.stats().hit_rate
+        0.0
+    """
+
+    def __init__(self, evaluator: Optional[HandEvaluator] = None,
+                 maxsize: int = DEFAULT_CACHE_SIZE) -> None:
+        """
+        初始化带缓存的评估器.
+
+        Args:
+            evaluator: 底层评估器，为None时创建新的HandEvaluator
+            maxsize: 缓存容量
+
+        Raises:
+            ValueError: 当maxsize无效时
+        """
+        self._evaluator = evaluator if evaluator is not None else HandEvaluator()
+        self._cache: LRUCache[int, HandResult] = LRUCache(maxsize)
+
+    def evaluate_hand(self, hole_cards: Union[List[Card], CardSet],
+                      community_cards: Union[List[Card], CardSet]) -> HandResult:
+        """
+        评估给定牌的最佳牌型，优先使用缓存.
+
+        Args:
+            hole_cards: 玩家手牌（必须是2张）
+            community_cards: 公共牌（最多5张）
+
+        Returns:
+            HandResult: 最佳牌型的评估结果
+
+        Raises:
+            TypeError: 当输入参数类型无效时
+            ValueError: 当牌数不符合要求或存在重复的牌时
+        """
+        key = self._cache_key(hole_cards, community_cards)
+        if key is None:
+            return self._evaluator.evaluate_hand(hole_cards, community_cards)
+
+        result = self._cache.get(key)
+        if result is None:
+            result = self._evaluator.evaluate_hand(hole_cards, community_cards)
+            self._cache.put(key, result)
+        return result
+
+    @staticmethod
+    def _cache_key(hole_cards: Union[List[Card], CardSet],
+                   community_cards: Union[List[Card], CardSet]) -> Optional[int]:
+        """
+        计算缓存键，输入不能直接评估时返回None.
+
+        Args:
+            hole_cards: 玩家手牌
+            community_cards: 公共牌
+
+        Returns:
+            Optional[int]: 规范键
+        """
+        if not isinstance(hole_cards, (list, CardSet)) or not isinstance(community_cards, (list, CardSet)):
+            return None
+        if len(hole_cards) != 2 or len(community_cards) > 5 or len(hole_cards) + len(community_cards) < 5:
+            return None
+        try:
+            return canonical_hand_key([*hole_cards, *community_cards])
+        except TypeError:
+            return None
+
+    def compare_hands(self, hand1: HandResult, hand2: HandResult) -> int:
+        """
+        比较两个牌型的强弱.
+
+        Args:
+            hand1: 第一个牌型
+            hand2: 第二个牌型
+
+        Returns:
+            int: 1表示hand1更强，-1表示hand2更强，0表示相等
+        """
+        return self._evaluator.compare_hands(hand1, hand2)
+
+    def evaluate_batch(self, card_indices: "np.ndarray") -> "np.ndarray":
+        """
+        批量评估多手牌的强度键（不经过缓存）.
+
+        Args:
+            card_indices: 形状为(N, k)的牌下标数组
+
+        Returns:
+            np.ndarray: 形状为(N,)的强度键数组
+        """
+        return self._evaluator.evaluate_batch(card_indices)
+
+    def stats(self) -> CacheStats:
+        """
+        获取缓存统计信息.
+
+        Returns:
+            CacheStats: 统计信息
+        """
+        return self._cache.stats()
+
+    def clear_cache(self) -> None:
+        """清空缓存和统计计数."""
+        self._cache.clear()
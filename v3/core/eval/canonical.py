@@ -0,0 +1,156 @@
+"""
+花色同构规范化.
+
+德州扑克中四种花色地位相同，只相差花色置换的牌局在策略上完全等价.
+本模块把"若干组牌"（如公共牌、各玩家手牌、死牌）按花色置换映射到唯一的规范形式，
+规范索引相同的牌局具有相同的评估结果和胜率，可以作为缓存键.
+
+做法是为每种花色计算签名：该花色在各组牌中的13位点数掩码组成的元组，
+按签名降序排列花色后依次打包，签名相同的花色可以互换，因此结果唯一.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Sequence, Tuple
+
+from ..deck.card import ALL_CARDS, Card
+
+__all__ = ['CanonicalForm', 'canonicalize', 'canonical_hand_key']
+
+_SUIT_COUNT = 4
+_RANK_COUNT = 13
+
+# 索引最低位记录分组数的宽度
+_COUNT_BITS = 8
+
+# 牌id -> 花色序号 / 花色内的点数位
+_SUIT_OF = tuple(card_id // _RANK_COUNT for card_id in range(52))
+_RANK_BIT_OF = tuple(1 << (card_id % _RANK_COUNT) for card_id in range(52))
+
+
+@dataclass(frozen=True)
+class CanonicalForm:
+    """
+    一组牌局的规范形式.
+
+    Attributes:
+        index: 规范索引，只相差花色置换的牌局索引相同
+        suit_order: 规范形式中第i个花色对应的原始花色序号（Suit枚举顺序）
+        card_count: 各组牌的总张数（含重复）
+        distinct_count: 各组牌合并后不同牌的张数
+    """
+
+    index: int
+    suit_order: Tuple[int, ...]
+    card_count: int
+    distinct_count: int
+
+    def map_card(self, card: Card) -> Card:
+        """
+        将原始牌映射为规范形式中的牌.
+
+        Args:
+            card: 原始牌
+
+        Returns:
+            Card: 花色替换后的牌
+        """
+        suit_index, rank_offset = divmod(card.id, _RANK_COUNT)
+        return ALL_CARDS[self.suit_order.index(suit_index) * _RANK_COUNT + rank_offset]
+
+    @property
+    def is_valid(self) -> bool:
+        """
+        检查各组牌之间是否没有重复的牌.
+
+        Returns:
+            bool: 没有重复的牌时返回True
+        """
+        return self.distinct_count == self.card_count
+
+
+def _suit_masks(cards: Iterable[Card]) -> Tuple[list, int]:
+    """
+    计算一组牌在四种花色上的点数掩码.
+
+    Args:
+        cards: 扑克牌
+
+    Returns:
+        Tuple: (四种花色的13位点数掩码, 牌数)
+
+    Raises:
+        TypeError: 当元素不是Card类型时
+    """
+    masks = [0, 0, 0, 0]
+    count = 0
+    for card in cards:
+        if card.__class__ is not Card:
+            raise TypeError(f"必须是Card类型，实际: {type(card)}")
+        card_id = card.id
+        masks[_SUIT_OF[card_id]] |= _RANK_BIT_OF[card_id]
+        count += 1
+    return masks, count
+
+
+def canonicalize(groups: Sequence[Iterable[Card]]) -> CanonicalForm:
+    """
+    计算若干组牌的规范形式.
+
+    组的顺序有意义（如公共牌、玩家1手牌、玩家2手牌、死牌），组内顺序无关.
+
+    Args:
+        groups: 牌组序列，最多255组
+
+    Returns:
+        CanonicalForm: 规范形式
+
+    Raises:
+        TypeError: 当元素不是Card类型时
+        ValueError: 当组数超过上限时
+    """
+    if len(groups) >= 1 << _COUNT_BITS:
+        raise ValueError(f"牌组数量过多: {len(groups)}")
+
+    group_masks = []
+    card_count = 0
+    union = [0, 0, 0, 0]
+    for group in groups:
+        masks, count = _suit_masks(group)
+        group_masks.append(masks)
+        card_count += count
+        union = [a | b for a, b in zip(union, masks)]
+
+    signatures = [tuple(masks[suit] for masks in group_masks) for suit in range(_SUIT_COUNT)]
+    suit_order = tuple(sorted(range(_SUIT_COUNT), key=signatures.__getitem__, reverse=True))
+
+    index = 0
+    for suit in suit_order:
+        for mask in signatures[suit]:
+            index = (index << _RANK_COUNT) | mask
+    index = (index << _COUNT_BITS) | len(groups)
+    return CanonicalForm(index=index, suit_order=suit_order, card_count=card_count,
+                         distinct_count=sum(mask.bit_count() for mask in union))
+
+
+def canonical_hand_key(cards: Iterable[Card]) -> Optional[int]:
+    """
+    计算单手牌（不区分手牌和公共牌）的规范键.
+
+    单手牌的牌型只取决于各花色的点数掩码，与花色名称无关，
+    因此把四个花色掩码排序后打包即可.
+
+    Args:
+        cards: 扑克牌
+
+    Returns:
+        Optional[int]: 52位规范键；有重复的牌时返回None
+
+    Raises:
+        TypeError: 当元素不是Card类型时
+    """
+    masks, count = _suit_masks(cards)
+    masks.sort(reverse=True)
+    key = (masks[0] << 39) | (masks[1] << 26) | (masks[2] << 13) | masks[3]
+    if key.bit_count() != count:
+        return None
+    return key
@@ -0,0 +1,367 @@
+"""
+听牌与补牌(outs)分析.
+
+给定玩家手牌和翻牌/转牌阶段的公共牌，找出能让牌型等级提升的每一张未知牌，
+并精确计算下一张牌和到河牌为止的提升概率.
+
+评估沿用查找表的增量编码：已知牌的点数键和四个花色掩码只计算一次，
+每张候选牌只做一次加法、一次按位或和一次查表. 翻牌时的转牌+河牌组合
+按点数对合并计数，不逐个组合评估. 牌集合用52位掩码表示，
+顺子听牌通过预计算的顺子掩码判断"只差一个点数"的窗口.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from ..deck.card import Card
+from ..deck.card_set import CardSet
+from .lookup_tables import (
+    CARD_RANK_BITS, CARD_RANK_KEYS, CARD_SUITS, FLUSH_TABLE, RANK_TABLE, STRAIGHT_MASKS,
+)
+from .types import HandRank, HandResult, pack_strength
+
+__all__ = ['DrawAnalysis', 'analyze_draws', 'straight_completions']
+
+# 强度键整除该值得到牌型等级（整数比HandRank做字典键快）
+_RANK_UNIT = pack_strength(1, 0)
+
+
+@dataclass(frozen=True)
+class DrawAnalysis:
+    """
+    听牌分析结果.
+
+    "提升"指最佳牌型的等级（HandRank）高于当前等级，同等级内变大不计入.
+
+    Attributes:
+        current: 当前最佳牌型
+        outs: 提升后的牌型等级 -> 下一张牌能达到该等级的牌
+        next_card_odds: 提升后的牌型等级 -> 下一张牌达到该等级的概率
+        river_odds: 提升后的牌型等级 -> 到河牌时最终为该等级的概率
+        unseen_count: 未知牌数量
+        flush_draw: 是否为同花听牌（差一张，且至少一张手牌参与）
+        backdoor_flush_draw: 是否为后门同花听牌（翻牌时差两张，且至少一张手牌参与）
+        open_ended_straight_draw: 是否有两个及以上的点数能完成顺子（含双卡顺）
+        gutshot: 是否只有一个点数能完成顺子
+    """
+
+    current: HandResult
+    outs: Dict[HandRank, CardSet]
+    next_card_odds: Dict[HandRank, float]
+    river_odds: Dict[HandRank, float]
+    unseen_count: int
+    flush_draw: bool
+    backdoor_flush_draw: bool
+    open_ended_straight_draw: bool
+    gutshot: bool
+
+    @property
+    def all_outs(self) -> CardSet:
+        """
+        获取所有能提升牌型等级的牌.
+
+        Returns:
+            CardSet: 补牌集合
+        """
+        mask = 0
+        for cards in self.outs.values():
+            mask |= cards.mask
+        return CardSet.from_mask(mask)
+
+    @property
+    def out_count(self) -> int:
+        """
+        获取补牌数量.
+
+        Returns:
+            int: 补牌张数
+        """
+        return sum(len(cards) for cards in self.outs.values())
+
+    @property
+    def next_card_probability(self) -> float:
+        """
+        获取下一张牌提升牌型等级的概率.
+
+        Returns:
+            float: 概率
+        """
+        return sum(self.next_card_odds.values())
+
+    @property
+    def river_probability(self) -> float:
+        """
+        获取到河牌时牌型等级已提升的概率.
+
+        Returns:
+            float: 概率
+        """
+        return sum(self.river_odds.values())
+
+
+def straight_completions(rank_mask: int) -> int:
+    """
+    找出能补成顺子的点数.
+
+    Args:
+        rank_mask: 13位点数掩码（第0位为2，第12位为A）
+
+    Returns:
+        int: 13位掩码，每一位表示加入该点数后可以组成顺子
+    """
+    completions = 0
+    for straight_mask in STRAIGHT_MASKS:
+        missing = straight_mask & ~rank_mask
+        if missing and not missing & (missing - 1):
+            completions |= missing
+    return completions
+
+
+def _collect_ids(cards: Iterable[Card], seen_mask: int, name: str) -> Tuple[List[int], int]:
+    """
+    校验一组牌并转换为牌id.
+
+    Args:
+        cards: 扑克牌
+        seen_mask: 已出现的牌的掩码
+        name: 用于错误信息的牌组名称
+
+    Returns:
+        Tuple: (牌id列表, 更新后的掩码)
+
+    Raises:
+        TypeError: 当元素不是Card类型时
+        ValueError: 当存在重复的牌时
+    """
+    card_ids = []
+    for card in cards:
+        if not isinstance(card, Card):
+            raise TypeError(f"{name}必须是Card类型，实际: {type(card)}")
+        card_id = card.id
+        if seen_mask >> card_id & 1:
+            raise ValueError(f"存在重复的牌: {card}")
+        seen_mask |= 1 << card_id
+        card_ids.append(card_id)
+    return card_ids, seen_mask
+
+
+def _flush_suit(masks: Sequence[int]) -> int:
+    """
+    找出已成同花的花色.
+
+    Args:
+        masks: 四个花色的点数掩码
+
+    Returns:
+        int: 花色序号，没有同花时返回-1
+    """
+    for suit, mask in enumerate(masks):
+        if mask.bit_count() >= 5:
+            return suit
+    return -1
+
+
+def _evaluate_with(rank_key: int, masks: Sequence[int], flush_suit: int, card_id: int) -> HandResult:
+    """
+    在已知牌上加一张牌后查表评估.
+
+    7张牌中成同花时不可能同时有四条或葫芦，因此同花表的结果即为最佳牌型.
+
+    Args:
+        rank_key: 已知牌的点数键
+        masks: 已知牌的四个花色掩码
+        flush_suit: 已知牌中已成同花的花色，没有时为-1
+        card_id: 新加入的牌id
+
+    Returns:
+        HandResult: 最佳牌型
+    """
+    suit = CARD_SUITS[card_id]
+    if flush_suit >= 0 and suit != flush_suit:
+        return FLUSH_TABLE[masks[flush_suit]]
+    suit_mask = masks[suit] | CARD_RANK_BITS[card_id]
+    if suit_mask.bit_count() >= 5:
+        return FLUSH_TABLE[suit_mask]
+    return RANK_TABLE[rank_key + CARD_RANK_KEYS[card_id]]
+
+
+def analyze_draws(hole_cards: Sequence[Card], board: Sequence[Card],
+                  dead_cards: Iterable[Card] = ()) -> DrawAnalysis:
+    """
+    分析玩家的听牌和补牌.
+
+    翻牌时精确枚举全部转牌+河牌组合计算河牌概率，转牌时河牌概率即下一张牌的概率.
+
+    Args:
+        hole_cards: 玩家手牌（必须是2张）
+        board: 公共牌（3或4张）
+        dead_cards: 已知不会再出现的牌
+
+    Returns:
+        DrawAnalysis: 分析结果
+
+    Raises:
+        TypeError: 当输入类型无效时
+        ValueError: 当牌数不符合要求或存在重复的牌时
+    """
+    if len(hole_cards) != 2:
+        raise ValueError(f"手牌必须是2张，实际: {len(hole_cards)}")
+    if len(board) not in (3, 4):
+        raise ValueError(f"公共牌必须是3或4张，实际: {len(board)}")
+
+    hole_ids, seen_mask = _collect_ids(hole_cards, 0, "手牌")
+    board_ids, seen_mask = _collect_ids(board, seen_mask, "公共牌")
+    _, seen_mask = _collect_ids(dead_cards, seen_mask, "死牌")
+    dead_mask = seen_mask
+    unseen = [card_id for card_id in range(52) if not dead_mask >> card_id & 1]
+
+    rank_key = 0
+    masks = [0, 0, 0, 0]
+    counts = [0, 0, 0, 0]
+    for card_id in hole_ids + board_ids:
+        rank_key += CARD_RANK_KEYS[card_id]
+        masks[CARD_SUITS[card_id]] |= CARD_RANK_BITS[card_id]
+        counts[CARD_SUITS[card_id]] += 1
+    flush_suit = _flush_suit(masks)
+    current = FLUSH_TABLE[masks[flush_suit]] if flush_suit >= 0 else RANK_TABLE[rank_key]
+    current_rank = current.rank
+
+    # 下一张牌
+    out_masks: Dict[HandRank, int] = {}
+    for card_id in unseen:
+        rank = _evaluate_with(rank_key, masks, flush_suit, card_id).rank
+        if rank > current_rank:
+            out_masks[rank] = out_masks.get(rank, 0) | (1 << card_id)
+    unseen_count = len(unseen)
+    next_card_odds = {
+        rank: mask.bit_count() / unseen_count for rank, mask in sorted(out_masks.items())
+    }
+
+    # 到河牌
+    if len(board_ids) == 4:
+        river_odds = dict(next_card_odds)
+    else:
+        river_odds = _river_odds(rank_key, masks, unseen, current_rank)
+
+    # 听牌类型
+    hole_suits = {CARD_SUITS[card_id] for card_id in hole_ids}
+    draw_suit_counts = [counts[suit] for suit in hole_suits]
+    flush_draw = current_rank < HandRank.FLUSH and 4 in draw_suit_counts
+    backdoor_flush_draw = (current_rank < HandRank.FLUSH and len(board_ids) == 3
+                           and not flush_draw and 3 in draw_suit_counts)
+
+    completions = 0
+    if current_rank < HandRank.STRAIGHT:
+        board_rank_mask = 0
+        for card_id in board_ids:
+            board_rank_mask |= CARD_RANK_BITS[card_id]
+        completions = (straight_completions(masks[0] | masks[1] | masks[2] | masks[3])
+                       & ~straight_completions(board_rank_mask))
+    completion_count = completions.bit_count()
+
+    return DrawAnalysis(
+        current=current,
+        outs={rank: CardSet.from_mask(mask) for rank, mask in sorted(out_masks.items())},
+        next_card_odds=next_card_odds,
+        river_odds=river_odds,
+        unseen_count=unseen_count,
+        flush_draw=flush_draw,
+        backdoor_flush_draw=backdoor_flush_draw,
+        open_ended_straight_draw=completion_count >= 2,
+        gutshot=completion_count == 1,
+    )
+
+
+def _river_odds(rank_key: int, masks: List[int], unseen: List[int],
+                current_rank: HandRank) -> Dict[HandRank, float]:
+    """
+    翻牌时精确计算转牌+河牌全部组合的最终牌型等级分布.
+
+    不成同花时牌型只取决于两张新牌的点数，因此按点数对查表一次，乘以该点数对的组合数；
+    13x13的点数对最多91次查表. 已知牌中某花色至少3张时，能凑满5张该花色的组合改按同花表计数：
+    两张都是该花色的组合逐个查表，只有一张是该花色的组合（已知4张时）按这张牌合并，
+    已知5张时其余组合都按已知的同花计数.
+
+    Args:
+        rank_key: 已知5张牌的点数键
+        masks: 已知5张牌的四个花色掩码
+        unseen: 未知牌id
+        current_rank: 当前牌型等级
+
+    Returns:
+        Dict[HandRank, float]: 提升后的牌型等级 -> 概率
+    """
+    # 未知牌中每个点数的张数（牌id除以13的余数即点数序号，CARD_RANK_KEYS[r]即该点数的点数键）
+    rank_counts = [0] * 13
+    for card_id in unseen:
+        rank_counts[card_id % 13] += 1
+
+    # 循环内频繁使用的表绑定为局部变量
+    rank_table, rank_keys, rank_unit = RANK_TABLE, CARD_RANK_KEYS, _RANK_UNIT
+    totals: Dict[int, int] = {}
+    grid = [[0] * 13 for _ in range(13)]
+    present = [(rank_index, count) for rank_index, count in enumerate(rank_counts) if count]
+    for index, (first, first_count) in enumerate(present):
+        first_key = rank_key + rank_keys[first]
+        first_grid = grid[first]
+        if first_count > 1:
+            rank = rank_table[first_key + rank_keys[first]].strength // rank_unit
+            first_grid[first] = rank
+            totals[rank] = totals.get(rank, 0) + first_count * (first_count - 1) // 2
+        for second, second_count in present[index + 1:]:
+            rank = rank_table[first_key + rank_keys[second]].strength // rank_unit
+            first_grid[second] = grid[second][first] = rank
+            totals[rank] = totals.get(rank, 0) + first_count * second_count
+
+    # 能凑成同花的组合：从点数对的计数中移出，改按同花表计数
+    for suit, mask in enumerate(masks):
+        known_count = mask.bit_count()
+        if known_count < 3:
+            continue
+        suited = [card_id % 13 for card_id in unseen if CARD_SUITS[card_id] == suit]
+        others = list(rank_counts)
+        for rank_index in suited:
+            others[rank_index] -= 1
+        flush_changes: Dict[int, int] = {}
+        for index, first in enumerate(suited):
+            first_mask = mask | CARD_RANK_BITS[first]
+            for second in suited[index + 1:]:
+                flush_rank = FLUSH_TABLE[first_mask | CARD_RANK_BITS[second]].strength // _RANK_UNIT
+                _move(flush_changes, grid[first][second], flush_rank, 1)
+            if known_count >= 4:
+                flush_rank = FLUSH_TABLE[first_mask].strength // _RANK_UNIT
+                for second, count in enumerate(others):
+                    if count:
+                        _move(flush_changes, grid[first][second], flush_rank, count)
+        if known_count >= 5:
+            flush_rank = FLUSH_TABLE[mask].strength // _RANK_UNIT
+            for first in range(13):
+                for second in range(first, 13):
+                    if first == second:
+                        combos = others[first] * (others[first] - 1) // 2
+                    else:
+                        combos = others[first] * others[second]
+                    if combos:
+                        _move(flush_changes, grid[first][second], flush_rank, combos)
+        for rank, change in flush_changes.items():
+            totals[rank] = totals.get(rank, 0) + change
+
+    combos = len(unseen) * (len(unseen) - 1) // 2
+    return {
+        HandRank(rank): count / combos for rank, count in sorted(totals.items()) if rank > current_rank and count
+    }
+
+
+def _move(changes: Dict[int, int], old_rank: int, new_rank: int, count: int) -> None:
+    """
+    把count个组合的计数从old_rank移到new_rank.
+
+    Args:
+        changes: 牌型等级 -> 计数变化
+        old_rank: 原牌型等级
+        new_rank: 新牌型等级
+        count: 组合数
+    """
+    if old_rank != new_rank:
+        changes[old_rank] = changes.get(old_rank, 0) - count
+        changes[new_rank] = changes.get(new_rank, 0) + count
@@ -0,0 +1,205 @@
+"""
+德州扑克牌型查找表.
+
+在模块导入时一次性构建点数表和同花表，使5/6/7张牌的评估
+不再需要枚举全部5张牌组合，只需一次字典查找或数组下标访问.
+
+编码方式:
+    - 点数键: 每张牌贡献 5**(rank-2)，一手牌的点数键即为各牌之和.
+      由于同一点数最多4张，五进制各位不会进位，点数多重集与键一一对应.
+    - 同花掩码: 每个花色维护一个13位点数掩码，某花色位数≥5即构成同花.
+      7张牌中若已有同花，则不可能同时组成四条或葫芦，因此同花表的结果即为最佳牌型.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from .types import HandRank, HandResult
+
+__all__ = [
+    'RANK_KEYS',
+    'RANK_BITS',
+    'RANK_TABLE',
+    'FLUSH_TABLE',
+    'STRAIGHT_MASKS',
+    'CARD_RANK_KEYS',
+    'CARD_SUITS',
+    'CARD_RANK_BITS',
+]
+
+# 点数2..14对应的五进制权重和位掩码（按点数值直接下标，0和1位置占位）
+RANK_KEYS: List[int] = [0, 0] + [5 ** i for i in range(13)]
+RANK_BITS: List[int] = [0, 0] + [1 << i for i in range(13)]
+
+# 顺子掩码，从A高到5高（A-2-3-4-5），值为顺子最高牌
+_STRAIGHT_MASKS: List[Tuple[int, int]] = [
+    (0b11111 << (high - 6), high) for high in range(14, 5, -1)
+] + [((1 << 12) | 0b1111, 5)]
+STRAIGHT_MASKS: Tuple[int, ...] = tuple(straight_mask for straight_mask, _ in _STRAIGHT_MASKS)
+
+# 牌id -> 点数键 / 花色序号 / 花色内点数位（牌id = 花色序号*13 + 点数-2）
+CARD_RANK_KEYS: Tuple[int, ...] = tuple(RANK_KEYS[card_id % 13 + 2] for card_id in range(52))
+CARD_SUITS: Tuple[int, ...] = tuple(card_id // 13 for card_id in range(52))
+CARD_RANK_BITS: Tuple[int, ...] = tuple(RANK_BITS[card_id % 13 + 2] for card_id in range(52))
+
+# 相同牌型结果的实例共享，避免为每个点数组合重复创建HandResult
+_RESULT_POOL: Dict[Tuple[HandRank, int, int, Tuple[int, ...]], HandResult] = {}
+
+
+def _intern(rank: HandRank, primary: int, secondary: int = 0,
+            kickers: Tuple[int, ...] = ()) -> HandResult:
+    """
+    获取共享的HandResult实例.
+
+    Args:
+        rank: 牌型等级
+        primary: 主要牌值
+        secondary: 次要牌值
+        kickers: 踢脚牌
+
+    Returns:
+        HandResult: 相同取值共享同一实例
+    """
+    key = (rank, primary, secondary, kickers)
+    result = _RESULT_POOL.get(key)
+    if result is None:
+        result = HandResult.from_trusted(rank, primary, secondary, kickers)
+        _RESULT_POOL[key] = result
+    return result
+
+
+def _straight_high(mask: int) -> int:
+    """
+    获取点数掩码中最大顺子的最高牌.
+
+    Args:
+        mask: 13位点数掩码
+
+    Returns:
+        int: 顺子最高牌，没有顺子时返回0
+    """
+    for straight_mask, high in _STRAIGHT_MASKS:
+        if mask & straight_mask == straight_mask:
+            return high
+    return 0
+
+
+# 13位点数掩码 -> 顺子最高牌（0表示没有顺子）
+STRAIGHT_HIGH: List[int] = [_straight_high(mask) for mask in range(1 << 13)]
+
+
+def _evaluate_flush_mask(mask: int) -> HandResult:
+    """
+    评估同一花色的点数掩码（至少5张）.
+
+    Args:
+        mask: 同花花色的13位点数掩码
+
+    Returns:
+        HandResult: 同花顺、皇家同花顺或同花
+    """
+    high = STRAIGHT_HIGH[mask]
+    if high == 14:
+        return _intern(HandRank.ROYAL_FLUSH, 14)
+    if high:
+        return _intern(HandRank.STRAIGHT_FLUSH, high)
+    ranks = tuple(rank for rank in range(14, 1, -1) if mask & RANK_BITS[rank])
+    return _intern(HandRank.FLUSH, ranks[0], 0, ranks[1:5])
+
+
+def _evaluate_rank_groups(quads: Tuple[int, ...], trips: Tuple[int, ...],
+                          pairs: Tuple[int, ...], singles: Tuple[int, ...],
+                          mask: int) -> HandResult:
+    """
+    评估不含同花的点数多重集（5-7张）.
+
+    各分组内的点数均按降序排列.
+
+    Args:
+        quads: 出现4次的点数
+        trips: 出现3次的点数
+        pairs: 出现2次的点数
+        singles: 出现1次的点数
+        mask: 出现过的点数掩码
+
+    Returns:
+        HandResult: 最佳5张牌的牌型
+    """
+    if quads:
+        kicker = max(trips[:1] + pairs[:1] + singles[:1])
+        return _intern(HandRank.FOUR_OF_A_KIND, quads[0], 0, (kicker,))
+
+    if trips and (len(trips) > 1 or pairs):
+        return _intern(HandRank.FULL_HOUSE, trips[0], max(trips[1:2] + pairs[:1]))
+
+    high = STRAIGHT_HIGH[mask]
+    if high:
+        return _intern(HandRank.STRAIGHT, high)
+
+    if trips:
+        return _intern(HandRank.THREE_OF_A_KIND, trips[0], 0, singles[:2])
+
+    if len(pairs) >= 2:
+        kicker = max(pairs[2:3] + singles[:1])
+        return _intern(HandRank.TWO_PAIR, pairs[0], pairs[1], (kicker,))
+
+    if pairs:
+        return _intern(HandRank.ONE_PAIR, pairs[0], 0, singles[:3])
+
+    return _intern(HandRank.HIGH_CARD, singles[0], 0, singles[1:5])
+
+
+def _build_rank_table() -> Dict[int, HandResult]:
+    """
+    构建点数表：从A到2逐个点数决定张数，枚举所有5/6/7张牌的点数多重集.
+
+    Returns:
+        Dict[int, HandResult]: 点数键 -> 最佳非同花牌型
+    """
+    table: Dict[int, HandResult] = {}
+    empty: Tuple[int, ...] = ()
+
+    def visit(rank: int, remaining: int, key: int, mask: int,
+              quads: Tuple[int, ...], trips: Tuple[int, ...],
+              pairs: Tuple[int, ...], singles: Tuple[int, ...]) -> None:
+        if remaining == 0:
+            table[key] = _evaluate_rank_groups(quads, trips, pairs, singles, mask)
+            return
+        if remaining > 4 * (rank - 1):
+            return
+        next_rank = rank - 1
+        rank_key = RANK_KEYS[rank]
+        rank_mask = mask | RANK_BITS[rank]
+        visit(next_rank, remaining, key, mask, quads, trips, pairs, singles)
+        visit(next_rank, remaining - 1, key + rank_key, rank_mask,
+              quads, trips, pairs, singles + (rank,))
+        if remaining >= 2:
+            visit(next_rank, remaining - 2, key + 2 * rank_key, rank_mask,
+                  quads, trips, pairs + (rank,), singles)
+        if remaining >= 3:
+            visit(next_rank, remaining - 3, key + 3 * rank_key, rank_mask,
+                  quads, trips + (rank,), pairs, singles)
+        if remaining >= 4:
+            visit(next_rank, remaining - 4, key + 4 * rank_key, rank_mask,
+                  quads + (rank,), trips, pairs, singles)
+
+    for card_count in (5, 6, 7):
+        visit(14, card_count, 0, 0, empty, empty, empty, empty)
+    return table
+
+
+def _build_flush_table() -> List[Optional[HandResult]]:
+    """
+    构建同花表：以13位点数掩码为下标.
+
+    Returns:
+        List[Optional[HandResult]]: 位数不足5的掩码对应None
+    """
+    table: List[Optional[HandResult]] = [None] * (1 << 13)
+    for mask in range(1 << 13):
+        if bin(mask).count("1") >= 5:
+            table[mask] = _evaluate_flush_mask(mask)
+    return table
+
+
+RANK_TABLE: Dict[int, HandResult] = _build_rank_table()
+FLUSH_TABLE: List[Optional[HandResult]] = _build_flush_table()
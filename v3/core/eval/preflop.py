@@ -0,0 +1,320 @@
+"""
+翻牌前胜率查询表.
+
+169种起手牌类别的单挑胜率矩阵和多人底池近似胜率在构建阶段一次性计算
+（见preflop_build模块），以紧凑的二进制文件随代码发布.
+查询时通过mmap按需映射文件，不依赖评估器，每次查询都是O(1)的下标访问.
+
+起手牌类别按13x13网格编号：行列都按A到2排列，
+对子在对角线上，同花在右上三角（行为大牌），非同花在左下三角（行为小牌）.
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+from ..deck.card import Card
+from ..deck.types import Rank
+
+__all__ = [
+    'HAND_CLASS_COUNT',
+    'PreflopEquityTable',
+    'hand_class_index',
+    'hand_class_name',
+    'parse_hand_class',
+    'get_preflop_table',
+]
+
+# 起手牌类别数量
+HAND_CLASS_COUNT = 169
+
+# 默认数据文件路径
+DEFAULT_TABLE_PATH = Path(__file__).with_name('data') / 'preflop_equity.bin'
+
+# 文件头：魔数、版本、类别数、最大对手数、保留字段、每个对局的样本数
+HEADER_FORMAT = '<4sHHHHI'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+MAGIC = b'PFEQ'
+VERSION = 1
+
+# 胜率以uint16定点数存储
+EQUITY_SCALE = 65535
+
+_RANK_CHARS = 'AKQJT98765432'
+_RANK_BY_CHAR = {char: 14 - i for i, char in enumerate(_RANK_CHARS)}
+
+HandClass = Union[int, str, Sequence[Card]]
+
+
+def _grid_position(rank: int) -> int:
+    """
+    获取点数在网格中的行列位置（A为0，2为12）.
+
+    Args:
+        rank: 点数值（2-14）
+
+    Returns:
+        int: 网格位置
+    """
+    return 14 - rank
+
+
+def hand_class_index(cards: Sequence[Card]) -> int:
+    """
+    获取两张手牌所属的起手牌类别编号.
+
+    Args:
+        cards: 2张手牌
+
+    Returns:
+        int: 类别编号（0-168）
+
+    Raises:
+        ValueError: 当手牌数量不为2或两张牌相同时
+        TypeError: 当手牌类型无效时
+    """
+    if len(cards) != 2:
+        raise ValueError(f"起手牌必须是2张，实际: {len(cards)}")
+    first, second = cards
+    if not isinstance(first, Card) or not isinstance(second, Card):
+        raise TypeError("起手牌必须是Card类型")
+    if first == second:
+        raise ValueError(f"起手牌不能重复: {first}")
+
+    high = _grid_position(max(first.rank.value, second.rank.value))
+    low = _grid_position(min(first.rank.value, second.rank.value))
+    if first.suit == second.suit:
+        return high * 13 + low
+    return low * 13 + high
+
+
+def hand_class_name(index: int) -> str:
+    """
+    获取起手牌类别的名称.
+
+    Args:
+        index: 类别编号（0-168）
+
+    Returns:
+        str: 如"AA"、"AKs"、"72o"
+
+    Raises:
+        ValueError: 当编号超出范围时
+    """
+    if not 0 <= index < HAND_CLASS_COUNT:
+        raise ValueError(f"起手牌类别编号必须在0-168之间，实际: {index}")
+    row, col = divmod(index, 13)
+    if row == col:
+        return _RANK_CHARS[row] * 2
+    if row < col:
+        return f"{_RANK_CHARS[row]}{_RANK_CHARS[col]}s"
+    return f"{_RANK_CHARS[col]}{_RANK_CHARS[row]}o"
+
+
+def parse_hand_class(name: str) -> int:
+    """
+    解析起手牌类别名称.
+
+    Args:
+        name: 如"AA"、"AKs"、"T9o"，点数可以用"10"表示T
+
+    Returns:
+        int: 类别编号（0-168）
+
+    Raises:
+        ValueError: 当名称格式无效时
+    """
+    if not isinstance(name, str):
+        raise TypeError(f"起手牌类别名称必须是字符串，实际: {type(name)}")
+    text = name.strip().upper().replace('10', 'T')
+    suffix = ''
+    if len(text) == 3:
+        text, suffix = text[:2], text[2]
+    if len(text) != 2 or any(char not in _RANK_BY_CHAR for char in text):
+        raise ValueError(f"无效的起手牌类别: {name}")
+
+    first, second = (_grid_position(_RANK_BY_CHAR[char]) for char in text)
+    high, low = min(first, second), max(first, second)
+    if high == low:
+        if suffix:
+            raise ValueError(f"对子不能指定同花或非同花: {name}")
+        return high * 13 + low
+    if suffix == 'S':
+        return high * 13 + low
+    if suffix == 'O':
+        return low * 13 + high
+    raise ValueError(f"非对子必须以s或o结尾: {name}")
+
+
+def _to_class_index(hand: HandClass) -> int:
+    """
+    将类别编号、类别名称或2张手牌统一转换为类别编号.
+
+    Args:
+        hand: 起手牌类别
+
+    Returns:
+        int: 类别编号
+    """
+    if isinstance(hand, int):
+        if not 0 <= hand < HAND_CLASS_COUNT:
+            raise ValueError(f"起手牌类别编号必须在0-168之间，实际: {hand}")
+        return hand
+    if isinstance(hand, str):
+        return parse_hand_class(hand)
+    return hand_class_index(hand)
+
+
+class PreflopEquityTable:
+    """
+    翻牌前胜率查询表.
+
+    数据文件通过只读mmap映射，创建表对象时只读取文件头，
+    胜率按需从映射内存中取出.
+
+    Attributes:
+        samples: 构建时每个对局的抽样次数
+        max_opponents: 多人近似胜率支持的最大对手数
+
+    Examples:
+        >>> table = get_preflop_table()
+        >>> round(table.heads_up('AA', 'KK'), 2)
+        0.82
+        >>> round(table.multiway('AKs', 3), 2)
+        0.5
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        """
+        映射数据文件.
+
+        Args:
+            path: 数据文件路径
+
+        Raises:
+            FileNotFoundError: 当文件不存在时
+            ValueError: 当文件格式无效时
+        """
+        self._path = Path(path)
+        with open(self._path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mmap) < HEADER_SIZE:
+            raise ValueError(f"胜率表文件过短: {self._path}")
+        magic, version, classes, max_opponents, _, samples = struct.unpack_from(
+            HEADER_FORMAT, self._mmap
+        )
+        if magic != MAGIC or version != VERSION or classes != HAND_CLASS_COUNT:
+            raise ValueError(f"无效的胜率表文件: {self._path}")
+        expected_size = HEADER_SIZE + 2 * HAND_CLASS_COUNT * (HAND_CLASS_COUNT + max_opponents)
+        if len(self._mmap) != expected_size:
+            raise ValueError(f"胜率表文件大小不符: {len(self._mmap)} != {expected_size}")
+
+        self.samples = samples
+        self.max_opponents = max_opponents
+        self._values = self._view_values()
+
+    def _view_values(self) -> Sequence[int]:
+        """
+        获取文件头之后的uint16数据视图.
+
+        Returns:
+            Sequence[int]: 先单挑矩阵、后多人近似的定点胜率
+        """
+        view = memoryview(self._mmap)[HEADER_SIZE:]
+        if sys.byteorder == 'little':
+            return view.cast('H')
+        # 大端平台上需要转换字节序，只能复制一份
+        values = array('H', view)
+        values.byteswap()
+        return values
+
+    @property
+    def path(self) -> Path:
+        """
+        获取数据文件路径.
+
+        Returns:
+            Path: 数据文件路径
+        """
+        return self._path
+
+    def heads_up(self, hero: HandClass, villain: HandClass) -> float:
+        """
+        查询单挑全下胜率.
+
+        Args:
+            hero: 己方起手牌（类别编号、类别名称或2张手牌）
+            villain: 对手起手牌
+
+        Returns:
+            float: 己方底池权益（平分计一半）
+        """
+        hero_index = _to_class_index(hero)
+        villain_index = _to_class_index(villain)
+        return self._values[hero_index * HAND_CLASS_COUNT + villain_index] / EQUITY_SCALE
+
+    def multiway(self, hero: HandClass, opponents: int) -> float:
+        """
+        查询对抗若干随机手牌时的近似胜率.
+
+        Args:
+            hero: 己方起手牌（类别编号、类别名称或2张手牌）
+            opponents: 对手人数
+
+        Returns:
+            float: 己方底池权益
+
+        Raises:
+            ValueError: 当对手人数超出范围时
+        """
+        if not 1 <= opponents <= self.max_opponents:
+            raise ValueError(f"对手人数必须在1-{self.max_opponents}之间，实际: {opponents}")
+        hero_index = _to_class_index(hero)
+        offset = HAND_CLASS_COUNT * HAND_CLASS_COUNT + hero_index * self.max_opponents
+        return self._values[offset + opponents - 1] / EQUITY_SCALE
+
+    def row(self, hero: HandClass) -> Tuple[float, ...]:
+        """
+        获取某个起手牌对所有类别的单挑胜率.
+
+        Args:
+            hero: 己方起手牌
+
+        Returns:
+            Tuple[float, ...]: 按类别编号排列的169个胜率
+        """
+        start = _to_class_index(hero) * HAND_CLASS_COUNT
+        return tuple(value / EQUITY_SCALE for value in self._values[start:start + HAND_CLASS_COUNT])
+
+    def close(self) -> None:
+        """释放内存映射."""
+        if isinstance(self._values, memoryview):
+            self._values.release()
+        self._mmap.close()
+
+
+_default_table: Optional[PreflopEquityTable] = None
+
+
+def get_preflop_table(path: Optional[Union[str, Path]] = None) -> PreflopEquityTable:
+    """
+    获取翻牌前胜率查询表.
+
+    未指定路径时首次调用映射随代码发布的默认文件，之后复用同一个对象.
+
+    Args:
+        path: 可选的数据文件路径
+
+    Returns:
+        PreflopEquityTable: 查询表
+    """
+    global _default_table
+    if path is not None:
+        return PreflopEquityTable(path)
+    if _default_table is None:
+        _default_table = PreflopEquityTable(DEFAULT_TABLE_PATH)
+    return _default_table
@@ -0,0 +1,256 @@
+"""
+翻牌前胜率表构建.
+
+对169x169的每个类别对局，在两个类别所有不冲突的具体组合中均匀抽取手牌，
+再随机发出5张公共牌，用批量评估统计胜率；多人近似胜率则是己方类别对抗
+1到max_opponents个随机手牌的底池权益. 结果写入preflop模块读取的二进制文件.
+
+使用方法:
+    python -m v3.core.eval.preflop_build
+    python -m v3.core.eval.preflop_build --samples 20000 --output table.bin
+"""
+
+import argparse
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+
+from .batch import CARD_BITS, CARD_RANK_KEYS, strengths_from_components
+from .preflop import (
+    DEFAULT_TABLE_PATH, EQUITY_SCALE, HAND_CLASS_COUNT, HEADER_FORMAT, MAGIC, VERSION,
+    hand_class_name,
+)
+
+__all__ = ['class_combos', 'build_heads_up_matrix', 'build_multiway_table', 'write_preflop_table']
+
+# 默认每个对局的抽样次数
+DEFAULT_SAMPLES = 10000
+
+# 默认最大对手数（9人桌）
+DEFAULT_MAX_OPPONENTS = 8
+
+# 公共牌张数
+BOARD_SIZE = 5
+
+
+def class_combos(index: int) -> np.ndarray:
+    """
+    列出起手牌类别的全部具体组合.
+
+    Args:
+        index: 类别编号（0-168）
+
+    Returns:
+        np.ndarray: 形状为(n, 2)的牌下标，对子6种、同花4种、非同花12种
+    """
+    row, col = divmod(index, 13)
+    high_rank = 12 - min(row, col)
+    low_rank = 12 - max(row, col)
+    combos = []
+    for first_suit in range(4):
+        for second_suit in range(4):
+            if row == col and second_suit <= first_suit:
+                continue
+            if row < col and second_suit != first_suit:
+                continue
+            if row > col and second_suit == first_suit:
+                continue
+            combos.append((first_suit * 13 + high_rank, second_suit * 13 + low_rank))
+    return np.array(combos, dtype=np.intp)
+
+
+def _hand_components(cards: np.ndarray):
+    """
+    计算每行牌的点数键之和与牌面掩码.
+
+    Args:
+        cards: 形状为(N, k)的牌下标
+
+    Returns:
+        Tuple: (点数键之和, 牌面掩码)
+    """
+    return CARD_RANK_KEYS[cards].sum(axis=1), np.bitwise_or.reduce(CARD_BITS[cards], axis=1)
+
+
+def _sample_boards(used: np.ndarray, count: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    为每行随机抽取不与已用牌冲突的公共牌.
+
+    Args:
+        used: 形状为(N, k)的已用牌下标
+        count: 每行抽取张数
+        rng: 随机数生成器
+
+    Returns:
+        np.ndarray: 形状为(N, count)的牌下标，顺序随机
+    """
+    keys = rng.random((len(used), 52))
+    np.put_along_axis(keys, used, 2.0, axis=1)
+    return np.argsort(keys, axis=1)[:, :count]
+
+
+def _heads_up_equity(hero_combos: np.ndarray, villain_combos: np.ndarray,
+                     samples: int, rng: np.random.Generator) -> float:
+    """
+    抽样估算两个类别之间的单挑胜率.
+
+    Args:
+        hero_combos: 己方类别的全部组合
+        villain_combos: 对手类别的全部组合
+        samples: 抽样次数
+        rng: 随机数生成器
+
+    Returns:
+        float: 己方底池权益
+    """
+    # 所有不冲突的组合对，保证按真实出现频率抽样
+    hero_rows, villain_rows = np.nonzero(
+        (hero_combos[:, None, :, None] != villain_combos[None, :, None, :]).all(axis=(2, 3))
+    )
+    picks = rng.integers(len(hero_rows), size=samples)
+    hero = hero_combos[hero_rows[picks]]
+    villain = villain_combos[villain_rows[picks]]
+
+    keys = rng.random((samples, 52))
+    np.put_along_axis(keys, hero, 2.0, axis=1)
+    np.put_along_axis(keys, villain, 2.0, axis=1)
+    board = np.argpartition(keys, BOARD_SIZE, axis=1)[:, :BOARD_SIZE]
+
+    board_keys, board_bits = _hand_components(board)
+    hero_keys, hero_bits = _hand_components(hero)
+    villain_keys, villain_bits = _hand_components(villain)
+    hero_strengths = strengths_from_components(hero_keys + board_keys, hero_bits | board_bits)
+    villain_strengths = strengths_from_components(villain_keys + board_keys, villain_bits | board_bits)
+    wins = np.count_nonzero(hero_strengths > villain_strengths)
+    ties = np.count_nonzero(hero_strengths == villain_strengths)
+    return (wins + 0.5 * ties) / samples
+
+
+def build_heads_up_matrix(samples: int = DEFAULT_SAMPLES, seed: Optional[int] = None,
+                          progress: bool = False) -> np.ndarray:
+    """
+    构建169x169单挑胜率矩阵.
+
+    只抽样计算上三角，下三角取互补值，对角线为0.5.
+
+    Args:
+        samples: 每个对局的抽样次数
+        seed: 随机种子
+        progress: 是否在标准错误输出打印进度
+
+    Returns:
+        np.ndarray: 形状为(169, 169)的胜率，[i, j]为类别i对类别j的权益
+    """
+    rng = np.random.default_rng(seed)
+    combos = [class_combos(index) for index in range(HAND_CLASS_COUNT)]
+    matrix = np.full((HAND_CLASS_COUNT, HAND_CLASS_COUNT), 0.5)
+    for hero in range(HAND_CLASS_COUNT):
+        for villain in range(hero + 1, HAND_CLASS_COUNT):
+            equity = _heads_up_equity(combos[hero], combos[villain], samples, rng)
+            matrix[hero, villain] = equity
+            matrix[villain, hero] = 1.0 - equity
+        if progress:
+            print(f"单挑矩阵: {hand_class_name(hero)} 完成 ({hero + 1}/{HAND_CLASS_COUNT})",
+                  file=sys.stderr)
+    return matrix
+
+
+def build_multiway_table(samples: int = DEFAULT_SAMPLES,
+                         max_opponents: int = DEFAULT_MAX_OPPONENTS,
+                         seed: Optional[int] = None) -> np.ndarray:
+    """
+    构建各类别对抗随机手牌的多人近似胜率.
+
+    Args:
+        samples: 每个类别、每个对手人数的抽样次数
+        max_opponents: 最大对手数
+        seed: 随机种子
+
+    Returns:
+        np.ndarray: 形状为(169, max_opponents)的胜率，[i, n-1]为类别i对抗n个对手的权益
+    """
+    rng = np.random.default_rng(seed)
+    table = np.zeros((HAND_CLASS_COUNT, max_opponents))
+    for index in range(HAND_CLASS_COUNT):
+        combos = class_combos(index)
+        for opponents in range(1, max_opponents + 1):
+            hero = combos[rng.integers(len(combos), size=samples)]
+            dealt = _sample_boards(hero, BOARD_SIZE + 2 * opponents, rng)
+            board = dealt[:, :BOARD_SIZE]
+            board_keys, board_bits = _hand_components(board)
+
+            strengths = np.empty((opponents + 1, samples), dtype=np.int32)
+            hero_keys, hero_bits = _hand_components(hero)
+            strengths[0] = strengths_from_components(hero_keys + board_keys, hero_bits | board_bits)
+            for seat in range(opponents):
+                start = BOARD_SIZE + 2 * seat
+                keys, bits = _hand_components(dealt[:, start:start + 2])
+                strengths[seat + 1] = strengths_from_components(keys + board_keys, bits | board_bits)
+
+            best = strengths.max(axis=0)
+            winners = (strengths == best).sum(axis=0)
+            table[index, opponents - 1] = float(((strengths[0] == best) / winners).sum()) / samples
+    return table
+
+
+def write_preflop_table(path: Union[str, Path], heads_up: np.ndarray,
+                        multiway: np.ndarray, samples: int) -> None:
+    """
+    将胜率写入二进制文件.
+
+    Args:
+        path: 输出路径
+        heads_up: 形状为(169, 169)的单挑胜率
+        multiway: 形状为(169, max_opponents)的多人近似胜率
+        samples: 每个对局的抽样次数
+
+    Raises:
+        ValueError: 当数组形状无效时
+    """
+    if heads_up.shape != (HAND_CLASS_COUNT, HAND_CLASS_COUNT):
+        raise ValueError(f"单挑矩阵形状必须为(169, 169)，实际: {heads_up.shape}")
+    if multiway.ndim != 2 or multiway.shape[0] != HAND_CLASS_COUNT:
+        raise ValueError(f"多人胜率形状必须为(169, n)，实际: {multiway.shape}")
+
+    header = struct.pack(HEADER_FORMAT, MAGIC, VERSION, HAND_CLASS_COUNT, multiway.shape[1], 0, samples)
+    values = np.concatenate([heads_up.ravel(), multiway.ravel()])
+    quantized = np.rint(np.clip(values, 0.0, 1.0) * EQUITY_SCALE).astype('<u2')
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'wb') as file:
+        file.write(header)
+        file.write(quantized.tobytes())
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    命令行入口.
+
+    Args:
+        argv: 命令行参数
+
+    Returns:
+        int: 退出码
+    """
+    parser = argparse.ArgumentParser(description="构建翻牌前胜率表")
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES, help="每个对局的抽样次数")
+    parser.add_argument('--max-opponents', type=int, default=DEFAULT_MAX_OPPONENTS, help="最大对手数")
+    parser.add_argument('--seed', type=int, default=2024, help="随机种子")
+    parser.add_argument('--output', type=Path, default=DEFAULT_TABLE_PATH, help="输出路径")
+    args = parser.parse_args(argv)
+
+    start_time = time.perf_counter()
+    heads_up = build_heads_up_matrix(args.samples, args.seed, progress=True)
+    multiway = build_multiway_table(args.samples, args.max_opponents, args.seed)
+    write_preflop_table(args.output, heads_up, multiway, args.samples)
+    print(f"已写入 {args.output}，耗时 {time.perf_counter() - start_time:.1f}秒", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+多人摊牌排名.
+
+一次评估所有摊牌玩家：公共牌的点数键和花色掩码只计算一次，
+每位玩家只在其上叠加两张手牌后查表. 结果按强度键分成从强到弱的层级，
+同一层级的玩家平分，边池只需用有资格的玩家与层级求交集即可确定赢家.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, Mapping, Sequence, Tuple
+
+from ..deck.card import Card
+from .lookup_tables import CARD_RANK_BITS, CARD_RANK_KEYS, CARD_SUITS, FLUSH_TABLE, RANK_TABLE
+from .types import HandResult
+
+__all__ = ['ShowdownTier', 'ShowdownRanking', 'rank_showdown']
+
+
+@dataclass(frozen=True)
+class ShowdownTier:
+    """
+    摊牌中牌力相同的一组玩家.
+
+    Attributes:
+        strength: 强度键
+        result: 牌型评估结果
+        player_ids: 该层级的玩家ID（按ID排序）
+    """
+
+    strength: int
+    result: HandResult
+    player_ids: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ShowdownRanking:
+    """
+    摊牌排名结果.
+
+    Attributes:
+        tiers: 从强到弱排列的层级
+        results: 玩家ID -> 牌型评估结果
+    """
+
+    tiers: Tuple[ShowdownTier, ...]
+    results: Dict[str, HandResult]
+
+    @classmethod
+    def from_results(cls, results: Mapping[str, HandResult]) -> 'ShowdownRanking':
+        """
+        由已有的评估结果构建排名.
+
+        Args:
+            results: 玩家ID -> 牌型评估结果
+
+        Returns:
+            ShowdownRanking: 排名结果
+        """
+        groups: Dict[int, list] = {}
+        for player_id, result in results.items():
+            groups.setdefault(result.strength, []).append(player_id)
+        tiers = tuple(
+            ShowdownTier(strength=strength, result=results[player_ids[0]],
+                         player_ids=tuple(sorted(player_ids)))
+            for strength, player_ids in sorted(groups.items(), reverse=True)
+        )
+        return cls(tiers=tiers, results=dict(results))
+
+    def winners_among(self, eligible_players: Iterable[str]) -> Tuple[str, ...]:
+        """
+        在有资格的玩家中找出牌力最强的玩家.
+
+        Args:
+            eligible_players: 有资格争夺某个底池的玩家ID
+
+        Returns:
+            Tuple[str, ...]: 赢家ID（按ID排序），没有玩家参与摊牌时为空
+        """
+        eligible = eligible_players if isinstance(eligible_players, (set, frozenset)) else set(eligible_players)
+        for tier in self.tiers:
+            winners = tuple(player_id for player_id in tier.player_ids if player_id in eligible)
+            if winners:
+                return winners
+        return ()
+
+    def tier_of(self, player_id: str) -> int:
+        """
+        获取玩家所在的层级序号.
+
+        Args:
+            player_id: 玩家ID
+
+        Returns:
+            int: 0表示最强
+
+        Raises:
+            KeyError: 当玩家不在排名中时
+        """
+        strength = self.results[player_id].strength
+        for index, tier in enumerate(self.tiers):
+            if tier.strength == strength:
+                return index
+        raise KeyError(player_id)
+
+
+def rank_showdown(hole_cards: Mapping[str, Sequence[Card]],
+                  board: Sequence[Card]) -> ShowdownRanking:
+    """
+    对所有摊牌玩家一次性排名.
+
+    Args:
+        hole_cards: 玩家ID -> 2张手牌
+        board: 公共牌（3-5张）
+
+    Returns:
+        ShowdownRanking: 从强到弱的层级和每位玩家的评估结果
+
+    Raises:
+        TypeError: 当输入类型无效时
+        ValueError: 当牌数不符合要求或存在重复的牌时
+    """
+    if len(board) > 5:
+        raise ValueError(f"公共牌不能超过5张，实际: {len(board)}")
+    if len(board) < 3:
+        raise ValueError(f"总牌数不足5张，无法评估: {len(board) + 2}")
+
+    seen_mask = 0
+    board_key = 0
+    board_masks = [0, 0, 0, 0]
+    for card in board:
+        if not isinstance(card, Card):
+            raise TypeError(f"公共牌必须是Card类型，实际: {type(card)}")
+        card_id = card.id
+        if seen_mask >> card_id & 1:
+            raise ValueError(f"存在重复的牌: {card}")
+        seen_mask |= 1 << card_id
+        board_key += CARD_RANK_KEYS[card_id]
+        board_masks[CARD_SUITS[card_id]] |= CARD_RANK_BITS[card_id]
+
+    results: Dict[str, HandResult] = {}
+    for player_id, cards in hole_cards.items():
+        if len(cards) != 2:
+            raise ValueError(f"玩家{player_id}的手牌必须是2张，实际: {len(cards)}")
+        rank_key = board_key
+        masks = board_masks.copy()
+        for card in cards:
+            if not isinstance(card, Card):
+                raise TypeError(f"玩家{player_id}的手牌必须是Card类型，实际: {type(card)}")
+            card_id = card.id
+            if seen_mask >> card_id & 1:
+                raise ValueError(f"存在重复的牌: {card}")
+            seen_mask |= 1 << card_id
+            rank_key += CARD_RANK_KEYS[card_id]
+            masks[CARD_SUITS[card_id]] |= CARD_RANK_BITS[card_id]
+
+        for mask in masks:
+            if mask.bit_count() >= 5:
+                results[player_id] = FLUSH_TABLE[mask]
+                break
+        else:
+            results[player_id] = RANK_TABLE[rank_key]
+
+    return ShowdownRanking.from_results(results)
@@ -4,7 +4,7 @@
 定义牌型等级、评估结果等核心数据结构.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import IntEnum
 from typing import Tuple
 
@@ -38,11 +38,16 @@ class HandResult:
     
     包含牌型等级、关键牌和踢脚牌信息，支持牌型比较.
     
+    每个结果携带打包后的整数强度键strength，按位依次为
+    牌型等级、主要牌值、次要牌值和最多4张踢脚牌（各占4位），
+    因此两手牌的强弱比较、排序和取最大值都只是整数运算.
+    
     Attributes:
         rank: 牌型等级
         primary_value: 主要牌值（如对子的点数）
         secondary_value: 次要牌值（如两对中较小的对子）
         kickers: 踢脚牌点数，按降序排列
+        strength: 打包的整数强度键，越大牌型越强
         
     Examples:
         >>> result = HandResult(HandRank.ONE_PAIR, 14, 0, (13, 12, 11))
@@ -50,12 +55,15 @@ class HandResult:
         <HandRank.ONE_PAIR: 2>
         >>> result.primary_value
         14
+        >>> result.strength > HandResult(HandRank.ONE_PAIR, 13, 0, (12, 11, 10)).strength
+        True
     """
 
     rank: HandRank
     primary_value: int
     secondary_value: int = 0
     kickers: Tuple[int, ...] = ()
+    strength: int = field(init=False, repr=False, compare=False)
 
     def __post_init__(self) -> None:
         """
@@ -78,6 +86,57 @@ class HandResult:
         for kicker in self.kickers:
             if kicker < 2 or kicker > 14:
                 raise ValueError(f"无效的踢脚牌值: {kicker}")
+        if len(self.kickers) > 4:
+            raise ValueError(f"踢脚牌不能超过4张，实际: {len(self.kickers)}")
+        
+        object.__setattr__(self, 'strength', pack_strength(
+            self.rank, self.primary_value, self.secondary_value, self.kickers
+        ))
+
+    @classmethod
+    def from_trusted(cls, rank: HandRank, primary_value: int, secondary_value: int = 0,
+                     kickers: Tuple[int, ...] = (), strength: int = -1) -> 'HandResult':
+        """
+        跳过校验直接构建评估结果.
+        
+        仅供评估器内部等已保证数据合法的热路径使用，不执行__post_init__校验.
+        
+        Args:
+            rank: 牌型等级
+            primary_value: 主要牌值
+            secondary_value: 次要牌值
+            kickers: 踢脚牌点数
+            strength: 已知的强度键，为负数时根据其他字段计算
+            
+        Returns:
+            HandResult: 评估结果
+        """
+        result = object.__new__(cls)
+        object.__setattr__(result, 'rank', rank)
+        object.__setattr__(result, 'primary_value', primary_value)
+        object.__setattr__(result, 'secondary_value', secondary_value)
+        object.__setattr__(result, 'kickers', kickers)
+        if strength < 0:
+            strength = pack_strength(rank, primary_value, secondary_value, kickers)
+        object.__setattr__(result, 'strength', strength)
+        return result
+
+    @classmethod
+    def from_strength(cls, strength: int) -> 'HandResult':
+        """
+        从强度键还原评估结果.
+        
+        Args:
+            strength: pack_strength生成的强度键
+            
+        Returns:
+            HandResult: 对应的评估结果
+            
+        Raises:
+            ValueError: 当强度键无效时
+        """
+        rank, primary_value, secondary_value, kickers = unpack_strength(strength)
+        return cls(rank, primary_value, secondary_value, kickers)
 
     def compare_to(self, other: 'HandResult') -> int:
         """
@@ -95,25 +154,10 @@ class HandResult:
         if not isinstance(other, HandResult):
             raise TypeError(f"比较对象必须是HandResult类型，实际: {type(other)}")
         
-        # 首先比较牌型等级
-        if self.rank != other.rank:
-            return 1 if self.rank > other.rank else -1
-        
-        # 牌型相同，比较主要牌值
-        if self.primary_value != other.primary_value:
-            return 1 if self.primary_value > other.primary_value else -1
-        
-        # 主要牌值相同，比较次要牌值
-        if self.secondary_value != other.secondary_value:
-            return 1 if self.secondary_value > other.secondary_value else -1
-        
-        # 比较踢脚牌
-        for my_kicker, other_kicker in zip(self.kickers, other.kickers):
-            if my_kicker != other_kicker:
-                return 1 if my_kicker > other_kicker else -1
-        
-        # 完全相同
-        return 0
+        # 强度键已按牌型等级、主要牌值、次要牌值、踢脚牌的优先级打包
+        if self.strength == other.strength:
+            return 0
+        return 1 if self.strength > other.strength else -1
 
     def __str__(self) -> str:
         """
@@ -148,4 +192,58 @@ class HandResult:
         elif self.rank in [HandRank.STRAIGHT, HandRank.STRAIGHT_FLUSH, HandRank.ROYAL_FLUSH]:
             return f"{rank_name}({Rank(self.primary_value).name}高)"
         else:
-            return rank_name 
\ No newline at end of file
+            return rank_name
+
+
+# 强度键各字段的位偏移
+_RANK_SHIFT = 24
+_PRIMARY_SHIFT = 20
+_SECONDARY_SHIFT = 16
+_KICKER_SHIFTS = (12, 8, 4, 0)
+
+
+def pack_strength(rank: int, primary_value: int, secondary_value: int = 0,
+                  kickers: Tuple[int, ...] = ()) -> int:
+    """
+    将牌型信息打包为单个整数强度键.
+    
+    踢脚牌左对齐，缺省位置为0，因此相同牌型下的逐张比较
+    等价于强度键的整数比较.
+    
+    Args:
+        rank: 牌型等级
+        primary_value: 主要牌值
+        secondary_value: 次要牌值
+        kickers: 踢脚牌点数（最多4张，降序）
+        
+    Returns:
+        int: 强度键，越大牌型越强
+    """
+    strength = (rank << _RANK_SHIFT) | (primary_value << _PRIMARY_SHIFT) | (secondary_value << _SECONDARY_SHIFT)
+    for kicker, shift in zip(kickers, _KICKER_SHIFTS):
+        strength |= kicker << shift
+    return strength
+
+
+def unpack_strength(strength: int) -> Tuple[HandRank, int, int, Tuple[int, ...]]:
+    """
+    将强度键拆解为牌型信息.
+    
+    Args:
+        strength: pack_strength生成的强度键
+        
+    Returns:
+        Tuple: (牌型等级, 主要牌值, 次要牌值, 踢脚牌)
+        
+    Raises:
+        ValueError: 当强度键中的牌型等级无效时
+    """
+    if strength < 0:
+        raise ValueError(f"无效的强度键: {strength}")
+    rank = HandRank(strength >> _RANK_SHIFT)
+    primary_value = (strength >> _PRIMARY_SHIFT) & 0xF
+    secondary_value = (strength >> _SECONDARY_SHIFT) & 0xF
+    kickers = tuple(
+        value for value in ((strength >> shift) & 0xF for shift in _KICKER_SHIFTS) if value
+    )
+    return rank, primary_value, secondary_value, kickers
@@ -5,6 +5,7 @@
 """
 
 from typing import Dict, Any, Set
+from ..deck.card_set import CardSet
 from ..snapshot.types import GameStateSnapshot
 from ..state_machine.types import GamePhase
 from .base_checker import BaseInvariantChecker
@@ -122,18 +123,11 @@ class PhaseConsistencyChecker(BaseInvariantChecker):
         if not snapshot.community_cards:
             return True  # 没有公共牌时无需检查
         
-        # 检查公共牌中是否有重复
-        seen_cards = set()
-        duplicate_cards = []
+        # 检查公共牌中是否有重复（基于52位掩码）
+        duplicate_set = CardSet.duplicates(snapshot.community_cards)
         
-        for card in snapshot.community_cards:
-            card_key = (card.suit, card.rank)
-            if card_key in seen_cards:
-                duplicate_cards.append(str(card))
-            else:
-                seen_cards.add(card_key)
-        
-        if duplicate_cards:
+        if duplicate_set:
+            duplicate_cards = [str(card) for card in duplicate_set]
             self._create_violation(
                 f"公共牌中存在重复牌: {', '.join(duplicate_cards)}",
                 'CRITICAL',
@@ -142,7 +136,7 @@ class PhaseConsistencyChecker(BaseInvariantChecker):
                     'duplicate_cards': duplicate_cards,
                     'community_cards': [str(card) for card in snapshot.community_cards],
                     'total_cards': len(snapshot.community_cards),
-                    'unique_cards': len(seen_cards)
+                    'unique_cards': len(CardSet(snapshot.community_cards))
                 }
             )
             return False
@@ -2,15 +2,18 @@
 边池管理模块
 
 提供边池计算、分配和管理功能。
+批量模拟牌局的向量化结算可以使用batch_settlement模块中基于NumPy的settle_batch.
 """
 
 from .pot_manager import PotManager, SidePot
 from .pot_calculator import PotCalculator
+from .side_pot_tracker import SidePotTracker
 from .pot_distributor import PotDistributor
 
 __all__ = [
     'PotManager',
     'SidePot',
     'PotCalculator',
+    'SidePotTracker',
     'PotDistributor'
 ] 
\ No newline at end of file
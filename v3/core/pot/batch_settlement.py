@@ -0,0 +1,127 @@
+"""
+批量底池结算
+
+一次结算N手模拟牌局，规则与PotManager.calculate_side_pots/distribute_pots一致：
+    - 按不同的下注额分层构建边池，每层的贡献者是下注额不低于该层的玩家（含已弃牌玩家）
+    - 每个边池由有资格且未弃牌的玩家中强度键最大者获得，强度相同则平分
+    - 无法整除的余数按玩家顺序（列顺序，对应PotManager中按玩家ID排序）从前往后每人1个筹码
+    - 没有未弃牌玩家有资格争夺的边池不分配，计入unclaimed
+
+做法是把每手牌的下注额升序排列，第k个下注额与前一个的差乘以下注额不低于它的人数即为第k层边池，
+相同的下注额对应金额为0的空层. 于是每手牌都是P层 x P名玩家的固定形状，
+全部N手牌可以在(N, P, P)的数组上一次向量化计算.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+__all__ = ['BatchSettlement', 'settle_batch']
+
+# 每批处理的手牌数，用于限制(N, P, P)中间数组的内存占用
+DEFAULT_CHUNK_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class BatchSettlement:
+    """
+    批量结算结果
+
+    Attributes:
+        payouts: 形状为(N, P)的每位玩家赢得的筹码
+        net: 形状为(N, P)的每位玩家净输赢（赢得的筹码减去下注额）
+        unclaimed: 形状为(N,)的未分配筹码
+    """
+
+    payouts: np.ndarray
+    net: np.ndarray
+    unclaimed: np.ndarray
+
+
+def settle_batch(contributions: np.ndarray, folded: np.ndarray, strengths: np.ndarray,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> BatchSettlement:
+    """
+    批量结算N手牌的底池
+
+    Args:
+        contributions: 形状为(N, P)的非负整数数组，每位玩家本手牌的总下注额
+        folded: 形状为(N, P)的布尔数组，True表示该玩家已弃牌
+        strengths: 形状为(N, P)的整数数组，每位玩家的强度键（HandResult.strength），弃牌玩家的值被忽略
+        chunk_size: 每批处理的手牌数
+
+    Returns:
+        BatchSettlement: 结算结果
+
+    Raises:
+        TypeError: 当数组类型无效时
+        ValueError: 当数组形状不一致、下注额为负数或chunk_size无效时
+    """
+    contributions = np.asarray(contributions)
+    folded = np.asarray(folded)
+    strengths = np.asarray(strengths)
+    if contributions.dtype.kind not in 'iu' or strengths.dtype.kind not in 'iu':
+        raise TypeError("下注额和强度键必须是整数数组")
+    if folded.dtype != np.bool_:
+        raise TypeError(f"弃牌标记必须是布尔数组，实际: {folded.dtype}")
+    if contributions.ndim != 2:
+        raise ValueError(f"下注额数组必须是二维(N, P)，实际维度: {contributions.ndim}")
+    if folded.shape != contributions.shape or strengths.shape != contributions.shape:
+        raise ValueError("下注额、弃牌标记和强度键的形状必须一致")
+    if contributions.size and contributions.min() < 0:
+        raise ValueError("下注额不能为负数")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size必须为正数，实际: {chunk_size}")
+
+    contributions = contributions.astype(np.int64, copy=False)
+    # 评估器产生的强度键都在int32范围内，用int32计算可以减少一半的内存带宽
+    if strengths.size == 0 or (strengths.min() >= np.iinfo(np.int32).min
+                               and strengths.max() <= np.iinfo(np.int32).max):
+        strengths = strengths.astype(np.int32, copy=False)
+    else:
+        strengths = strengths.astype(np.int64, copy=False)
+    hand_count = contributions.shape[0]
+    payouts = np.zeros(contributions.shape, dtype=np.int64)
+    unclaimed = np.zeros(hand_count, dtype=np.int64)
+    for begin in range(0, hand_count, chunk_size):
+        end = begin + chunk_size
+        payouts[begin:end], unclaimed[begin:end] = _settle_chunk(
+            contributions[begin:end], folded[begin:end], strengths[begin:end]
+        )
+    return BatchSettlement(payouts=payouts, net=payouts - contributions, unclaimed=unclaimed)
+
+
+def _settle_chunk(contributions: np.ndarray, folded: np.ndarray, strengths: np.ndarray):
+    """
+    结算一批手牌
+
+    Args:
+        contributions: 形状为(n, P)的下注额
+        folded: 形状为(n, P)的弃牌标记
+        strengths: 形状为(n, P)的强度键
+
+    Returns:
+        (形状为(n, P)的赢得筹码, 形状为(n,)的未分配筹码)
+    """
+    player_count = contributions.shape[1]
+
+    # 第k层：下注额升序后的第k个值，金额 = 与前一层的差 x 下注额不低于该层的人数
+    levels = np.sort(contributions, axis=1)
+    increments = np.diff(levels, axis=1, prepend=0)
+    pot_amounts = increments * np.arange(player_count, 0, -1)
+
+    # (n, 层, 玩家) 有资格争夺该层且未弃牌的玩家；空层金额为0，分到的筹码自然也是0
+    eligible = (contributions[:, None, :] >= levels[:, :, None]) & ~folded[:, None, :]
+
+    masked = np.where(eligible, strengths[:, None, :], np.iinfo(strengths.dtype).min)
+    best = masked.max(axis=2, keepdims=True)
+    winners = eligible & (masked == best)
+    winner_counts = winners.sum(axis=2, dtype=np.int64)
+
+    shares, remainders = np.divmod(pot_amounts, np.maximum(winner_counts, 1))
+    # 余数按列顺序分给排在前面的赢家，每人1个筹码
+    winner_order = np.cumsum(winners, axis=2, dtype=np.int16)
+    odd_chips = winners & (winner_order <= remainders[:, :, None])
+    payouts = np.einsum('nkj,nk->nj', winners, shares) + odd_chips.sum(axis=1)
+
+    unclaimed = np.where(winner_counts == 0, pot_amounts, 0).sum(axis=1)
+    return payouts, unclaimed
@@ -4,8 +4,9 @@
 提供边池计算的辅助功能。
 """
 
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from .pot_manager import SidePot
+from .side_pot_tracker import SidePotTracker
 
 __all__ = ['PotCalculator']
 
@@ -48,48 +49,56 @@ class PotCalculator:
         return contribution_levels
     
     @staticmethod
-    def calculate_pot_distribution_preview(player_bets: Dict[str, int]) -> Dict[str, List[str]]:
+    def calculate_pot_distribution_preview(player_bets: Dict[str, int],
+                                           tracker: Optional[SidePotTracker] = None) -> Dict[str, List[str]]:
         """
         预览边池分配（不实际创建边池）
         
+        牌局进行中传入GameContext.pot_tracker，跟踪器与下注记录一致时直接读取缓存的预览，
+        不一致或未提供时才从下注记录重新计算。
+        
         Args:
             player_bets: 玩家下注记录
+            tracker: 随下注增量更新的边池跟踪器
             
         Returns:
             边池预览 {pot_description: eligible_players}
         """
-        if not player_bets:
-            return {}
+        return PotCalculator.resolve_tracker(player_bets, tracker).preview()
+    
+    @staticmethod
+    def get_eligible_pot_ids(player_bets: Dict[str, int], player_id: str,
+                             tracker: Optional[SidePotTracker] = None) -> Tuple[str, ...]:
+        """
+        获取玩家有资格争夺的边池ID
         
-        sorted_bets = sorted(player_bets.items(), key=lambda x: x[1])
-        pot_preview = {}
+        Args:
+            player_bets: 玩家下注记录
+            player_id: 玩家ID
+            tracker: 随下注增量更新的边池跟踪器，与下注记录一致时直接读取
+            
+        Returns:
+            边池ID元组，玩家未下注时为空
+        """
+        return PotCalculator.resolve_tracker(player_bets, tracker).eligible_pot_ids(player_id)
+    
+    @staticmethod
+    def resolve_tracker(player_bets: Dict[str, int], tracker: Optional[SidePotTracker] = None) -> SidePotTracker:
+        """
+        返回与下注记录一致的边池跟踪器
         
-        previous_level = 0
-        remaining_players = set(player_bets.keys())
-        pot_index = 0
+        一次查询中需要多次读取边池时先调用本方法，再直接读取返回的跟踪器。
         
-        for i, (player_id, bet_amount) in enumerate(sorted_bets):
-            if bet_amount <= previous_level:
-                continue
-            
-            level_contribution = bet_amount - previous_level
-            pot_amount = level_contribution * len(remaining_players)
-            
-            if pot_amount > 0:
-                pot_name = f"主池" if pot_index == 0 else f"边池{pot_index}"
-                pot_description = f"{pot_name} ({pot_amount}筹码)"
-                pot_preview[pot_description] = list(remaining_players)
-                pot_index += 1
-            
-            # 移除当前玩家（如果他们全押了）
-            if i < len(sorted_bets) - 1:
-                next_bet = sorted_bets[i + 1][1]
-                if bet_amount < next_bet:
-                    remaining_players.discard(player_id)
+        Args:
+            player_bets: 玩家下注记录
+            tracker: 随下注增量更新的边池跟踪器
             
-            previous_level = bet_amount
-        
-        return pot_preview
+        Returns:
+            传入的跟踪器与下注记录一致时返回它本身，否则返回从下注记录重建的跟踪器
+        """
+        if tracker is not None and tracker.matches(player_bets):
+            return tracker
+        return SidePotTracker.from_bets(player_bets)
     
     @staticmethod
     def validate_bet_consistency(player_bets: Dict[str, int]) -> bool:
@@ -8,6 +8,7 @@ from typing import Dict, List, Optional, Set
 from dataclasses import dataclass
 from ..chips.chip_ledger import ChipLedger
 from ..eval.types import HandResult
+from ..eval.showdown import ShowdownRanking
 
 __all__ = ['PotManager', 'SidePot', 'PotDistributionResult']
 
@@ -81,34 +82,33 @@ class PotManager:
         self._side_pots.clear()
         self._pot_counter = 0
 
-        # 获取所有不重复的下注额，并排序
-        sorted_bet_levels = sorted(list(set(active_bets.values())))
-        
+        # 按下注额分组，从最高层级向下累积贡献者：下注额不低于某层级的玩家都对该层级有贡献
+        players_at_level: Dict[int, Set[str]] = {}
+        for player_id, bet in active_bets.items():
+            players_at_level.setdefault(bet, set()).add(player_id)
+        sorted_bet_levels = sorted(players_at_level)
+
+        contributors_by_level = []
+        contributors: Set[str] = set()
+        for level in reversed(sorted_bet_levels):
+            contributors = contributors | players_at_level[level]
+            contributors_by_level.append(contributors)
+        contributors_by_level.reverse()
+
         last_level = 0
-        
-        for i, level in enumerate(sorted_bet_levels):
-            # 找出所有下注额大于等于当前层级的玩家
-            # 这些玩家对当前层级的底池有贡献
-            contributors = {p for p, b in active_bets.items() if b >= level}
-            
+        for i, (level, contributors) in enumerate(zip(sorted_bet_levels, contributors_by_level)):
             # 计算当前层级的贡献额
-            contribution_per_player = level - last_level
-            pot_amount = contribution_per_player * len(contributors)
-            
-            if pot_amount > 0:
-                pot_id = f"pot_{self._pot_counter}"
-                self._pot_counter += 1
-                
-                side_pot = SidePot(
-                    pot_id=pot_id,
-                    amount=pot_amount,
-                    eligible_players=contributors,
-                    is_main_pot=(i == 0)
-                )
-                self._side_pots.append(side_pot)
-            
+            pot_amount = (level - last_level) * len(contributors)
+            pot_id = f"pot_{self._pot_counter}"
+            self._pot_counter += 1
+            self._side_pots.append(SidePot(
+                pot_id=pot_id,
+                amount=pot_amount,
+                eligible_players=contributors,
+                is_main_pot=(i == 0)
+            ))
             last_level = level
-            
+
         return self._side_pots.copy()
     
     def distribute_pots(self, side_pots: List[SidePot], player_hand_results: Dict[str, HandResult]) -> Dict[str, int]:
@@ -122,50 +122,42 @@ class PotManager:
         Returns:
             一个字典，包含每个获胜玩家及其赢得的总金额 {player_id: total_winnings}
         """
-        winnings = {player_id: 0 for player_id in player_hand_results.keys()}
+        return self.distribute_pots_by_ranking(side_pots, ShowdownRanking.from_results(player_hand_results))
+
+    def distribute_pots_by_ranking(self, side_pots: List[SidePot], ranking: ShowdownRanking) -> Dict[str, int]:
+        """
+        根据摊牌排名分配所有边池
+
+        每个边池的赢家是有资格的玩家与排名层级的第一个非空交集，
+        无需为每个边池重新比较手牌强度。
+
+        Args:
+            side_pots: 待分配的边池列表
+            ranking: 参与摊牌玩家的排名（由rank_showdown得到）
+
+        Returns:
+            一个字典，包含每个获胜玩家及其赢得的总金额 {player_id: total_winnings}
+        """
+        winnings = {player_id: 0 for player_id in ranking.results}
 
         # 通常边池是从主池开始，按顺序分配
         for pot in side_pots:
-            # 找出有资格争夺此底池且参与摊牌的玩家
-            eligible_players_in_showdown = [
-                p_id for p_id in pot.eligible_players if p_id in player_hand_results
-            ]
+            # 有资格争夺此底池且参与摊牌的玩家中排名最高的层级（已按ID排序）
+            pot_winners = ranking.winners_among(pot.eligible_players)
 
-            if not eligible_players_in_showdown:
+            if not pot_winners:
                 # 这种情况理论上不应该发生，但作为保护，跳过这个池
                 continue
 
-            # 在有资格的玩家中找到最好的手牌
-            best_hand_in_pot: Optional[HandResult] = None
-            for player_id in eligible_players_in_showdown:
-                hand_result = player_hand_results[player_id]
-                if best_hand_in_pot is None or hand_result.compare_to(best_hand_in_pot) > 0:
-                    best_hand_in_pot = hand_result
-
-            # 找到所有拥有这手最好牌的玩家（处理平分底池的情况）
-            if best_hand_in_pot is None:
-                continue
-                
-            pot_winners = [
-                player_id for player_id in eligible_players_in_showdown
-                if player_hand_results[player_id].compare_to(best_hand_in_pot) == 0
-            ]
-
-            # 在赢家之间分配底池金额
-            if pot_winners:
-                pot_amount = pot.amount
-                per_winner_amount = pot_amount // len(pot_winners)
-                remainder = pot_amount % len(pot_winners)
+            # 在赢家之间分配底池金额，余数按玩家ID顺序逐个分配以保证确定性
+            per_winner_amount, remainder = divmod(pot.amount, len(pot_winners))
+            for i, winner_id in enumerate(pot_winners):
+                win_amount = per_winner_amount
+                if i < remainder:
+                    win_amount += 1
 
-                # 为了确定性地分配余数，按玩家ID排序
-                sorted_pot_winners = sorted(pot_winners)
-                for i, winner_id in enumerate(sorted_pot_winners):
-                    win_amount = per_winner_amount
-                    if i < remainder:
-                        win_amount += 1
-                    
-                    if win_amount > 0:
-                        winnings[winner_id] = winnings.get(winner_id, 0) + win_amount
+                if win_amount > 0:
+                    winnings[winner_id] = winnings.get(winner_id, 0) + win_amount
 
         # 返回只包含有奖金的玩家
         return {p_id: amount for p_id, amount in winnings.items() if amount > 0}
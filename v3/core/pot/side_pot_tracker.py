@@ -0,0 +1,229 @@
+"""
+增量边池跟踪器
+
+在每次下注、全押时更新边池结构，而不是在摊牌时从头计算。
+"""
+
+import bisect
+from typing import Dict, FrozenSet, List, Mapping, Set, Tuple
+
+from .pot_manager import SidePot
+
+__all__ = ['SidePotTracker']
+
+
+class SidePotTracker:
+    """
+    增量边池跟踪器
+
+    维护每位玩家本手牌的总下注、升序的不同下注额层级以及每个层级上的玩家。
+    下注变化时只移动该玩家所在的层级，并重建一次边池列表；
+    边池、底池总额、玩家可争夺的边池和边池预览都是直接读取缓存结果。
+    边池的划分与PotManager.calculate_side_pots完全一致。
+    """
+
+    def __init__(self):
+        """初始化空的跟踪器"""
+        self._bets: Dict[str, int] = {}
+        self._levels: List[int] = []
+        self._players_at_level: Dict[int, Set[str]] = {}
+        self._total = 0
+        self._side_pots: Tuple[SidePot, ...] = ()
+        self._eligible_pot_ids: Dict[str, Tuple[str, ...]] = {}
+        self._preview: Dict[str, List[str]] = {}
+
+    @classmethod
+    def from_bets(cls, player_bets: Mapping[str, int]) -> 'SidePotTracker':
+        """
+        从下注记录创建跟踪器
+
+        Args:
+            player_bets: 玩家下注记录 {player_id: bet_amount}
+
+        Returns:
+            跟踪器
+        """
+        tracker = cls()
+        tracker.sync(player_bets)
+        return tracker
+
+    def add_bet(self, player_id: str, amount: int) -> None:
+        """
+        记录一次下注（跟注、加注、全押或盲注）
+
+        Args:
+            player_id: 玩家ID
+            amount: 本次新增的下注额
+
+        Raises:
+            ValueError: 当下注额为负数时
+        """
+        if amount < 0:
+            raise ValueError(f"下注额不能为负数: {amount}")
+        if amount == 0:
+            return
+        self._move(player_id, self._bets.get(player_id, 0) + amount)
+        self._rebuild()
+
+    def set_bet(self, player_id: str, total_bet: int) -> None:
+        """
+        设置玩家本手牌的总下注额
+
+        Args:
+            player_id: 玩家ID
+            total_bet: 总下注额
+
+        Raises:
+            ValueError: 当下注额为负数时
+        """
+        if total_bet < 0:
+            raise ValueError(f"下注额不能为负数: {total_bet}")
+        if self._bets.get(player_id, 0) == total_bet:
+            return
+        self._move(player_id, total_bet)
+        self._rebuild()
+
+    def sync(self, player_bets: Mapping[str, int]) -> None:
+        """
+        与外部下注记录同步，只移动下注额有变化的玩家
+
+        Args:
+            player_bets: 玩家下注记录 {player_id: bet_amount}
+
+        Raises:
+            ValueError: 当下注额为负数时
+        """
+        for total_bet in player_bets.values():
+            if total_bet < 0:
+                raise ValueError(f"下注额不能为负数: {total_bet}")
+        changed = False
+        for player_id in set(self._bets) | set(player_bets):
+            total_bet = player_bets.get(player_id, 0)
+            if self._bets.get(player_id, 0) != total_bet:
+                self._move(player_id, total_bet)
+                changed = True
+        if changed:
+            self._rebuild()
+
+    def reset(self) -> None:
+        """清空所有下注，开始新的一手牌"""
+        self._bets.clear()
+        self._levels.clear()
+        self._players_at_level.clear()
+        self._total = 0
+        self._side_pots = ()
+        self._eligible_pot_ids = {}
+        self._preview = {}
+
+    def matches(self, player_bets: Mapping[str, int]) -> bool:
+        """
+        检查跟踪器是否与外部下注记录一致
+
+        Args:
+            player_bets: 玩家下注记录
+
+        Returns:
+            一致时返回True
+        """
+        return self._bets == {p: b for p, b in player_bets.items() if b > 0}
+
+    @property
+    def total(self) -> int:
+        """底池总额"""
+        return self._total
+
+    def get_bet(self, player_id: str) -> int:
+        """
+        获取玩家本手牌的总下注额
+
+        Args:
+            player_id: 玩家ID
+
+        Returns:
+            总下注额
+        """
+        return self._bets.get(player_id, 0)
+
+    def side_pots(self) -> List[SidePot]:
+        """
+        获取当前的边池列表（主池在前）
+
+        Returns:
+            边池列表
+        """
+        return list(self._side_pots)
+
+    def eligible_pot_ids(self, player_id: str) -> Tuple[str, ...]:
+        """
+        获取玩家有资格争夺的边池ID
+
+        Args:
+            player_id: 玩家ID
+
+        Returns:
+            边池ID元组，玩家未下注时为空
+        """
+        return self._eligible_pot_ids.get(player_id, ())
+
+    def preview(self) -> Dict[str, List[str]]:
+        """
+        获取边池预览
+
+        Returns:
+            边池预览 {pot_description: eligible_players}，格式与PotCalculator一致
+        """
+        return {description: list(players) for description, players in self._preview.items()}
+
+    def _move(self, player_id: str, total_bet: int) -> None:
+        """
+        把玩家从原下注层级移到新层级
+
+        Args:
+            player_id: 玩家ID
+            total_bet: 新的总下注额
+        """
+        old_bet = self._bets.pop(player_id, 0)
+        if old_bet > 0:
+            players = self._players_at_level[old_bet]
+            players.discard(player_id)
+            if not players:
+                del self._players_at_level[old_bet]
+                del self._levels[bisect.bisect_left(self._levels, old_bet)]
+        if total_bet > 0:
+            self._bets[player_id] = total_bet
+            players = self._players_at_level.get(total_bet)
+            if players is None:
+                self._players_at_level[total_bet] = {player_id}
+                bisect.insort(self._levels, total_bet)
+            else:
+                players.add(player_id)
+        self._total += total_bet - old_bet
+
+    def _rebuild(self) -> None:
+        """按层级重建边池、玩家可争夺的边池和预览（每次下注变化只执行一次）"""
+        # 从最高层级向下累积贡献者：下注额不低于某层级的玩家都参与该层级的边池
+        contributors_by_level: List[FrozenSet[str]] = []
+        contributors: FrozenSet[str] = frozenset()
+        for level in reversed(self._levels):
+            contributors = contributors | self._players_at_level[level]
+            contributors_by_level.append(contributors)
+        contributors_by_level.reverse()
+
+        side_pots = []
+        eligible_pot_ids: Dict[str, List[str]] = {player_id: [] for player_id in self._bets}
+        preview: Dict[str, List[str]] = {}
+        last_level = 0
+        for index, (level, eligible) in enumerate(zip(self._levels, contributors_by_level)):
+            pot_id = f"pot_{index}"
+            amount = (level - last_level) * len(eligible)
+            side_pots.append(SidePot(pot_id=pot_id, amount=amount,
+                                     eligible_players=eligible, is_main_pot=index == 0))
+            for player_id in eligible:
+                eligible_pot_ids[player_id].append(pot_id)
+            pot_name = "主池" if index == 0 else f"边池{index}"
+            preview[f"{pot_name} ({amount}筹码)"] = sorted(eligible)
+            last_level = level
+
+        self._side_pots = tuple(side_pots)
+        self._eligible_pot_ids = {p: tuple(pot_ids) for p, pot_ids in eligible_pot_ids.items()}
+        self._preview = preview
@@ -13,10 +13,11 @@ Classes:
 """
 
 from .types import CorePermissibleActionsData, ActionConstraints
-from .action_logic import determine_permissible_actions
+from .action_logic import determine_permissible_actions, determine_permissible_actions_from_state
 
 __all__ = [
     'CorePermissibleActionsData',
     'ActionConstraints', 
-    'determine_permissible_actions'
+    'determine_permissible_actions',
+    'determine_permissible_actions_from_state'
 ] 
\ No newline at end of file
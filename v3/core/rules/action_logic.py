@@ -4,12 +4,12 @@
 实现德州扑克可用行动的判断逻辑。
 """
 
-from typing import List
+from typing import List, Any
 from v3.core.state_machine.types import GameContext, GamePhase
 from v3.core.betting.betting_types import BetType
 from v3.core.rules.types import CorePermissibleActionsData, ActionConstraints
 
-__all__ = ['determine_permissible_actions']
+__all__ = ['determine_permissible_actions', 'determine_permissible_actions_from_state']
 
 
 def determine_permissible_actions(game_context: GameContext, player_id: str) -> CorePermissibleActionsData:
@@ -33,17 +33,62 @@ def determine_permissible_actions(game_context: GameContext, player_id: str) ->
         raise ValueError(f"玩家 {player_id} 不在游戏中")
     
     player_data = game_context.players[player_id]
-    is_player_active = player_data.get('active', False)
-    player_chips = player_data.get('chips', 0)
-    player_current_bet = player_data.get('current_bet', 0)
+    return _determine_actions(
+        player_id,
+        is_player_active=player_data.get('active', False),
+        player_chips=player_data.get('chips', 0),
+        player_current_bet=player_data.get('current_bet', 0),
+        phase=game_context.current_phase,
+        current_bet=game_context.current_bet,
+        big_blind=game_context.big_blind
+    )
+
+
+def determine_permissible_actions_from_state(state: Any, player_id: str) -> CorePermissibleActionsData:
+    """
+    根据快照形式的游戏状态确定玩家的可用行动
+    
+    state可以是GameStateSnapshot或GameStateView，玩家的筹码取快照中的筹码（来自ChipLedger），
+    是否活跃取is_active（在游戏中且未弃牌）。
+    
+    Args:
+        state: 具有GameStateSnapshot属性的游戏状态
+        player_id: 玩家ID
+        
+    Returns:
+        核心层可用行动数据
+        
+    Raises:
+        ValueError: 当玩家不存在或参数无效时
+    """
+    if not player_id:
+        raise ValueError("player_id不能为空")
     
+    player = state.get_player_by_id(player_id)
+    if player is None:
+        raise ValueError(f"玩家 {player_id} 不在游戏中")
+    
+    return _determine_actions(
+        player_id,
+        is_player_active=player.is_active,
+        player_chips=player.chips,
+        player_current_bet=player.current_bet,
+        phase=state.phase,
+        current_bet=state.current_bet,
+        big_blind=state.big_blind_amount
+    )
+
+
+def _determine_actions(player_id: str, is_player_active: bool, player_chips: int, player_current_bet: int,
+                       phase: GamePhase, current_bet: int, big_blind: int) -> CorePermissibleActionsData:
+    """根据玩家和牌桌的状态确定可用行动"""
     # 非活跃玩家没有可用行动
     if not is_player_active:
         return CorePermissibleActionsData(
             player_id=player_id,
             available_bet_types=[],
             constraints=ActionConstraints(
-                big_blind_amount=game_context.big_blind
+                big_blind_amount=big_blind
             ),
             player_chips=player_chips,
             is_player_active=False,
@@ -51,22 +96,20 @@ def determine_permissible_actions(game_context: GameContext, player_id: str) ->
         )
     
     # 只有在下注阶段才有行动
-    if game_context.current_phase not in [GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER]:
+    if phase not in [GamePhase.PRE_FLOP, GamePhase.FLOP, GamePhase.TURN, GamePhase.RIVER]:
         return CorePermissibleActionsData(
             player_id=player_id,
             available_bet_types=[BetType.FOLD],  # 活跃玩家至少能弃牌
             constraints=ActionConstraints(
-                big_blind_amount=game_context.big_blind
+                big_blind_amount=big_blind
             ),
             player_chips=player_chips,
             is_player_active=True,
-            reasoning=f"当前阶段 {game_context.current_phase.name} 不允许玩家行动"
+            reasoning=f"当前阶段 {phase.name} 不允许玩家行动"
         )
     
     # 计算行动约束
-    current_bet = game_context.current_bet
     call_amount = max(0, current_bet - player_current_bet)
-    big_blind = game_context.big_blind
     
     # 计算加注范围
     min_raise_amount = current_bet + big_blind  # 最小加注到当前下注 + 大盲注
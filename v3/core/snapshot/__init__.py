@@ -12,6 +12,9 @@ Classes:
     PotSnapshot: 奖池状态快照
     SnapshotMetadata: 快照元数据
     SnapshotManager: 快照管理器
+    SnapshotHistory: 增量编码的单游戏快照历史
+    SnapshotArchive: 只追加的带索引快照归档文件
+    GameStateView: 实时游戏上下文的只读视图
     SnapshotSerializer: 快照序列化器
 """
 
@@ -22,12 +25,27 @@ from .types import (
     GameStateSnapshot,
     SnapshotMetadata
 )
+from .state_view import (
+    GameStateView,
+    PlayerStateView
+)
+from .snapshot_history import (
+    SnapshotHistory,
+    SnapshotDelta
+)
 from .snapshot_manager import (
     SnapshotManager,
+    SnapshotHistoryMode,
+    SnapshotPartitionInfo,
     SnapshotCreationError,
     SnapshotRestoreError,
     get_snapshot_manager
 )
+from .snapshot_archive import (
+    SnapshotArchive,
+    ArchiveEntry,
+    SnapshotArchiveError
+)
 from .serializer import (
     SnapshotSerializer,
     SerializationError,
@@ -42,8 +60,16 @@ __all__ = [
     'GameStateSnapshot',
     'SnapshotMetadata',
     
+    # 只读视图
+    'GameStateView',
+    'PlayerStateView',
+    
     # 快照管理器
     'SnapshotManager',
+    'SnapshotHistoryMode',
+    'SnapshotPartitionInfo',
+    'SnapshotHistory',
+    'SnapshotDelta',
     'get_snapshot_manager',
     'SnapshotCreationError',
     'SnapshotRestoreError',
@@ -51,5 +77,10 @@ __all__ = [
     # 序列化器
     'SnapshotSerializer',
     'SerializationError',
-    'DeserializationError'
+    'DeserializationError',
+    
+    # 归档
+    'SnapshotArchive',
+    'ArchiveEntry',
+    'SnapshotArchiveError'
 ] 
\ No newline at end of file
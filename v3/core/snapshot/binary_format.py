@@ -0,0 +1,300 @@
+"""
+快照二进制格式
+
+把GameStateSnapshot编码为紧凑的版本化二进制格式，与JSON格式一一对应、可以精确往返。
+
+格式：
+    固定头部：魔数b"TXSS"(4字节) | 格式版本(uint8) | 标志位(uint8) | 负载长度(uint32)
+    负载：标志位含FLAG_COMPRESSED时为zlib压缩后的正文，否则为正文本身
+
+正文依次为：
+    字符串表    长度(uint32) + UTF-8的JSON字符串数组；快照中的所有字符串（ID、名称、描述、
+                最后行动、边池和交易元数据的JSON）去重后各存一次，其余部分按序号引用
+    快照字段    固定宽度结构（_SNAPSHOT），公共牌为5个单字节牌id
+    玩家        每人一个固定宽度结构（_PLAYER），手牌为2个单字节牌id
+    边池        字符串序号数组
+    有资格玩家  字符串序号数组
+    交易        每笔一个固定宽度结构（_TRANSACTION）
+
+扑克牌为牌id（0..51），未使用的牌位填0xFF；枚举为单字节序号；
+可选字符串的序号加1，0表示None；可选位置用-1表示None。
+所有数值均为小端序。固定宽度字段中的大量零字节和重复的字符串前缀由zlib压缩消除，
+解码时每类记录只需一次struct解包，字符串表只需一次json.loads。
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .types import (
+    GameStateSnapshot, PlayerSnapshot, PotSnapshot, SnapshotMetadata,
+    SnapshotVersion
+)
+from ..state_machine.types import GamePhase
+from ..deck.card import Card, ALL_CARDS
+from ..chips.chip_transaction import ChipTransaction, TransactionType
+
+__all__ = [
+    'BINARY_MAGIC', 'BINARY_FORMAT_VERSION', 'FLAG_COMPRESSED',
+    'encode_snapshot', 'decode_snapshot'
+]
+
+# 魔数
+BINARY_MAGIC = b"TXSS"
+
+# 二进制格式版本，格式变化时递增
+BINARY_FORMAT_VERSION = 1
+
+# 标志位：负载经过zlib压缩
+FLAG_COMPRESSED = 1
+
+_HEADER = struct.Struct('<4sBBI')
+_LENGTH = struct.Struct('<I')
+
+# 版本、阶段、创建时间、持续时间、手牌编号、快照ID、描述(可选)、游戏ID、
+# 当前下注、庄家/小盲/大盲/行动玩家位置、小盲/大盲金额、公共牌数、公共牌、
+# 玩家数、主池、总奖池、边池数、有资格玩家数、交易数
+_SNAPSHOT = struct.Struct('<BBddQIIIQiiiiQQB5sIQQIII')
+
+# 玩家ID、名称、最后行动(可选)、筹码、位置、标志、手牌数、手牌、当前下注、本手总下注
+_PLAYER = struct.Struct('<IIIQiBB2sQQ')
+
+# 交易ID、类型、玩家ID、数量、时间戳、描述、元数据JSON(可选)
+_TRANSACTION = struct.Struct('<IBIQdII')
+
+# 枚举 <-> 单字节序号，只能在末尾追加新成员
+_PHASES: Tuple[GamePhase, ...] = tuple(GamePhase)
+_PHASE_CODES: Dict[GamePhase, int] = {phase: i for i, phase in enumerate(_PHASES)}
+_VERSIONS: Tuple[SnapshotVersion, ...] = tuple(SnapshotVersion)
+_VERSION_CODES: Dict[SnapshotVersion, int] = {version: i for i, version in enumerate(_VERSIONS)}
+_TRANSACTION_TYPES: Tuple[TransactionType, ...] = tuple(TransactionType)
+_TRANSACTION_TYPE_CODES: Dict[TransactionType, int] = {t: i for i, t in enumerate(_TRANSACTION_TYPES)}
+
+# 玩家标志位
+_FLAG_ACTIVE = 1
+_FLAG_ALL_IN = 2
+
+# 未使用的牌位
+_NO_CARD = 0xFF
+
+
+def encode_snapshot(snapshot: GameStateSnapshot, compress: bool = True) -> bytes:
+    """
+    把快照编码为二进制格式
+
+    Args:
+        snapshot: 游戏状态快照
+        compress: 是否用zlib压缩负载
+
+    Returns:
+        bytes: 包含固定头部的二进制数据
+
+    Raises:
+        ValueError: 当字段超出固定宽度的表示范围时
+        struct.error: 当数值超出字段宽度时
+    """
+    strings: Dict[str, int] = {}
+
+    def ref(value: str) -> int:
+        index = strings.get(value)
+        if index is None:
+            index = strings[value] = len(strings)
+        return index
+
+    def optional_ref(value: Optional[str]) -> int:
+        return 0 if value is None else ref(value) + 1
+
+    metadata = snapshot.metadata
+    pot = snapshot.pot
+    if len(snapshot.community_cards) > 5:
+        raise ValueError("公共牌不能超过5张")
+
+    # 先编码玩家、边池、资格和交易，收集字符串
+    players = bytearray()
+    for player in snapshot.players:
+        if len(player.hole_cards) > 2:
+            raise ValueError("手牌不能超过2张")
+        players += _PLAYER.pack(
+            ref(player.player_id), ref(player.name), optional_ref(player.last_action),
+            player.chips, player.position,
+            (_FLAG_ACTIVE if player.is_active else 0) | (_FLAG_ALL_IN if player.is_all_in else 0),
+            len(player.hole_cards), _pack_cards(player.hole_cards, 2),
+            player.current_bet, player.total_bet_this_hand
+        )
+
+    side_pots = [ref(_dump_json(side_pot)) for side_pot in pot.side_pots]
+    eligible_players = [ref(player_id) for player_id in pot.eligible_players]
+
+    transactions = bytearray()
+    for transaction in snapshot.recent_transactions:
+        transactions += _TRANSACTION.pack(
+            ref(transaction.transaction_id), _TRANSACTION_TYPE_CODES[transaction.transaction_type],
+            ref(transaction.player_id), transaction.amount, transaction.timestamp,
+            ref(transaction.description),
+            0 if transaction.metadata is None else ref(_dump_json(transaction.metadata)) + 1
+        )
+
+    fields = _SNAPSHOT.pack(
+        _VERSION_CODES[metadata.version], _PHASE_CODES[snapshot.phase],
+        metadata.created_at, metadata.game_duration, metadata.hand_number,
+        ref(metadata.snapshot_id), optional_ref(metadata.description), ref(snapshot.game_id),
+        snapshot.current_bet, snapshot.dealer_position, snapshot.small_blind_position,
+        snapshot.big_blind_position,
+        -1 if snapshot.active_player_position is None else snapshot.active_player_position,
+        snapshot.small_blind_amount, snapshot.big_blind_amount,
+        len(snapshot.community_cards), _pack_cards(snapshot.community_cards, 5),
+        len(snapshot.players), pot.main_pot, pot.total_pot,
+        len(side_pots), len(eligible_players), len(snapshot.recent_transactions)
+    )
+
+    string_table = json.dumps(list(strings), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    body = b''.join((
+        _LENGTH.pack(len(string_table)), string_table, fields, players,
+        struct.pack(f'<{len(side_pots)}I{len(eligible_players)}I', *side_pots, *eligible_players),
+        transactions
+    ))
+    flags = 0
+    if compress:
+        body = zlib.compress(body)
+        flags |= FLAG_COMPRESSED
+    return _HEADER.pack(BINARY_MAGIC, BINARY_FORMAT_VERSION, flags, len(body)) + body
+
+
+def decode_snapshot(data: bytes) -> GameStateSnapshot:
+    """
+    从二进制格式解码快照
+
+    Args:
+        data: encode_snapshot生成的二进制数据
+
+    Returns:
+        GameStateSnapshot: 解码的游戏状态快照
+
+    Raises:
+        ValueError: 当头部、版本或负载无效时
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError(f"二进制快照过短: {len(data)}字节")
+    magic, format_version, flags, length = _HEADER.unpack_from(data)
+    if magic != BINARY_MAGIC:
+        raise ValueError(f"无效的二进制快照魔数: {magic!r}")
+    if format_version != BINARY_FORMAT_VERSION:
+        raise ValueError(f"不支持的二进制快照格式版本: {format_version}")
+    if len(data) != _HEADER.size + length:
+        raise ValueError(f"二进制快照长度不一致: 头部声明{length}字节，实际{len(data) - _HEADER.size}字节")
+
+    body = data[_HEADER.size:]
+    try:
+        if flags & FLAG_COMPRESSED:
+            body = zlib.decompress(body)
+
+        table_length, = _LENGTH.unpack_from(body)
+        offset = _LENGTH.size + table_length
+        strings: List[str] = json.loads(bytes(body[_LENGTH.size:offset]).decode('utf-8'))
+
+        (version, phase, created_at, game_duration, hand_number,
+         snapshot_id, description, game_id,
+         current_bet, dealer_position, small_blind_position, big_blind_position, active_player_position,
+         small_blind_amount, big_blind_amount, community_count, community_cards,
+         player_count, main_pot, total_pot,
+         side_pot_count, eligible_count, transaction_count) = _SNAPSHOT.unpack_from(body, offset)
+        offset += _SNAPSHOT.size
+
+        players = []
+        for (player_id, name, last_action, chips, position, player_flags, card_count, hole_cards,
+             player_bet, total_bet) in _iter_records(_PLAYER, body, offset, player_count):
+            players.append(PlayerSnapshot(
+                player_id=strings[player_id],
+                name=strings[name],
+                chips=chips,
+                hole_cards=_unpack_cards(hole_cards, card_count),
+                position=position,
+                is_active=bool(player_flags & _FLAG_ACTIVE),
+                is_all_in=bool(player_flags & _FLAG_ALL_IN),
+                current_bet=player_bet,
+                total_bet_this_hand=total_bet,
+                last_action=strings[last_action - 1] if last_action else None
+            ))
+        offset += _PLAYER.size * player_count
+
+        refs = struct.unpack_from(f'<{side_pot_count + eligible_count}I', body, offset)
+        offset += 4 * (side_pot_count + eligible_count)
+        pot = PotSnapshot(
+            main_pot=main_pot,
+            side_pots=tuple(json.loads(strings[i]) for i in refs[:side_pot_count]),
+            total_pot=total_pot,
+            eligible_players=tuple(strings[i] for i in refs[side_pot_count:])
+        )
+
+        transactions = tuple(
+            ChipTransaction(
+                transaction_id=strings[transaction_id],
+                transaction_type=_TRANSACTION_TYPES[transaction_type],
+                player_id=strings[player_id],
+                amount=amount,
+                timestamp=timestamp,
+                description=strings[transaction_description],
+                metadata=json.loads(strings[metadata - 1]) if metadata else None
+            )
+            for (transaction_id, transaction_type, player_id, amount, timestamp,
+                 transaction_description, metadata) in _iter_records(_TRANSACTION, body, offset, transaction_count)
+        )
+        offset += _TRANSACTION.size * transaction_count
+
+        snapshot_metadata = SnapshotMetadata(
+            snapshot_id=strings[snapshot_id],
+            version=_VERSIONS[version],
+            created_at=created_at,
+            game_duration=game_duration,
+            hand_number=hand_number,
+            description=strings[description - 1] if description else None
+        )
+        board = _unpack_cards(community_cards, community_count)
+    except (IndexError, struct.error, zlib.error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"二进制快照负载被截断或无效: {e}") from e
+
+    if offset != len(body):
+        raise ValueError(f"二进制快照负载末尾有{len(body) - offset}字节多余数据")
+
+    return GameStateSnapshot(
+        metadata=snapshot_metadata,
+        game_id=strings[game_id],
+        phase=_PHASES[phase],
+        players=tuple(players),
+        pot=pot,
+        community_cards=board,
+        current_bet=current_bet,
+        dealer_position=dealer_position,
+        small_blind_position=small_blind_position,
+        big_blind_position=big_blind_position,
+        active_player_position=None if active_player_position < 0 else active_player_position,
+        small_blind_amount=small_blind_amount,
+        big_blind_amount=big_blind_amount,
+        recent_transactions=transactions
+    )
+
+
+def _iter_records(record: struct.Struct, body: bytes, offset: int, count: int):
+    """解包从offset开始的count条固定宽度记录"""
+    end = offset + record.size * count
+    if end > len(body):
+        raise ValueError("二进制快照负载被截断")
+    return record.iter_unpack(memoryview(body)[offset:end])
+
+
+def _pack_cards(cards: Tuple[Card, ...], slots: int) -> bytes:
+    """把扑克牌编码为slots个单字节牌id，未使用的牌位填_NO_CARD"""
+    return bytes(card.id for card in cards) + bytes((_NO_CARD,)) * (slots - len(cards))
+
+
+def _unpack_cards(data: bytes, count: int) -> Tuple[Card, ...]:
+    """把单字节牌id解码为扑克牌"""
+    if count > len(data):
+        raise ValueError(f"牌数超出牌位: {count}")
+    return tuple(ALL_CARDS[card_id] for card_id in data[:count])
+
+
+def _dump_json(value: Any) -> str:
+    """把任意字典编码为紧凑的JSON字符串，内容与JSON序列化器一致"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
@@ -2,7 +2,8 @@
 快照序列化器
 
 实现游戏状态快照的序列化和反序列化功能。
-支持JSON格式的序列化，确保数据的完整性和版本兼容性。
+支持JSON格式的序列化，确保数据的完整性和版本兼容性；
+另提供紧凑的二进制格式（见binary_format），用于每次行动都要持久化快照的场景。
 """
 
 import json
@@ -17,6 +18,7 @@ from ..state_machine.types import GamePhase
 from ..deck.card import Card
 from ..deck.types import Suit, Rank
 from ..chips.chip_transaction import ChipTransaction, TransactionType
+from .binary_format import encode_snapshot, decode_snapshot
 
 __all__ = ['SnapshotSerializer', 'SerializationError', 'DeserializationError']
 
@@ -36,7 +38,7 @@ class SnapshotSerializer:
     快照序列化器
     
     负责游戏状态快照的序列化和反序列化。
-    支持JSON格式，确保数据完整性和版本兼容性。
+    支持JSON格式和紧凑的二进制格式，两种格式可以精确往返，确保数据完整性和版本兼容性。
     """
     
     @staticmethod
@@ -127,6 +129,84 @@ class SnapshotSerializer:
         except Exception as e:
             raise DeserializationError(f"从文件读取快照失败: {str(e)}") from e
     
+    @staticmethod
+    def serialize_binary(snapshot: GameStateSnapshot) -> bytes:
+        """
+        将快照序列化为紧凑的二进制格式
+        
+        Args:
+            snapshot: 游戏状态快照
+            
+        Returns:
+            bytes: 带有版本化固定头部的二进制数据
+            
+        Raises:
+            SerializationError: 序列化失败时抛出
+        """
+        try:
+            return encode_snapshot(snapshot)
+        except Exception as e:
+            raise SerializationError(f"快照二进制序列化失败: {str(e)}") from e
+    
+    @staticmethod
+    def deserialize_binary(data: bytes) -> GameStateSnapshot:
+        """
+        从二进制数据反序列化快照
+        
+        Args:
+            data: serialize_binary生成的二进制数据
+            
+        Returns:
+            GameStateSnapshot: 反序列化的游戏状态快照
+            
+        Raises:
+            DeserializationError: 反序列化失败时抛出
+        """
+        try:
+            return decode_snapshot(data)
+        except Exception as e:
+            raise DeserializationError(f"快照二进制反序列化失败: {str(e)}") from e
+    
+    @staticmethod
+    def serialize_binary_to_file(snapshot: GameStateSnapshot, file_path: str):
+        """
+        将快照以二进制格式保存到文件
+        
+        Args:
+            snapshot: 游戏状态快照
+            file_path: 文件路径
+            
+        Raises:
+            SerializationError: 序列化或文件写入失败时抛出
+        """
+        try:
+            data = SnapshotSerializer.serialize_binary(snapshot)
+            with open(file_path, 'wb') as f:
+                f.write(data)
+        except Exception as e:
+            raise SerializationError(f"快照二进制保存到文件失败: {str(e)}") from e
+    
+    @staticmethod
+    def deserialize_binary_from_file(file_path: str) -> GameStateSnapshot:
+        """
+        从二进制文件读取并反序列化快照
+        
+        Args:
+            file_path: 文件路径
+            
+        Returns:
+            GameStateSnapshot: 反序列化的游戏状态快照
+            
+        Raises:
+            DeserializationError: 文件读取或反序列化失败时抛出
+        """
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+            return SnapshotSerializer.deserialize_binary(data)
+        except Exception as e:
+            raise DeserializationError(f"从二进制文件读取快照失败: {str(e)}") from e
+    
     @staticmethod
     def _snapshot_to_dict(snapshot: GameStateSnapshot) -> Dict[str, Any]:
         """将快照对象转换为字典"""
@@ -0,0 +1,519 @@
+"""
+快照归档文件
+
+把大量快照追加写入同一个归档文件，并维护一个按(game_id, hand_number, sequence)索引的伴随索引文件，
+用于长期保存整场牌局、事后分析和争议处理。归档和索引都通过mmap随机访问，按需逐个解码快照，
+打开归档时不会把索引条目逐个载入内存。
+
+归档文件（path）：
+    头部：魔数b"TXSA"(4字节) | 格式版本(uint8)
+    记录：负载长度(uint32) | CRC32(uint32) | 负载（binary_format编码的快照）
+
+索引文件（path + ".idx"），定长条目：
+    头部：魔数b"TXSI"(4字节) | 格式版本(uint8)
+    条目：手牌编号(uint64) | 序号(uint64) | 创建时间(double) | 记录偏移(uint64) | 负载长度(uint32) |
+          游戏编号(uint32)
+
+游戏ID表（path + ".ids"）：
+    头部：魔数b"TXSG"(4字节) | 格式版本(uint8)
+    条目：游戏ID长度(uint16) | 游戏ID(UTF-8)，游戏编号即条目在表中的位置
+
+序号是同一游戏在归档中的快照序号，从0开始递增。所有数值均为小端序。
+三个文件都只追加，flush时依次写入归档、游戏ID表、索引；打开归档时只核对索引尾部，
+丢弃指向归档文件末尾之外或游戏ID表之外的条目，并扫描索引之后的记录补全索引，
+因此崩溃后未写完的尾部会被截断，已写完的记录不会丢失。
+按游戏查询时对索引的游戏编号列做一次向量化扫描，得到该游戏的条目位置表并缓存，
+之后按序号直接定位条目。
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .types import GameStateSnapshot
+from .binary_format import encode_snapshot, decode_snapshot
+
+__all__ = ['SnapshotArchive', 'ArchiveEntry', 'SnapshotArchiveError', 'ARCHIVE_FORMAT_VERSION']
+
+# 归档格式版本，格式变化时递增
+ARCHIVE_FORMAT_VERSION = 2
+
+_ARCHIVE_MAGIC = b"TXSA"
+_INDEX_MAGIC = b"TXSI"
+_GAME_TABLE_MAGIC = b"TXSG"
+_FILE_HEADER = struct.Struct('<4sB')
+_FRAME = struct.Struct('<II')
+_INDEX_ENTRY = struct.Struct('<QQdQII')
+_GAME_ID_LENGTH = struct.Struct('<H')
+
+# 与_INDEX_ENTRY相同布局的numpy类型，用于向量化扫描索引列
+_INDEX_DTYPE = np.dtype([
+    ('hand_number', '<u8'), ('sequence', '<u8'), ('created_at', '<f8'),
+    ('offset', '<u8'), ('length', '<u4'), ('game', '<u4')
+])
+
+
+class SnapshotArchiveError(Exception):
+    """快照归档错误"""
+    pass
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """
+    归档索引条目
+
+    Attributes:
+        game_id: 游戏ID
+        hand_number: 手牌编号
+        sequence: 该游戏在归档中的快照序号
+        created_at: 快照创建时间
+        offset: 记录在归档文件中的偏移
+        length: 负载长度
+    """
+
+    game_id: str
+    hand_number: int
+    sequence: int
+    created_at: float
+    offset: int
+    length: int
+
+    @property
+    def key(self) -> Tuple[str, int, int]:
+        """索引键(game_id, hand_number, sequence)"""
+        return (self.game_id, self.hand_number, self.sequence)
+
+
+class SnapshotArchive:
+    """
+    只追加的快照归档
+
+    内存中只保存游戏ID表、尚未写入索引文件的条目，以及已查询过的游戏的条目位置表；
+    ArchiveEntry在查询时从映射的索引中按需构造。
+
+    Examples:
+        >>> with SnapshotArchive("2024-06-01.txsa") as archive:
+        ...     archive.append(snapshot)
+        >>> with SnapshotArchive("2024-06-01.txsa", readonly=True) as archive:
+        ...     for snapshot in archive.iter_snapshots(game_id="table_1"):
+        ...         ...
+    """
+
+    def __init__(self, path: Union[str, Path], readonly: bool = False,
+                 compress: bool = True, sync: bool = False) -> None:
+        """
+        打开（或创建）归档文件、索引文件和游戏ID表
+
+        Args:
+            path: 归档文件路径，索引文件和游戏ID表为同名加".idx"和".ids"
+            readonly: 是否只读打开；只读时不创建文件，也不截断或补写崩溃留下的尾部
+            compress: 追加快照时是否压缩负载
+            sync: flush时是否fsync
+
+        Raises:
+            SnapshotArchiveError: 当文件头无效或只读打开的归档不存在时
+        """
+        self._path = Path(path)
+        self._index_path = self._path.with_name(self._path.name + ".idx")
+        self._game_table_path = self._path.with_name(self._path.name + ".ids")
+        self._readonly = readonly
+        self._compress = compress
+        self._sync = sync
+
+        # 游戏ID表，以及已写入游戏ID表文件的数量
+        self._game_ids: List[str] = []
+        self._game_numbers: Dict[str, int] = {}
+        self._games_written = 0
+        # 映射的索引中的有效条目数，以及其后尚未写入索引文件的条目
+        self._indexed = 0
+        self._pending: List[bytes] = []
+        # 游戏编号 -> 该游戏各条目在索引中的位置，按需构建
+        self._positions: Dict[int, array] = {}
+
+        self._data_file = None
+        self._game_table_file = None
+        self._index_file = None
+        self._mmap: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self._index_mmap: Optional[mmap.mmap] = None
+        self._dirty = False
+
+        if readonly:
+            if not self._path.exists():
+                raise SnapshotArchiveError(f"归档文件不存在: {self._path}")
+        else:
+            for file_path, magic in ((self._path, _ARCHIVE_MAGIC), (self._index_path, _INDEX_MAGIC),
+                                     (self._game_table_path, _GAME_TABLE_MAGIC)):
+                if not file_path.exists() or file_path.stat().st_size == 0:
+                    file_path.write_bytes(_FILE_HEADER.pack(magic, ARCHIVE_FORMAT_VERSION))
+
+        self._data_size = self._load()
+
+        if not readonly:
+            self._data_file = open(self._path, 'ab')
+            self._game_table_file = open(self._game_table_path, 'ab')
+            self._index_file = open(self._index_path, 'ab')
+            # 写入崩溃恢复时补全的条目
+            self.flush()
+
+    def __enter__(self) -> 'SnapshotArchive':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._indexed + len(self._pending)
+
+    @property
+    def path(self) -> Path:
+        """归档文件路径"""
+        return self._path
+
+    @property
+    def index_path(self) -> Path:
+        """索引文件路径"""
+        return self._index_path
+
+    @property
+    def nbytes(self) -> int:
+        """归档文件的字节数（含未flush的部分）"""
+        return self._data_size
+
+    def append(self, snapshot: GameStateSnapshot) -> ArchiveEntry:
+        """
+        追加快照
+
+        Args:
+            snapshot: 游戏状态快照
+
+        Returns:
+            ArchiveEntry: 新快照的索引条目
+
+        Raises:
+            SnapshotArchiveError: 当归档只读或已关闭时
+        """
+        if self._data_file is None:
+            raise SnapshotArchiveError("归档只读或已关闭")
+
+        payload = encode_snapshot(snapshot, compress=self._compress)
+        entry = ArchiveEntry(
+            game_id=snapshot.game_id,
+            hand_number=snapshot.metadata.hand_number,
+            sequence=len(self._game_positions(self._game_number(snapshot.game_id))),
+            created_at=snapshot.metadata.created_at,
+            offset=self._data_size,
+            length=len(payload)
+        )
+        self._data_file.write(_FRAME.pack(len(payload), zlib.crc32(payload)))
+        self._data_file.write(payload)
+        self._data_size += _FRAME.size + len(payload)
+        self._dirty = True
+        self._add_entry(entry)
+        return entry
+
+    def flush(self) -> None:
+        """把缓冲的记录写入文件（sync为True时fsync）"""
+        if self._data_file is None or not self._dirty:
+            return
+        # 依次写入归档、游戏ID表、索引；打开时会丢弃指向归档末尾或游戏ID表之外的索引条目
+        self._sync_file(self._data_file)
+        self._game_table_file.write(b''.join(
+            _pack_game_id(game_id) for game_id in self._game_ids[self._games_written:]))
+        self._sync_file(self._game_table_file)
+        self._index_file.write(b''.join(self._pending))
+        self._sync_file(self._index_file)
+
+        self._games_written = len(self._game_ids)
+        self._indexed += len(self._pending)
+        self._pending = []
+        self._map_index()
+        self._dirty = False
+
+    def close(self) -> None:
+        """flush并关闭归档"""
+        self.flush()
+        for mapping in (self._mmap, self._index_mmap):
+            if mapping is not None:
+                mapping.close()
+        self._mmap = None
+        self._mapped_size = 0
+        self._index_mmap = None
+        for file in (self._data_file, self._game_table_file, self._index_file):
+            if file is not None:
+                file.close()
+        self._data_file = None
+        self._game_table_file = None
+        self._index_file = None
+
+    def entries(self, game_id: Optional[str] = None, hand_number: Optional[int] = None) -> List[ArchiveEntry]:
+        """
+        查询索引条目
+
+        Args:
+            game_id: 游戏ID；为None时包括所有游戏
+            hand_number: 手牌编号；为None时包括所有手牌
+
+        Returns:
+            List[ArchiveEntry]: 按追加顺序排列的索引条目
+        """
+        entries = (self._entry_at(position) for position in self._positions_of(game_id))
+        if hand_number is None:
+            return list(entries)
+        return [entry for entry in entries if entry.hand_number == hand_number]
+
+    def game_ids(self) -> List[str]:
+        """归档中的游戏ID，按首次出现的顺序排列"""
+        return list(self._game_ids)
+
+    def get(self, game_id: str, hand_number: int, sequence: int) -> Optional[GameStateSnapshot]:
+        """
+        按索引键读取快照
+
+        Args:
+            game_id: 游戏ID
+            hand_number: 手牌编号
+            sequence: 该游戏在归档中的快照序号
+
+        Returns:
+            Optional[GameStateSnapshot]: 快照，如果不存在则返回None
+        """
+        positions = self._positions_of(game_id)
+        if not 0 <= sequence < len(positions):
+            return None
+        entry = self._entry_at(positions[sequence])
+        if entry.hand_number != hand_number:
+            return None
+        return self.read(entry)
+
+    def read(self, entry: ArchiveEntry) -> GameStateSnapshot:
+        """
+        通过mmap读取索引条目对应的快照
+
+        Args:
+            entry: 索引条目
+
+        Returns:
+            GameStateSnapshot: 解码的快照
+
+        Raises:
+            SnapshotArchiveError: 当记录损坏时
+        """
+        view = self._view(entry.offset + _FRAME.size + entry.length)
+        length, crc = _FRAME.unpack_from(view, entry.offset)
+        start = entry.offset + _FRAME.size
+        payload = view[start:start + length]
+        if length != entry.length or zlib.crc32(payload) != crc:
+            raise SnapshotArchiveError(f"归档记录损坏: 偏移{entry.offset}")
+        try:
+            return decode_snapshot(payload)
+        except ValueError as e:
+            raise SnapshotArchiveError(f"归档记录解码失败: 偏移{entry.offset}: {e}") from e
+
+    def iter_snapshots(self, game_id: Optional[str] = None, hand_number: Optional[int] = None,
+                       since: Optional[float] = None, until: Optional[float] = None) -> Iterator[GameStateSnapshot]:
+        """
+        按追加顺序逐个解码快照，不会一次载入整个归档
+
+        只包括开始迭代时已有的快照，迭代过程中追加的快照不会产出。
+
+        Args:
+            game_id: 游戏ID；为None时包括所有游戏
+            hand_number: 手牌编号；为None时包括所有手牌
+            since: 只包括创建时间不早于该时间的快照
+            until: 只包括创建时间早于该时间的快照
+
+        Yields:
+            GameStateSnapshot: 快照
+        """
+        positions = self._positions_of(game_id)
+        for index in range(len(positions)):
+            entry = self._entry_at(positions[index])
+            if hand_number is not None and entry.hand_number != hand_number:
+                continue
+            if since is not None and entry.created_at < since:
+                continue
+            if until is not None and entry.created_at >= until:
+                continue
+            yield self.read(entry)
+
+    def _sync_file(self, file) -> None:
+        file.flush()
+        if self._sync:
+            os.fsync(file.fileno())
+
+    def _view(self, end: int) -> mmap.mmap:
+        """返回覆盖到end的只读映射，必要时flush并重新映射"""
+        if end > self._mapped_size:
+            self.flush()
+            if self._mmap is not None:
+                self._mmap.close()
+            with open(self._path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._mapped_size = len(self._mmap)
+            if end > self._mapped_size:
+                raise SnapshotArchiveError(f"归档记录超出文件末尾: {end} > {self._mapped_size}")
+        return self._mmap
+
+    def _map_index(self) -> None:
+        """重新映射索引文件，映射范围包括前self._indexed个条目"""
+        if self._index_mmap is not None:
+            self._index_mmap.close()
+            self._index_mmap = None
+        if self._indexed:
+            with open(self._index_path, 'rb') as f:
+                self._index_mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _entry_at(self, position: int) -> ArchiveEntry:
+        """构造索引中第position个条目"""
+        if position < self._indexed:
+            fields = _INDEX_ENTRY.unpack_from(self._index_mmap, _FILE_HEADER.size + position * _INDEX_ENTRY.size)
+        else:
+            fields = _INDEX_ENTRY.unpack(self._pending[position - self._indexed])
+        hand_number, sequence, created_at, offset, length, game = fields
+        return ArchiveEntry(self._game_ids[game], hand_number, sequence, created_at, offset, length)
+
+    def _positions_of(self, game_id: Optional[str]) -> Sequence[int]:
+        """游戏各条目在索引中的位置；game_id为None时为全部条目"""
+        if game_id is None:
+            return range(len(self))
+        game = self._game_numbers.get(game_id)
+        if game is None:
+            return ()
+        return self._game_positions(game)
+
+    def _game_positions(self, game: int) -> array:
+        """游戏各条目在索引中的位置，首次查询时扫描索引的游戏编号列"""
+        positions = self._positions.get(game)
+        if positions is None:
+            positions = array('Q')
+            if self._indexed:
+                games = np.frombuffer(self._index_mmap, dtype=_INDEX_DTYPE, count=self._indexed,
+                                      offset=_FILE_HEADER.size)['game']
+                positions.frombytes(np.flatnonzero(games == game).astype(np.uint64).tobytes())
+                del games
+            positions.extend(
+                self._indexed + index for index, packed in enumerate(self._pending)
+                if _INDEX_ENTRY.unpack(packed)[5] == game
+            )
+            self._positions[game] = positions
+        return positions
+
+    def _game_number(self, game_id: str) -> int:
+        """游戏ID在游戏ID表中的编号，新的游戏ID追加到表末尾（索引中还没有它的条目）"""
+        game = self._game_numbers.get(game_id)
+        if game is None:
+            game = len(self._game_ids)
+            self._game_ids.append(game_id)
+            self._game_numbers[game_id] = game
+            self._positions[game] = array('Q')
+        return game
+
+    def _add_entry(self, entry: ArchiveEntry) -> None:
+        game = self._game_number(entry.game_id)
+        self._game_positions(game).append(len(self))
+        self._pending.append(_INDEX_ENTRY.pack(entry.hand_number, entry.sequence, entry.created_at,
+                                               entry.offset, entry.length, game))
+
+    def _load(self) -> int:
+        """载入游戏ID表，核对索引尾部并补全索引，返回归档文件的有效字节数"""
+        with open(self._path, 'rb') as f:
+            data = f.read(_FILE_HEADER.size)
+            _check_header(data, _ARCHIVE_MAGIC, self._path)
+            data_size = os.fstat(f.fileno()).st_size
+
+        self._load_game_ids()
+
+        # 从最后一个条目往前，丢弃不完整、指向归档末尾之外或游戏ID表之外的条目
+        valid_end = _FILE_HEADER.size
+        if self._index_path.exists():
+            with open(self._index_path, 'rb') as f:
+                _check_header(f.read(_FILE_HEADER.size), _INDEX_MAGIC, self._index_path)
+                count = (os.fstat(f.fileno()).st_size - _FILE_HEADER.size) // _INDEX_ENTRY.size
+                while count:
+                    f.seek(_FILE_HEADER.size + (count - 1) * _INDEX_ENTRY.size)
+                    _, _, _, record_offset, length, game = _INDEX_ENTRY.unpack(f.read(_INDEX_ENTRY.size))
+                    record_end = record_offset + _FRAME.size + length
+                    if game < len(self._game_ids) and record_end <= data_size:
+                        valid_end = record_end
+                        break
+                    count -= 1
+            if not self._readonly:
+                os.truncate(self._index_path, _FILE_HEADER.size + count * _INDEX_ENTRY.size)
+            self._indexed = count
+            self._map_index()
+
+        # 扫描索引之后已写完的记录，补全索引
+        if valid_end < data_size:
+            with open(self._path, 'rb') as f:
+                f.seek(valid_end)
+                tail = f.read()
+            position = 0
+            while position + _FRAME.size <= len(tail):
+                length, crc = _FRAME.unpack_from(tail, position)
+                start = position + _FRAME.size
+                payload = tail[start:start + length]
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                try:
+                    snapshot = decode_snapshot(payload)
+                except ValueError:
+                    break
+                self._add_entry(ArchiveEntry(
+                    game_id=snapshot.game_id,
+                    hand_number=snapshot.metadata.hand_number,
+                    sequence=len(self._game_positions(self._game_number(snapshot.game_id))),
+                    created_at=snapshot.metadata.created_at,
+                    offset=valid_end + position,
+                    length=length
+                ))
+                position = start + length
+            valid_end += position
+            self._dirty = bool(self._pending)
+
+        if not self._readonly and valid_end < data_size:
+            os.truncate(self._path, valid_end)
+        return valid_end
+
+    def _load_game_ids(self) -> None:
+        """读取游戏ID表中所有完整的条目"""
+        if not self._game_table_path.exists():
+            return
+        data = self._game_table_path.read_bytes()
+        _check_header(data, _GAME_TABLE_MAGIC, self._game_table_path)
+        offset = _FILE_HEADER.size
+        while offset + _GAME_ID_LENGTH.size <= len(data):
+            (length,) = _GAME_ID_LENGTH.unpack_from(data, offset)
+            end = offset + _GAME_ID_LENGTH.size + length
+            if end > len(data):
+                break
+            game_id = data[offset + _GAME_ID_LENGTH.size:end].decode('utf-8')
+            self._game_numbers[game_id] = len(self._game_ids)
+            self._game_ids.append(game_id)
+            offset = end
+        self._games_written = len(self._game_ids)
+        if not self._readonly and offset < len(data):
+            os.truncate(self._game_table_path, offset)
+
+
+def _pack_game_id(game_id: str) -> bytes:
+    encoded = game_id.encode('utf-8')
+    return _GAME_ID_LENGTH.pack(len(encoded)) + encoded
+
+
+def _check_header(data: bytes, magic: bytes, path: Path) -> None:
+    if len(data) < _FILE_HEADER.size:
+        raise SnapshotArchiveError(f"文件过短: {path}")
+    file_magic, version = _FILE_HEADER.unpack_from(data)
+    if file_magic != magic:
+        raise SnapshotArchiveError(f"无效的魔数: {path}: {file_magic!r}")
+    if version != ARCHIVE_FORMAT_VERSION:
+        raise SnapshotArchiveError(f"不支持的归档格式版本: {path}: {version}")
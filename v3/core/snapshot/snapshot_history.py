@@ -0,0 +1,492 @@
+"""
+增量编码的快照历史
+
+为单个游戏保存一串连续的快照：每隔一定数量保存一个完整的关键帧，其余只保存与前一个快照之间的
+增量（变化的玩家、奖池、公共牌、阶段和其他字段）。任意历史快照都可以从最近的关键帧开始，
+依次应用不超过关键帧间隔个增量后重建，内存占用按字节统计。
+"""
+
+from bisect import bisect_right
+from collections import deque
+from dataclasses import dataclass, fields as dataclass_fields
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
+import struct
+import sys
+
+from .types import GameStateSnapshot, PlayerSnapshot, PotSnapshot, SnapshotMetadata
+from ..state_machine.types import GamePhase
+from ..deck.card import Card
+from ..chips.chip_transaction import ChipTransaction
+
+__all__ = ['SnapshotDelta', 'SnapshotHistory', 'estimate_size', 'DEFAULT_KEYFRAME_INTERVAL']
+
+# 默认关键帧间隔（快照数）
+DEFAULT_KEYFRAME_INTERVAL = 32
+
+# 增量中记录的标量字段
+_SCALAR_FIELDS = (
+    'phase', 'current_bet', 'dealer_position', 'small_blind_position', 'big_blind_position',
+    'active_player_position', 'small_blind_amount', 'big_blind_amount'
+)
+
+
+@dataclass(frozen=True)
+class SnapshotDelta:
+    """
+    相邻两个快照之间的增量
+
+    SnapshotManager生成的元数据除创建时间外都可以推导：快照ID由游戏ID和创建时间组成，
+    描述由阶段决定，版本、游戏时长和手牌编号与前一个快照相同。这种情况下增量只保存创建时间，
+    不保存SnapshotMetadata对象和两个字符串；无法推导时在metadata中完整保存。
+
+    Attributes:
+        created_at: 新快照的创建时间
+        fields: 发生变化的标量字段 (字段名, 新值)
+        players: 发生变化的玩家 (在players中的下标, 新的玩家快照)
+        pot: 新的奖池快照，未变化时为None
+        community_cards: 新的公共牌，未变化时为None
+        recent_transactions: 新的最近交易，未变化时为None
+        metadata: 无法推导时新快照的元数据，可以推导时为None
+    """
+    created_at: float
+    fields: Tuple[Tuple[str, Any], ...] = ()
+    players: Tuple[Tuple[int, PlayerSnapshot], ...] = ()
+    pot: Optional[PotSnapshot] = None
+    community_cards: Optional[Tuple[Card, ...]] = None
+    recent_transactions: Optional[Tuple[ChipTransaction, ...]] = None
+    metadata: Optional[SnapshotMetadata] = None
+
+    @classmethod
+    def between(cls, previous: GameStateSnapshot, current: GameStateSnapshot) -> Optional['SnapshotDelta']:
+        """
+        计算两个快照之间的增量
+
+        未变化的子对象先按身份比较（SnapshotManager在连续快照之间共享未变化的对象），再按值比较。
+
+        Args:
+            previous: 前一个快照
+            current: 当前快照
+
+        Returns:
+            Optional[SnapshotDelta]: 增量；游戏ID或玩家数量不同、无法用增量表示时返回None
+        """
+        if current.game_id != previous.game_id or len(current.players) != len(previous.players):
+            return None
+
+        changed_fields = tuple(
+            (name, getattr(current, name)) for name in _SCALAR_FIELDS
+            if getattr(current, name) != getattr(previous, name)
+        )
+        changed_players = tuple(
+            (i, player) for i, (before, player) in enumerate(zip(previous.players, current.players))
+            if player is not before and player != before
+        )
+        metadata = current.metadata
+        return cls(
+            created_at=metadata.created_at,
+            fields=changed_fields,
+            players=changed_players,
+            pot=_changed(previous.pot, current.pot),
+            community_cards=_changed(previous.community_cards, current.community_cards),
+            recent_transactions=_changed(previous.recent_transactions, current.recent_transactions),
+            metadata=None if _is_derived(metadata, previous.metadata, current) else metadata
+        )
+
+
+class SnapshotHistory:
+    """
+    单个游戏的增量编码快照历史
+
+    每keyframe_interval个快照保存一个完整关键帧，其余保存SnapshotDelta。
+    重建第k个快照只需从之前最近的关键帧开始应用至多keyframe_interval-1个增量，
+    最新的快照始终直接可用。淘汰最旧的快照时，如果下一个快照是增量，会先把它重建为关键帧。
+
+    增量与关键帧共享未变化的子对象，与SnapshotManager的结构共享相比只省去快照对象本身和可推导的元数据；
+    get_at的耗时与需要应用的增量数成正比，读取频繁时应减小关键帧间隔。
+    """
+
+    def __init__(self, keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        """
+        初始化快照历史
+
+        Args:
+            keyframe_interval: 关键帧间隔（快照数），1表示每个快照都完整保存
+
+        Raises:
+            ValueError: 当关键帧间隔小于1时
+        """
+        if keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval必须为正数，实际: {keyframe_interval}")
+        self._keyframe_interval = keyframe_interval
+        self._entries: Deque[Union[GameStateSnapshot, SnapshotDelta]] = deque()
+        self._entry_sizes: Deque[int] = deque()
+        self._keyframes: Deque[int] = deque()  # 关键帧的序号，递增
+        self._first_sequence = 0  # 第一个保留快照的序号
+        self._sequences: Dict[str, int] = {}  # snapshot_id -> 序号
+        self._latest: Optional[GameStateSnapshot] = None
+        self._nbytes = 0
+
+    def __len__(self) -> int:
+        """保留的快照数"""
+        return len(self._entries)
+
+    def __contains__(self, snapshot_id: str) -> bool:
+        """快照ID是否仍在历史中"""
+        return snapshot_id in self._sequences
+
+    def snapshot_ids(self) -> List[str]:
+        """保留的快照ID"""
+        return list(self._sequences)
+
+    @property
+    def nbytes(self) -> int:
+        """关键帧和增量估计占用的字节数"""
+        return self._nbytes
+
+    @property
+    def first_sequence(self) -> int:
+        """第一个保留快照的序号"""
+        return self._first_sequence
+
+    @property
+    def next_sequence(self) -> int:
+        """下一个快照的序号"""
+        return self._first_sequence + len(self._entries)
+
+    @property
+    def keyframe_count(self) -> int:
+        """保留的关键帧数"""
+        return len(self._keyframes)
+
+    def append(self, snapshot: GameStateSnapshot) -> int:
+        """
+        追加快照
+
+        Args:
+            snapshot: 游戏状态快照
+
+        Returns:
+            int: 本次增加的字节数
+        """
+        entry: Union[GameStateSnapshot, SnapshotDelta, None] = None
+        sequence = self.next_sequence
+        if self._latest is not None and sequence - self._keyframes[-1] < self._keyframe_interval:
+            entry = SnapshotDelta.between(self._latest, snapshot)
+        if entry is None:
+            entry = snapshot
+            self._keyframes.append(sequence)
+
+        # 与前一个快照共享的子对象已由之前的条目计入
+        size = estimate_size(entry, previous=self._latest) + _index_size(snapshot.metadata.snapshot_id)
+        self._entries.append(entry)
+        self._entry_sizes.append(size)
+        self._sequences[snapshot.metadata.snapshot_id] = sequence
+        self._latest = snapshot
+        self._nbytes += size
+        return size
+
+    def latest(self) -> Optional[GameStateSnapshot]:
+        """获取最新的快照"""
+        return self._latest
+
+    def get(self, snapshot_id: str) -> Optional[GameStateSnapshot]:
+        """
+        根据ID获取快照
+
+        Args:
+            snapshot_id: 快照ID
+
+        Returns:
+            Optional[GameStateSnapshot]: 快照，不存在或已淘汰时返回None
+        """
+        sequence = self._sequences.get(snapshot_id)
+        if sequence is None:
+            return None
+        return self.get_at(sequence)
+
+    def get_at(self, sequence: int) -> GameStateSnapshot:
+        """
+        根据序号获取快照
+
+        Args:
+            sequence: 快照序号
+
+        Returns:
+            GameStateSnapshot: 重建的快照
+
+        Raises:
+            IndexError: 当序号超出保留范围时
+        """
+        if not self._first_sequence <= sequence < self.next_sequence:
+            raise IndexError(f"快照序号超出范围: {sequence}，保留范围{self._first_sequence}..{self.next_sequence - 1}")
+        if sequence == self.next_sequence - 1:
+            return self._latest
+        return self._materialize(sequence)
+
+    def iter_recent(self, limit: Optional[int] = None) -> Iterator[GameStateSnapshot]:
+        """
+        从新到旧遍历快照
+
+        Args:
+            limit: 最多返回的快照数，为None时遍历全部
+
+        Yields:
+            GameStateSnapshot: 快照
+        """
+        last = self.next_sequence - 1
+        first = self._first_sequence if limit is None else max(self._first_sequence, last - limit + 1)
+        for sequence in range(last, first - 1, -1):
+            yield self.get_at(sequence)
+
+    def pop_oldest(self) -> Tuple[str, int]:
+        """
+        淘汰最旧的快照
+
+        Returns:
+            Tuple[str, int]: (被淘汰快照的ID, 释放的字节数)
+
+        Raises:
+            IndexError: 当历史为空时
+        """
+        if not self._entries:
+            raise IndexError("快照历史为空")
+
+        freed = 0
+        if len(self._entries) > 1:
+            # 下一个快照成为第一个条目：增量先重建为关键帧；
+            # 原先与被淘汰快照共享的子对象改由它计入
+            keyframe = self._entries[1]
+            if isinstance(keyframe, SnapshotDelta):
+                keyframe = self.get_at(self._first_sequence + 1)
+                self._entries[1] = keyframe
+                self._keyframes.insert(1, self._first_sequence + 1)
+            size = estimate_size(keyframe) + _index_size(keyframe.metadata.snapshot_id)
+            freed -= size - self._entry_sizes[1]
+            self._entry_sizes[1] = size
+
+        oldest = self._entries.popleft()
+        freed += self._entry_sizes.popleft()
+        self._keyframes.popleft()
+        snapshot_id = oldest.metadata.snapshot_id
+        if self._sequences.get(snapshot_id) == self._first_sequence:
+            del self._sequences[snapshot_id]
+        self._first_sequence += 1
+        if not self._entries:
+            self._latest = None
+        self._nbytes -= freed
+        return snapshot_id, freed
+
+    def clear(self) -> None:
+        """清空历史，序号继续递增"""
+        self._first_sequence = self.next_sequence
+        self._entries.clear()
+        self._entry_sizes.clear()
+        self._keyframes.clear()
+        self._sequences.clear()
+        self._latest = None
+        self._nbytes = 0
+
+    def _materialize(self, sequence: int) -> GameStateSnapshot:
+        """从之前最近的关键帧开始应用增量，重建指定序号的快照，可以推导的元数据由最近一次完整保存的元数据推导"""
+        keyframe_sequence = self._keyframes[bisect_right(self._keyframes, sequence) - 1]
+
+        base: GameStateSnapshot = self._entries[keyframe_sequence - self._first_sequence]
+        if keyframe_sequence == sequence:
+            return base
+
+        state: Dict[str, Any] = {name: getattr(base, name) for name in _SCALAR_FIELDS}
+        players: List[PlayerSnapshot] = list(base.players)
+        pot = base.pot
+        community_cards = base.community_cards
+        recent_transactions = base.recent_transactions
+        metadata = base.metadata
+        delta: SnapshotDelta = base  # type: ignore[assignment]
+        for offset in range(keyframe_sequence + 1 - self._first_sequence, sequence + 1 - self._first_sequence):
+            delta = self._entries[offset]
+            if delta.fields:
+                state.update(delta.fields)
+            for index, player in delta.players:
+                players[index] = player
+            if delta.pot is not None:
+                pot = delta.pot
+            if delta.community_cards is not None:
+                community_cards = delta.community_cards
+            if delta.recent_transactions is not None:
+                recent_transactions = delta.recent_transactions
+            if delta.metadata is not None:
+                metadata = delta.metadata
+
+        if delta.metadata is None:
+            metadata = _derive_metadata(metadata, base.game_id, state['phase'], delta.created_at)
+        return GameStateSnapshot(
+            metadata=metadata,
+            game_id=base.game_id,
+            players=tuple(players),
+            pot=pot,
+            community_cards=community_cards,
+            recent_transactions=recent_transactions,
+            **state
+        )
+
+
+def _changed(previous: Any, current: Any) -> Any:
+    """子对象未变化时返回None，否则返回新值"""
+    if current is previous or current == previous:
+        return None
+    return current
+
+
+def _derive_metadata(previous: SnapshotMetadata, game_id: str, phase: GamePhase,
+                     created_at: float) -> SnapshotMetadata:
+    """由前一个快照的元数据、游戏ID、阶段和创建时间推导元数据"""
+    return SnapshotMetadata(
+        snapshot_id=SnapshotMetadata.default_snapshot_id(game_id, created_at),
+        version=previous.version,
+        created_at=created_at,
+        game_duration=previous.game_duration,
+        hand_number=previous.hand_number,
+        description=SnapshotMetadata.default_description(phase)
+    )
+
+
+def _is_derived(metadata: SnapshotMetadata, previous: SnapshotMetadata, snapshot: GameStateSnapshot) -> bool:
+    """元数据是否与由前一个快照的元数据推导的结果相同"""
+    return (metadata.version == previous.version
+            and metadata.game_duration == previous.game_duration
+            and metadata.hand_number == previous.hand_number
+            and metadata.description == SnapshotMetadata.default_description(snapshot.phase)
+            and metadata.snapshot_id == SnapshotMetadata.default_snapshot_id(snapshot.game_id, metadata.created_at))
+
+
+def estimate_size(obj: Union[GameStateSnapshot, SnapshotDelta],
+                  previous: Optional[GameStateSnapshot] = None) -> int:
+    """
+    估计快照或增量新分配的字节数
+
+    只计入每个快照新分配的对象：快照、增量、元数据、玩家和奖池对象本身，描述、创建时间、
+    奖池金额，以及各个元组和边池容器。玩家ID、名字、最近行动等字符串和筹码数值与游戏上下文共享，
+    扑克牌和枚举成员是全局共享的单例，都不计入；快照ID由SnapshotHistory的ID索引计入。
+    对象大小按CPython 3.11的对象布局计算（对象头加上每个字段一个指针的实例字典值数组），
+    与tracemalloc测得的分配相差约一成。给出previous时，与它共享（同一对象）的玩家、奖池、
+    公共牌和交易已经由之前的条目计入，不再重复计算。
+
+    Args:
+        obj: 快照或增量
+        previous: 前一个快照
+
+    Returns:
+        int: 估计的字节数
+    """
+    if isinstance(obj, SnapshotDelta):
+        total = _overhead(obj) + _FLOAT_SIZE
+        if obj.metadata is not None:
+            total += _metadata_size(obj.metadata)
+        if obj.fields:
+            total += sys.getsizeof(obj.fields) + len(obj.fields) * _PAIR_SIZE
+        if obj.players:
+            total += sys.getsizeof(obj.players) + len(obj.players) * _PAIR_SIZE
+            total += sum(_player_size(player) for _, player in obj.players)
+        if obj.pot is not None:
+            total += _pot_size(obj.pot)
+        if obj.community_cards is not None:
+            total += _tuple_size(obj.community_cards)
+        if obj.recent_transactions is not None:
+            total += _transactions_size(obj.recent_transactions)
+        return total
+
+    total = _overhead(obj) + _metadata_size(obj.metadata)
+    shared = previous is not None and previous.game_id == obj.game_id
+    if not (shared and obj.players is previous.players):
+        total += _tuple_size(obj.players)
+        previous_players = previous.players if shared else ()
+        for i, player in enumerate(obj.players):
+            if i >= len(previous_players) or player is not previous_players[i]:
+                total += _player_size(player)
+    if not (shared and obj.pot is previous.pot):
+        total += _pot_size(obj.pot)
+    if not (shared and obj.community_cards is previous.community_cards):
+        total += _tuple_size(obj.community_cards)
+    if not (shared and obj.recent_transactions is previous.recent_transactions):
+        total += _transactions_size(obj.recent_transactions)
+    return total
+
+
+# 指针的大小
+_POINTER_SIZE = struct.calcsize('P')
+
+# (字段名, 值)或(下标, 玩家)二元组的大小
+_PAIR_SIZE = sys.getsizeof((0, 0))
+
+# 新分配的float和超出小整数缓存的int的大小（含内存分配器的对齐）
+_FLOAT_SIZE = 32
+_INT_SIZE = 32
+
+# 历史中每个快照的簿记开销：ID索引的字典条目、序号和字节数两个int、两个deque的槽位
+_BOOKKEEPING_SIZE = 48 + 2 * _INT_SIZE + 2 * _POINTER_SIZE
+
+# 类 -> 对象本身与实例字典值数组的开销
+_OVERHEADS: Dict[type, int] = {}
+
+
+def _overhead(obj: Any) -> int:
+    """对象本身与实例字典值数组的开销，按类缓存；不访问__dict__，以免为对象创建实例字典"""
+    overhead = _OVERHEADS.get(obj.__class__)
+    if overhead is None:
+        overhead = sys.getsizeof(obj)
+        if obj.__class__.__dictoffset__:
+            # 值数组：每个字段一个指针，另有3个指针的头部和预留
+            overhead += (len(dataclass_fields(obj)) + 3) * _POINTER_SIZE
+        _OVERHEADS[obj.__class__] = overhead
+    return overhead
+
+
+def _index_size(snapshot_id: str) -> int:
+    """快照ID和每个快照的簿记开销"""
+    return sys.getsizeof(snapshot_id) + _BOOKKEEPING_SIZE
+
+
+def _tuple_size(value: Tuple) -> int:
+    """元组的大小，空元组是全局共享的单例，不计入"""
+    return sys.getsizeof(value) if value else 0
+
+
+def _optional_str_size(value: Optional[str]) -> int:
+    """可选字符串的大小"""
+    return 0 if value is None else sys.getsizeof(value)
+
+
+def _metadata_size(metadata: SnapshotMetadata) -> int:
+    """快照元数据的大小，快照ID由ID索引计入"""
+    return _overhead(metadata) + _FLOAT_SIZE + _optional_str_size(metadata.description)
+
+
+def _player_size(player: PlayerSnapshot) -> int:
+    """玩家快照的大小"""
+    return _overhead(player) + _tuple_size(player.hole_cards)
+
+
+def _pot_size(pot: PotSnapshot) -> int:
+    """奖池快照的大小"""
+    total = _overhead(pot) + 2 * _INT_SIZE + _tuple_size(pot.side_pots) + _tuple_size(pot.eligible_players)
+    total += sum(_container_size(side_pot) for side_pot in pot.side_pots)
+    return total
+
+
+def _transactions_size(transactions: Tuple[ChipTransaction, ...]) -> int:
+    """交易元组的大小"""
+    total = _tuple_size(transactions)
+    for transaction in transactions:
+        total += (_overhead(transaction) + sys.getsizeof(transaction.transaction_id)
+                  + sys.getsizeof(transaction.description))
+        if transaction.metadata is not None:
+            total += _container_size(transaction.metadata)
+    return total
+
+
+def _container_size(value: Any) -> int:
+    """边池、交易元数据等任意字典、列表和元组的大小，其中的字符串和数值与游戏状态共享，不计入"""
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_container_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(_container_size(item) for item in value)
+    return 0
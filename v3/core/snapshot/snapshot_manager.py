@@ -4,9 +4,13 @@
 实现游戏状态快照的创建、恢复和管理功能。
 """
 
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, field
+from enum import Enum, auto
 import time
 import copy
+import weakref
 
 from .types import (
     GameStateSnapshot, PlayerSnapshot, PotSnapshot, SnapshotMetadata, 
@@ -16,8 +20,22 @@ from ..state_machine.types import GameContext, GamePhase
 from ..deck.card import Card
 from ..chips.chip_transaction import ChipTransaction
 from ..chips.chip_ledger import ChipLedger
+from .snapshot_history import SnapshotHistory, DEFAULT_KEYFRAME_INTERVAL
+from .state_view import (
+    _is_in_hand, _is_actionable, _active_player_position, _blind_positions, _pot_snapshot, _pot_inputs
+)
+
+__all__ = [
+    'SnapshotManager', 'SnapshotHistoryMode', 'SnapshotPartitionInfo',
+    'SnapshotCreationError', 'SnapshotRestoreError', 'get_snapshot_manager',
+    'DEFAULT_PARTITION_MAX_BYTES', 'DEFAULT_MAX_TOTAL_BYTES'
+]
+
+# 每个游戏分区默认的字节预算
+DEFAULT_PARTITION_MAX_BYTES = 4 * 1024 * 1024
 
-__all__ = ['SnapshotManager', 'SnapshotCreationError', 'SnapshotRestoreError', 'get_snapshot_manager']
+# 所有分区合计默认的字节预算
+DEFAULT_MAX_TOTAL_BYTES = 64 * 1024 * 1024
 
 
 class SnapshotCreationError(Exception):
@@ -30,19 +48,138 @@ class SnapshotRestoreError(Exception):
     pass
 
 
+class SnapshotHistoryMode(Enum):
+    """快照历史的保存方式"""
+    FULL = auto()   # 保存每个完整快照，每个分区另有数量上限
+    DELTA = auto()  # 保存周期性的关键帧和相邻快照之间的增量
+
+
+@dataclass(frozen=True)
+class SnapshotPartitionInfo:
+    """游戏快照分区的统计信息"""
+    game_id: str
+    snapshot_count: int  # 保留的快照数
+    nbytes: int  # 估计占用的字节数
+    max_bytes: int  # 分区的字节预算
+
+
+@dataclass
+class _SnapshotPartition:
+    """单个游戏的快照分区"""
+    history: SnapshotHistory
+    max_bytes: int
+
+
+@dataclass
+class _SharedParts:
+    """
+    同一游戏上一版快照的可共享部分
+    
+    每个子对象都和生成它的输入键一起保存，输入键不变时直接复用上一版的不可变对象，
+    不再重新构造和校验。同时记录生成上一版时游戏上下文和账本的变化版本号，
+    没有被标记为变化的玩家直接复用，不再计算和比较输入键。
+    """
+    player_entries: Dict[str, Tuple[tuple, PlayerSnapshot]] = field(default_factory=dict)
+    players: Tuple[PlayerSnapshot, ...] = ()
+    pot_key: Optional[tuple] = None
+    pot: Optional[PotSnapshot] = None
+    community_cards: Tuple[Card, ...] = ()
+    context: Optional[weakref.ref] = None  # 生成上一版的游戏上下文
+    ledger: Optional[weakref.ref] = None  # 生成上一版的筹码账本
+    context_version: int = 0
+    ledger_version: int = 0
+    
+    def tracks(self, game_context: GameContext) -> bool:
+        """是否由同一个游戏上下文和账本生成，可以按变化版本号判断哪些玩家需要重建"""
+        return (self.context is not None and self.context() is game_context
+                and self.ledger is not None and self.ledger() is game_context.chip_ledger)
+    
+    def unchanged(self, game_context: GameContext) -> bool:
+        """自生成以来游戏上下文和账本都没有被标记任何变化"""
+        return (self.tracks(game_context) and game_context.state_version == self.context_version
+                and game_context.chip_ledger.version == self.ledger_version)
+    
+    def record_versions(self, game_context: GameContext) -> None:
+        """记录游戏上下文和账本当前的变化版本号"""
+        if isinstance(game_context, GameContext) and isinstance(game_context.chip_ledger, ChipLedger):
+            self.context = weakref.ref(game_context)
+            self.ledger = weakref.ref(game_context.chip_ledger)
+            self.context_version = game_context.state_version
+            self.ledger_version = game_context.chip_ledger.version
+
+
 class SnapshotManager:
     """
     快照管理器
     
     负责游戏状态快照的创建、恢复和管理。
     支持版本控制和快照历史记录。
+    
+    同一游戏的连续快照采用写时复制的结构共享：自上一版以来没有变化的PlayerSnapshot、
+    PotSnapshot和元组直接复用上一版的对象，只重建发生变化的部分。变化由游戏上下文和账本的
+    变化版本号跟踪：账本的每次筹码变动、玩家行动、下盲注、开始新手牌和阶段转换都会标记变化，
+    未被标记的玩家不再计算和比较输入，整桌都未变化时直接复用上一版。直接修改players中的
+    玩家字典后需要调用GameContext.mark_player_changed或mark_changed。
+    
+    快照按game_id分区保存，每个分区是一个SnapshotHistory，有自己的字节预算，超出时只淘汰
+    本分区最旧的快照，繁忙的牌桌不会挤掉其他牌桌的历史。所有分区合计超出总预算时，
+    按最近最少使用（LRU）的顺序从最久未使用的游戏开始淘汰。
+    
+    历史记录有两种保存方式（SnapshotHistoryMode）：FULL保存每个完整快照；DELTA保存周期性的
+    关键帧和相邻快照之间的增量，任意历史快照可以从最近的关键帧重建。由于结构共享，FULL模式下
+    未变化的部分已经不占额外内存，DELTA模式只再省去每个快照的GameStateSnapshot对象和可推导的
+    元数据（一般行动约两成），代价是读取历史快照需要重建，耗时随关键帧间隔增长
+    （默认间隔下约为FULL模式的6倍）。
     """
     
-    def __init__(self):
-        """初始化快照管理器"""
-        self._snapshots: Dict[str, GameStateSnapshot] = {}
-        self._snapshot_history: List[str] = []  # 按时间顺序存储快照ID
-        self._max_history_size: int = 100  # 最大历史记录数量
+    def __init__(self, history_mode: SnapshotHistoryMode = SnapshotHistoryMode.FULL,
+                 partition_max_bytes: int = DEFAULT_PARTITION_MAX_BYTES,
+                 max_total_bytes: int = DEFAULT_MAX_TOTAL_BYTES,
+                 keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL):
+        """
+        初始化快照管理器
+        
+        Args:
+            history_mode: 历史记录的保存方式
+            partition_max_bytes: 每个游戏分区默认的字节预算，可用set_partition_budget单独设置
+            max_total_bytes: 所有分区合计的字节预算
+            keyframe_interval: DELTA模式的关键帧间隔（快照数）
+            
+        Raises:
+            TypeError: 当保存方式类型无效时
+            ValueError: 当字节预算或关键帧间隔无效时
+        """
+        if not isinstance(history_mode, SnapshotHistoryMode):
+            raise TypeError(f"history_mode必须是SnapshotHistoryMode类型，实际: {type(history_mode)}")
+        if partition_max_bytes <= 0:
+            raise ValueError(f"partition_max_bytes必须为正数，实际: {partition_max_bytes}")
+        if max_total_bytes <= 0:
+            raise ValueError(f"max_total_bytes必须为正数，实际: {max_total_bytes}")
+        if keyframe_interval < 1:
+            raise ValueError(f"keyframe_interval必须为正数，实际: {keyframe_interval}")
+        
+        # snapshot_id -> game_id，按创建时间排序，用于跨游戏的ID查询和历史查询
+        self._snapshot_history: 'OrderedDict[str, str]' = OrderedDict()
+        self._max_history_size: int = 100  # FULL模式下每个分区的最大快照数
+        self._shared_parts: Dict[str, _SharedParts] = {}  # game_id -> 上一版快照的可共享部分
+        
+        self._history_mode = history_mode
+        self._keyframe_interval = keyframe_interval if history_mode is SnapshotHistoryMode.DELTA else 1
+        self._partition_max_bytes = partition_max_bytes
+        self._max_total_bytes = max_total_bytes
+        self._partition_budgets: Dict[str, int] = {}  # game_id -> 单独设置的分区预算
+        self._partitions: 'OrderedDict[str, _SnapshotPartition]' = OrderedDict()  # 按最近使用排序
+        self._history_bytes = 0  # 所有分区估计占用的字节数
+    
+    @property
+    def history_mode(self) -> SnapshotHistoryMode:
+        """历史记录的保存方式"""
+        return self._history_mode
+    
+    @property
+    def history_bytes(self) -> int:
+        """所有分区估计占用的字节数"""
+        return self._history_bytes
     
     def create_snapshot(self, game_context: GameContext, 
                        hand_number: int = 1,
@@ -65,28 +202,33 @@ class SnapshotManager:
             # 创建元数据
             timestamp = time.time()
             metadata = SnapshotMetadata(
-                snapshot_id=f"snapshot_{game_context.game_id}_{int(timestamp * 1000000)}",
+                snapshot_id=SnapshotMetadata.default_snapshot_id(game_context.game_id, timestamp),
                 version=SnapshotVersion.CURRENT,
                 created_at=timestamp,
                 game_duration=0.0,  # 需要从游戏上下文计算
                 hand_number=hand_number,
-                description=description or f"游戏快照 - {game_context.current_phase.name}"
+                description=description or SnapshotMetadata.default_description(game_context.current_phase)
             )
             
-            # 创建玩家快照
-            players = self._create_player_snapshots(game_context)
+            # 从上一版读取可复用的部分，本版的共享部分写入新对象
+            previous = self._shared_parts.get(game_context.game_id)
+            if previous is None:
+                previous = _SharedParts()
+            shared = _SharedParts()
+            
+            # 创建玩家快照（未变化的玩家复用上一版）
+            players = self._create_player_snapshots(game_context, previous, shared)
             
-            # 创建奖池快照
-            pot = self._create_pot_snapshot(game_context)
+            # 创建奖池快照（未变化时复用上一版）
+            pot = self._create_pot_snapshot(game_context, previous, shared)
             
             # 创建社区牌快照
             community_cards = tuple(game_context.community_cards) if game_context.community_cards else ()
+            if community_cards == previous.community_cards:
+                community_cards = previous.community_cards
             
             # 计算位置信息
-            player_count = len(players)
-            dealer_position = 0
-            small_blind_position = 1 % player_count if player_count > 1 else 0
-            big_blind_position = 2 % player_count if player_count > 2 else (1 if player_count > 1 else 0)
+            dealer_position, small_blind_position, big_blind_position = _blind_positions(len(players))
             
             # 创建游戏状态快照
             snapshot = GameStateSnapshot(
@@ -106,6 +248,10 @@ class SnapshotManager:
                 recent_transactions=()  # 需要从游戏上下文获取
             )
             
+            # 快照构造成功后才替换本游戏的共享部分，失败时上一版保持不变
+            shared.community_cards = community_cards
+            self._shared_parts[game_context.game_id] = shared
+            
             # 存储快照
             self._store_snapshot(snapshot)
             
@@ -168,137 +314,274 @@ class SnapshotManager:
         Returns:
             Optional[GameStateSnapshot]: 快照对象，如果不存在则返回None
         """
-        return self._snapshots.get(snapshot_id)
+        game_id = self._snapshot_history.get(snapshot_id)
+        if game_id is None:
+            return None
+        return self._touch(game_id).history.get(snapshot_id)
     
-    def get_latest_snapshot(self) -> Optional[GameStateSnapshot]:
+    def get_latest_snapshot(self, game_id: Optional[str] = None) -> Optional[GameStateSnapshot]:
         """
         获取最新的快照
         
+        Args:
+            game_id: 游戏ID；为None时返回所有游戏中最新创建的快照
+        
         Returns:
             Optional[GameStateSnapshot]: 最新的快照，如果没有则返回None
         """
+        if game_id is not None:
+            if game_id not in self._partitions:
+                return None
+            return self._touch(game_id).history.latest()
+        
         if not self._snapshot_history:
             return None
         
-        latest_id = self._snapshot_history[-1]
-        return self._snapshots.get(latest_id)
+        latest_id = next(reversed(self._snapshot_history))
+        return self.get_snapshot(latest_id)
     
-    def get_snapshot_history(self, limit: int = 10) -> List[GameStateSnapshot]:
+    def get_snapshot_history(self, limit: int = 10, game_id: Optional[str] = None) -> List[GameStateSnapshot]:
         """
         获取快照历史记录
         
         Args:
             limit: 返回的快照数量限制
+            game_id: 游戏ID；为None时返回所有游戏的快照
             
         Returns:
             List[GameStateSnapshot]: 快照列表，按时间倒序排列
         """
-        history_ids = self._snapshot_history[-limit:] if limit > 0 else self._snapshot_history
-        snapshots = []
+        if game_id is not None:
+            if game_id not in self._partitions:
+                return []
+            return list(self._touch(game_id).history.iter_recent(limit if limit > 0 else None))
         
-        for snapshot_id in reversed(history_ids):
-            snapshot = self._snapshots.get(snapshot_id)
+        snapshots = []
+        for snapshot_id, owner in reversed(self._snapshot_history.items()):
+            if 0 < limit <= len(snapshots):
+                break
+            snapshot = self._partitions[owner].history.get(snapshot_id)
             if snapshot:
                 snapshots.append(snapshot)
         
         return snapshots
     
-    def clear_old_snapshots(self, keep_count: int = 50):
+    def clear_old_snapshots(self, keep_count: int = 50, game_id: Optional[str] = None):
         """
         清理旧的快照，保留指定数量的最新快照
         
         Args:
             keep_count: 保留的快照数量
+            game_id: 游戏ID；为None时按所有游戏的创建顺序清理
         """
-        if len(self._snapshot_history) <= keep_count:
+        if game_id is not None:
+            partition = self._partitions.get(game_id)
+            while partition is not None and len(partition.history) > keep_count:
+                self._evict_from(game_id)
+                partition = self._partitions.get(game_id)
             return
         
-        # 计算需要删除的快照数量
-        to_remove_count = len(self._snapshot_history) - keep_count
-        to_remove_ids = self._snapshot_history[:to_remove_count]
+        while len(self._snapshot_history) > keep_count:
+            # 全局最旧的快照总是所在分区中最旧的
+            self._evict_from(next(iter(self._snapshot_history.values())))
+    
+    def get_game_history(self, game_id: str) -> Optional[SnapshotHistory]:
+        """
+        获取游戏的快照历史，用于回放、撤销和审计
         
-        # 删除旧快照
-        for snapshot_id in to_remove_ids:
-            self._snapshots.pop(snapshot_id, None)
+        Args:
+            game_id: 游戏ID
+            
+        Returns:
+            Optional[SnapshotHistory]: 该游戏分区的快照历史；没有快照时返回None
+        """
+        if game_id not in self._partitions:
+            return None
+        return self._touch(game_id).history
+    
+    def list_partitions(self) -> List[SnapshotPartitionInfo]:
+        """
+        列出所有游戏分区
+        
+        Returns:
+            List[SnapshotPartitionInfo]: 分区统计信息，按最近使用时间从旧到新排列
+        """
+        return [
+            SnapshotPartitionInfo(
+                game_id=game_id,
+                snapshot_count=len(partition.history),
+                nbytes=partition.history.nbytes,
+                max_bytes=partition.max_bytes
+            )
+            for game_id, partition in self._partitions.items()
+        ]
+    
+    def set_partition_budget(self, game_id: str, max_bytes: int) -> None:
+        """
+        单独设置游戏分区的字节预算，超出时立即淘汰该分区最旧的快照
         
-        # 更新历史记录
-        self._snapshot_history = self._snapshot_history[to_remove_count:]
+        Args:
+            game_id: 游戏ID
+            max_bytes: 字节预算
+            
+        Raises:
+            ValueError: 当字节预算无效时
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes必须为正数，实际: {max_bytes}")
+        self._partition_budgets[game_id] = max_bytes
+        partition = self._partitions.get(game_id)
+        if partition is not None:
+            partition.max_bytes = max_bytes
+            self._enforce_partition_budget(game_id, partition)
     
-    def _create_player_snapshots(self, game_context: GameContext) -> tuple:
+    def drop_partition(self, game_id: str) -> bool:
+        """
+        删除游戏的快照分区及其结构共享状态，用于游戏被移除时释放内存
+        
+        Args:
+            game_id: 游戏ID
+            
+        Returns:
+            bool: 分区是否存在
+        """
+        self._shared_parts.pop(game_id, None)
+        self._partition_budgets.pop(game_id, None)
+        partition = self._partitions.pop(game_id, None)
+        if partition is None:
+            return False
+        for snapshot_id in partition.history.snapshot_ids():
+            if self._snapshot_history.get(snapshot_id) == game_id:
+                del self._snapshot_history[snapshot_id]
+        self._history_bytes -= partition.history.nbytes
+        return True
+    
+    def discard_shared_parts(self, game_id: str) -> None:
+        """
+        丢弃游戏用于结构共享的上一版快照部分，下次创建快照时完整重建
+        
+        Args:
+            game_id: 游戏ID
+        """
+        self._shared_parts.pop(game_id, None)
+    
+    def _create_player_snapshots(self, game_context: GameContext,
+                                 previous: Optional[_SharedParts] = None,
+                                 shared: Optional[_SharedParts] = None) -> tuple:
         """从游戏上下文的玩家信息创建玩家快照
         
         平衡修复：is_active表示"在游戏中且未弃牌"，但增强active_player_position逻辑
         这保持了原有语义的同时，通过active_player_position确保状态一致性
+        
+        结构共享：上一版由同一个游戏上下文和账本生成时，未被标记变化的玩家直接复用上一版的PlayerSnapshot，
+        整桌都未变化时直接复用整个元组；其余玩家的快照字段先组成输入键，与上一版（previous）相同时
+        同样复用。本版的输入键、快照和变化版本号写入shared，不修改previous。
         """
+        if previous is None:
+            previous = _SharedParts()
+        if shared is None:
+            shared = _SharedParts()
+        previous_entries = previous.player_entries
+        shared.record_versions(game_context)
+        if previous.unchanged(game_context):
+            # 自上一版以来没有任何变化，直接复用
+            shared.player_entries = previous_entries
+            shared.players = previous.players
+            return previous.players
+        
+        tracked = previous.tracks(game_context)
+        ledger = game_context.chip_ledger
+        entries: Dict[str, Tuple[tuple, PlayerSnapshot]] = {}
         player_snapshots = []
+        all_reused = len(previous_entries) == len(game_context.players)
         
         for player_id, player_data in game_context.players.items():
+            previous_entry = previous_entries.get(player_id)
+            if (tracked and previous_entry is not None
+                    and not game_context.player_changed_since(player_id, previous.context_version)
+                    and not ledger.changed_since(player_id, previous.ledger_version)):
+                # 未被标记变化的玩家直接复用，不计算输入键
+                entries[player_id] = previous_entry
+                player_snapshots.append(previous_entry[1])
+                continue
+            
             # 处理手牌
-            hole_cards = ()
-            if 'hole_cards' in player_data and player_data['hole_cards']:
-                hole_cards = tuple(player_data['hole_cards'])
+            hole_cards = player_data.get('hole_cards')
+            hole_cards = tuple(hole_cards) if hole_cards else ()
             
             # 平衡修复：is_active保持原有语义（在游戏中且未弃牌），
             # 但通过增强的active_player_position逻辑确保状态一致性
-            base_active = player_data.get('active', False)
-            player_status = player_data.get('status', 'active')
-            
             # is_active表示"在游戏中且未弃牌"
-            is_in_hand = base_active and player_status not in ['folded', 'out']
+            is_in_hand = _is_in_hand(player_data)
             
             # (Phase 4 Fix) 从ChipLedger获取筹码的唯一真实来源
             chips = game_context.chip_ledger.get_balance(player_id)
             
-            player_snapshot = PlayerSnapshot(
-                player_id=player_id,
-                name=player_data.get('name', player_id),
-                chips=chips, # 修复：使用ChipLedger的真实筹码
-                hole_cards=hole_cards,
-                position=player_data.get('position', 0),
-                is_active=is_in_hand,  # 修复：在游戏中且未弃牌
-                is_all_in=player_data.get('is_all_in', False),
-                current_bet=player_data.get('current_bet', 0),
-                total_bet_this_hand=player_data.get('total_bet_this_hand', 0),
-                last_action=player_data.get('last_action')
+            key = (
+                player_data.get('name', player_id),
+                chips,
+                hole_cards,
+                player_data.get('position', 0),
+                is_in_hand,
+                player_data.get('is_all_in', False),
+                player_data.get('current_bet', 0),
+                player_data.get('total_bet_this_hand', 0),
+                player_data.get('last_action'),
             )
+            
+            if previous_entry is not None and previous_entry[0] == key:
+                player_snapshot = previous_entry[1]
+            else:
+                all_reused = False
+                name, chips, hole_cards, position, is_in_hand, is_all_in, current_bet, total_bet, last_action = key
+                player_snapshot = PlayerSnapshot(
+                    player_id=player_id,
+                    name=name,
+                    chips=chips, # 修复：使用ChipLedger的真实筹码
+                    hole_cards=hole_cards,
+                    position=position,
+                    is_active=is_in_hand,  # 修复：在游戏中且未弃牌
+                    is_all_in=is_all_in,
+                    current_bet=current_bet,
+                    total_bet_this_hand=total_bet,
+                    last_action=last_action
+                )
+            entries[player_id] = (key, player_snapshot)
             player_snapshots.append(player_snapshot)
         
-        return tuple(player_snapshots)
+        # 玩家集合和顺序都未变化时复用整个元组
+        if all_reused and list(previous_entries) == list(entries):
+            players = previous.players
+        else:
+            players = tuple(player_snapshots)
+        shared.player_entries = entries
+        shared.players = players
+        return players
     
-    def _create_pot_snapshot(self, game_context: GameContext) -> PotSnapshot:
-        """从游戏上下文创建奖池快照"""
-        total_pot = sum(game_context.current_hand_bets.values())
-        
-        eligible_players = set(game_context.current_hand_bets.keys())
-        for p_id, p_data in game_context.players.items():
-            if p_data.get('status') not in ['folded', 'out']:
-                eligible_players.add(p_id)
-
-        return PotSnapshot(
-            main_pot=total_pot,  # 简化，真实边池由PotManager在结算时计算
-            side_pots=(),
-            total_pot=total_pot,
-            eligible_players=tuple(sorted(list(eligible_players)))
-        )
+    def _create_pot_snapshot(self, game_context: GameContext,
+                             previous: Optional[_SharedParts] = None,
+                             shared: Optional[_SharedParts] = None) -> PotSnapshot:
+        """从游戏上下文创建奖池快照，没有任何变化或输入与上一版（previous）相同时复用，本版的输入键和快照写入shared"""
+        if previous is not None and previous.pot is not None and previous.unchanged(game_context):
+            key, pot = previous.pot_key, previous.pot
+        else:
+            key = _pot_inputs(game_context)
+            if previous is not None and previous.pot is not None and previous.pot_key == key:
+                pot = previous.pot
+            else:
+                pot = _pot_snapshot(*key)
+        if shared is not None:
+            shared.pot_key = key
+            shared.pot = pot
+        return pot
     
     def _get_active_player_position(self, game_context: GameContext) -> Optional[int]:
         """获取当前活跃玩家的位置
         
-        修复：与状态机保持完全一致的可行动性检查逻辑
+        修复：与状态机保持完全一致的可行动性检查逻辑。
+        优先使用game_context.active_player_id，该玩家不可行动时取第一个可行动的玩家。
         """
-        # 首先尝试使用game_context.active_player_id，但要严格验证
-        if game_context.active_player_id:
-            player_data = game_context.players.get(game_context.active_player_id)
-            if player_data and self._is_player_actionable(game_context, game_context.active_player_id):
-                return player_data.get('position', 0)
-        
-        # 如果active_player_id指向的玩家不活跃，或者没有active_player_id，
-        # 则寻找第一个真正活跃的玩家
-        for player_id, player_data in game_context.players.items():
-            if self._is_player_actionable(game_context, player_id):
-                return player_data.get('position', 0)
-        
-        return None
+        return _active_player_position(game_context)
     
     def _is_player_actionable(self, game_context: GameContext, player_id: str) -> bool:
         """检查玩家是否可以行动（与状态机逻辑完全一致）
@@ -311,16 +594,8 @@ class SnapshotManager:
         
         注意：all_in玩家虽然active=True，但chips=0，所以不可行动
         """
-        if player_id not in game_context.players:
-            return False
-            
-        player_data = game_context.players[player_id]
-        
-        return (
-            player_data.get('active', False) and 
-            player_data.get('chips', 0) > 0 and 
-            player_data.get('status', 'active') not in ['folded', 'out']
-        )
+        player_data = game_context.players.get(player_id)
+        return bool(player_data) and _is_actionable(player_data)
     
     def _restore_players_from_snapshot(self, player_snapshots: tuple) -> Dict[str, Any]:
         """从玩家快照恢复玩家信息
@@ -364,13 +639,52 @@ class SnapshotManager:
     
     def _store_snapshot(self, snapshot: GameStateSnapshot):
         """存储快照并管理历史记录"""
-        if len(self._snapshot_history) >= self._max_history_size:
-            # 移除最旧的快照ID和对象
-            oldest_id = self._snapshot_history.pop(0)
-            self._snapshots.pop(oldest_id, None)
-            
-        self._snapshots[snapshot.metadata.snapshot_id] = snapshot
-        self._snapshot_history.append(snapshot.metadata.snapshot_id)
+        game_id = snapshot.game_id
+        partition = self._partitions.get(game_id)
+        if partition is None:
+            partition = self._partitions[game_id] = _SnapshotPartition(
+                history=SnapshotHistory(self._keyframe_interval),
+                max_bytes=self._partition_budgets.get(game_id, self._partition_max_bytes)
+            )
+        else:
+            self._partitions.move_to_end(game_id)
+        
+        self._history_bytes += partition.history.append(snapshot)
+        snapshot_id = snapshot.metadata.snapshot_id
+        self._snapshot_history.pop(snapshot_id, None)
+        self._snapshot_history[snapshot_id] = game_id
+        
+        # 先执行本分区的预算，再按LRU执行总预算；每个分区至少保留最新的一个快照
+        self._enforce_partition_budget(game_id, partition)
+        while self._history_bytes > self._max_total_bytes:
+            lru_game_id = next(iter(self._partitions))
+            if lru_game_id == game_id and len(partition.history) <= 1:
+                break
+            self._evict_from(lru_game_id)
+    
+    def _enforce_partition_budget(self, game_id: str, partition: _SnapshotPartition):
+        """淘汰分区最旧的快照直到满足分区预算（FULL模式还有数量上限）"""
+        history = partition.history
+        while len(history) > 1 and (
+                history.nbytes > partition.max_bytes
+                or (self._history_mode is SnapshotHistoryMode.FULL and len(history) > self._max_history_size)):
+            self._evict_from(game_id)
+    
+    def _evict_from(self, game_id: str):
+        """淘汰分区最旧的快照，分区为空时删除分区"""
+        partition = self._partitions[game_id]
+        history = partition.history
+        snapshot_id, freed = history.pop_oldest()
+        self._history_bytes -= freed
+        if snapshot_id not in history and self._snapshot_history.get(snapshot_id) == game_id:
+            del self._snapshot_history[snapshot_id]
+        if not len(history):
+            del self._partitions[game_id]
+    
+    def _touch(self, game_id: str) -> _SnapshotPartition:
+        """把分区标记为最近使用"""
+        self._partitions.move_to_end(game_id)
+        return self._partitions[game_id]
 
 # 全局单例
 _snapshot_manager_instance: Optional[SnapshotManager] = None
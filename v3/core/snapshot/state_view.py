@@ -0,0 +1,272 @@
+"""
+游戏状态只读视图
+
+GameStateView直接包装实时的GameContext，提供与GameStateSnapshot相同的属性，
+每次访问属性时从上下文读取当前值，不复制玩家、奖池或公共牌，也不登记到快照历史。
+用于进程内的查询；需要跨进程传递或持久化时再通过materialize创建完整快照。
+
+视图与SnapshotManager共用本模块的字段推导规则（玩家是否仍在手牌中、当前行动玩家位置、
+奖池、盲注位置），保证视图读到的值与同一时刻创建的快照一致。
+"""
+
+import time
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+from .types import PotSnapshot, SnapshotMetadata, SnapshotVersion
+from ..state_machine.types import GameContext, GamePhase
+from ..deck.card import Card
+from ..chips.chip_transaction import ChipTransaction
+
+if TYPE_CHECKING:
+    from .types import GameStateSnapshot
+    from .snapshot_manager import SnapshotManager
+
+__all__ = ['GameStateView', 'PlayerStateView']
+
+# 不再参与当前手牌的玩家状态
+_OUT_OF_HAND_STATUSES = ('folded', 'out')
+
+
+def _is_in_hand(player_data: Dict[str, Any]) -> bool:
+    """玩家是否在游戏中且未弃牌（包括all-in玩家）"""
+    return player_data.get('active', False) and player_data.get('status', 'active') not in _OUT_OF_HAND_STATUSES
+
+
+def _is_actionable(player_data: Dict[str, Any]) -> bool:
+    """玩家是否可以行动（与状态机逻辑一致）：仍在手牌中且有筹码"""
+    return _is_in_hand(player_data) and player_data.get('chips', 0) > 0
+
+
+def _active_player_position(game_context: GameContext) -> Optional[int]:
+    """当前行动玩家的位置；active_player_id不可行动时取第一个可行动的玩家"""
+    if game_context.active_player_id:
+        player_data = game_context.players.get(game_context.active_player_id)
+        if player_data and _is_actionable(player_data):
+            return player_data.get('position', 0)
+
+    for player_data in game_context.players.values():
+        if _is_actionable(player_data):
+            return player_data.get('position', 0)
+
+    return None
+
+
+def _blind_positions(player_count: int) -> Tuple[int, int, int]:
+    """庄家、小盲、大盲位置"""
+    small_blind_position = 1 % player_count if player_count > 1 else 0
+    big_blind_position = 2 % player_count if player_count > 2 else (1 if player_count > 1 else 0)
+    return 0, small_blind_position, big_blind_position
+
+
+def _pot_snapshot(bets: Tuple[Tuple[str, int], ...], in_hand: Tuple[str, ...]) -> PotSnapshot:
+    """由本手牌各玩家的下注和仍在手牌中的玩家创建奖池快照"""
+    total_pot = sum(amount for _, amount in bets)
+    eligible_players = {player_id for player_id, _ in bets}
+    eligible_players.update(in_hand)
+    return PotSnapshot(
+        main_pot=total_pot,  # 简化，真实边池由PotManager在结算时计算
+        side_pots=(),
+        total_pot=total_pot,
+        eligible_players=tuple(sorted(eligible_players))
+    )
+
+
+def _pot_inputs(game_context: GameContext) -> Tuple[Tuple[Tuple[str, int], ...], Tuple[str, ...]]:
+    """奖池快照的输入：本手牌各玩家的下注、仍在手牌中的玩家"""
+    bets = tuple(game_context.current_hand_bets.items())
+    in_hand = tuple(player_id for player_id, player_data in game_context.players.items()
+                    if player_data.get('status') not in _OUT_OF_HAND_STATUSES)
+    return bets, in_hand
+
+
+class PlayerStateView:
+    """
+    玩家状态只读视图
+
+    属性与PlayerSnapshot相同，筹码从ChipLedger读取。
+    """
+
+    __slots__ = ('_context', '_player_id', '_data')
+
+    def __init__(self, game_context: GameContext, player_id: str, player_data: Dict[str, Any]) -> None:
+        self._context = game_context
+        self._player_id = player_id
+        self._data = player_data
+
+    def __repr__(self) -> str:
+        return f"PlayerStateView(player_id={self._player_id!r}, chips={self.chips})"
+
+    @property
+    def player_id(self) -> str:
+        return self._player_id
+
+    @property
+    def name(self) -> str:
+        return self._data.get('name', self._player_id)
+
+    @property
+    def chips(self) -> int:
+        return self._context.chip_ledger.get_balance(self._player_id)
+
+    @property
+    def hole_cards(self) -> Tuple[Card, ...]:
+        hole_cards = self._data.get('hole_cards')
+        return tuple(hole_cards) if hole_cards else ()
+
+    @property
+    def position(self) -> int:
+        return self._data.get('position', 0)
+
+    @property
+    def is_active(self) -> bool:
+        return _is_in_hand(self._data)
+
+    @property
+    def is_all_in(self) -> bool:
+        return self._data.get('is_all_in', False)
+
+    @property
+    def current_bet(self) -> int:
+        return self._data.get('current_bet', 0)
+
+    @property
+    def total_bet_this_hand(self) -> int:
+        return self._data.get('total_bet_this_hand', 0)
+
+    @property
+    def last_action(self) -> Optional[str]:
+        return self._data.get('last_action')
+
+
+class GameStateView:
+    """
+    游戏状态只读视图
+
+    属性与GameStateSnapshot相同，读取的是实时状态：在视图创建之后发生的变化也会反映出来。
+    视图本身不可修改，但不保证多次读取之间状态不变；需要某一时刻的一致副本时使用materialize。
+
+    Examples:
+        >>> view = GameStateView(context)
+        >>> view.get_player_by_id("player1").chips
+        1000
+        >>> snapshot = view.materialize(snapshot_manager)  # 需要持久化时
+    """
+
+    __slots__ = ('_context', '_hand_number', '_created_at', '_metadata')
+
+    def __init__(self, game_context: GameContext, hand_number: int = 1) -> None:
+        """
+        创建视图
+
+        Args:
+            game_context: 实时游戏上下文
+            hand_number: 手牌编号，用于metadata和materialize
+        """
+        self._context = game_context
+        self._hand_number = hand_number
+        self._created_at = time.time()
+        self._metadata: Optional[SnapshotMetadata] = None
+
+    def __repr__(self) -> str:
+        return f"GameStateView(game_id={self.game_id!r}, phase={self.phase.name})"
+
+    @property
+    def metadata(self) -> SnapshotMetadata:
+        """视图的元数据，首次访问时创建"""
+        if self._metadata is None:
+            self._metadata = SnapshotMetadata(
+                snapshot_id=f"view_{self.game_id}_{int(self._created_at * 1000000)}",
+                version=SnapshotVersion.CURRENT,
+                created_at=self._created_at,
+                game_duration=0.0,
+                hand_number=self._hand_number,
+                description=f"游戏状态视图 - {self.phase.name}"
+            )
+        return self._metadata
+
+    @property
+    def game_id(self) -> str:
+        return self._context.game_id
+
+    @property
+    def phase(self) -> GamePhase:
+        return self._context.current_phase
+
+    @property
+    def players(self) -> Tuple[PlayerStateView, ...]:
+        return tuple(PlayerStateView(self._context, player_id, player_data)
+                     for player_id, player_data in self._context.players.items())
+
+    @property
+    def pot(self) -> PotSnapshot:
+        return _pot_snapshot(*_pot_inputs(self._context))
+
+    @property
+    def community_cards(self) -> Tuple[Card, ...]:
+        return tuple(self._context.community_cards)
+
+    @property
+    def current_bet(self) -> int:
+        return self._context.current_bet
+
+    @property
+    def dealer_position(self) -> int:
+        return _blind_positions(len(self._context.players))[0]
+
+    @property
+    def small_blind_position(self) -> int:
+        return _blind_positions(len(self._context.players))[1]
+
+    @property
+    def big_blind_position(self) -> int:
+        return _blind_positions(len(self._context.players))[2]
+
+    @property
+    def active_player_position(self) -> Optional[int]:
+        return _active_player_position(self._context)
+
+    @property
+    def small_blind_amount(self) -> int:
+        return self._context.small_blind
+
+    @property
+    def big_blind_amount(self) -> int:
+        return self._context.big_blind
+
+    @property
+    def recent_transactions(self) -> Tuple[ChipTransaction, ...]:
+        return ()
+
+    def get_player_by_id(self, player_id: str) -> Optional[PlayerStateView]:
+        """根据ID获取玩家视图"""
+        player_data = self._context.players.get(player_id)
+        if player_data is None:
+            return None
+        return PlayerStateView(self._context, player_id, player_data)
+
+    def get_active_players(self) -> Tuple[PlayerStateView, ...]:
+        """获取活跃玩家列表"""
+        return tuple(p for p in self.players if p.is_active)
+
+    def get_total_chips(self) -> int:
+        """获取所有玩家的筹码总数"""
+        ledger = self._context.chip_ledger
+        return sum(ledger.get_balance(player_id) for player_id in self._context.players) + self.pot.total_pot
+
+    def materialize(self, snapshot_manager: Optional['SnapshotManager'] = None,
+                    description: Optional[str] = None) -> 'GameStateSnapshot':
+        """
+        创建当前状态的完整快照并登记到快照历史
+
+        Args:
+            snapshot_manager: 快照管理器；为None时使用全局快照管理器
+            description: 快照描述
+
+        Returns:
+            GameStateSnapshot: 创建的游戏状态快照
+        """
+        if snapshot_manager is None:
+            from .snapshot_manager import get_snapshot_manager
+            snapshot_manager = get_snapshot_manager()
+        return snapshot_manager.create_snapshot(self._context, hand_number=self._hand_number,
+                                                description=description)
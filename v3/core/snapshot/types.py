@@ -98,6 +98,16 @@ class SnapshotMetadata:
         if self.hand_number < 0:
             raise ValueError("hand_number不能为负数")
 
+    @staticmethod
+    def default_snapshot_id(game_id: str, created_at: float) -> str:
+        """由游戏ID和创建时间（微秒）组成的默认快照ID"""
+        return f"snapshot_{game_id}_{int(created_at * 1000000)}"
+
+    @staticmethod
+    def default_description(phase: GamePhase) -> str:
+        """未指定描述时使用的默认快照描述"""
+        return f"游戏快照 - {phase.name}"
+
 
 @dataclass(frozen=True)
 class GameStateSnapshot:
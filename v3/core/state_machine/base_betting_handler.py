@@ -45,6 +45,7 @@ class BaseBettingHandler(BasePhaseHandler):
             if amount_to_freeze > 0:
                 ctx.chip_ledger.freeze_chips(player_id, amount_to_freeze, "Action: CALL")
                 ctx.current_hand_bets[player_id] += amount_to_freeze
+                ctx.pot_tracker.add_bet(player_id, amount_to_freeze)
                 if amount_to_freeze >= player_balance:
                     player_data['status'] = 'all_in'
 
@@ -55,6 +56,7 @@ class BaseBettingHandler(BasePhaseHandler):
             
             ctx.chip_ledger.freeze_chips(player_id, amount_to_freeze, "Action: RAISE")
             ctx.current_hand_bets[player_id] = total_bet_amount
+            ctx.pot_tracker.set_bet(player_id, total_bet_amount)
             ctx.current_bet = total_bet_amount
             
             if amount_to_freeze >= player_balance:
@@ -69,6 +71,7 @@ class BaseBettingHandler(BasePhaseHandler):
                 ctx.chip_ledger.freeze_chips(player_id, amount_to_freeze, "Action: ALL_IN")
                 new_total_bet = player_current_bet + amount_to_freeze
                 ctx.current_hand_bets[player_id] = new_total_bet
+                ctx.pot_tracker.set_bet(player_id, new_total_bet)
                 player_data['status'] = 'all_in'
                 
                 if new_total_bet > ctx.current_bet:
@@ -78,6 +81,7 @@ class BaseBettingHandler(BasePhaseHandler):
             return GameEvent("INVALID_ACTION", {"reason": f"未知行动 {action_type}"}, self.phase)
 
         player_data['has_acted_this_round'] = True
+        ctx.mark_player_changed(player_id)
         return self._determine_next_step(ctx)
 
     def _determine_next_step(self, ctx: GameContext) -> GameEvent:
@@ -213,4 +217,5 @@ class BaseBettingHandler(BasePhaseHandler):
                 player_data['current_bet'] = 0
 
         # We also need to reset the round's `current_bet` to 0 so players can check.
-        ctx.current_bet = 0 
\ No newline at end of file
+        ctx.current_bet = 0
+        ctx.mark_changed() 
\ No newline at end of file
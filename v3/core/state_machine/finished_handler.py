@@ -75,6 +75,7 @@ class FinishedHandler(BasePhaseHandler):
         ctx.active_player_id = None
         ctx.winners_this_hand = []
         ctx.current_hand_bets.clear() # 清理本手牌的下注记录
+        ctx.pot_tracker.reset()
         
         logger.info("已完成手牌清理，准备下一手。")
 
@@ -76,6 +76,8 @@ class GameStateMachine:
         target_handler = self.get_handler()
         if hasattr(target_handler, 'on_enter'):
             target_handler.on_enter(ctx)
+        # 阶段处理器可能批量修改了玩家状态
+        ctx.mark_changed()
 
         # 记录转换历史
         self._transition_history.append({
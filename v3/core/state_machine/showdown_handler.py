@@ -9,6 +9,7 @@ from ..pot.pot_manager import PotManager
 from ..chips.chip_ledger import ChipLedger
 from ..eval.evaluator import HandEvaluator
 from ..eval.types import HandResult
+from ..eval.showdown import ShowdownRanking, rank_showdown
 
 __all__ = ['ShowdownHandler']
 
@@ -17,6 +18,7 @@ class ShowdownHandler(BasePhaseHandler):
     
     def __init__(self):
         super().__init__(GamePhase.SHOWDOWN)
+        self._evaluator = HandEvaluator()
     
     def on_enter(self, ctx: GameContext) -> None:
         """进入摊牌阶段"""
@@ -76,34 +78,21 @@ class ShowdownHandler(BasePhaseHandler):
             return
 
         # 多个玩家摊牌
-        player_hand_results: Dict[str, HandResult] = {}
-        for p_id, p_data in showdown_players_data.items():
-            hole_cards = p_data.get('hole_cards', [])
-            if not hole_cards:
-                 logger.error(f"玩家 {p_id} 参与摊牌但没有手牌！这是一个严重错误。")
-                 hand_strength = -1
-                 hand_rank_str = "Error: No cards"
-            else:
-                hand_strength, hand_rank_str = HandEvaluator.evaluate_hand(hole_cards, ctx.community_cards)
-            
-            p_data['hand_rank_str'] = hand_rank_str
-            logger.info(f"[手牌评估] 玩家 {p_id} 的手牌: {p_data['hole_cards']}, 公共牌: {ctx.community_cards}, 牌力: {hand_rank_str}")
-            
-            player_hand_results[p_id] = HandResult(
-                player_id=p_id, 
-                hand_strength=hand_strength, 
-                hand_rank_str=hand_rank_str, 
-                kickers=[] # 注意：当前HandEvaluator未实现Kickers
-            )
+        ranking = self._rank_showdown_players(ctx, showdown_players_data)
+        player_hand_results = ranking.results
 
         # 使用PotManager和ChipLedger进行结算
         pot_manager = PotManager(ctx.chip_ledger)
         
-        side_pots = pot_manager.calculate_side_pots(ctx.current_hand_bets)
+        # 下注过程中已增量维护边池；若下注记录被绕过跟踪器修改，则重新计算
+        if ctx.pot_tracker.matches(ctx.current_hand_bets):
+            side_pots = ctx.pot_tracker.side_pots()
+        else:
+            side_pots = pot_manager.calculate_side_pots(ctx.current_hand_bets)
         pots_str = ", ".join([f'{sp.pot_id}({sp.amount})' for sp in side_pots])
         logger.info(f"计算出的边池结构: [{pots_str}]")
 
-        winnings = pot_manager.distribute_pots(side_pots, player_hand_results)
+        winnings = pot_manager.distribute_pots_by_ranking(side_pots, ranking)
         logger.info(f"底池分配结果: {winnings}")
 
         # 构建最终的结算交易
@@ -120,7 +109,7 @@ class ShowdownHandler(BasePhaseHandler):
                 ctx.winners_this_hand.append({
                     'player_id': p_id,
                     'amount': amount,
-                    'hand_rank': player_hand_results[p_id].hand_rank_str,
+                    'hand_rank': str(player_hand_results[p_id]),
                 })
         
         # 验证筹码守恒 (可选的调试步骤)
@@ -130,4 +119,62 @@ class ShowdownHandler(BasePhaseHandler):
 
 
         ctx.pot_total = 0
-        logger.info("[游戏流程] 摊牌阶段结束，底池分配和筹码结算完成。") 
\ No newline at end of file
+        logger.info("[游戏流程] 摊牌阶段结束，底池分配和筹码结算完成。") 
+
+    def _rank_showdown_players(self, ctx: GameContext,
+                               showdown_players_data: Dict[str, Dict[str, Any]]) -> ShowdownRanking:
+        """
+        一次性评估并排名所有摊牌玩家。
+
+        公共牌只计算一次；若有玩家的手牌无法评估，则退回逐个评估，
+        跳过出错的玩家并在其数据中记录错误信息。
+
+        Args:
+            ctx: 游戏上下文
+            showdown_players_data: 参与摊牌的玩家数据
+
+        Returns:
+            摊牌排名
+        """
+        logger = logging.getLogger(__name__)
+        hole_cards_by_player = {}
+        for p_id, p_data in showdown_players_data.items():
+            hole_cards = p_data.get('hole_cards', [])
+            if not hole_cards:
+                logger.error(f"玩家 {p_id} 参与摊牌但没有手牌！这是一个严重错误。")
+                p_data['hand_rank_str'] = "Error: No cards"
+                continue
+            hole_cards_by_player[p_id] = list(hole_cards)
+
+        try:
+            ranking = rank_showdown(hole_cards_by_player, list(ctx.community_cards))
+        except (TypeError, ValueError):
+            ranking = ShowdownRanking.from_results(self._evaluate_players_individually(ctx, hole_cards_by_player))
+
+        for p_id, hand_result in ranking.results.items():
+            p_data = showdown_players_data[p_id]
+            p_data['hand_rank_str'] = str(hand_result)
+            logger.info(f"[手牌评估] 玩家 {p_id} 的手牌: {p_data['hole_cards']}, 公共牌: {ctx.community_cards}, 牌力: {hand_result}")
+        return ranking
+
+    def _evaluate_players_individually(self, ctx: GameContext,
+                                       hole_cards_by_player: Dict[str, List[Any]]) -> Dict[str, HandResult]:
+        """
+        逐个评估玩家手牌，跳过无法评估的玩家。
+
+        Args:
+            ctx: 游戏上下文
+            hole_cards_by_player: 玩家ID -> 手牌
+
+        Returns:
+            可以评估的玩家的手牌评估结果
+        """
+        logger = logging.getLogger(__name__)
+        player_hand_results: Dict[str, HandResult] = {}
+        for p_id, hole_cards in hole_cards_by_player.items():
+            try:
+                player_hand_results[p_id] = self._evaluator.evaluate_hand(hole_cards, list(ctx.community_cards))
+            except (TypeError, ValueError) as e:
+                logger.error(f"玩家 {p_id} 的手牌无法评估: {e}")
+                ctx.players[p_id]['hand_rank_str'] = f"Error: {e}"
+        return player_hand_results
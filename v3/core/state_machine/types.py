@@ -8,6 +8,7 @@ from enum import Enum, auto
 from typing import Protocol, Dict, Optional, Any
 from dataclasses import dataclass, field
 from v3.core.chips.chip_ledger import ChipLedger
+from v3.core.pot.side_pot_tracker import SidePotTracker
 
 __all__ = [
     'GamePhase',
@@ -54,6 +55,11 @@ class GameContext:
     active_player_id: Optional[str] = None
     last_event: Optional['GameEvent'] = None
     game_events: list = field(default_factory=list)
+    pot_tracker: SidePotTracker = field(default_factory=SidePotTracker, compare=False, repr=False)  # 随每次下注增量更新的边池结构
+    # 变化版本号：直接修改players中的玩家字典后调用mark_player_changed或mark_changed递增，供快照增量重建
+    state_version: int = field(default=0, init=False, compare=False, repr=False)
+    _player_versions: Dict[str, int] = field(default_factory=dict, init=False, compare=False, repr=False)
+    _all_players_version: int = field(default=0, init=False, compare=False, repr=False)
     
     def __post_init__(self):
         """验证游戏上下文的有效性"""
@@ -67,6 +73,36 @@ class GameContext:
             raise ValueError("big_blind必须大于0")
         if self.big_blind <= self.small_blind:
             raise ValueError("big_blind必须大于small_blind")
+        if self.current_hand_bets:
+            self.pot_tracker.sync(self.current_hand_bets)
+    
+    def mark_player_changed(self, player_id: str) -> None:
+        """
+        标记某个玩家的状态已变化（修改了players中该玩家的字典）
+        
+        Args:
+            player_id: 玩家ID
+        """
+        self.state_version += 1
+        self._player_versions[player_id] = self.state_version
+    
+    def mark_changed(self) -> None:
+        """标记所有玩家的状态都可能已变化（阶段转换、开始新手牌等批量修改）"""
+        self.state_version += 1
+        self._all_players_version = self.state_version
+    
+    def player_changed_since(self, player_id: str, version: int) -> bool:
+        """
+        玩家的状态在版本version之后是否被标记为变化
+        
+        Args:
+            player_id: 玩家ID
+            version: 之前读取的state_version
+            
+        Returns:
+            是否被标记为变化
+        """
+        return max(self._all_players_version, self._player_versions.get(player_id, 0)) > version
 
 
 class PhaseHandler(Protocol):
@@ -236,6 +236,9 @@ def _is_mock_object_enhanced(obj: Any) -> bool:
     
     obj_type_name = type(obj).__name__
     obj_module_name = type(obj).__module__
+    if not isinstance(obj_module_name, str):
+        # 部分扩展类型（如NumPy）的__module__是描述符而不是字符串
+        obj_module_name = ''
     
     # 如果是Python内置类型，直接返回False
     if obj_type_name in builtin_types_whitelist:
@@ -285,8 +288,13 @@ def _is_mock_object_enhanced(obj: Any) -> bool:
         ]
         mock_attr_count = 0
         for attr in mock_attributes:
-            if hasattr(obj, attr):
-                mock_attr_count += 1
+            try:
+                if hasattr(obj, attr):
+                    mock_attr_count += 1
+            except Exception:
+                # 部分对象的__getattr__会抛出非AttributeError异常
+                # （如NumPy加载的ctypes.LibraryLoader会尝试打开同名动态库）
+                continue
         
         # 如果有多个mock特有属性，很可能是mock对象
         if mock_attr_count >= 2:
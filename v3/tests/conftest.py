@@ -95,6 +95,30 @@ def prevent_mock_usage(request):
                 request.addfinalizer(restore_module)
 
 
+@pytest.fixture
+def game_context_factory():
+    """游戏上下文工厂fixture：创建翻牌前、尚无下注的GameContext，玩家ID为player0、player1..."""
+    from v3.core.state_machine.types import GameContext, GamePhase
+    from v3.core.chips.chip_ledger import ChipLedger
+
+    def _create_context(game_id: str = "test_game", player_count: int = 4, chips: int = 10000) -> GameContext:
+        """创建游戏上下文，每名玩家的筹码相同"""
+        player_ids = [f"player{i}" for i in range(player_count)]
+        return GameContext(
+            game_id=game_id,
+            current_phase=GamePhase.PRE_FLOP,
+            players={
+                player_id: {'name': player_id, 'position': i, 'active': True, 'status': 'active',
+                            'current_bet': 0, 'total_bet_this_hand': 0}
+                for i, player_id in enumerate(player_ids)
+            },
+            chip_ledger=ChipLedger({player_id: chips for player_id in player_ids}),
+            community_cards=[],
+            current_bet=0,
+        )
+    return _create_context
+
+
 @pytest.fixture
 def chip_conservation_tracker():
     """筹码守恒跟踪器fixture"""
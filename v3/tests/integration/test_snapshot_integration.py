@@ -9,14 +9,16 @@ import pytest
 import time
 import tempfile
 import os
+from unittest.mock import patch
 
 from v3.core.snapshot.types import (
     GameStateSnapshot, PlayerSnapshot, PotSnapshot, SnapshotMetadata,
     SnapshotVersion
 )
-from v3.core.snapshot.snapshot_manager import SnapshotManager
-from v3.core.snapshot.serializer import SnapshotSerializer
-from v3.core.state_machine.types import GamePhase
+from v3.core.snapshot.snapshot_manager import SnapshotManager, SnapshotCreationError
+from v3.core.snapshot.serializer import SnapshotSerializer, DeserializationError
+from v3.core.state_machine.types import GamePhase, GameContext
+from v3.core.chips.chip_ledger import ChipLedger
 from v3.core.deck.card import Card
 from v3.core.deck.types import Suit, Rank
 from v3.core.chips.chip_transaction import ChipTransaction, TransactionType
@@ -185,6 +187,88 @@ class TestSnapshotIntegration:
         assert rest_tx.transaction_id == orig_tx.transaction_id
         assert rest_tx.amount == orig_tx.amount
     
+    def test_snapshot_structural_sharing(self):
+        """测试同一游戏的连续快照共享未变化的玩家和奖池对象"""
+        manager = SnapshotManager()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(manager, "SnapshotManager")
+        
+        player_ids = [f"player{i}" for i in range(6)]
+        context = GameContext(
+            game_id="sharing_test",
+            current_phase=GamePhase.PRE_FLOP,
+            players={
+                player_id: {'name': player_id, 'chips': 1000, 'position': i, 'active': True,
+                            'status': 'active', 'current_bet': 0, 'total_bet_this_hand': 0,
+                            'hole_cards': [Card(Suit.HEARTS, Rank.ACE), Card(Suit.SPADES, Rank(i + 2))]}
+                for i, player_id in enumerate(player_ids)
+            },
+            chip_ledger=ChipLedger({player_id: 1000 for player_id in player_ids}),
+            community_cards=[],
+            current_bet=0,
+        )
+        
+        first = manager.create_snapshot(context)
+        second = manager.create_snapshot(context)
+        assert second.players is first.players
+        assert second.pot is first.pot
+        
+        # 只有行动的玩家和奖池被重建
+        context.chip_ledger.deduct_chips("player3", 100)
+        context.players["player3"]['current_bet'] = 100
+        context.players["player3"]['total_bet_this_hand'] = 100
+        context.current_hand_bets["player3"] = 100
+        third = manager.create_snapshot(context)
+        assert third.players is not second.players
+        assert third.pot is not second.pot
+        assert third.pot.total_pot == 100
+        for before, after in zip(second.players, third.players):
+            if after.player_id == "player3":
+                assert after is not before
+                assert after.chips == 900
+                assert after.current_bet == 100
+            else:
+                assert after is before
+        
+        # 社区牌元组未变化时同样被复用
+        context.community_cards = [Card(Suit.CLUBS, Rank.KING)]
+        fourth = manager.create_snapshot(context)
+        fifth = manager.create_snapshot(context)
+        assert fifth.community_cards is fourth.community_cards
+        assert fifth.players is third.players
+        
+        # 快照构造失败（公共牌超过5张）时不替换共享部分
+        context.players["player0"]['last_action'] = 'call'
+        context.community_cards = [Card(Suit.CLUBS, Rank(i + 2)) for i in range(6)]
+        with pytest.raises(SnapshotCreationError):
+            manager.create_snapshot(context)
+        context.players["player0"]['last_action'] = None
+        context.community_cards = [Card(Suit.CLUBS, Rank.KING)]
+        sixth = manager.create_snapshot(context)
+        assert sixth.players is fifth.players
+        assert sixth.community_cards is fifth.community_cards
+        
+        # 只重建被标记变化的玩家，其余玩家不再读取输入
+        context.players["player0"]['last_action'] = 'fold'
+        context.mark_player_changed("player0")
+        with patch.object(context.chip_ledger, 'get_balance', wraps=context.chip_ledger.get_balance) as get_balance:
+            seventh = manager.create_snapshot(context)
+        assert [c.args for c in get_balance.call_args_list] == [("player0",)]
+        assert seventh.players[0].last_action == 'fold'
+        assert seventh.players[1:] == sixth.players[1:]
+        assert all(a is b for a, b in zip(seventh.players[1:], sixth.players[1:]))
+        assert seventh.pot is sixth.pot
+        context.players["player0"]['last_action'] = None
+        context.mark_player_changed("player0")
+        
+        # 丢弃共享部分后完整重建，内容不变
+        manager.discard_shared_parts("sharing_test")
+        rebuilt = manager.create_snapshot(context)
+        assert rebuilt.players is not fifth.players
+        assert rebuilt.players == fifth.players
+        assert rebuilt.pot == fifth.pot
+    
     def test_snapshot_manager_persistence(self):
         """测试快照管理器的持久化功能"""
         manager = SnapshotManager()
@@ -307,6 +391,86 @@ class TestSnapshotIntegration:
             if os.path.exists(temp_path):
                 os.unlink(temp_path)
     
+    def test_snapshot_binary_round_trip(self):
+        """测试二进制格式与JSON格式精确往返一致"""
+        timestamp = time.time()
+        snapshot = GameStateSnapshot(
+            metadata=SnapshotMetadata(
+                snapshot_id="binary_test",
+                version=SnapshotVersion.V1_0,
+                created_at=timestamp,
+                game_duration=12.5,
+                hand_number=7,
+                description=None
+            ),
+            game_id="二进制测试",
+            phase=GamePhase.TURN,
+            players=(
+                PlayerSnapshot(
+                    player_id="player1",
+                    name="张三",
+                    chips=2 ** 40,
+                    hole_cards=(Card(Suit.HEARTS, Rank.ACE), Card(Suit.SPADES, Rank.TWO)),
+                    position=0,
+                    is_active=True,
+                    is_all_in=False,
+                    current_bet=300,
+                    total_bet_this_hand=500,
+                    last_action="raise"
+                ),
+                PlayerSnapshot(
+                    player_id="player2",
+                    name="Bob",
+                    chips=0,
+                    hole_cards=(),
+                    position=1,
+                    is_active=False,
+                    is_all_in=True,
+                    current_bet=0,
+                    total_bet_this_hand=200
+                ),
+            ),
+            pot=PotSnapshot(
+                main_pot=400,
+                side_pots=({"amount": 300, "eligible_players": ["player1"]},),
+                total_pot=700,
+                eligible_players=("player1", "observer")
+            ),
+            community_cards=(Card(Suit.CLUBS, Rank.KING), Card(Suit.DIAMONDS, Rank.TEN),
+                             Card(Suit.CLUBS, Rank.THREE), Card(Suit.HEARTS, Rank.NINE)),
+            current_bet=300,
+            dealer_position=1,
+            small_blind_position=0,
+            big_blind_position=1,
+            active_player_position=None,
+            small_blind_amount=10,
+            big_blind_amount=20,
+            recent_transactions=(
+                ChipTransaction("tx_1", TransactionType.DEDUCT, "player1", 300, timestamp, "加注",
+                                {"round": "turn"}),
+                ChipTransaction("tx_2", TransactionType.FREEZE, "player2", 200, timestamp - 0.1, ""),
+            )
+        )
+        
+        data = SnapshotSerializer.serialize_binary(snapshot)
+        restored = SnapshotSerializer.deserialize_binary(data)
+        assert restored == snapshot
+        assert restored == SnapshotSerializer.deserialize(SnapshotSerializer.serialize(snapshot))
+        assert restored.players[0].hole_cards[0] is Card(Suit.HEARTS, Rank.ACE)
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            file_path = os.path.join(temp_dir, "snapshot.bin")
+            SnapshotSerializer.serialize_binary_to_file(snapshot, file_path)
+            assert SnapshotSerializer.deserialize_binary_from_file(file_path) == snapshot
+        
+        # 损坏的数据
+        with pytest.raises(DeserializationError):
+            SnapshotSerializer.deserialize_binary(b"JSON" + data[4:])
+        with pytest.raises(DeserializationError):
+            SnapshotSerializer.deserialize_binary(data[:-1])
+        with pytest.raises(DeserializationError):
+            SnapshotSerializer.deserialize_binary(data[:5] + bytes([0]) + data[6:])
+    
     def test_snapshot_version_compatibility(self):
         """测试快照版本兼容性"""
         # 创建不同版本的快照元数据
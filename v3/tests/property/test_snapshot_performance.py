@@ -149,6 +149,29 @@ class TestSnapshotPerformance:
         assert restored_snapshot.game_id == snapshot.game_id
         assert len(restored_snapshot.players) == len(snapshot.players)
     
+    def test_snapshot_binary_serialization_performance(self):
+        """测试二进制序列化比JSON至少小10倍，且编码和解码更快"""
+        snapshot = self._create_complex_snapshot()
+        json_str = SnapshotSerializer.serialize(snapshot)
+        data = SnapshotSerializer.serialize_binary(snapshot)
+        
+        # 验证两种格式往返一致
+        assert SnapshotSerializer.deserialize_binary(data) == SnapshotSerializer.deserialize(json_str)
+        
+        # 验证体积
+        json_size = len(json_str.encode('utf-8'))
+        assert len(data) * 10 <= json_size, f"二进制快照过大: {len(data)}字节，JSON {json_size}字节"
+        
+        def measure(func, arg, rounds=200):
+            start_time = time.perf_counter()
+            for _ in range(rounds):
+                func(arg)
+            return time.perf_counter() - start_time
+        
+        # 验证编码和解码速度
+        assert measure(SnapshotSerializer.serialize_binary, snapshot) < measure(SnapshotSerializer.serialize, snapshot)
+        assert measure(SnapshotSerializer.deserialize_binary, data) < measure(SnapshotSerializer.deserialize, json_str)
+    
     def test_snapshot_manager_performance(self):
         """测试快照管理器性能"""
         manager = SnapshotManager()
@@ -0,0 +1,127 @@
+"""
+单元测试: settle_batch
+"""
+import time
+import unittest
+
+import numpy as np
+
+from v3.core.chips.chip_ledger import ChipLedger
+from v3.core.eval.showdown import ShowdownRanking
+from v3.core.eval.types import HandRank, HandResult
+from v3.core.pot import PotManager
+from v3.core.pot.batch_settlement import BatchSettlement, settle_batch
+from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
+
+
+class TestSettleBatch(unittest.TestCase):
+    """测试 settle_batch 的功能"""
+
+    def setUp(self):
+        """测试设置"""
+        self.pot_manager = PotManager(ChipLedger())
+        CoreUsageChecker.verify_real_objects(self.pot_manager, "PotManager")
+
+    def _expected_payouts(self, contributions, folded, strengths):
+        """用PotManager逐手结算，返回(N, P)的赢得筹码（强度取值0-12，映射为高牌的主要牌值）"""
+        expected = np.zeros(contributions.shape, dtype=np.int64)
+        for hand in range(contributions.shape[0]):
+            player_bets = {f"p{j}": int(c) for j, c in enumerate(contributions[hand])}
+            results = {
+                f"p{j}": HandResult(HandRank.HIGH_CARD, 2 + int(strengths[hand, j]))
+                for j in range(contributions.shape[1]) if not folded[hand, j]
+            }
+            side_pots = self.pot_manager.calculate_side_pots(player_bets)
+            ranking = ShowdownRanking.from_results(results)
+            for player_id, amount in self.pot_manager.distribute_pots_by_ranking(side_pots, ranking).items():
+                expected[hand, int(player_id[1:])] = amount
+        return expected
+
+    def test_matches_pot_manager_on_random_hands(self):
+        """
+        测试：随机牌局的结算结果与PotManager逐手结算一致（含边池、平分和余数）
+        """
+        rng = np.random.default_rng(11)
+        hands, players = 2000, 6
+        contributions = rng.choice([0, 1, 3, 7, 10, 25, 25, 100], size=(hands, players))
+        folded = rng.random((hands, players)) < 0.3
+        # 强度取值很少，制造大量平局以覆盖余数分配
+        strengths = rng.integers(0, 4, size=(hands, players))
+
+        settlement = settle_batch(contributions, folded, strengths)
+
+        self.assertIsInstance(settlement, BatchSettlement)
+        expected = self._expected_payouts(contributions, folded, strengths)
+        np.testing.assert_array_equal(settlement.payouts, expected)
+        np.testing.assert_array_equal(settlement.net, expected - contributions)
+        # 筹码守恒：赢得的筹码加未分配的筹码等于总下注
+        np.testing.assert_array_equal(
+            settlement.payouts.sum(axis=1) + settlement.unclaimed, contributions.sum(axis=1)
+        )
+
+    def test_side_pot_and_odd_chip(self):
+        """
+        测试：短码全押赢得主池，边池由剩余玩家平分，余数给排在前面的玩家
+        """
+        contributions = np.array([[50, 201, 201, 0]])
+        folded = np.array([[False, False, False, True]])
+        strengths = np.array([[9, 5, 5, 0]])
+
+        settlement = settle_batch(contributions, folded, strengths)
+
+        # 主池150归短码，边池 151*2=302 平分，每人151
+        np.testing.assert_array_equal(settlement.payouts, [[150, 151, 151, 0]])
+        np.testing.assert_array_equal(settlement.unclaimed, [0])
+
+        odd = settle_batch(np.array([[5, 5, 5]]), np.zeros((1, 3), dtype=bool), np.array([[1, 1, 0]]))
+        np.testing.assert_array_equal(odd.payouts, [[8, 7, 0]])
+
+    def test_chunking_does_not_change_result(self):
+        """
+        测试：分批大小不影响结果
+        """
+        rng = np.random.default_rng(3)
+        contributions = rng.integers(0, 200, size=(500, 9))
+        folded = rng.random((500, 9)) < 0.5
+        strengths = rng.integers(0, 1000, size=(500, 9))
+
+        whole = settle_batch(contributions, folded, strengths)
+        chunked = settle_batch(contributions, folded, strengths, chunk_size=37)
+
+        np.testing.assert_array_equal(whole.payouts, chunked.payouts)
+        np.testing.assert_array_equal(whole.unclaimed, chunked.unclaimed)
+
+    def test_invalid_input(self):
+        """
+        测试：无效输入抛出异常
+        """
+        contributions = np.zeros((2, 3), dtype=np.int64)
+        folded = np.zeros((2, 3), dtype=bool)
+        with self.assertRaises(ValueError):
+            settle_batch(contributions - 1, folded, contributions)
+        with self.assertRaises(ValueError):
+            settle_batch(contributions, folded[:, :2], contributions)
+        with self.assertRaises(TypeError):
+            settle_batch(contributions.astype(float), folded, contributions)
+        with self.assertRaises(TypeError):
+            settle_batch(contributions, contributions, contributions)
+
+    def test_performance(self):
+        """
+        测试：批量结算速度（10万手9人桌应在数秒内完成）
+        """
+        rng = np.random.default_rng(5)
+        hands = 100_000
+        contributions = rng.integers(0, 500, size=(hands, 9))
+        folded = rng.random((hands, 9)) < 0.5
+        strengths = rng.integers(0, 7000, size=(hands, 9))
+
+        start_time = time.perf_counter()
+        settle_batch(contributions, folded, strengths)
+        elapsed = time.perf_counter() - start_time
+
+        self.assertLess(elapsed, 5.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
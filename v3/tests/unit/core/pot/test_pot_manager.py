@@ -5,6 +5,9 @@ import unittest
 
 from v3.core.pot.pot_manager import PotManager
 from v3.core.chips.chip_ledger import ChipLedger
+from v3.core.deck.card import Card
+from v3.core.eval.types import HandRank, HandResult
+from v3.core.eval.showdown import rank_showdown
 from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
 
 class TestPotManager(unittest.TestCase):
@@ -47,5 +50,46 @@ class TestPotManager(unittest.TestCase):
         self.assertEqual(side_pot_1.amount, 300)
         self.assertEqual(side_pot_1.eligible_players, {'player_1', 'player_4', 'player_5'})
 
+    def test_distribute_pots_by_strength_with_split(self):
+        """
+        测试：按强度键分配边池，相同强度平分，余数按玩家ID确定性分配
+        """
+        # 1. 设置
+        player_bets = {'player_a': 101, 'player_b': 101, 'player_c': 301}
+        side_pots = self.pot_manager.calculate_side_pots(player_bets)
+        hand_results = {
+            'player_a': HandResult(HandRank.STRAIGHT, 9),
+            'player_b': HandResult(HandRank.STRAIGHT, 9),
+            'player_c': HandResult(HandRank.ONE_PAIR, 14, 0, (13, 12, 11)),
+        }
+
+        # 2. 执行
+        winnings = self.pot_manager.distribute_pots(side_pots, hand_results)
+
+        # 3. 断言: 主池303平分(152/151)，边池200归player_c
+        self.assertEqual(winnings, {'player_a': 152, 'player_b': 151, 'player_c': 200})
+        self.assertEqual(sum(winnings.values()), sum(player_bets.values()))
+
+    def test_distribute_pots_by_ranking_side_pot_goes_to_next_tier(self):
+        """
+        测试：短码玩家赢得主池，边池由有资格玩家中排名最高的层级获得
+        """
+        # 1. 设置: player_a全下100拿到同花，player_b和player_c的对子平分边池
+        player_bets = {'player_a': 100, 'player_b': 300, 'player_c': 300}
+        side_pots = self.pot_manager.calculate_side_pots(player_bets)
+        board = [Card.from_str(s) for s in ('2H', '7H', '9H', 'KD', 'KC')]
+        ranking = rank_showdown({
+            'player_a': [Card.from_str('AH'), Card.from_str('3H')],
+            'player_b': [Card.from_str('QS'), Card.from_str('4D')],
+            'player_c': [Card.from_str('QC'), Card.from_str('4S')],
+        }, board)
+
+        # 2. 执行
+        winnings = self.pot_manager.distribute_pots_by_ranking(side_pots, ranking)
+
+        # 3. 断言: 主池300归player_a，边池400平分
+        self.assertEqual(winnings, {'player_a': 300, 'player_b': 200, 'player_c': 200})
+        self.assertEqual(winnings, self.pot_manager.distribute_pots(side_pots, ranking.results))
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,130 @@
+"""
+单元测试: SidePotTracker
+"""
+import random
+import unittest
+from unittest.mock import patch
+
+from v3.core.pot import PotCalculator, PotManager, SidePotTracker
+from v3.core.chips.chip_ledger import ChipLedger
+from v3.core.state_machine.types import GameContext, GamePhase
+from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
+
+class TestSidePotTracker(unittest.TestCase):
+    """测试 SidePotTracker 的功能"""
+
+    def setUp(self):
+        """测试设置"""
+        self.tracker = SidePotTracker()
+        CoreUsageChecker.verify_real_objects(self.tracker, "SidePotTracker")
+
+    def _assert_same_pots(self, player_bets):
+        """断言跟踪器的边池与PotManager从头计算的结果一致"""
+        expected = PotManager(ChipLedger()).calculate_side_pots(player_bets)
+        actual = self.tracker.side_pots()
+        self.assertEqual(
+            [(p.pot_id, p.amount, set(p.eligible_players), p.is_main_pot) for p in actual],
+            [(p.pot_id, p.amount, set(p.eligible_players), p.is_main_pot) for p in expected],
+        )
+
+    def test_incremental_bets_match_full_recalculation(self):
+        """
+        测试：逐笔下注后的边池与每次从头计算的结果一致
+        """
+        rng = random.Random(7)
+        for _ in range(50):
+            self.tracker.reset()
+            player_bets = {}
+            for _ in range(30):
+                player_id = f"player_{rng.randrange(9)}"
+                amount = rng.choice((0, 50, 100, 100, 250, 400))
+                player_bets[player_id] = player_bets.get(player_id, 0) + amount
+                self.tracker.add_bet(player_id, amount)
+                self._assert_same_pots(player_bets)
+            self.assertEqual(self.tracker.total, sum(player_bets.values()))
+            self.assertTrue(self.tracker.matches(player_bets))
+
+    def test_all_in_side_pots_and_eligibility(self):
+        """
+        测试：多人全押时的边池、可争夺边池和预览
+        """
+        # 1. 执行: 短码全押100，中码全押300，大码跟到300
+        self.tracker.add_bet('short', 100)
+        self.tracker.add_bet('mid', 300)
+        self.tracker.add_bet('big', 100)
+        self.tracker.set_bet('big', 300)
+
+        # 2. 断言
+        pots = self.tracker.side_pots()
+        self.assertEqual([p.amount for p in pots], [300, 400])
+        self.assertEqual(set(pots[1].eligible_players), {'mid', 'big'})
+        self.assertEqual(self.tracker.eligible_pot_ids('short'), ('pot_0',))
+        self.assertEqual(self.tracker.eligible_pot_ids('big'), ('pot_0', 'pot_1'))
+        self.assertEqual(self.tracker.eligible_pot_ids('nobody'), ())
+        self.assertEqual(self.tracker.preview(), {
+            '主池 (300筹码)': ['big', 'mid', 'short'],
+            '边池1 (400筹码)': ['big', 'mid'],
+        })
+        self.assertEqual(
+            PotCalculator.calculate_pot_distribution_preview({'short': 100, 'mid': 300, 'big': 300}),
+            self.tracker.preview(),
+        )
+
+        # 3. 同步外部记录只移动有变化的玩家
+        self.tracker.sync({'short': 100, 'mid': 300})
+        self.assertEqual(self.tracker.get_bet('big'), 0)
+        self.assertEqual(self.tracker.total, 400)
+        self.tracker.reset()
+        self.assertEqual(self.tracker.side_pots(), [])
+
+    def test_invalid_bets(self):
+        """
+        测试：负数下注被拒绝
+        """
+        with self.assertRaises(ValueError):
+            self.tracker.add_bet('player_a', -1)
+        with self.assertRaises(ValueError):
+            self.tracker.set_bet('player_a', -1)
+        with self.assertRaises(ValueError):
+            self.tracker.sync({'player_a': -5})
+
+    def test_calculator_reads_matching_tracker(self):
+        """
+        测试：跟踪器与下注记录一致时PotCalculator直接读取跟踪器，不一致时才重新计算
+        """
+        player_bets = {'short': 100, 'mid': 300, 'big': 300}
+        for player_id, amount in player_bets.items():
+            self.tracker.add_bet(player_id, amount)
+
+        # 1. 一致时不调用from_bets
+        with patch.object(SidePotTracker, 'from_bets', side_effect=AssertionError("不应重新计算边池")):
+            self.assertIs(PotCalculator.resolve_tracker(player_bets, self.tracker), self.tracker)
+            self.assertEqual(PotCalculator.calculate_pot_distribution_preview(player_bets, self.tracker),
+                             self.tracker.preview())
+            self.assertEqual(PotCalculator.get_eligible_pot_ids(player_bets, 'mid', self.tracker),
+                             ('pot_0', 'pot_1'))
+
+        # 2. 不一致时从下注记录重新计算
+        changed_bets = {'short': 100, 'mid': 300, 'big': 500}
+        self.assertIsNot(PotCalculator.resolve_tracker(changed_bets, self.tracker), self.tracker)
+        self.assertEqual(PotCalculator.get_eligible_pot_ids(changed_bets, 'big', self.tracker),
+                         ('pot_0', 'pot_1', 'pot_2'))
+        self.assertEqual(PotCalculator.get_eligible_pot_ids(changed_bets, 'big'),
+                         ('pot_0', 'pot_1', 'pot_2'))
+
+    def test_context_equality_ignores_tracker(self):
+        """
+        测试：GameContext的相等比较和repr不包含边池跟踪器
+        """
+        ledger = ChipLedger({'a': 950})
+        first = GameContext(game_id="g", current_phase=GamePhase.PRE_FLOP, players={}, chip_ledger=ledger,
+                            community_cards=[], current_bet=50, current_hand_bets={'a': 50})
+        second = GameContext(game_id="g", current_phase=GamePhase.PRE_FLOP, players={}, chip_ledger=ledger,
+                             community_cards=[], current_bet=50, current_hand_bets={'a': 50})
+        second.pot_tracker.add_bet('b', 20)
+
+        self.assertEqual(first, second)
+        self.assertNotIn('pot_tracker', repr(first))
+
+if __name__ == '__main__':
+    unittest.main()
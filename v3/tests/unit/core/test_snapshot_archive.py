@@ -0,0 +1,164 @@
+"""
+快照归档单元测试
+
+测试只追加的快照归档文件、伴随索引、mmap随机访问、流式迭代和崩溃恢复。
+包含反作弊验证，确保测试使用真实的核心模块。
+"""
+
+import pytest
+
+from v3.core.snapshot.snapshot_archive import SnapshotArchive, SnapshotArchiveError
+from v3.core.snapshot.snapshot_manager import SnapshotManager
+from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
+
+
+def _record(create_context, games=("table_1", "table_2"), steps: int = 30) -> list:
+    """为多个游戏交替创建快照，每次一名玩家下注，每10步换一手牌；create_context为game_context_factory"""
+    manager = SnapshotManager()
+    contexts = [create_context(game_id) for game_id in games]
+    snapshots = []
+    for step in range(steps):
+        context = contexts[step % len(contexts)]
+        player_id = f"player{step % 4}"
+        context.chip_ledger.deduct_chips(player_id, 10)
+        context.players[player_id]['current_bet'] += 10
+        snapshots.append(manager.create_snapshot(context, hand_number=step // 10 + 1))
+    return snapshots
+
+
+class TestSnapshotArchive:
+    """测试快照归档"""
+
+    def test_append_and_random_access(self, tmp_path, game_context_factory):
+        """测试追加后按索引键随机读取"""
+        snapshots = _record(game_context_factory)
+        path = tmp_path / "day.txsa"
+        with SnapshotArchive(path) as archive:
+            # 反作弊检查
+            CoreUsageChecker.verify_real_objects(archive, "SnapshotArchive")
+
+            entries = [archive.append(snapshot) for snapshot in snapshots]
+            assert len(archive) == 30
+            assert entries[2].key == ("table_1", 1, 1)
+            # 未flush的记录同样可以读取
+            assert archive.read(entries[-1]) == snapshots[-1]
+
+        with SnapshotArchive(path, readonly=True) as archive:
+            assert len(archive) == 30
+            assert archive.game_ids() == ["table_1", "table_2"]
+            assert archive.get("table_2", 3, 14) == snapshots[29]
+            assert archive.get("table_2", 1, 14) is None
+            assert [e.sequence for e in archive.entries("table_1", hand_number=2)] == [5, 6, 7, 8, 9]
+            for entry, snapshot in zip(archive.entries(), snapshots):
+                assert archive.read(entry) == snapshot
+
+    def test_streaming_iterator(self, tmp_path, game_context_factory):
+        """测试流式迭代按条件逐个产出快照"""
+        snapshots = _record(game_context_factory)
+        path = tmp_path / "day.txsa"
+        with SnapshotArchive(path) as archive:
+            for snapshot in snapshots:
+                archive.append(snapshot)
+
+            iterator = archive.iter_snapshots(game_id="table_1")
+            assert next(iterator) == snapshots[0]
+            assert list(iterator) == snapshots[2::2]
+            assert list(archive.iter_snapshots(hand_number=3)) == snapshots[20:]
+
+            since = snapshots[10].metadata.created_at
+            until = snapshots[15].metadata.created_at
+            assert list(archive.iter_snapshots(since=since, until=until)) == snapshots[10:15]
+
+    def test_reopen_appends_with_continuing_sequence(self, tmp_path, game_context_factory):
+        """测试重新打开后继续追加，序号延续"""
+        snapshots = _record(game_context_factory, games=("table_1",), steps=6)
+        path = tmp_path / "day.txsa"
+        with SnapshotArchive(path) as archive:
+            for snapshot in snapshots[:3]:
+                archive.append(snapshot)
+        with SnapshotArchive(path, compress=False) as archive:
+            entry = archive.append(snapshots[3])
+            assert entry.sequence == 3
+        with SnapshotArchive(path, readonly=True) as archive:
+            assert list(archive.iter_snapshots()) == snapshots[:4]
+
+    def test_recover_after_crash(self, tmp_path, game_context_factory):
+        """测试索引缺失条目和归档末尾残缺时的恢复"""
+        snapshots = _record(game_context_factory, steps=10)
+        path = tmp_path / "day.txsa"
+        with SnapshotArchive(path) as archive:
+            for snapshot in snapshots:
+                archive.append(snapshot)
+            index_path = archive.index_path
+
+        # 模拟崩溃：索引只写入了部分条目，归档末尾多出半条记录
+        index = index_path.read_bytes()
+        index_path.write_bytes(index[:len(index) // 2])
+        with open(path, 'ab') as f:
+            f.write(b"\x10\x00\x00\x00\x00")
+        size = path.stat().st_size
+
+        with SnapshotArchive(path, readonly=True) as archive:
+            assert list(archive.iter_snapshots()) == snapshots
+        assert path.stat().st_size == size  # 只读打开不修改文件
+
+        with SnapshotArchive(path) as archive:
+            assert len(archive) == 10
+            archive.append(snapshots[0])
+        assert path.stat().st_size < size + len(index)
+        with SnapshotArchive(path, readonly=True) as archive:
+            assert [e.sequence for e in archive.entries("table_1")] == [0, 1, 2, 3, 4, 5]
+            assert index_path.read_bytes().startswith(index)
+
+    def test_corrupted_record_and_invalid_files(self, tmp_path, game_context_factory):
+        """测试损坏的记录和无效的文件"""
+        snapshots = _record(game_context_factory, steps=2)
+        path = tmp_path / "day.txsa"
+        with SnapshotArchive(path) as archive:
+            entry = archive.append(snapshots[0])
+
+        data = bytearray(path.read_bytes())
+        data[entry.offset + 20] ^= 0xFF
+        path.write_bytes(bytes(data))
+        with SnapshotArchive(path, readonly=True) as archive:
+            with pytest.raises(SnapshotArchiveError):
+                archive.read(entry)
+            with pytest.raises(SnapshotArchiveError):
+                archive.append(snapshots[1])
+
+        with pytest.raises(SnapshotArchiveError):
+            SnapshotArchive(tmp_path / "missing.txsa", readonly=True)
+        bad = tmp_path / "bad.txsa"
+        bad.write_bytes(b"JUNK\x01")
+        with pytest.raises(SnapshotArchiveError):
+            SnapshotArchive(bad)
+
+    def test_fixed_width_index_and_game_table(self, tmp_path, game_context_factory):
+        """测试索引为定长条目，游戏ID只在游戏ID表中保存一次，缺失游戏ID的条目从归档恢复"""
+        snapshots = _record(game_context_factory, steps=8)
+        path = tmp_path / "day.txsa"
+        with SnapshotArchive(path) as archive:
+            for snapshot in snapshots:
+                archive.append(snapshot)
+            index_path = archive.index_path
+        game_table_path = path.with_name(path.name + ".ids")
+
+        header_size = 5
+        assert index_path.stat().st_size == header_size + 8 * 40
+        assert game_table_path.read_bytes().count(b"table_") == 2
+
+        # 模拟崩溃：游戏ID表和索引都只写入了第一个游戏的第一个条目
+        index = index_path.read_bytes()
+        game_table = game_table_path.read_bytes()
+        index_path.write_bytes(index[:header_size + 40])
+        game_table_path.write_bytes(game_table[:header_size + 2 + len("table_1")])
+        with SnapshotArchive(path, readonly=True) as archive:
+            assert len(archive) == 8
+            assert archive.game_ids() == ["table_1", "table_2"]
+            assert archive.get("table_2", 1, 3) == snapshots[7]
+            assert list(archive.iter_snapshots(game_id="table_1")) == snapshots[::2]
+
+        with SnapshotArchive(path):
+            pass
+        assert index_path.read_bytes() == index
+        assert game_table_path.read_bytes() == game_table
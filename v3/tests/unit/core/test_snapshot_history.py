@@ -0,0 +1,287 @@
+"""
+增量编码快照历史单元测试
+
+测试关键帧加增量的快照历史、重建、按字节预算淘汰，以及SnapshotManager的DELTA模式。
+包含反作弊验证，确保测试使用真实的核心模块。
+"""
+
+import tracemalloc
+
+import pytest
+
+from v3.core.snapshot.snapshot_history import SnapshotHistory, SnapshotDelta
+from v3.core.snapshot.snapshot_manager import SnapshotManager, SnapshotHistoryMode
+from v3.core.snapshot.serializer import SnapshotSerializer
+from v3.core.state_machine.types import GameContext, GamePhase
+from v3.core.deck.card import Card
+from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
+
+
+def _play_step(context: GameContext, step: int) -> None:
+    """模拟一次玩家行动：一名玩家下注，偶尔发公共牌"""
+    player_id = f"player{step % len(context.players)}"
+    context.chip_ledger.deduct_chips(player_id, 10)
+    player = context.players[player_id]
+    player['current_bet'] += 10
+    player['total_bet_this_hand'] += 10
+    player['last_action'] = 'call'
+    context.current_hand_bets[player_id] = context.current_hand_bets.get(player_id, 0) + 10
+    if step % 7 == 6 and len(context.community_cards) < 5:
+        context.community_cards.append(Card.from_id(step % 52))
+        context.current_phase = GamePhase.FLOP
+
+
+class TestSnapshotHistory:
+    """测试增量编码快照历史"""
+
+    def _record(self, create_context, steps: int, keyframe_interval: int = 8):
+        """记录若干步的快照，返回历史和完整快照列表"""
+        manager = SnapshotManager()
+        context = create_context("history_game", player_count=6)
+        history = SnapshotHistory(keyframe_interval)
+        snapshots = []
+        for step in range(steps):
+            _play_step(context, step)
+            snapshot = manager.create_snapshot(context, description=f"第{step}步")
+            history.append(snapshot)
+            snapshots.append(snapshot)
+        return history, snapshots
+
+    def test_reconstruct_any_snapshot(self, game_context_factory):
+        """测试任意历史快照都能从关键帧加增量精确重建"""
+        history, snapshots = self._record(game_context_factory, 50)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(history, "SnapshotHistory")
+
+        assert len(history) == 50
+        assert history.keyframe_count == 7
+        for sequence, snapshot in enumerate(snapshots):
+            assert history.get_at(sequence) == snapshot
+            assert history.get(snapshot.metadata.snapshot_id) == snapshot
+        assert history.latest() is snapshots[-1]
+        assert [s.metadata.description for s in history.iter_recent(3)] == ["第49步", "第48步", "第47步"]
+        with pytest.raises(IndexError):
+            history.get_at(50)
+
+    def test_delta_contains_only_changes(self, game_context_factory):
+        """测试增量只包含变化的玩家和字段"""
+        _, snapshots = self._record(game_context_factory, 2)
+        delta = SnapshotDelta.between(snapshots[0], snapshots[1])
+
+        assert [index for index, _ in delta.players] == [1]
+        assert delta.pot is not None
+        assert delta.community_cards is None
+        assert delta.fields == ()
+        assert SnapshotDelta.between(snapshots[0], snapshots[0]).players == ()
+
+    def test_delta_derives_default_metadata(self, game_context_factory):
+        """测试可以推导的元数据不保存在增量中，重建后与原快照相同"""
+        manager = SnapshotManager()
+        context = game_context_factory("history_game", player_count=6)
+        history = SnapshotHistory()
+        snapshots = []
+        for step in range(10):
+            _play_step(context, step)
+            description = "摊牌" if step == 5 else None
+            snapshots.append(manager.create_snapshot(context, hand_number=1 + step // 8, description=description))
+            history.append(snapshots[-1])
+
+        deltas = [SnapshotDelta.between(a, b) for a, b in zip(snapshots, snapshots[1:])]
+        assert [delta.metadata is not None for delta in deltas] == [
+            False, False, False, False, True, False, False, True, False]
+        assert deltas[0].created_at == snapshots[1].metadata.created_at
+        for sequence, snapshot in enumerate(snapshots):
+            assert history.get_at(sequence).metadata == snapshot.metadata
+
+    def test_delta_is_smaller_than_keyframe(self, game_context_factory):
+        """测试不共享子对象的快照（如反序列化得到的快照）按增量保存时占用更少的字节"""
+        _, snapshots = self._record(game_context_factory, 64)
+        snapshots = [SnapshotSerializer.deserialize_binary(SnapshotSerializer.serialize_binary(s))
+                     for s in snapshots]
+        delta_history = SnapshotHistory(keyframe_interval=32)
+        full_history = SnapshotHistory(keyframe_interval=1)
+        for snapshot in snapshots:
+            delta_history.append(snapshot)
+            full_history.append(snapshot)
+
+        assert full_history.keyframe_count == 64
+        assert delta_history.nbytes * 3 < full_history.nbytes * 2
+        assert delta_history.get_at(40) == snapshots[40]
+
+    def test_pop_oldest_promotes_keyframe(self, game_context_factory):
+        """测试淘汰最旧的快照时把下一个增量重建为关键帧"""
+        history, snapshots = self._record(game_context_factory, 20)
+        nbytes = history.nbytes
+
+        for expected in snapshots[:5]:
+            snapshot_id, freed = history.pop_oldest()
+            assert snapshot_id == expected.metadata.snapshot_id
+            nbytes -= freed
+            assert history.nbytes == nbytes
+
+        assert history.first_sequence == 5
+        assert snapshots[0].metadata.snapshot_id not in history
+        assert history.get(snapshots[0].metadata.snapshot_id) is None
+        for sequence in range(5, 20):
+            assert history.get_at(sequence) == snapshots[sequence]
+
+        history.clear()
+        assert len(history) == 0 and history.nbytes == 0 and history.latest() is None
+        with pytest.raises(IndexError):
+            history.pop_oldest()
+
+    def test_invalid_keyframe_interval(self):
+        """测试无效的关键帧间隔"""
+        with pytest.raises(ValueError):
+            SnapshotHistory(keyframe_interval=0)
+
+
+class TestSnapshotManagerDeltaMode:
+    """测试快照管理器的DELTA历史模式"""
+
+    def test_delta_mode_history(self, game_context_factory):
+        """测试DELTA模式按游戏保存增量历史，查询结果与FULL模式一致"""
+        manager = SnapshotManager(history_mode=SnapshotHistoryMode.DELTA, keyframe_interval=16)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(manager, "SnapshotManager")
+
+        contexts = [game_context_factory("game_a", player_count=6),
+                    game_context_factory("game_b", player_count=3)]
+        snapshots = []
+        for step in range(40):
+            context = contexts[step % 2]
+            _play_step(context, step // 2)
+            snapshots.append(manager.create_snapshot(context))
+
+        assert manager.get_latest_snapshot() == snapshots[-1]
+        assert manager.get_snapshot_history(5) == list(reversed(snapshots[-5:]))
+        assert manager.get_snapshot(snapshots[3].metadata.snapshot_id) == snapshots[3]
+        assert len(manager.get_game_history("game_a")) == 20
+        assert manager.history_bytes == sum(manager.get_game_history(g).nbytes for g in ("game_a", "game_b"))
+
+        manager.clear_old_snapshots(keep_count=10)
+        assert manager.get_snapshot(snapshots[0].metadata.snapshot_id) is None
+        assert manager.get_snapshot_history(100) == list(reversed(snapshots[-10:]))
+
+    def test_byte_budget_eviction(self, game_context_factory):
+        """测试超出分区字节预算时淘汰最旧的快照"""
+        budget = 40000
+        manager = SnapshotManager(history_mode=SnapshotHistoryMode.DELTA, partition_max_bytes=budget)
+        context = game_context_factory("history_game", player_count=6)
+        snapshots = []
+        for step in range(500):
+            _play_step(context, step)
+            snapshots.append(manager.create_snapshot(context))
+            assert manager.history_bytes <= budget
+
+        history = manager.get_game_history(context.game_id)
+        assert 1 < len(history) < 500
+        assert manager.get_latest_snapshot() is snapshots[-1]
+        assert history.get_at(history.first_sequence) == snapshots[history.first_sequence]
+
+        # FULL模式同样按分区字节预算淘汰
+        full_manager = SnapshotManager(partition_max_bytes=budget)
+        for snapshot in snapshots[:100]:
+            full_manager._store_snapshot(snapshot)
+        assert full_manager.history_bytes <= budget
+        assert len(full_manager.get_game_history(context.game_id)) < 100
+
+    def test_history_bytes_match_allocation(self, game_context_factory):
+        """测试估计的字节数与tracemalloc测得的快照分配相符，DELTA模式占用更少"""
+        allocated = {}
+        for mode in SnapshotHistoryMode:
+            manager = SnapshotManager(history_mode=mode)
+            context = game_context_factory("history_game", player_count=6)
+            allocated[mode] = 0
+            tracemalloc.start()
+            try:
+                for step in range(90):
+                    _play_step(context, step)
+                    before = tracemalloc.get_traced_memory()[0]
+                    manager.create_snapshot(context)
+                    allocated[mode] += tracemalloc.get_traced_memory()[0] - before
+            finally:
+                tracemalloc.stop()
+
+            assert len(manager.get_game_history(context.game_id)) == 90
+            assert 0.8 < manager.history_bytes / allocated[mode] < 1.25
+        assert allocated[SnapshotHistoryMode.DELTA] < allocated[SnapshotHistoryMode.FULL]
+
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with pytest.raises(TypeError):
+            SnapshotManager(history_mode="delta")
+        with pytest.raises(ValueError):
+            SnapshotManager(partition_max_bytes=0)
+        with pytest.raises(ValueError):
+            SnapshotManager(max_total_bytes=0)
+        with pytest.raises(ValueError):
+            SnapshotManager(keyframe_interval=0)
+
+
+class TestSnapshotPartitions:
+    """测试按游戏分区的快照存储"""
+
+    def _fill(self, manager: SnapshotManager, context: GameContext, steps: int) -> list:
+        """为游戏连续创建若干快照"""
+        snapshots = []
+        for step in range(steps):
+            _play_step(context, step)
+            snapshots.append(manager.create_snapshot(context))
+        return snapshots
+
+    def test_busy_game_does_not_evict_quiet_game(self, game_context_factory):
+        """测试繁忙牌桌只淘汰自己分区的快照"""
+        manager = SnapshotManager(history_mode=SnapshotHistoryMode.DELTA, partition_max_bytes=30000)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(manager, "SnapshotManager")
+
+        quiet = self._fill(manager, game_context_factory("quiet", player_count=6), 3)
+        busy = self._fill(manager, game_context_factory("busy", player_count=6), 400)
+
+        assert [manager.get_snapshot(s.metadata.snapshot_id) for s in quiet] == quiet
+        assert manager.get_snapshot(busy[0].metadata.snapshot_id) is None
+        assert manager.get_latest_snapshot("busy") is busy[-1]
+        assert manager.get_latest_snapshot("quiet") is quiet[-1]
+        assert manager.get_snapshot_history(2, game_id="quiet") == [quiet[2], quiet[1]]
+
+        info = {p.game_id: p for p in manager.list_partitions()}
+        assert info["quiet"].snapshot_count == 3
+        assert info["busy"].nbytes <= info["busy"].max_bytes == 30000
+        assert manager.history_bytes == info["quiet"].nbytes + info["busy"].nbytes
+
+    def test_total_budget_evicts_least_recently_used(self, game_context_factory):
+        """测试超出总预算时从最久未使用的游戏开始淘汰"""
+        manager = SnapshotManager(history_mode=SnapshotHistoryMode.DELTA, max_total_bytes=50000)
+        old = self._fill(manager, game_context_factory("old", player_count=6), 20)
+        recent = self._fill(manager, game_context_factory("recent", player_count=6), 20)
+        assert manager.get_latest_snapshot("old") is old[-1]  # 查询使old成为最近使用
+
+        self._fill(manager, game_context_factory("new", player_count=6), 20)
+
+        assert manager.history_bytes <= 50000
+        assert [p.game_id for p in manager.list_partitions()] == ["recent", "old", "new"]
+        assert manager.get_snapshot(recent[0].metadata.snapshot_id) is None
+        assert [manager.get_snapshot(s.metadata.snapshot_id) for s in old] == old
+
+    def test_partition_budget_and_drop(self, game_context_factory):
+        """测试单独设置分区预算和删除分区"""
+        manager = SnapshotManager()
+        snapshots = self._fill(manager, game_context_factory("table", player_count=6), 20)
+        other = self._fill(manager, game_context_factory("other", player_count=6), 5)
+
+        manager.set_partition_budget("table", 1)
+        assert len(manager.get_game_history("table")) == 1
+        assert manager.get_latest_snapshot("table") is snapshots[-1]
+        with pytest.raises(ValueError):
+            manager.set_partition_budget("table", 0)
+
+        assert manager.drop_partition("table")
+        assert not manager.drop_partition("table")
+        assert manager.get_game_history("table") is None
+        assert manager.get_snapshot(snapshots[-1].metadata.snapshot_id) is None
+        assert manager.get_snapshot_history(100) == list(reversed(other))
+        assert manager.history_bytes == manager.get_game_history("other").nbytes
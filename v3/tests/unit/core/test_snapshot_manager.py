@@ -33,7 +33,7 @@ class TestSnapshotManager:
         CoreUsageChecker.verify_real_objects(manager, "SnapshotManager")
         
         # 验证初始状态
-        assert len(manager._snapshots) == 0
+        assert manager.list_partitions() == []
         assert len(manager._snapshot_history) == 0
         assert manager._max_history_size == 100
     
@@ -89,9 +89,9 @@ class TestSnapshotManager:
         assert snapshot.metadata.description == "测试快照"
         
         # 验证快照已存储
-        assert len(manager._snapshots) == 1
+        assert len(manager.get_game_history(snapshot.game_id)) == 1
         assert len(manager._snapshot_history) == 1
-        assert snapshot.metadata.snapshot_id in manager._snapshots
+        assert snapshot.metadata.snapshot_id in manager._snapshot_history
     
     def test_create_snapshot_with_cards(self):
         """测试包含卡牌的快照创建"""
@@ -327,14 +327,14 @@ class TestSnapshotManager:
             time.sleep(0.001)
         
         # 验证所有快照都存在
-        assert len(manager._snapshots) == 10
+        assert len(manager.get_game_history("test_game")) == 10
         assert len(manager._snapshot_history) == 10
         
         # 清理旧快照，保留5个
         manager.clear_old_snapshots(keep_count=5)
         
         # 验证只保留了5个最新的快照
-        assert len(manager._snapshots) == 5
+        assert len(manager.get_game_history("test_game")) == 5
         assert len(manager._snapshot_history) == 5
         
         # 验证保留的是最新的快照
@@ -0,0 +1,193 @@
+"""
+游戏状态只读视图单元测试
+
+测试GameStateView与同一时刻创建的GameStateSnapshot属性一致、反映实时状态、不可修改，
+以及查询服务通过视图查询时不创建快照。
+包含反作弊验证，确保测试使用真实的核心模块。
+"""
+
+import pytest
+
+from v3.core.snapshot.state_view import GameStateView
+from v3.core.snapshot.snapshot_manager import SnapshotManager
+from v3.core.state_machine.types import GameContext, GamePhase
+from v3.core.chips.chip_ledger import ChipLedger
+from v3.core.deck.card import Card
+from v3.core.rules import determine_permissible_actions_from_state
+from v3.application import GameCommandService, GameQueryService
+from v3.core.events import EventBus
+from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
+
+_PLAYER_FIELDS = ('player_id', 'name', 'chips', 'hole_cards', 'position', 'is_active',
+                  'is_all_in', 'current_bet', 'total_bet_this_hand', 'last_action')
+_STATE_FIELDS = ('game_id', 'phase', 'pot', 'community_cards', 'current_bet', 'dealer_position',
+                 'small_blind_position', 'big_blind_position', 'active_player_position',
+                 'small_blind_amount', 'big_blind_amount', 'recent_transactions')
+
+
+def _create_context() -> GameContext:
+    """创建一手进行中的牌局上下文"""
+    return GameContext(
+        game_id="view_game",
+        current_phase=GamePhase.FLOP,
+        players={
+            "alice": {'name': 'Alice', 'position': 0, 'active': True, 'status': 'active', 'chips': 900,
+                      'current_bet': 100, 'total_bet_this_hand': 100, 'last_action': 'raise',
+                      'hole_cards': [Card.from_id(0), Card.from_id(13)]},
+            "bob": {'name': 'Bob', 'position': 1, 'active': True, 'status': 'folded',
+                    'current_bet': 0, 'total_bet_this_hand': 50},
+            "carol": {'name': 'Carol', 'position': 2, 'active': True, 'status': 'all_in', 'is_all_in': True,
+                      'current_bet': 100, 'total_bet_this_hand': 100},
+        },
+        chip_ledger=ChipLedger({"alice": 900, "bob": 950, "carol": 0}),
+        community_cards=[Card.from_id(1), Card.from_id(2), Card.from_id(3)],
+        current_bet=100,
+        current_hand_bets={"alice": 100, "bob": 50, "carol": 100},
+        active_player_id="alice",
+    )
+
+
+def _assert_same_state(view: GameStateView, snapshot) -> None:
+    """验证视图与快照的属性一致"""
+    for field in _STATE_FIELDS:
+        assert getattr(view, field) == getattr(snapshot, field), field
+    assert len(view.players) == len(snapshot.players)
+    for player_view, player_snapshot in zip(view.players, snapshot.players):
+        for field in _PLAYER_FIELDS:
+            assert getattr(player_view, field) == getattr(player_snapshot, field), field
+    assert view.get_total_chips() == snapshot.get_total_chips()
+    assert [p.player_id for p in view.get_active_players()] == \
+        [p.player_id for p in snapshot.get_active_players()]
+
+
+class TestGameStateView:
+    """测试游戏状态只读视图"""
+
+    def test_view_matches_snapshot(self):
+        """测试视图与同一时刻的快照属性一致"""
+        context = _create_context()
+        view = GameStateView(context, hand_number=3)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(view, "GameStateView")
+
+        manager = SnapshotManager()
+        _assert_same_state(view, manager.create_snapshot(context, hand_number=3))
+        assert view.get_player_by_id("alice").chips == 900
+        assert view.get_player_by_id("nobody") is None
+        assert view.metadata.hand_number == 3
+
+    def test_view_reads_live_state(self):
+        """测试视图反映创建之后的状态变化，materialize创建并登记一致的快照"""
+        context = _create_context()
+        view = GameStateView(context)
+        alice = view.get_player_by_id("alice")
+
+        context.chip_ledger.deduct_chips("alice", 200)
+        context.players["alice"]['current_bet'] = 300
+        context.current_bet = 300
+        context.community_cards.append(Card.from_id(4))
+        context.current_phase = GamePhase.TURN
+
+        assert alice.chips == 700 and alice.current_bet == 300
+        assert view.phase is GamePhase.TURN and len(view.community_cards) == 4
+
+        manager = SnapshotManager()
+        snapshot = view.materialize(manager, description="争议记录")
+        _assert_same_state(view, snapshot)
+        assert manager.get_latest_snapshot("view_game") is snapshot
+
+    def test_view_is_read_only(self):
+        """测试视图不可修改"""
+        view = GameStateView(_create_context())
+        with pytest.raises(AttributeError):
+            view.current_bet = 0
+        with pytest.raises(AttributeError):
+            view.get_player_by_id("alice").chips = 0
+        with pytest.raises(AttributeError):
+            view.extra = 1
+
+    def test_permissible_actions_from_view(self):
+        """测试核心层根据视图确定可用行动，筹码取自ChipLedger"""
+        context = _create_context()
+        view = GameStateView(context)
+
+        actions = determine_permissible_actions_from_state(view, "alice")
+        assert actions.player_chips == 900
+        assert "raise" in actions.get_action_types_as_strings()
+        assert determine_permissible_actions_from_state(view, "bob").is_player_active is False
+
+        # 同一状态的快照得到相同的结果
+        snapshot = SnapshotManager().create_snapshot(context)
+        assert determine_permissible_actions_from_state(snapshot, "alice") == actions
+        with pytest.raises(ValueError):
+            determine_permissible_actions_from_state(view, "nobody")
+
+
+class TestQueryServiceStateView:
+    """测试查询服务通过只读视图查询"""
+
+    def setup_method(self):
+        """测试前设置"""
+        self.event_bus = EventBus()
+        self.command_service = GameCommandService(self.event_bus)
+        self.query_service = GameQueryService(self.command_service, self.event_bus)
+        assert self.command_service.create_new_game("view_game", ["player_0", "player_1"]).success
+
+    def test_queries_do_not_create_snapshots(self):
+        """测试玩家信息、可用行动、阶段信息和游戏结束查询不创建快照"""
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(self.query_service, "GameQueryService")
+
+        context = self.command_service.get_live_context("view_game").data
+        context.current_phase = GamePhase.PRE_FLOP
+        context.current_bet = 100
+        snapshot_manager = self.command_service._snapshot_manager
+        snapshot_count = len(snapshot_manager.get_snapshot_history(limit=0))
+
+        player_info = self.query_service.get_player_info("view_game", "player_0")
+        assert player_info.success
+        assert player_info.data.chips == context.chip_ledger.get_balance("player_0")
+
+        actions = self.query_service.get_available_actions("view_game", "player_0")
+        assert actions.success
+        assert {"fold", "call", "raise"} <= set(actions.data.actions)
+
+        phase_info = self.query_service.get_phase_info("view_game")
+        assert phase_info.success and phase_info.data['current_phase'] == "PRE_FLOP"
+        assert phase_info.data['next_phase'] == "FLOP"
+
+        game_over = self.query_service.is_game_over("view_game")
+        assert game_over.success and game_over.data is False
+
+        assert self.query_service.calculate_game_state_hash("view_game").success
+        assert len(snapshot_manager.get_snapshot_history(limit=0)) == snapshot_count
+
+    def test_pot_info_reads_tracker(self):
+        """测试底池查询读取随下注更新的边池跟踪器"""
+        context = self.command_service.get_live_context("view_game").data
+        for player_id, amount in (("player_0", 50), ("player_1", 100)):
+            context.current_hand_bets[player_id] = amount
+            context.pot_tracker.add_bet(player_id, amount)
+
+        pot_info = self.query_service.get_pot_info("view_game")
+        assert pot_info.success
+        assert pot_info.data['pot_total'] == sum(context.current_hand_bets.values())
+        assert pot_info.data['preview'] == context.pot_tracker.preview()
+        for player_id in context.players:
+            assert pot_info.data['eligible_pots'][player_id] == context.pot_tracker.eligible_pot_ids(player_id)
+        assert pot_info.data['eligible_pots']["player_1"] == ('pot_0', 'pot_1')
+
+        # 直接修改下注记录后跟踪器不再一致，查询从下注记录重新计算
+        context.current_hand_bets["player_0"] = 100
+        pot_info = self.query_service.get_pot_info("view_game")
+        assert pot_info.data['pot_total'] == 200
+        assert pot_info.data['eligible_pots']["player_1"] == ('pot_0',)
+
+        assert self.query_service.get_pot_info("missing").error_code == "GAME_NOT_FOUND"
+
+    def test_missing_game_and_player(self):
+        """测试游戏或玩家不存在"""
+        assert self.query_service.get_available_actions("missing", "player_0").error_code == "GAME_NOT_FOUND"
+        assert self.query_service.get_player_info("view_game", "nobody").error_code == "PLAYER_NOT_IN_GAME"
+        assert self.query_service.is_game_over("missing").error_code == "GAME_NOT_FOUND"
@@ -5,11 +5,16 @@
 """
 
 import pytest
+import random
 import time
 from typing import Dict, List
+from unittest.mock import patch
 
 # 导入被测试的模块
-from v3.core.chips import ChipLedger, ChipTransaction, TransactionType, ChipValidator, ValidationResult
+from v3.core.chips import (
+    ChipLedger, ChipTransaction, TransactionType, ChipValidator, ValidationResult,
+    SimulationChipLedger, TransactionRecording, TransactionLog, LedgerWAL,
+)
 from v3.core.betting import BettingEngine, BetResult, BettingValidator, BetType, BetAction
 from v3.core.pot import PotManager, SidePot, PotCalculator, PotDistributor
 
@@ -105,6 +110,304 @@ class TestChipLedger:
         assert ledger.get_available_chips("player1") == 800
         assert ledger.get_frozen_chips("player1") == 200
 
+    def test_running_total_and_player_index(self):
+        """测试增量维护的总筹码和按玩家索引的交易历史"""
+        ledger = ChipLedger({"player1": 1000, "player2": 500})
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "ChipLedger")
+
+        ledger.deduct_chips("player1", 100, "下注")
+        ledger.add_chips("player3", 40, "买入")
+        ledger.transfer_chips("player2", "player1", 60, "测试转移")
+        ledger.freeze_chips("player1", 200, "冻结")
+        ledger.deduct_chips("player2", 10000, "余额不足")
+
+        assert ledger.get_total_chips() == sum(
+            ledger.get_balance(p) for p in ledger.get_all_players()
+        ) == 1440
+        history = ledger.get_transaction_history()
+        for player_id in ("player1", "player2", "player3", "nobody"):
+            assert ledger.get_transaction_history(player_id) == [
+                t for t in history if t.player_id == player_id
+            ]
+
+    def test_hand_transaction_index(self):
+        """测试按手牌查询交易记录（每次settle_hand结束一手牌）"""
+        ledger = ChipLedger({"player1": 1000, "player2": 1000})
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "ChipLedger")
+
+        ledger.freeze_chips("player1", 100, "下注")
+        ledger.settle_hand({"player1": -100, "player2": 100})
+        ledger.freeze_chips("player2", 50, "下注")
+        ledger.settle_hand({})
+        ledger.deduct_chips("player1", 20, "小盲")
+
+        assert ledger.get_hand_count() == 2
+        assert [t.transaction_type for t in ledger.get_hand_transactions(0)] == [
+            TransactionType.FREEZE, TransactionType.SETTLE, TransactionType.SETTLE
+        ]
+        assert [t.transaction_type for t in ledger.get_hand_transactions(-1)] == [TransactionType.FREEZE]
+        assert [t.amount for t in ledger.get_hand_transactions()] == [20]
+        assert ledger.get_total_chips() == 1980
+        with pytest.raises(IndexError):
+            ledger.get_hand_transactions(2)
+
+
+class TestTransactionLog:
+    """列式交易日志测试"""
+
+    @staticmethod
+    def _fill(ledger, hands):
+        """执行若干手牌的下注和结算"""
+        for hand in range(hands):
+            ledger.freeze_chips("player1", 10, f"第{hand}手下注")
+            ledger.freeze_chips("player2", 10, f"第{hand}手跟注")
+            ledger.settle_hand({"player1": 10, "player2": -10} if hand % 2 else {"player1": -10, "player2": 10})
+
+    def test_spill_keeps_window_bounded(self, tmp_path):
+        """测试窗口写满后溢出到文件，查询结果与不溢出时一致"""
+        spill_path = tmp_path / "ledger.ctxl"
+        ledger = ChipLedger({"player1": 1000, "player2": 1000},
+                            TransactionLog(window_size=7, spill_path=spill_path))
+        reference = ChipLedger({"player1": 1000, "player2": 1000})
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "ChipLedger")
+
+        self._fill(ledger, 20)
+        self._fill(reference, 20)
+        log = ledger.transaction_log
+
+        assert len(log) == 80
+        assert log.spilled_count == 77
+        assert spill_path.exists()
+
+        def fields(transactions):
+            return [(t.transaction_id, t.transaction_type, t.player_id, t.amount, t.description, t.metadata)
+                    for t in transactions]
+
+        assert fields(ledger.get_transaction_history()) == fields(reference.get_transaction_history())
+        assert fields(ledger.get_transaction_history("player2")) == \
+            fields(reference.get_transaction_history("player2"))
+        assert fields(ledger.get_hand_transactions(5)) == fields(reference.get_hand_transactions(5))
+        assert fields([log.get(76), log.get(77)]) == fields(reference.get_transaction_history()[76:78])
+        assert sum(log.column("delta")) == 0
+        assert list(log.column("delta", 2, 4)) == [-10, 10]
+
+    def test_for_player_reads_indexed_rows(self, tmp_path):
+        """测试按玩家查询只读取该玩家所在的行，不扫描溢出段的玩家列"""
+        spill_path = tmp_path / "ledger.ctxl"
+        with ChipLedger({"player1": 1000, "player2": 1000},
+                        TransactionLog(window_size=5, spill_path=spill_path)) as ledger:
+            self._fill(ledger, 6)
+            ledger.add_chips("player3", 40, "买入")
+            self._fill(ledger, 6)
+            log = ledger.transaction_log
+            expected = [t for t in log if t.player_id == "player3"] + \
+                [t for t in log if t.player_id == "player1"]
+
+            with patch.object(TransactionLog, '_read_column', side_effect=AssertionError("不应扫描玩家列")):
+                history = ledger.get_transaction_history("player3") + ledger.get_transaction_history("player1")
+            assert [(t.transaction_id, t.amount, t.description, t.metadata) for t in history] == \
+                [(t.transaction_id, t.amount, t.description, t.metadata) for t in expected]
+
+            archive = TransactionLog.open_archive(spill_path)
+            assert [t.transaction_id for t in archive.for_player("player1")] == \
+                [t.transaction_id for t in archive if t.player_id == "player1"]
+            archive.close()
+
+        # 退出with语句时关闭交易日志的文件和内存映射
+        assert log._file is None and log._mmap is None
+
+    def test_hand_bounds_across_segments(self, tmp_path):
+        """测试手牌边界由日志的手牌列二分查找，跨越溢出段时与不溢出时一致"""
+        spill_path = tmp_path / "ledger.ctxl"
+        with ChipLedger({"player1": 1000, "player2": 1000},
+                        TransactionLog(window_size=3, spill_path=spill_path)) as ledger:
+            reference = ChipLedger({"player1": 1000, "player2": 1000})
+            for target in (ledger, reference):
+                self._fill(target, 5)
+                target.settle_hand({})  # 没有交易的一手牌
+                self._fill(target, 5)
+                target.freeze_chips("player1", 10, "未结算的当前手牌")
+            log = ledger.transaction_log
+
+            assert ledger.get_hand_count() == reference.get_hand_count() == 11
+            for hand_index in [*range(-11, 11), None]:
+                assert [t.transaction_id for t in ledger.get_hand_transactions(hand_index)] == \
+                    [t.transaction_id for t in reference.get_hand_transactions(hand_index)]
+            assert ledger.get_hand_transactions(5) == []
+            assert log.hand_bounds(6) == (20, 24)
+            assert list(log.column("hand", 18, 22)) == [4, 4, 6, 6]
+
+            archive = TransactionLog.open_archive(spill_path)
+            assert archive.hand_count == 10
+            assert archive.hand_bounds(6) == (20, 24)
+            assert [t.player_id for t in archive.for_player("player2")] == ["player2"] * 19  # 最后一条仍在窗口中
+            archive.close()
+
+    def test_open_archive(self, tmp_path):
+        """测试只读打开溢出文件用于审计"""
+        spill_path = tmp_path / "ledger.ctxl"
+        log = TransactionLog(window_size=3, spill_path=spill_path)
+        log.append(TransactionType.DEDUCT, "玩家一", 100, -100, "下注 100")
+        log.append(TransactionType.ADD, "player2", 50, 50, "")
+        log.append(TransactionType.FREEZE, "player2", 25, 0, "冻结")
+        log.append(TransactionType.SETTLE, "玩家一", 30, -30, "手牌结算: 净变化 -30")
+
+        archive = TransactionLog.open_archive(spill_path)
+
+        assert len(archive) == 3
+        assert [t.description for t in archive] == ["下注 100", "", "冻结"]
+        assert [t.amount for t in archive.for_player("玩家一")] == [100]
+        assert list(archive.column("delta")) == [-100, 50, 0]
+        with pytest.raises(RuntimeError):
+            archive.append(TransactionType.ADD, "player2", 1, 1)
+        archive.close()
+        log.close()
+
+    def test_invalid_arguments(self):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            TransactionLog(window_size=0)
+        with pytest.raises(ValueError):
+            TransactionLog().column("description")
+        with pytest.raises(IndexError):
+            TransactionLog().get(0)
+
+
+class TestLedgerWAL:
+    """筹码账本预写日志测试"""
+
+    @staticmethod
+    def _play(ledger, hands):
+        """执行若干手牌的下注、转移和结算"""
+        for hand in range(hands):
+            ledger.freeze_chips("player1", 20, f"第{hand}手下注")
+            ledger.freeze_chips("玩家二", 20, f"第{hand}手跟注")
+            ledger.settle_hand({"player1": 20, "玩家二": -20} if hand % 3 else {"player1": -20, "玩家二": 20})
+        ledger.transfer_chips("player1", "player3", 50, "买入")
+        ledger.freeze_chips("player3", 30, "未结算的下注")
+
+    def test_recover_after_crash(self, tmp_path):
+        """测试崩溃后重放日志恢复余额和冻结筹码"""
+        wal_path = tmp_path / "ledger.wal"
+        wal = LedgerWAL(wal_path, group_commit_size=4, group_commit_interval=60)
+        ledger = ChipLedger({"player1": 1000, "玩家二": 1000}, wal=wal)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "ChipLedger")
+
+        self._play(ledger, 10)
+        wal.close()
+
+        result = LedgerWAL.recover(wal_path)
+        recovered = result.ledger
+
+        assert result.torn_bytes == 0
+        assert result.record_count == wal.record_count
+        for player_id in ("player1", "玩家二", "player3"):
+            assert recovered.get_balance(player_id) == ledger.get_balance(player_id)
+            assert recovered.get_frozen_chips(player_id) == ledger.get_frozen_chips(player_id)
+        assert recovered.get_total_chips() == 2000
+        assert recovered.get_hand_count() == 10
+
+    def test_settle_hand_is_durable(self, tmp_path):
+        """测试结算立即提交，未提交的记录在崩溃时丢失"""
+        wal_path = tmp_path / "ledger.wal"
+        wal = LedgerWAL(wal_path, group_commit_size=1000, group_commit_interval=60)
+        ledger = ChipLedger({"player1": 1000, "player2": 1000}, wal=wal)
+        ledger.freeze_chips("player1", 100)
+        ledger.freeze_chips("player2", 100)
+        ledger.settle_hand({"player1": 100, "player2": -100})
+        ledger.deduct_chips("player1", 10)
+
+        # 不关闭日志，模拟进程崩溃
+        recovered = LedgerWAL.recover(wal_path).ledger
+        assert recovered.get_balance("player1") == 1100
+        assert recovered.get_balance("player2") == 900
+        wal.close()
+
+    def test_torn_tail_and_reopen(self, tmp_path):
+        """测试忽略并截断末尾未写完的记录，恢复后可以继续追加"""
+        wal_path = tmp_path / "ledger.wal"
+        wal = LedgerWAL(wal_path)
+        ledger = ChipLedger({"player1": 1000, "player2": 1000}, wal=wal)
+        ledger.transfer_chips("player1", "player2", 100)
+        wal.close()
+        valid_size = wal_path.stat().st_size
+        with open(wal_path, "ab") as f:
+            f.write(b"\x10\x00\x00\x00\x01")
+
+        result = LedgerWAL.recover(wal_path)
+        assert result.torn_bytes == 5
+        assert result.valid_bytes == valid_size
+        assert wal_path.stat().st_size == valid_size
+
+        wal = LedgerWAL(wal_path)
+        ledger = result.ledger
+        ledger.attach_wal(wal)
+        ledger.transfer_chips("player2", "player1", 300)
+        wal.close()
+
+        recovered = LedgerWAL.recover(wal_path).ledger
+        assert recovered.get_balance("player1") == 1200
+        assert recovered.get_balance("player2") == 800
+
+    @pytest.mark.parametrize("recording", list(TransactionRecording))
+    def test_recover_simulation_ledger(self, tmp_path, recording):
+        """测试模拟用账本同样写入日志，恢复结果与账本一致"""
+        wal_path = tmp_path / "simulation.wal"
+        wal = LedgerWAL(wal_path, group_commit_size=4, group_commit_interval=60)
+        ledger = SimulationChipLedger({"player1": 1000, "玩家二": 1000}, recording=recording, wal=wal)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "SimulationChipLedger")
+
+        self._play(ledger, 10)
+        ledger.deduct_chips("player1", 30)
+        ledger.add_chips("玩家二", 30)
+        ledger.unfreeze_chips("player3", 10)
+        wal.close()
+
+        recovered = LedgerWAL.recover(wal_path).ledger
+        for player_id in ("player1", "玩家二", "player3"):
+            assert recovered.get_balance(player_id) == ledger.get_balance(player_id)
+            assert recovered.get_frozen_chips(player_id) == ledger.get_frozen_chips(player_id)
+        assert recovered.get_total_chips() == ledger.get_total_chips()
+        assert recovered.get_hand_count() == 10
+
+    def test_append_throughput(self, tmp_path):
+        """测试日志追加的吞吐量：每条记录平均不超过10微秒，即不到一次玩家动作延迟的10%"""
+        wal = LedgerWAL(tmp_path / "ledger.wal", sync=False)
+        record_count = 20000
+
+        start_time = time.perf_counter()
+        for i in range(record_count):
+            wal.log_freeze("player1", i + 1)
+        wal.commit()
+        total_time = time.perf_counter() - start_time
+        wal.close()
+
+        assert total_time / record_count < 1e-5, f"WAL追加过慢: {total_time / record_count * 1e6:.2f}微秒/条"
+
+    def test_invalid_arguments(self, tmp_path):
+        """测试无效参数"""
+        with pytest.raises(ValueError):
+            LedgerWAL(tmp_path / "ledger.wal", group_commit_size=0)
+        with pytest.raises(ValueError):
+            LedgerWAL(tmp_path / "ledger.wal", group_commit_interval=-1)
+        wal = LedgerWAL(tmp_path / "ledger.wal")
+        wal.close()
+        assert wal.closed
+        with pytest.raises(RuntimeError):
+            wal.log_add("player1", 1)
+        with pytest.raises(FileNotFoundError):
+            LedgerWAL.recover(tmp_path / "missing.wal")
+
 
 class TestChipValidator:
     """筹码验证器测试"""
@@ -412,5 +715,125 @@ class TestChipConservation:
         assert result.total_distributed == total_bet
 
 
+class TestSimulationChipLedger:
+    """单线程模拟用筹码账本测试"""
+
+    @staticmethod
+    def _random_operations(ledger, seed):
+        """在账本上执行一串随机操作，返回每步的结果"""
+        rng = random.Random(seed)
+        players = ["player1", "player2", "player3"]
+        results = []
+        for _ in range(300):
+            player, other = rng.sample(players, 2)
+            amount = rng.randint(1, 400)
+            operation = rng.choice(("deduct", "add", "transfer", "freeze", "unfreeze"))
+            if operation == "deduct":
+                results.append(ledger.deduct_chips(player, amount))
+            elif operation == "add":
+                results.append(ledger.add_chips(player, amount))
+            elif operation == "transfer":
+                results.append(ledger.transfer_chips(player, other, amount))
+            elif operation == "freeze":
+                results.append(ledger.freeze_chips(player, amount))
+            else:
+                results.append(ledger.unfreeze_chips(player, amount))
+            results.append((ledger.get_balance(player), ledger.get_available_chips(player),
+                            ledger.get_frozen_chips(player), ledger.get_total_chips()))
+        return results
+
+    @pytest.mark.parametrize("recording", list(TransactionRecording))
+    def test_matches_chip_ledger(self, recording):
+        """测试随机操作序列的结果与ChipLedger完全一致"""
+        initial_balances = {"player1": 1000, "player2": 500, "player3": 0}
+        reference = ChipLedger(initial_balances)
+        ledger = SimulationChipLedger(initial_balances, recording=recording)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "SimulationChipLedger")
+
+        assert self._random_operations(ledger, 3) == self._random_operations(reference, 3)
+        assert ledger.transaction_count == len(reference.get_transaction_history())
+        assert ledger.create_snapshot().transaction_count == ledger.transaction_count
+        assert ledger.validate_chip_conservation()
+        assert ledger.validate_chip_conservation(reference.get_total_chips())
+
+    def test_transaction_recording_modes(self):
+        """测试逐笔记录、聚合记录和关闭记录"""
+        full = SimulationChipLedger({"player1": 1000, "player2": 1000}, recording=TransactionRecording.FULL)
+        aggregate = SimulationChipLedger({"player1": 1000, "player2": 1000})
+        disabled = SimulationChipLedger({"player1": 1000, "player2": 1000}, recording=TransactionRecording.NONE)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(aggregate, "SimulationChipLedger")
+
+        for ledger in (full, aggregate, disabled):
+            ledger.deduct_chips("player1", 100, "下注")
+            ledger.deduct_chips("player1", 50, "下注")
+            ledger.transfer_chips("player2", "player1", 30, "测试转移")
+            assert ledger.transaction_count == 4
+
+        assert [t.transaction_type for t in full.get_transaction_history("player1")] == [
+            TransactionType.DEDUCT, TransactionType.DEDUCT, TransactionType.ADD
+        ]
+        summary = aggregate.get_transaction_summary()
+        assert (summary[("player1", TransactionType.DEDUCT)].count,
+                summary[("player1", TransactionType.DEDUCT)].amount) == (2, 150)
+        assert summary[("player2", TransactionType.DEDUCT)].amount == 30
+        assert {key: (a.count, a.amount) for key, a in full.get_transaction_summary().items()} == \
+            {key: (a.count, a.amount) for key, a in summary.items()}
+        assert aggregate.get_transaction_history() == []
+        assert disabled.get_transaction_history() == []
+        assert disabled.get_transaction_summary() == {}
+
+        for ledger in (full, aggregate, disabled):
+            ledger.settle_hand({"player1": 10, "player2": -10})
+            assert ledger.get_hand_count() == 1
+            assert ledger.get_total_chips() == 1850
+        assert len(full.get_hand_transactions(0)) == 6
+        assert aggregate.get_hand_transactions(0) == []
+
+    def test_settle_hand_conservation(self):
+        """测试结算不守恒时抛出异常且余额不变"""
+        ledger = SimulationChipLedger({"player1": 1000, "player2": 1000})
+        ledger.freeze_chips("player1", 200)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "SimulationChipLedger")
+
+        with pytest.raises(RuntimeError):
+            ledger.settle_hand({"player1": 100, "player2": -50})
+        assert ledger.get_balance("player1") == 1000
+        assert ledger.get_frozen_chips("player1") == 200
+
+        ledger.settle_hand({"player1": 100, "player2": -100})
+        assert ledger.get_balance("player1") == 1100
+        assert ledger.get_frozen_chips("player1") == 0
+        assert ledger.validate_chip_conservation(2000)
+
+    def test_chip_conservation_in_betting_round(self):
+        """测试与BettingEngine配合时的筹码守恒"""
+        ledger = SimulationChipLedger({"player1": 1000, "player2": 1000, "player3": 1000})
+        engine = BettingEngine(ledger, big_blind=20)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ledger, "SimulationChipLedger")
+        CoreUsageChecker.verify_real_objects(engine, "BettingEngine")
+
+        initial_total = ledger.get_total_chips()
+        engine.start_new_round(["player1", "player2", "player3"], "player1", "player2")
+        engine.execute_player_action("player3", BetType.RAISE, 40)
+        engine.execute_player_action("player1", BetType.CALL)
+        engine.execute_player_action("player2", BetType.FOLD)
+
+        assert initial_total == ledger.get_total_chips() + engine.get_total_pot()
+        assert ledger.validate_chip_conservation()
+
+    def test_invalid_recording(self):
+        """测试无效的记录方式"""
+        with pytest.raises(TypeError):
+            SimulationChipLedger({"player1": 100}, recording="full")
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"]) 
\ No newline at end of file
@@ -123,6 +123,33 @@ class TestCard:
         with pytest.raises(TypeError):
             Card(Suit.HEARTS, "invalid")
 
+        # 整数不能代替Rank
+        with pytest.raises(TypeError):
+            Card(Suit.HEARTS, 14)
+
+    def test_card_interning(self):
+        """测试扑克牌是享元对象，且id与批量评估下标一致."""
+        import pickle
+        from v3.core.deck import ALL_CARDS
+        
+        card = Card(Suit.CLUBS, Rank.QUEEN)
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(card, "Card")
+        
+        assert card is Card.from_str("QC")
+        assert card is Card.from_id(card.id)
+        assert card is pickle.loads(pickle.dumps(card))
+        assert card.id == 2 * 13 + Rank.QUEEN.value - 2
+        assert [c.id for c in ALL_CARDS] == list(range(52))
+        assert len({hash(c) for c in ALL_CARDS}) == 52
+        
+        deck = Deck()
+        assert all(dealt is ALL_CARDS[dealt.id] for dealt in deck.deal_cards(52))
+        
+        with pytest.raises(ValueError):
+            Card.from_id(52)
+
 
 class TestDeck:
     """Deck类的单元测试."""
@@ -297,6 +324,168 @@ class TestDeck:
         assert deck.peek_top() is None
 
 
+class TestFastDeck:
+    """FastDeck和ShuffleStream类的单元测试."""
+
+    def test_seeded_determinism(self):
+        """测试相同种子得到相同的发牌顺序."""
+        from v3.core.deck.fast_deck import FastDeck
+        
+        first = FastDeck(random.Random(42))
+        second = FastDeck(random.Random(42))
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(first, "FastDeck")
+        
+        for _ in range(5):
+            first.shuffle()
+            second.shuffle()
+            assert first.deal_cards(9) == second.deal_cards(9)
+        
+        first.shuffle()
+        cards = first.deal_cards(52)
+        assert len(set(cards)) == 52
+        assert first.is_empty
+        with pytest.raises(IndexError):
+            first.deal_card()
+
+    def test_dealing_and_dead_cards(self):
+        """测试切片发牌、剩余牌和移除死牌."""
+        from v3.core.deck import CardSet
+        from v3.core.deck.fast_deck import FastDeck
+        
+        deck = FastDeck(random.Random(1))
+        deck.shuffle()
+        top = deck.peek_top()
+        ids = deck.deal_ids(2)
+        assert Card.from_id(int(ids[0])) is top
+        assert len(deck) == 50
+        
+        dealt = CardSet(Card.from_id(card_id) for card_id in ids.tolist())
+        assert deck.remaining_cards == CardSet.full() - dealt
+        
+        dead = CardSet.from_str("AH AS KD")
+        removed = deck.remove_cards(dead)
+        assert removed == len(dead - dealt)
+        assert CardSet(deck.deal_cards(len(deck))) == CardSet.full() - dealt - dead
+        
+        deck.reset()
+        assert deck.deal_cards(2) == [Card.from_id(0), Card.from_id(1)]
+        with pytest.raises(ValueError):
+            deck.deal_ids(-1)
+
+    def test_shuffle_stream_is_block_size_independent(self):
+        """测试排列流的结果与块大小和取法无关."""
+        import numpy as np
+        from v3.core.deck.fast_deck import ShuffleStream
+        
+        large = ShuffleStream(seed=5, block_size=256)
+        small = ShuffleStream(seed=5, block_size=7)
+        expected = np.array([large.next_permutation() for _ in range(40)])
+        
+        actual = np.vstack([small.next_permutation(), small.next_block(39)])
+        assert (actual == expected).all()
+        assert (np.sort(expected, axis=1) == np.arange(52)).all()
+
+    def test_deck_bulk_deal_matches_single_deal(self):
+        """测试Deck批量发牌与逐张发牌的顺序一致."""
+        bulk = Deck(random.Random(8))
+        single = Deck(random.Random(8))
+        bulk.shuffle()
+        single.shuffle()
+        
+        assert bulk.deal_cards(7) == [single.deal_card() for _ in range(7)]
+        assert bulk.remaining_cards == single.remaining_cards
+        assert bulk.deal_cards(0) == []
+        assert bulk.deal_cards(45) == [single.deal_card() for _ in range(45)]
+
+
+class TestCardSet:
+    """CardSet类的单元测试."""
+
+    def test_set_operations(self):
+        """测试并集、交集、差集、包含和计数."""
+        from v3.core.deck import CardSet
+        
+        board = CardSet.from_str("AH KH QH")
+        hand = CardSet([Card(Suit.HEARTS, Rank.ACE), Card(Suit.SPADES, Rank.TWO)])
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(board, "CardSet")
+        
+        assert len(board) == 3
+        assert Card.from_str("KH") in board
+        assert Card.from_str("KS") not in board
+        assert board | hand == CardSet.from_str("AH KH QH 2S")
+        assert board & hand == CardSet.from_str("AH")
+        assert board - hand == CardSet.from_str("KH QH")
+        assert len(~board) == 49
+        assert len(CardSet.full() - board) == 49
+        assert not board.isdisjoint(hand)
+        assert CardSet.from_str("AH").issubset(board)
+        assert board.add(Card.from_str("JH")).remove(Card.from_str("AH")) == CardSet.from_str("KH QH JH")
+        assert hash(board) == hash(CardSet.from_str("QH, KH, AH"))
+        assert not CardSet()
+        
+        with pytest.raises(KeyError):
+            board.remove(Card.from_str("2C"))
+        with pytest.raises(TypeError):
+            CardSet(["AH"])
+        with pytest.raises(ValueError):
+            CardSet.from_mask(1 << 52)
+
+    def test_iteration_and_duplicates(self):
+        """测试按id升序迭代和重复检测."""
+        from v3.core.deck import ALL_CARDS, CardSet
+        
+        cards = CardSet.from_str("AS 2H 10D")
+        assert list(cards) == sorted(cards, key=lambda card: card.id)
+        assert all(card is ALL_CARDS[card.id] for card in cards)
+        assert list(CardSet.full()) == list(ALL_CARDS)
+        
+        sequence = [Card.from_str(s) for s in ("AH", "KD", "AH", "2C", "KD", "AH")]
+        assert CardSet.duplicates(sequence) == CardSet.from_str("AH KD")
+        assert not CardSet.duplicates(ALL_CARDS)
+
+    def test_deck_remaining_and_dead_cards(self):
+        """测试牌组剩余牌集合和移除死牌."""
+        from v3.core.deck import CardSet
+        
+        deck = Deck(random.Random(3))
+        deck.shuffle()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(deck, "Deck")
+        
+        dealt = CardSet(deck.deal_cards(5))
+        assert deck.remaining_cards == CardSet.full() - dealt
+        
+        dead = CardSet.from_str("AH AS")
+        removed = deck.remove_cards(dead | dealt)
+        assert removed == len(dead - dealt)
+        assert len(deck) == 52 - 5 - removed
+        assert deck.remaining_cards.isdisjoint(dead)
+        assert CardSet(deck.deal_cards(len(deck))) == CardSet.full() - dealt - dead
+        
+        deck.reset()
+        assert deck.remaining_cards == CardSet.full()
+
+    def test_evaluator_accepts_card_set(self):
+        """测试评估器接受CardSet并拒绝重复的牌."""
+        from v3.core.deck import CardSet
+        
+        evaluator = HandEvaluator()
+        hole_cards = CardSet.from_str("AH KH")
+        board = CardSet.from_str("QH JH 10H 2C")
+        
+        result = evaluator.evaluate_hand(hole_cards, board)
+        assert result.rank == HandRank.ROYAL_FLUSH
+        assert result == evaluator.evaluate_hand(list(hole_cards), list(board))
+        
+        with pytest.raises(ValueError):
+            evaluator.evaluate_hand(list(hole_cards), [Card.from_str(s) for s in ("AH", "2C", "3D")])
+
+
 class TestHandEvaluator:
     """HandEvaluator类的单元测试."""
 
@@ -632,6 +821,49 @@ class TestHandEvaluator:
         assert evaluator.compare_hands(hand1, hand2) == -1
         assert evaluator.compare_hands(hand1, hand1) == 0
 
+    def test_strength_key_ordering(self):
+        """测试整数强度键与逐字段比较的顺序一致."""
+        ordered_hands = [
+            HandResult(HandRank.HIGH_CARD, 14, 0, (13, 12, 11, 9)),
+            HandResult(HandRank.ONE_PAIR, 2, 0, (5, 4, 3)),
+            HandResult(HandRank.ONE_PAIR, 14, 0, (13, 12, 10)),
+            HandResult(HandRank.ONE_PAIR, 14, 0, (13, 12, 11)),
+            HandResult(HandRank.TWO_PAIR, 13, 12, (11,)),
+            HandResult(HandRank.TWO_PAIR, 14, 2, (3,)),
+            HandResult(HandRank.STRAIGHT, 5),
+            HandResult(HandRank.STRAIGHT, 6),
+            HandResult(HandRank.FULL_HOUSE, 3, 2),
+            HandResult(HandRank.ROYAL_FLUSH, 14),
+        ]
+        
+        for hand in ordered_hands:
+            # 反作弊检查
+            CoreUsageChecker.verify_real_objects(hand, "HandResult")
+        
+        strengths = [hand.strength for hand in ordered_hands]
+        assert strengths == sorted(strengths)
+        assert len(set(strengths)) == len(strengths)
+        assert max(ordered_hands, key=lambda h: h.strength).rank == HandRank.ROYAL_FLUSH
+        assert ordered_hands[3].compare_to(ordered_hands[2]) == 1
+
+    def test_strength_key_round_trip(self):
+        """测试强度键的打包、还原和免校验构造."""
+        from v3.core.eval import pack_strength, unpack_strength
+        
+        hand = HandResult(HandRank.FLUSH, 14, 0, (13, 9, 7, 2))
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(hand, "HandResult")
+        
+        assert hand.strength == pack_strength(HandRank.FLUSH, 14, 0, (13, 9, 7, 2))
+        assert unpack_strength(hand.strength) == (HandRank.FLUSH, 14, 0, (13, 9, 7, 2))
+        assert HandResult.from_strength(hand.strength) == hand
+        
+        trusted = HandResult.from_trusted(HandRank.FLUSH, 14, 0, (13, 9, 7, 2))
+        assert trusted == hand
+        assert trusted.strength == hand.strength
+        assert hash(trusted) == hash(hand)
+
     def test_evaluate_hand_validation(self):
         """测试evaluate_hand的输入验证."""
         evaluator = HandEvaluator()
@@ -674,4 +906,482 @@ class TestHandEvaluator:
         
         # 测试无效的牌类型
         with pytest.raises(TypeError):
-            evaluator.evaluate_hand(["invalid_card", valid_hole_cards[1]], valid_community_cards) 
\ No newline at end of file
+            evaluator.evaluate_hand(["invalid_card", valid_hole_cards[1]], valid_community_cards)
+
+    def test_evaluate_six_cards(self):
+        """测试转牌圈（6张牌）的评估."""
+        evaluator = HandEvaluator()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(evaluator, "HandEvaluator")
+        
+        hole_cards = [
+            Card(Suit.HEARTS, Rank.KING),
+            Card(Suit.SPADES, Rank.KING)
+        ]
+        community_cards = [
+            Card(Suit.DIAMONDS, Rank.QUEEN),
+            Card(Suit.CLUBS, Rank.QUEEN),
+            Card(Suit.HEARTS, Rank.QUEEN),
+            Card(Suit.SPADES, Rank.TWO)
+        ]
+        
+        result = evaluator.evaluate_hand(hole_cards, community_cards)
+        
+        # 反作弊检查结果
+        CoreUsageChecker.verify_real_objects(result, "HandResult")
+        
+        assert result.rank == HandRank.FULL_HOUSE
+        assert result.primary_value == 12  # Q的三条
+        assert result.secondary_value == 13  # K的对子
+
+    def test_flush_beats_board_straight(self):
+        """测试同花优先于同时存在的顺子."""
+        evaluator = HandEvaluator()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(evaluator, "HandEvaluator")
+        
+        hole_cards = [
+            Card(Suit.CLUBS, Rank.ACE),
+            Card(Suit.CLUBS, Rank.TWO)
+        ]
+        community_cards = [
+            Card(Suit.CLUBS, Rank.NINE),
+            Card(Suit.CLUBS, Rank.EIGHT),
+            Card(Suit.DIAMONDS, Rank.SEVEN),
+            Card(Suit.HEARTS, Rank.SIX),
+            Card(Suit.CLUBS, Rank.FIVE)
+        ]
+        
+        result = evaluator.evaluate_hand(hole_cards, community_cards)
+        
+        # 反作弊检查结果
+        CoreUsageChecker.verify_real_objects(result, "HandResult")
+        
+        assert result.rank == HandRank.FLUSH
+        assert result.primary_value == 14
+        assert result.kickers == (9, 8, 5, 2)
+
+    def test_lookup_tables_cover_all_hand_classes(self):
+        """测试查找表覆盖全部7462种不同的5张牌牌型."""
+        from v3.core.eval.lookup_tables import FLUSH_TABLE, RANK_TABLE
+        
+        distinct_results = set(RANK_TABLE.values())
+        distinct_results.update(result for result in FLUSH_TABLE if result is not None)
+        
+        for result in list(distinct_results)[:10]:
+            # 反作弊检查结果
+            CoreUsageChecker.verify_real_objects(result, "HandResult")
+        
+        assert len(distinct_results) == 7462
+
+
+class TestBatchEvaluation:
+    """批量评估API的单元测试."""
+
+    def test_batch_matches_single_evaluation(self):
+        """测试批量评估结果与逐手评估的强度键一致."""
+        from v3.core.eval.batch import cards_to_array
+        
+        evaluator = HandEvaluator()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(evaluator, "HandEvaluator")
+        
+        deck = Deck(random.Random(2024))
+        for card_count in (5, 6, 7):
+            hands = []
+            for _ in range(200):
+                deck.reset()
+                deck.shuffle()
+                hands.append(deck.deal_cards(card_count))
+            
+            strengths = evaluator.evaluate_batch(cards_to_array(hands))
+            
+            assert strengths.shape == (200,)
+            expected = [evaluator.evaluate_hand(hand[:2], hand[2:]).strength for hand in hands]
+            assert strengths.tolist() == expected
+
+    def test_batch_card_index_convention(self):
+        """测试牌下标约定与批量评估的牌型识别."""
+        import numpy as np
+        from v3.core.eval.batch import card_to_index
+        
+        assert card_to_index(Card(Suit.HEARTS, Rank.TWO)) == 0
+        assert card_to_index(Card(Suit.SPADES, Rank.ACE)) == 51
+        
+        royal = [Card(Suit.CLUBS, rank) for rank in (Rank.ACE, Rank.KING, Rank.QUEEN, Rank.JACK, Rank.TEN)]
+        cards = np.array([[card_to_index(card) for card in royal] + [0, 1]], dtype=np.uint8)
+        
+        strength = int(HandEvaluator().evaluate_batch(cards)[0])
+        assert HandResult.from_strength(strength).rank == HandRank.ROYAL_FLUSH
+
+    def test_batch_validation(self):
+        """测试批量评估的输入验证."""
+        import numpy as np
+        
+        evaluator = HandEvaluator()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(evaluator, "HandEvaluator")
+        
+        with pytest.raises(ValueError):
+            evaluator.evaluate_batch(np.array([0, 1, 2, 3, 4], dtype=np.uint8))
+        with pytest.raises(ValueError):
+            evaluator.evaluate_batch(np.zeros((1, 4), dtype=np.uint8))
+        with pytest.raises(ValueError):
+            evaluator.evaluate_batch(np.array([[0, 1, 2, 3, 52]]))
+        with pytest.raises(ValueError):
+            evaluator.evaluate_batch(np.array([[0, 1, 2, 3, 3]]))
+        with pytest.raises(TypeError):
+            evaluator.evaluate_batch(np.zeros((1, 5), dtype=np.float32))
+        
+        assert evaluator.evaluate_batch(np.zeros((0, 7), dtype=np.uint8)).shape == (0,)
+
+
+class TestPreflopEquityTable:
+    """翻牌前胜率查询表的单元测试."""
+
+    def test_hand_class_naming(self):
+        """测试起手牌类别编号与名称的对应关系."""
+        from v3.core.eval import hand_class_index, hand_class_name, parse_hand_class
+        
+        assert parse_hand_class('AA') == 0
+        assert parse_hand_class('AKs') == 1
+        assert parse_hand_class('AKo') == 13
+        assert parse_hand_class('22') == 168
+        assert parse_hand_class('109s') == parse_hand_class('T9s')
+        assert [parse_hand_class(hand_class_name(i)) for i in range(169)] == list(range(169))
+        
+        suited = [Card(Suit.HEARTS, Rank.KING), Card(Suit.HEARTS, Rank.ACE)]
+        offsuit = [Card(Suit.SPADES, Rank.SEVEN), Card(Suit.CLUBS, Rank.TWO)]
+        assert hand_class_name(hand_class_index(suited)) == 'AKs'
+        assert hand_class_name(hand_class_index(offsuit)) == '72o'
+        
+        with pytest.raises(ValueError):
+            parse_hand_class('AK')
+        with pytest.raises(ValueError):
+            parse_hand_class('AAs')
+        with pytest.raises(ValueError):
+            hand_class_index([suited[0], suited[0]])
+
+    def test_class_combos_cover_all_starting_hands(self):
+        """测试169个类别的组合恰好覆盖1326种起手牌."""
+        from v3.core.eval.preflop_build import class_combos
+        
+        combos = {tuple(sorted(combo)) for index in range(169) for combo in class_combos(index).tolist()}
+        assert len(combos) == 1326
+
+    def test_write_and_load_round_trip(self, tmp_path):
+        """测试构建文件的写入和mmap读取."""
+        import numpy as np
+        from v3.core.eval import get_preflop_table
+        from v3.core.eval.preflop_build import write_preflop_table
+        
+        heads_up = np.random.default_rng(1).random((169, 169))
+        multiway = np.linspace(0.0, 1.0, 169 * 3).reshape(169, 3)
+        path = tmp_path / 'preflop.bin'
+        write_preflop_table(path, heads_up, multiway, samples=123)
+        
+        table = get_preflop_table(path)
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(table, "PreflopEquityTable")
+        
+        assert table.samples == 123
+        assert table.max_opponents == 3
+        assert abs(table.heads_up(5, 7) - heads_up[5, 7]) < 1e-4
+        assert abs(table.multiway(168, 3) - 1.0) < 1e-4
+        assert len(table.row('AA')) == 169
+        with pytest.raises(ValueError):
+            table.multiway('AA', 4)
+        table.close()
+        
+        path.write_bytes(b'XXXX' + path.read_bytes()[4:])
+        with pytest.raises(ValueError):
+            get_preflop_table(path)
+
+    def test_shipped_table_values(self):
+        """测试随代码发布的胜率表的典型数值."""
+        from v3.core.eval import get_preflop_table
+        
+        table = get_preflop_table()
+        
+        assert table is get_preflop_table()
+        assert 0.80 < table.heads_up('AA', 'KK') < 0.84
+        assert abs(table.heads_up('AA', 'KK') + table.heads_up('KK', 'AA') - 1.0) < 1e-4
+        assert table.heads_up('QQ', 'QQ') == pytest.approx(0.5, abs=1e-4)
+        assert 0.50 < table.heads_up('22', 'AKo') < 0.55
+        assert 0.83 < table.multiway('AA', 1) < 0.87
+        assert table.multiway('AA', 8) < table.multiway('AA', 1)
+        
+        hole_cards = [Card(Suit.SPADES, Rank.ACE), Card(Suit.HEARTS, Rank.ACE)]
+        assert table.heads_up(hole_cards, 'KK') == table.heads_up('AA', 'KK')
+
+
+class TestCanonicalCache:
+    """花色规范化和评估缓存的单元测试."""
+
+    def test_canonical_form_is_suit_invariant(self):
+        """测试只相差花色置换的牌局规范索引相同."""
+        from v3.core.eval import canonicalize, canonical_hand_key
+        
+        def cards(text):
+            return [Card.from_str(s) for s in text.split()]
+        
+        first = canonicalize([cards("2H 9H 10C"), cards("AH KH"), cards("QS QD"), []])
+        swapped = canonicalize([cards("2S 9S 10D"), cards("AS KS"), cards("QH QC"), []])
+        reordered = canonicalize([cards("10C 9H 2H"), cards("KH AH"), cards("QD QS"), []])
+        other_player_order = canonicalize([cards("2H 9H 10C"), cards("QS QD"), cards("AH KH"), []])
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(first, "CanonicalForm")
+        
+        assert first.index == swapped.index == reordered.index
+        assert first.index != other_player_order.index
+        assert first.is_valid
+        assert not canonicalize([cards("AH KH"), cards("AH QS")]).is_valid
+        assert canonicalize([cards("AH KH")]).index != canonicalize([cards("AH KH"), []]).index
+        
+        mapped = {str(first.map_card(card)) for card in cards("AH KH")}
+        assert mapped == {str(swapped.map_card(card)) for card in cards("AS KS")}
+        
+        assert canonical_hand_key(cards("AH KH QH JH 10H")) == canonical_hand_key(cards("AC KC QC JC 10C"))
+        assert canonical_hand_key(cards("AH KH QH JH 10D")) != canonical_hand_key(cards("AH KH QH JH 10H"))
+        assert canonical_hand_key(cards("AH AH QH JH 10H")) is None
+
+    def test_lru_cache_eviction_and_stats(self):
+        """测试LRU淘汰顺序和命中统计."""
+        from v3.core.eval import LRUCache
+        
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+        assert cache.get('b') is None
+        
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size, stats.maxsize) == (1, 1, 2, 2)
+        assert stats.hit_rate == 0.5
+        
+        cache.clear()
+        assert len(cache) == 0 and cache.stats().hits == 0
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_cached_evaluator(self):
+        """测试带缓存评估器的结果与命中统计."""
+        from v3.core.eval import CachedHandEvaluator
+        
+        evaluator = HandEvaluator()
+        cached = CachedHandEvaluator(evaluator, maxsize=1000)
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(cached, "CachedHandEvaluator")
+        
+        deck = Deck(random.Random(5))
+        for _ in range(300):
+            deck.reset()
+            deck.shuffle()
+            cards = deck.deal_cards(7)
+            assert cached.evaluate_hand(cards[:2], cards[2:]) == evaluator.evaluate_hand(cards[:2], cards[2:])
+        
+        hole = [Card.from_str("AH"), Card.from_str("KH")]
+        board = [Card.from_str(s) for s in ("QH", "JH", "2C")]
+        suited_swap = [Card.from_str("AS"), Card.from_str("KS")]
+        swapped_board = [Card.from_str(s) for s in ("QS", "JS", "2D")]
+        
+        cached.clear_cache()
+        first = cached.evaluate_hand(hole, board)
+        second = cached.evaluate_hand(suited_swap, swapped_board)
+        assert first is second
+        assert (cached.stats().hits, cached.stats().misses) == (1, 1)
+        
+        # 无效输入不进入缓存，由底层评估器报错
+        with pytest.raises(ValueError):
+            cached.evaluate_hand(hole, [hole[0], board[0], board[1]])
+        with pytest.raises(TypeError):
+            cached.evaluate_hand(hole, ["QH", "JH", "2C"])
+        assert cached.stats().size == 1
+
+
+class TestShowdownRanking:
+    """多人摊牌排名的单元测试."""
+
+    @staticmethod
+    def _cards(text: str) -> List[Card]:
+        return [Card.from_str(s) for s in text.split()]
+
+    def test_rank_showdown_matches_evaluator(self):
+        """测试一次性排名与逐个评估的结果一致."""
+        from v3.core.eval import rank_showdown
+
+        evaluator = HandEvaluator()
+        rng = random.Random(11)
+        for _ in range(200):
+            deck = Deck(rng)
+            deck.shuffle()
+            board = deck.deal_cards(rng.choice((3, 4, 5)))
+            hole_cards = {f"p{i}": deck.deal_cards(2) for i in range(rng.randint(2, 9))}
+
+            ranking = rank_showdown(hole_cards, board)
+
+            for player_id, cards in hole_cards.items():
+                assert ranking.results[player_id] == evaluator.evaluate_hand(cards, board)
+            strengths = [tier.strength for tier in ranking.tiers]
+            assert strengths == sorted(set(strengths), reverse=True)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(ranking, "ShowdownRanking")
+
+    def test_tiers_and_side_pot_winners(self):
+        """测试平分层级和按有资格玩家求交集确定赢家."""
+        from v3.core.eval import rank_showdown
+
+        ranking = rank_showdown({
+            'c': self._cards("QS 4D"),
+            'a': self._cards("AH 3H"),
+            'b': self._cards("QC 4S"),
+            'd': self._cards("5C 6C"),
+        }, self._cards("2H 7H 9H KD KC"))
+
+        assert [tier.player_ids for tier in ranking.tiers] == [('a',), ('b', 'c'), ('d',)]
+        assert ranking.tiers[0].result.rank == HandRank.FLUSH
+        assert ranking.winners_among({'a', 'b', 'c', 'd'}) == ('a',)
+        assert ranking.winners_among(['c', 'b', 'd']) == ('b', 'c')
+        assert ranking.winners_among({'d', 'x'}) == ('d',)
+        assert ranking.winners_among(set()) == ()
+        assert ranking.tier_of('c') == 1
+
+    def test_rank_showdown_rejects_invalid_input(self):
+        """测试无效输入."""
+        from v3.core.eval import rank_showdown
+
+        board = self._cards("2H 7H 9H KD KC")
+        with pytest.raises(ValueError):
+            rank_showdown({'a': self._cards("AH 3H"), 'b': self._cards("AH 4S")}, board)
+        with pytest.raises(ValueError):
+            rank_showdown({'a': self._cards("KD 3H")}, board)
+        with pytest.raises(ValueError):
+            rank_showdown({'a': self._cards("AS")}, board)
+        with pytest.raises(ValueError):
+            rank_showdown({'a': self._cards("AS 3S")}, board[:2])
+        with pytest.raises(TypeError):
+            rank_showdown({'a': ["AS", "3S"]}, board)
+
+
+class TestDrawAnalysis:
+    """听牌与补牌分析的单元测试."""
+
+    @staticmethod
+    def _cards(text: str) -> List[Card]:
+        return [Card.from_str(s) for s in text.split()]
+
+    def test_flush_draw_outs_and_odds(self):
+        """测试同花听牌的补牌和概率."""
+        from v3.core.eval import analyze_draws
+
+        analysis = analyze_draws(self._cards("AH 5H"), self._cards("KH 9H 4C"))
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(analysis, "DrawAnalysis")
+
+        assert analysis.current.rank == HandRank.HIGH_CARD
+        assert analysis.flush_draw and not analysis.backdoor_flush_draw
+        assert not analysis.open_ended_straight_draw and not analysis.gutshot
+        assert len(analysis.outs[HandRank.FLUSH]) == 9
+        # 成对的15张中4H已计入同花
+        assert len(analysis.outs[HandRank.ONE_PAIR]) == 14
+        assert Card.from_str("4H") in analysis.outs[HandRank.FLUSH]
+        assert analysis.out_count == len(analysis.all_outs) == 23
+        assert analysis.unseen_count == 47
+        assert analysis.next_card_probability == pytest.approx(23 / 47)
+        assert analysis.river_probability > analysis.next_card_probability
+
+    def test_straight_draws(self):
+        """测试两头顺和卡顺."""
+        from v3.core.eval import analyze_draws, straight_completions
+
+        open_ended = analyze_draws(self._cards("8S 9D"), self._cards("10H JC 2S"))
+        assert open_ended.open_ended_straight_draw and not open_ended.gutshot
+        assert len(open_ended.outs[HandRank.STRAIGHT]) == 8
+
+        gutshot = analyze_draws(self._cards("8S 9D"), self._cards("QH JC 2S 3D"))
+        assert gutshot.gutshot and not gutshot.open_ended_straight_draw
+        assert len(gutshot.outs[HandRank.STRAIGHT]) == 4
+        assert gutshot.river_odds == gutshot.next_card_odds
+
+        # A-2-3-4 缺5
+        wheel = 0b1000000000111
+        assert straight_completions(wheel) == 0b1000
+        # 已成2-6顺子时，7和A分别能组成3-7和A-5顺子
+        assert straight_completions(0b11111) == (1 << 5) | (1 << 12)
+
+    def test_matches_brute_force_evaluation(self):
+        """测试补牌和河牌概率与逐个评估的结果一致."""
+        from itertools import combinations
+        from v3.core.eval import analyze_draws
+
+        evaluator = HandEvaluator()
+        rng = random.Random(5)
+        for _ in range(3):
+            deck = Deck(rng)
+            deck.shuffle()
+            hole = deck.deal_cards(2)
+            board = deck.deal_cards(3)
+            dead = deck.deal_cards(2)
+            unseen = deck.deal_cards(len(deck))
+
+            analysis = analyze_draws(hole, board, dead)
+            current = evaluator.evaluate_hand(hole, board).rank
+            expected_outs = {
+                card for card in unseen if evaluator.evaluate_hand(hole, board + [card]).rank > current
+            }
+            improved = sum(
+                evaluator.evaluate_hand(hole, board + list(pair)).rank > current
+                for pair in combinations(unseen, 2)
+            )
+
+            assert analysis.unseen_count == len(unseen)
+            assert set(analysis.all_outs) == expected_outs
+            total_pairs = len(unseen) * (len(unseen) - 1) // 2
+            assert analysis.river_probability == pytest.approx(improved / total_pairs)
+
+    def test_river_odds_with_suited_flops(self):
+        """测试已知3-5张同花色时各牌型等级的河牌概率与逐个评估的结果一致."""
+        from collections import Counter
+        from itertools import combinations
+        from v3.core.eval import analyze_draws
+
+        evaluator = HandEvaluator()
+        for hole, board in (("AH 5C", "KH 9H 4C"), ("AH 5H", "KH 9H 4C"), ("AH 5H", "KH 9H 3H")):
+            hole, board = self._cards(hole), self._cards(board)
+            unseen = [card for card in Deck().deal_cards(52) if card not in hole + board]
+
+            analysis = analyze_draws(hole, board)
+            current = analysis.current.rank
+            ranks = Counter(evaluator.evaluate_hand(hole, board + list(pair)).rank
+                            for pair in combinations(unseen, 2))
+            total_pairs = len(unseen) * (len(unseen) - 1) // 2
+
+            assert analysis.river_odds == pytest.approx(
+                {rank: count / total_pairs for rank, count in ranks.items() if rank > current}
+            )
+
+    def test_invalid_input(self):
+        """测试无效输入."""
+        from v3.core.eval import analyze_draws
+
+        with pytest.raises(ValueError):
+            analyze_draws(self._cards("AH 5H"), self._cards("KH 9H"))
+        with pytest.raises(ValueError):
+            analyze_draws(self._cards("AH 5H"), self._cards("AH 9H 4C"))
+        with pytest.raises(ValueError):
+            analyze_draws(self._cards("AH"), self._cards("KH 9H 4C"))
+        with pytest.raises(TypeError):
+            analyze_draws(["AH", "5H"], self._cards("KH 9H 4C"))
@@ -93,6 +93,78 @@ class TestHandEvaluatorPerformance:
         avg_time = total_time / 1000
         print(f"平均每次评估时间: {avg_time*1000:.3f}毫秒")
 
+    def test_lookup_table_throughput(self):
+        """测试查找表评估器的7张牌吞吐量."""
+        evaluator = HandEvaluator()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(evaluator, "HandEvaluator")
+        
+        deck = Deck(random.Random(42))
+        test_hands = []
+        for _ in range(10000):
+            deck.reset()
+            deck.shuffle()
+            all_cards = deck.deal_cards(7)
+            test_hands.append((all_cards[:2], all_cards[2:]))
+        
+        # 取3轮中最快的一轮，减少与其他任务并行运行时的干扰
+        timings = []
+        for _ in range(3):
+            start_time = time.perf_counter()
+            for hole_cards, community_cards in test_hands:
+                evaluator.evaluate_hand(hole_cards, community_cards)
+            timings.append(time.perf_counter() - start_time)
+        
+        # 单独运行时约0.1秒（平均每次10微秒）；上限留出余量，只用于发现明显的性能退化
+        total_time = min(timings)
+        assert total_time < 0.5, f"10000次评估时间过长: {total_time:.6f}秒"
+        print(f"平均每次7张牌评估时间: {total_time / 10000 * 1e6:.2f}微秒")
+
+    def test_batch_evaluation_throughput(self):
+        """测试NumPy批量评估的吞吐量."""
+        import numpy as np
+        
+        evaluator = HandEvaluator()
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(evaluator, "HandEvaluator")
+        
+        rng = np.random.default_rng(42)
+        card_indices = np.argsort(rng.random((200000, 52)), axis=1)[:, :7].astype(np.uint8)
+        
+        start_time = time.perf_counter()
+        strengths = evaluator.evaluate_batch(card_indices)
+        end_time = time.perf_counter()
+        
+        assert strengths.shape == (200000,)
+        
+        # 20万手7张牌应该在0.5秒内完成
+        total_time = end_time - start_time
+        assert total_time < 0.5, f"20万手批量评估时间过长: {total_time:.6f}秒"
+        print(f"批量评估吞吐量: {200000 / total_time / 1e6:.2f}百万手/秒")
+
+    def test_fast_deck_dealing_throughput(self):
+        """测试FastDeck洗牌加发牌的吞吐量."""
+        from v3.core.deck.fast_deck import FastDeck
+        
+        deck = FastDeck(random.Random(42), block_size=1024)
+        
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(deck, "FastDeck")
+        
+        start_time = time.perf_counter()
+        for _ in range(50000):
+            deck.shuffle()
+            deck.deal_ids(2)
+            deck.deal_ids(2)
+            deck.deal_ids(5)
+        end_time = time.perf_counter()
+        
+        # 5万手洗牌和发牌应该在1秒内完成
+        total_time = end_time - start_time
+        assert total_time < 1.0, f"5万手洗牌发牌时间过长: {total_time:.6f}秒"
+
     def test_all_hand_types_performance(self):
         """测试所有牌型的评估性能."""
         evaluator = HandEvaluator()
@@ -0,0 +1,442 @@
+"""
+德州扑克胜率计算模块的单元测试.
+
+测试蒙特卡洛和精确胜率计算器的正确性、可复现性和输入验证.
+包含反作弊验证，确保测试使用真实的核心模块.
+"""
+
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from v3.core.deck import Card, Deck
+from v3.core.equity import (
+    CachedEquityCalculator, EquityResult, ExactEquityCalculator, HandRange, MonteCarloEquityCalculator,
+    RangeEquityCalculator,
+)
+from v3.core.eval import HandEvaluator
+from v3.tests.anti_cheat.core_usage_checker import CoreUsageChecker
+
+
+def _cards(*card_strs: str):
+    """将字符串转换为Card列表."""
+    return [Card.from_str(card_str) for card_str in card_strs]
+
+
+class TestMonteCarloEquityCalculator:
+    """MonteCarloEquityCalculator类的单元测试."""
+
+    def test_preflop_overpair_equity(self):
+        """测试翻牌前AA对KK的胜率（约82%）."""
+        calculator = MonteCarloEquityCalculator()
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(calculator, "MonteCarloEquityCalculator")
+
+        result = calculator.calculate(
+            {'aces': _cards('AH', 'AS'), 'kings': _cards('KH', 'KS')},
+            samples=40000, seed=11
+        )
+
+        # 反作弊检查结果
+        CoreUsageChecker.verify_real_objects(result, "EquityResult")
+
+        assert result.samples == 40000
+        assert not result.exact
+        assert 0.80 < result.equity_of('aces') < 0.85
+        assert abs(result.equity_of('aces') + result.equity_of('kings') - 1.0) < 1e-9
+        assert result.ranking() == ('aces', 'kings')
+
+    def test_seed_reproducibility(self):
+        """测试相同种子和样本数得到相同结果."""
+        calculator = MonteCarloEquityCalculator(chunk_size=1000)
+        hole_cards = {
+            'player1': _cards('AH', 'KH'),
+            'player2': _cards('QS', 'QD'),
+            'player3': _cards('7C', '8C'),
+        }
+        board = _cards('2H', '9H', 'TC')
+
+        first = calculator.calculate(hole_cards, board, samples=5000, seed=3)
+        second = calculator.calculate(hole_cards, board, samples=5000, seed=3)
+        other = calculator.calculate(hole_cards, board, samples=5000, seed=4)
+
+        assert first.players == second.players
+        assert first.players != other.players
+
+    def test_parallel_matches_single_process(self):
+        """测试多进程结果与单进程结果一致."""
+        hole_cards = {'player1': _cards('AH', 'AS'), 'player2': _cards('8D', '9D')}
+        board = _cards('7D', '10D', '2C')
+
+        single = MonteCarloEquityCalculator(chunk_size=2000).calculate(
+            hole_cards, board, samples=6000, seed=5
+        )
+        with MonteCarloEquityCalculator(workers=2, chunk_size=2000) as calculator:
+            parallel = calculator.calculate(hole_cards, board, samples=6000, seed=5)
+
+        assert single.players == parallel.players
+
+    def test_complete_board_is_exact(self):
+        """测试公共牌已发完时直接给出确定结果."""
+        calculator = MonteCarloEquityCalculator()
+
+        result = calculator.calculate(
+            {'player1': _cards('AH', 'KD'), 'player2': _cards('AD', 'KC')},
+            _cards('2C', '3C', '4D', '9S', 'JH')
+        )
+
+        assert result.exact
+        assert result.players['player1'].tie == 1.0
+        assert result.equity_of('player1') == 0.5
+
+    def test_dead_cards_are_excluded(self):
+        """测试死牌不会出现在公共牌中."""
+        calculator = MonteCarloEquityCalculator()
+        hole_cards = {'player1': _cards('AH', 'AS'), 'player2': _cards('KH', 'KS')}
+        board = _cards('2C', '7D', '9S', '3H')
+
+        # 剩下的两张K都是死牌，KK已经没有出路
+        result = calculator.calculate(hole_cards, board, _cards('KC', 'KD'), samples=2000, seed=1)
+
+        assert result.equity_of('player1') == 1.0
+
+    def test_time_budget(self):
+        """测试只按时间预算抽样."""
+        calculator = MonteCarloEquityCalculator(chunk_size=512)
+
+        result = calculator.calculate(
+            {'player1': _cards('AH', 'AS'), 'player2': _cards('KH', 'KS')},
+            samples=None, time_budget=0.01, seed=2
+        )
+
+        assert isinstance(result, EquityResult)
+        assert result.samples >= 512
+        assert result.samples % 512 == 0
+
+    def test_input_validation(self):
+        """测试输入验证."""
+        calculator = MonteCarloEquityCalculator()
+        hole_cards = {'player1': _cards('AH', 'AS'), 'player2': _cards('KH', 'KS')}
+
+        with pytest.raises(ValueError):
+            calculator.calculate({'player1': _cards('AH', 'AS')})
+        with pytest.raises(ValueError):
+            calculator.calculate({'player1': _cards('AH', 'AS'), 'player2': _cards('AH', 'KS')})
+        with pytest.raises(ValueError):
+            calculator.calculate(hole_cards, _cards('2C', '3C', '4C', '5C', '6C', '7C'))
+        with pytest.raises(ValueError):
+            calculator.calculate(hole_cards, samples=None, time_budget=None)
+        with pytest.raises(ValueError):
+            calculator.calculate(hole_cards, samples=0)
+        with pytest.raises(TypeError):
+            calculator.calculate(hole_cards, ['AH', 'KD', 'QC'])
+        with pytest.raises(ValueError):
+            MonteCarloEquityCalculator(workers=0)
+
+
+class TestExactEquityCalculator:
+    """ExactEquityCalculator类的单元测试."""
+
+    def test_flop_matches_brute_force(self):
+        """测试翻牌圈穷举结果与逐手评估一致."""
+        calculator = ExactEquityCalculator()
+        evaluator = HandEvaluator()
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(calculator, "ExactEquityCalculator")
+
+        hole_cards = {'player1': _cards('AH', 'KH'), 'player2': _cards('QS', 'QD')}
+        board = _cards('2H', '9H', '10C')
+        result = calculator.calculate(hole_cards, board)
+
+        used = set(hole_cards['player1'] + hole_cards['player2'] + board)
+        remaining = [card for card in Deck()._cards if card not in used]
+        wins = ties = 0
+        for runout in itertools.combinations(remaining, 2):
+            full_board = board + list(runout)
+            first = evaluator.evaluate_hand(hole_cards['player1'], full_board).strength
+            second = evaluator.evaluate_hand(hole_cards['player2'], full_board).strength
+            wins += first > second
+            ties += first == second
+
+        assert result.exact
+        assert result.samples == 990
+        assert result.players['player1'].win == wins / 990
+        assert result.players['player1'].tie == ties / 990
+
+    def test_flop_enumeration_speed(self):
+        """测试单挑翻牌圈全下的穷举耗时."""
+        calculator = ExactEquityCalculator()
+        hole_cards = {'player1': _cards('AH', 'KH'), 'player2': _cards('QS', 'QD')}
+        board = _cards('2H', '9H', '10C')
+        calculator.calculate(hole_cards, board)
+
+        start_time = time.perf_counter()
+        calculator.calculate(hole_cards, board)
+        total_time = time.perf_counter() - start_time
+
+        # 990种发牌结果应该在20毫秒内完成
+        assert total_time < 0.02, f"翻牌圈穷举时间过长: {total_time:.6f}秒"
+
+    def test_turn_multiway_and_dead_cards(self):
+        """测试转牌圈多人穷举和死牌排除."""
+        calculator = ExactEquityCalculator()
+        hole_cards = {
+            'player1': _cards('AH', 'AS'),
+            'player2': _cards('KH', 'KS'),
+            'player3': _cards('7C', '8C'),
+        }
+        board = _cards('2C', '7D', '9S', '3H')
+
+        result = calculator.calculate(hole_cards, board, _cards('KC'))
+
+        assert result.samples == 52 - 6 - 4 - 1
+        assert result.samples == calculator.count_runouts(hole_cards, board, _cards('KC'))
+        assert abs(sum(p.equity for p in result.players.values()) - 1.0) < 1e-9
+        # KK只剩KD一张出路
+        assert result.players['player2'].win == 1 / result.samples
+
+    def test_agrees_with_monte_carlo(self):
+        """测试穷举结果与大样本蒙特卡洛结果接近."""
+        hole_cards = {'player1': _cards('AH', 'AS'), 'player2': _cards('8D', '9D')}
+        board = _cards('7D', '10D', '2C')
+
+        exact = ExactEquityCalculator().calculate(hole_cards, board)
+        estimate = MonteCarloEquityCalculator().calculate(hole_cards, board, samples=40000, seed=9)
+
+        assert abs(exact.equity_of('player1') - estimate.equity_of('player1')) < 0.015
+
+    def test_complete_board_and_validation(self):
+        """测试公共牌已发完时的结果和输入验证."""
+        calculator = ExactEquityCalculator()
+
+        result = calculator.calculate(
+            {'player1': _cards('AH', 'KD'), 'player2': _cards('AD', 'KC')},
+            _cards('2C', '3C', '4D', '9S', 'JH')
+        )
+        assert result.exact
+        assert result.samples == 1
+        assert result.equity_of('player2') == 0.5
+
+        with pytest.raises(ValueError):
+            calculator.calculate({'player1': _cards('AH', 'AS')})
+        with pytest.raises(ValueError):
+            ExactEquityCalculator(batch_size=0)
+
+
+class TestCachedEquityCalculator:
+    """CachedEquityCalculator类的单元测试."""
+
+    def test_suit_isomorphic_spots_share_cache(self):
+        """测试只相差花色置换的牌局命中同一条缓存."""
+        calculator = CachedEquityCalculator(ExactEquityCalculator(), maxsize=16)
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(calculator, "CachedEquityCalculator")
+
+        first = calculator.calculate(
+            {'hero': _cards('AH', 'KH'), 'villain': _cards('QS', 'QD')}, _cards('2H', '9H', '10C')
+        )
+        second = calculator.calculate(
+            {'p1': _cards('KS', 'AS'), 'p2': _cards('QC', 'QH')}, _cards('9S', '2S', '10D')
+        )
+
+        assert calculator.stats().hits == 1
+        assert calculator.stats().misses == 1
+        assert second.exact and second.samples == first.samples
+        assert second.players['p1'].equity == first.players['hero'].equity
+        assert second.players['p2'].win == first.players['villain'].win
+
+        # 玩家顺序不同时对应不同的缓存条目
+        third = calculator.calculate(
+            {'villain': _cards('QS', 'QD'), 'hero': _cards('AH', 'KH')}, _cards('2H', '9H', '10C')
+        )
+        assert third.players['hero'].equity == first.players['hero'].equity
+        assert calculator.stats().misses == 2
+
+    def test_options_are_part_of_key(self):
+        """测试底层计算器参数不同时不会命中."""
+        calculator = CachedEquityCalculator(MonteCarloEquityCalculator())
+        hole_cards = {'player1': _cards('AH', 'AS'), 'player2': _cards('KH', 'KS')}
+
+        first = calculator.calculate(hole_cards, samples=2000, seed=1)
+        repeated = calculator.calculate(hole_cards, samples=2000, seed=1)
+        calculator.calculate(hole_cards, samples=2000, seed=2)
+
+        assert repeated.players == first.players
+        assert calculator.stats().hits == 1
+        assert calculator.stats().misses == 2
+
+        with pytest.raises(ValueError):
+            calculator.calculate({'player1': _cards('AH', 'AS'), 'player2': _cards('AH', 'KS')})
+        assert calculator.stats().size == 2
+
+    def test_unseeded_samples_are_not_cached(self):
+        """测试未指定种子或受时间预算影响的抽样结果不写入缓存."""
+        calculator = CachedEquityCalculator(MonteCarloEquityCalculator())
+        hole_cards = {'player1': _cards('AH', 'AS'), 'player2': _cards('KH', 'KS')}
+
+        first = calculator.calculate(hole_cards, samples=2000)
+        second = calculator.calculate(hole_cards, samples=2000)
+        calculator.calculate(hole_cards, samples=2000, time_budget=10.0, seed=1)
+
+        assert not first.exact and not second.exact
+        assert calculator.stats().hits == 0
+        assert calculator.stats().size == 0
+
+        calculator.calculate(hole_cards, samples=2000, seed=1)
+        calculator.calculate(hole_cards, samples=2000, seed=1)
+        assert calculator.stats().hits == 1
+        assert calculator.stats().size == 1
+
+    def test_seeded_samples_are_not_shared_across_suits(self):
+        """测试指定种子的抽样结果不会被花色置换后的牌局命中."""
+        calculator = CachedEquityCalculator(MonteCarloEquityCalculator())
+        first_spot = {'player1': _cards('AH', 'KH'), 'player2': _cards('QS', 'QD')}
+        second_spot = {'player1': _cards('AS', 'KS'), 'player2': _cards('QH', 'QD')}
+
+        calculator.calculate(first_spot, samples=2000, seed=3)
+        cached = calculator.calculate(second_spot, samples=2000, seed=3)
+        direct = MonteCarloEquityCalculator().calculate(second_spot, samples=2000, seed=3)
+
+        assert calculator.stats().hits == 0
+        assert cached.players == direct.players
+
+
+class TestHandRange:
+    """HandRange类的单元测试."""
+
+    def test_parse_notation(self):
+        """测试标准范围写法的组合数."""
+        hand_range = HandRange.parse("AKs, TT+, A5s-A2s")
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(hand_range, "HandRange")
+
+        assert hand_range.combo_count == 4 + 5 * 6 + 4 * 4
+        assert HandRange.parse("AKo").combo_count == 12
+        assert HandRange.parse("AK").combo_count == 16
+        assert HandRange.parse("ATs+").combo_count == 16
+        assert HandRange.parse("TT-66").combo_count == 30
+        assert HandRange.parse("66-TT") == HandRange.parse("TT-66")
+        assert HandRange.parse("KQs-K9s").combo_count == 16
+        assert HandRange.parse("10s9s").combo_count == 1
+        assert HandRange.parse("AhKh") == HandRange.parse("KHAH")
+
+    def test_weights_and_blockers(self):
+        """测试权重覆盖和阻断牌."""
+        hand_range = HandRange.parse("AK, AKs:0.5")
+        assert hand_range.weight_of(Card.from_str("AH"), Card.from_str("KH")) == 0.5
+        assert hand_range.weight_of(Card.from_str("KD"), Card.from_str("AH")) == 1.0
+        assert hand_range.total_weight == pytest.approx(12 + 4 * 0.5)
+
+        blocked = hand_range.blocked(_cards('AH', '2C'))
+        assert blocked.combo_count == 12
+        assert hand_range.combo_count == 16
+        assert all(Card.from_str("AH") not in (card1, card2) for card1, card2, _ in blocked.combos())
+        with pytest.raises(ValueError):
+            blocked.weights[0] = 1.0
+
+    def test_invalid_notation(self):
+        """测试无效的范围写法."""
+        for text in ("AKx", "AAs", "A5s-K2s", "A5s-A2o", "AK:2", "AK:x", "AhAh"):
+            with pytest.raises(ValueError):
+                HandRange.parse(text)
+        with pytest.raises(TypeError):
+            HandRange.parse(None)
+        with pytest.raises(ValueError):
+            HandRange([1.0] * 10)
+
+
+class TestRangeEquityCalculator:
+    """RangeEquityCalculator类的单元测试."""
+
+    def test_single_combos_match_exact_calculator(self):
+        """测试单个组合对单个组合时与精确计算器一致."""
+        calculator = RangeEquityCalculator()
+
+        # 反作弊检查
+        CoreUsageChecker.verify_real_objects(calculator, "RangeEquityCalculator")
+
+        hero, villain = _cards('AH', 'KH'), _cards('QS', 'QD')
+        for board in (_cards('2H', '7H', '9C'), _cards('2H', '7H', '9C', '4D')):
+            result = calculator.calculate(HandRange.from_combos([hero]), HandRange.from_combos([villain]), board)
+            expected = ExactEquityCalculator().calculate({'hero': hero, 'villain': villain}, board)
+            assert result.exact
+            assert result.equity == pytest.approx(expected.players['hero'].equity)
+            assert result.villain_equity == pytest.approx(expected.players['villain'].equity)
+
+    def test_weighted_ranges_with_blockers(self):
+        """测试加权范围等于各组合对精确胜率的加权平均，共用牌的组合对被排除."""
+        board = _cards('2H', '7H', '9C', '4D')
+        hero_combos = {('AH', 'KH'): 1.0, ('QS', 'QD'): 0.5}
+        villain_combos = {('JC', 'JD'): 0.5, ('9S', '8S'): 1.0, ('QH', 'QC'): 1.0, ('AS', 'QS'): 1.0}
+        hero_weights = [0.0] * 1326
+        villain_weights = [0.0] * 1326
+        from v3.core.equity import combo_index
+        for (card1, card2), weight in hero_combos.items():
+            hero_weights[combo_index(Card.from_str(card1), Card.from_str(card2))] = weight
+        for (card1, card2), weight in villain_combos.items():
+            villain_weights[combo_index(Card.from_str(card1), Card.from_str(card2))] = weight
+
+        result = RangeEquityCalculator().calculate(HandRange(hero_weights), HandRange(villain_weights), board)
+
+        exact = ExactEquityCalculator()
+        numerator = denominator = 0.0
+        aks_numerator = aks_denominator = 0.0
+        for hero, hero_weight in hero_combos.items():
+            for villain, villain_weight in villain_combos.items():
+                if set(hero) & set(villain):
+                    continue
+                equity = exact.calculate({'hero': _cards(*hero), 'villain': _cards(*villain)}, board)
+                numerator += hero_weight * villain_weight * equity.players['hero'].equity
+                denominator += hero_weight * villain_weight
+                if hero == ('AH', 'KH'):
+                    aks_numerator += villain_weight * equity.players['hero'].equity
+                    aks_denominator += villain_weight
+
+        assert result.equity == pytest.approx(numerator / denominator)
+        assert result.win + result.tie + result.lose == pytest.approx(1.0)
+        aks = combo_index(Card.from_str('AH'), Card.from_str('KH'))
+        assert result.combo_equities[aks] == pytest.approx(aks_numerator / aks_denominator)
+        assert int(np.isfinite(result.combo_equities).sum()) == 2
+
+    def test_sampled_preflop_is_reproducible(self):
+        """测试翻牌前抽样的可复现性和大致胜率."""
+        calculator = RangeEquityCalculator(samples=300)
+        aces, kings = HandRange.parse("AA"), HandRange.parse("KK")
+        first = calculator.calculate(aces, kings, seed=3)
+        second = calculator.calculate(aces, kings, seed=3)
+        assert not first.exact
+        assert first.samples == 300
+        assert first.equity == second.equity
+        assert 0.75 < first.equity < 0.88
+
+    def test_range_query_speed(self):
+        """测试转牌圈范围对范围的查询速度."""
+        calculator = RangeEquityCalculator()
+        hero = HandRange.parse("TT+, AK, AQs")
+        villain = HandRange.parse("22+, A2s+, KTs+, QJs, AJo+")
+        board = _cards('2H', '7H', '9C', '4D')
+        calculator.calculate(hero, villain, board)
+
+        start_time = time.perf_counter()
+        for _ in range(10):
+            calculator.calculate(hero, villain, board)
+        assert (time.perf_counter() - start_time) / 10 < 0.05
+
+    def test_invalid_input(self):
+        """测试无效输入."""
+        calculator = RangeEquityCalculator()
+        board = _cards('AH', 'KH', 'QH')
+        with pytest.raises(ValueError):
+            calculator.calculate(HandRange.parse("AhKh"), HandRange.parse("QQ"), board)
+        with pytest.raises(ValueError):
+            calculator.calculate(HandRange.parse("AA"), HandRange.parse("QQ"), board + board[:1])
+        with pytest.raises(TypeError):
+            calculator.calculate("AA", HandRange.parse("QQ"))
+        with pytest.raises(ValueError):
+            RangeEquityCalculator(samples=0)
@@ -76,22 +76,24 @@ class TestPlan41ServiceDecoupling:
             mock_snapshot.assert_called_once_with("test_interface")
     
     def test_query_service_get_player_info_uses_snapshot(self):
-        """测试get_player_info使用快照接口"""
+        """测试get_player_info使用只读状态视图接口，不创建快照"""
         # 创建游戏
         create_result = self.command_service.create_new_game("test_player_info", ["p1", "p2"])
         assert create_result.success
         
         # 使用mock监视command_service的方法调用
-        with patch.object(self.command_service, 'get_game_state_snapshot', 
-                         wraps=self.command_service.get_game_state_snapshot) as mock_snapshot:
+        with patch.object(self.command_service, 'get_game_state_view', 
+                         wraps=self.command_service.get_game_state_view) as mock_view, \
+             patch.object(self.command_service, 'get_game_state_snapshot') as mock_snapshot:
             
             # 调用查询服务的方法
             result = self.query_service.get_player_info("test_player_info", "p1")
             
-            # 验证使用了快照接口
+            # 验证使用了状态视图接口
             assert result.success
             assert isinstance(result.data, PlayerInfo)
-            mock_snapshot.assert_called_once_with("test_player_info")
+            mock_view.assert_called_once_with("test_player_info")
+            mock_snapshot.assert_not_called()
     
     def test_query_service_get_available_actions_uses_snapshot(self):
         """测试get_available_actions使用快照接口"""
@@ -167,7 +167,7 @@ class TestPlan44CoreLogicIntegration:
     def test_get_available_actions_command_service_failure(self):
         """测试命令服务失败的场景"""
         # 设置命令服务返回失败
-        self.command_service.get_game_state_snapshot.return_value = QueryResult.failure_result(
+        self.command_service.get_game_state_view.return_value = QueryResult.failure_result(
             "游戏不存在", 
             error_code="GAME_NOT_FOUND"
         )
@@ -214,7 +214,7 @@ class TestPlan44CoreLogicIntegration:
     def test_get_available_actions_exception_handling(self):
         """测试异常处理"""
         # 设置命令服务抛出异常
-        self.command_service.get_game_state_snapshot.side_effect = Exception("Test exception")
+        self.command_service.get_game_state_view.side_effect = Exception("Test exception")
         
         result = self.query_service.get_available_actions("test_game", "player1")
         
@@ -181,8 +181,8 @@ class TestPlan45CoreLogicIntegration:
         # 反作弊检查
         CoreUsageChecker.verify_real_objects(self.query_service, "GameQueryService")
         
-        # 使用patch让快照获取失败
-        with patch.object(self.command_service, 'get_game_state_snapshot') as mock_snapshot:
+        # 使用patch让状态视图获取失败
+        with patch.object(self.command_service, 'get_game_state_view') as mock_snapshot:
             mock_snapshot.return_value = QueryResult.failure_result(
                 "游戏不存在", 
                 error_code="GAME_NOT_FOUND"